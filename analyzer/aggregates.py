@@ -0,0 +1,233 @@
+# analyzer/aggregates.py
+"""
+Сводные метрики проекта: распределения, перцентили и итоги по пакетам.
+
+Значения метрик модулей и функций собираются в массивы NumPy, и все
+сводки вычисляются над массивами целиком. Массивы модуля кешируются по
+записи модуля, а столбцы значений проекта хранятся отсортированными,
+поэтому при обновлении нескольких файлов (режим наблюдения) заново
+извлекаются и вставляются только их значения, а итоги пересчитываются
+только для их пакетов.
+"""
+import os
+import threading
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+import numpy as np
+
+from .metrics import FUNCTION_METRICS, MODULE_METRICS
+from .model import ModuleRecord
+
+PERCENTILES = (50, 75, 90, 95, 99)
+
+# Границы диапазонов цикломатической сложности (как в HTML-отчете)
+COMPLEXITY_BANDS = (('1-4', 1), ('5-10', 5), ('11-20', 11), ('21+', 21))
+
+_ModuleRows = Tuple[ModuleRecord, Optional[Tuple[float, ...]], Optional[np.ndarray]]
+
+_MODULE_COLUMNS = ['loc'] + MODULE_METRICS
+_COMPLEXITY = FUNCTION_METRICS.index('complexity')
+_COGNITIVE = FUNCTION_METRICS.index('cognitive_complexity')
+
+
+def _function_values(func: Dict[str, Any]) -> Tuple[float, ...]:
+    metrics = func.get('metrics') or {}
+    return (func.get('complexity', 1),) + tuple(metrics.get(name, 0) for name in FUNCTION_METRICS[1:])
+
+
+def _module_rows(module: ModuleRecord) -> Tuple[Tuple[float, ...], np.ndarray]:
+    """Извлекает значения метрик модуля и его функций"""
+    metrics = module.get('metrics') or {}
+    module_values = (module.get('loc', 0),) + tuple(metrics.get(name, 0) for name in MODULE_METRICS)
+
+    functions = [_function_values(func) for func in module.get('functions', ())]
+    for cls in module.get('classes', ()):
+        functions.extend(_function_values(method) for method in cls.get('methods', ()))
+    function_values = np.array(functions, dtype=np.float64).reshape(len(functions), len(FUNCTION_METRICS))
+    return module_values, function_values
+
+
+def _package(path: str) -> str:
+    return os.path.dirname(path) or '.'
+
+
+def _stack(rows: List[np.ndarray], columns: int) -> np.ndarray:
+    rows = [row for row in rows if len(row)]
+    return np.concatenate(rows) if rows else np.empty((0, columns))
+
+
+def _update_sorted(columns: np.ndarray, removed: np.ndarray, added: np.ndarray) -> np.ndarray:
+    """
+    Удаляет и добавляет значения в матрице, каждый столбец которой отсортирован.
+
+    Args:
+        columns: Матрица с отсортированными по отдельности столбцами
+        removed: Строки значений, которые есть в матрице и удаляются
+        added: Добавляемые строки значений
+
+    Returns:
+        Новая матрица с отсортированными столбцами
+    """
+    count = len(columns) - len(removed) + len(added)
+    result = np.empty((count, columns.shape[1]))
+    for index in range(columns.shape[1]):
+        column = columns[:, index]
+        if len(removed):
+            values = np.sort(removed[:, index])
+            # Для повторяющихся значений удаляются соседние позиции
+            repeats = np.arange(len(values)) - np.searchsorted(values, values)
+            column = np.delete(column, np.searchsorted(column, values) + repeats)
+        if len(added):
+            values = np.sort(added[:, index])
+            column = np.insert(column, np.searchsorted(column, values), values)
+        result[:, index] = column
+    return result
+
+
+def _summary(columns: np.ndarray, names: List[str]) -> Dict[str, Dict[str, float]]:
+    """Среднее, минимум, максимум и перцентили каждого столбца отсортированной матрицы"""
+    count = len(columns)
+    if not count:
+        empty = {'mean': 0.0, 'min': 0.0, 'max': 0.0, **{f'p{q}': 0.0 for q in PERCENTILES}}
+        return {name: dict(empty) for name in names}
+
+    # Перцентили с линейной интерполяцией, как np.percentile, но без
+    # частичной сортировки: столбцы уже отсортированы
+    positions = (count - 1) * (np.array(PERCENTILES) / 100)
+    lower = np.floor(positions).astype(np.int64)
+    gamma = (positions - lower)[:, None]
+    below, above = columns[lower], columns[np.minimum(lower + 1, count - 1)]
+    difference = above - below
+    percentiles = np.where(gamma >= 0.5, above - difference * (1 - gamma), below + difference * gamma)
+
+    stats = np.vstack([
+        columns.sum(axis=0) / count,
+        columns[0],
+        columns[-1],
+        percentiles
+    ]).round(2)
+    keys = ['mean', 'min', 'max'] + [f'p{q}' for q in PERCENTILES]
+    return {name: dict(zip(keys, stats[:, column].tolist())) for column, name in enumerate(names)}
+
+
+def _package_summary(package: str, rows: List[_ModuleRows]) -> Dict[str, Any]:
+    """Итоги одного пакета по строкам его модулей"""
+    module_values = np.array([row[1] for row in rows], dtype=np.float64)
+    function_values = _stack([row[2] for row in rows], len(FUNCTION_METRICS))
+
+    def column(name: str) -> np.ndarray:
+        return module_values[:, _MODULE_COLUMNS.index(name)]
+
+    functions = len(function_values)
+    complexity = function_values[:, _COMPLEXITY]
+    cognitive = function_values[:, _COGNITIVE]
+    return {
+        'package': package,
+        'modules': len(rows),
+        'functions': functions,
+        'sloc': int(column('sloc').sum()),
+        'comments': int(column('comments').sum()),
+        'complexity_mean': round(float(complexity.sum() / functions), 2) if functions else 0.0,
+        'complexity_max': int(complexity.max()) if functions else 0,
+        'cognitive_complexity_mean': round(float(cognitive.sum() / functions), 2) if functions else 0.0,
+        'maintainability_index_mean': round(float(column('maintainability_index').mean()), 2)
+    }
+
+
+class MetricsAggregator:
+    """
+    Вычисляет сводные метрики проекта по записям модулей.
+
+    Агрегатор хранит значения метрик всех функций и модулей в матрицах с
+    отсортированными по отдельности столбцами и итоги каждого пакета. При
+    повторном вызове aggregate значения измененных модулей (записи
+    сравниваются по идентичности) удаляются из столбцов и вставляются
+    заново, а итоги пересчитываются только для их пакетов, поэтому
+    перцентили, минимумы и максимумы не требуют сортировки всего проекта.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # {путь модуля: (запись, значения модуля, матрица значений функций)};
+        # для модулей с ошибками значения равны None
+        self._rows: Dict[str, _ModuleRows] = {}
+        self._functions = np.empty((0, len(FUNCTION_METRICS)))
+        self._modules = np.empty((0, len(_MODULE_COLUMNS)))
+        # {пакет: пути его модулей} и {пакет: итоги пакета}
+        self._package_paths: Dict[str, Set[str]] = {}
+        self._packages: Dict[str, Dict[str, Any]] = {}
+
+    def _sync(self, modules: Dict[str, ModuleRecord]) -> None:
+        """Применяет изменения записей модулей с прошлого вызова"""
+        rows = self._rows
+        missing = (None,)
+        changed = [path for path, module in modules.items() if rows.get(path, missing)[0] is not module]
+        removed = rows.keys() - modules.keys() if len(rows) + len(changed) > len(modules) else ()
+        if not changed and not removed:
+            return
+
+        old_rows = [rows.pop(path) for path in removed]
+        old_rows.extend(rows[path] for path in changed if path in rows)
+        new_rows = []
+        for path in changed:
+            module = modules[path]
+            rows[path] = (module, None, None) if module.get('error') is not None else (module,) + _module_rows(module)
+            new_rows.append(rows[path])
+
+        old_rows = [row for row in old_rows if row[1] is not None]
+        new_rows = [row for row in new_rows if row[1] is not None]
+        def module_values(rows: List[_ModuleRows]) -> np.ndarray:
+            return np.array([row[1] for row in rows], dtype=np.float64).reshape(len(rows), len(_MODULE_COLUMNS))
+
+        self._modules = _update_sorted(self._modules, module_values(old_rows), module_values(new_rows))
+        self._functions = _update_sorted(self._functions,
+                                         _stack([row[2] for row in old_rows], len(FUNCTION_METRICS)),
+                                         _stack([row[2] for row in new_rows], len(FUNCTION_METRICS)))
+
+        packages = set()
+        for path in [*removed, *changed]:
+            package = _package(path)
+            packages.add(package)
+            paths = self._package_paths.setdefault(package, set())
+            if path in rows and rows[path][1] is not None:
+                paths.add(path)
+            else:
+                paths.discard(path)
+        for package in packages:
+            paths = self._package_paths[package]
+            if paths:
+                self._packages[package] = _package_summary(package, [rows[path] for path in sorted(paths)])
+            else:
+                del self._package_paths[package]
+                self._packages.pop(package, None)
+
+    def aggregate(self, modules: Dict[str, ModuleRecord]) -> Dict[str, Any]:
+        """
+        Вычисляет сводные метрики проекта.
+
+        Args:
+            modules: Словарь {относительный путь: запись модуля}; модули
+                с синтаксическими ошибками не учитываются
+
+        Returns:
+            Словарь с итогами строк, распределениями метрик функций и
+            модулей, числом функций по диапазонам сложности и итогами по пакетам
+        """
+        with self._lock:
+            self._sync(modules)
+            module_values = self._modules
+            function_values = self._functions
+            packages = [self._packages[package] for package in sorted(self._packages)]
+
+        totals = module_values.sum(axis=0)
+        complexity = function_values[:, _COMPLEXITY]
+        band_starts = np.searchsorted(complexity, [start for _, start in COMPLEXITY_BANDS])
+        band_counts = np.diff(np.append(band_starts, len(complexity)))
+
+        return {
+            'totals': {name: int(totals[_MODULE_COLUMNS.index(name)]) for name in ('sloc', 'comments', 'blank')},
+            'functions': {'count': len(function_values), **_summary(function_values, FUNCTION_METRICS)},
+            'modules': {'count': len(module_values), **_summary(module_values[:, 1:], MODULE_METRICS)},
+            'complexity_bands': dict(zip((name for name, _ in COMPLEXITY_BANDS), band_counts.tolist())),
+            'packages': packages
+        }
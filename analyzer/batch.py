@@ -0,0 +1,521 @@
+# analyzer/batch.py
+"""
+Пакетный анализ нескольких проектов в общем пуле процессов.
+
+Проекты перечисляются в манифесте; файлы всех проектов анализируются
+одним пулом воркеров, который выдает пакеты файлов проектам по очереди
+(round-robin), поэтому большой проект не задерживает маленькие. Отчет
+проекта записывается сразу после его анализа, а журнал выполненных
+проектов позволяет продолжить прерванный запуск, не анализируя их заново.
+
+Запуск:
+    python -m analyzer.batch projects.txt --output-dir reports --workers 8
+"""
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import partial
+from typing import Deque, Dict, List, Any, Callable, Iterator, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .cache import AnalysisCache
+from .core import ANALYZER_VERSION, OPTIONAL_SECTIONS, CodeAnalyzer, _analyze_path
+from .discovery import FileDiscovery, DEFAULT_MAX_FILE_SIZE
+from .model import json_default
+from .ranking import DEFAULT_TOP_K
+
+# Файлов в одном пакете, выдаваемом воркеру
+DEFAULT_CHUNK_SIZE = 16
+# Сколько раз повторять пакет, если процесс-воркер аварийно завершился
+MAX_CHUNK_ATTEMPTS = 2
+
+JOURNAL_NAME = 'batch_journal.jsonl'
+
+
+class ManifestError(ValueError):
+    """Ошибка в манифесте проектов."""
+
+
+class BatchProject:
+    """Проект из манифеста"""
+
+    __slots__ = ('name', 'path', 'memory_limit', 'include', 'exclude')
+
+    def __init__(self, name: str, path: str, memory_limit: Optional[int] = None,
+                 include: Optional[List[str]] = None, exclude: Optional[List[str]] = None):
+        """
+        Args:
+            name: Уникальное имя проекта (имя файла отчета)
+            path: Корневая директория проекта
+            memory_limit: Ограничение прироста памяти воркера при анализе
+                пакета файлов проекта, байт; None - без ограничения
+            include: Шаблоны анализируемых файлов (по умолчанию *.py)
+            exclude: Шаблоны исключаемых путей
+        """
+        self.name = name
+        self.path = path
+        self.memory_limit = memory_limit
+        self.include = include
+        self.exclude = exclude
+
+    def __repr__(self) -> str:
+        return f'BatchProject({self.name!r}, {self.path!r})'
+
+
+def load_manifest(manifest_path: str, memory_limit: Optional[int] = None) -> List[BatchProject]:
+    """
+    Читает манифест проектов.
+
+    Манифест - текстовый файл с путем проекта в каждой строке (пустые
+    строки и строки, начинающиеся с #, пропускаются) или JSON-файл со
+    списком (или объектом {"projects": [...]}) путей либо объектов
+    {"path", "name", "memory_limit_mb", "include", "exclude"}.
+    Относительные пути отсчитываются от директории манифеста.
+
+    Args:
+        manifest_path: Путь к манифесту
+        memory_limit: Ограничение памяти по умолчанию, байт
+
+    Returns:
+        Проекты в порядке манифеста; совпадающие имена получают суффиксы -2, -3...
+
+    Raises:
+        ManifestError: Если манифест некорректен
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    if manifest_path.endswith('.json'):
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise ManifestError(f'Invalid JSON manifest: {e}')
+        entries = data.get('projects') if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            raise ManifestError('JSON manifest must be a list of projects or {"projects": [...]}')
+    else:
+        entries = [line.strip() for line in text.splitlines()]
+        entries = [line for line in entries if line and not line.startswith('#')]
+
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    projects = []
+    names: Dict[str, int] = {}
+    for number, entry in enumerate(entries, 1):
+        if isinstance(entry, str):
+            entry = {'path': entry}
+        if not isinstance(entry, dict) or not isinstance(entry.get('path'), str) or not entry['path']:
+            raise ManifestError(f'Project {number}: "path" is required')
+
+        path = os.path.normpath(os.path.join(base, os.path.expanduser(entry['path'])))
+        name = str(entry.get('name') or os.path.basename(path) or 'project')
+        names[name] = names.get(name, 0) + 1
+        if names[name] > 1:
+            name = f'{name}-{names[name]}'
+
+        limit = memory_limit
+        if entry.get('memory_limit_mb') is not None:
+            try:
+                limit = int(float(entry['memory_limit_mb']) * 1024 * 1024)
+            except (TypeError, ValueError):
+                raise ManifestError(f'Project {number}: memory_limit_mb must be a number')
+        projects.append(BatchProject(name, path, limit or None, entry.get('include'), entry.get('exclude')))
+    return projects
+
+
+def _address_space() -> Optional[int]:
+    """Текущий размер адресного пространства процесса, байт (только Linux)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE')
+
+
+@contextmanager
+def _memory_limit(limit: Optional[int]) -> Iterator[None]:
+    """
+    Ограничивает прирост адресного пространства процесса на время блока.
+
+    Превышение приводит к MemoryError при выделении памяти. Без модуля
+    resource или /proc (Windows, macOS) ограничение не применяется.
+    """
+    current = _address_space() if limit and resource is not None else None
+    if current is None:
+        yield
+        return
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    target = current + limit
+    if hard != resource.RLIM_INFINITY:
+        target = min(target, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (target, hard))
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+def _analyze_chunk(tasks: List[Tuple], memory_limit: Optional[int]) -> List[Tuple]:
+    """Анализирует пакет файлов одного проекта в процессе-воркере"""
+    with _memory_limit(memory_limit):
+        return [_analyze_path(task) for task in tasks]
+
+
+class _Chunk:
+    __slots__ = ('project', 'tasks', 'memory_limit', 'future', 'attempts', 'generation')
+
+    def __init__(self, project: str, tasks: List[Tuple], memory_limit: Optional[int]):
+        self.project = project
+        self.tasks = tasks
+        self.memory_limit = memory_limit
+        # Результат пакета для потока проекта
+        self.future: Future = Future()
+        self.attempts = 0
+        self.generation = 0
+
+
+class SharedWorkerPool:
+    """
+    Пул процессов, общий для анализа нескольких проектов.
+
+    Каждый проект ставит в очередь пакеты своих файлов (run), а поток-
+    диспетчер выдает воркерам пакеты проектов по очереди, поддерживая не
+    больше max_pending пакетов в работе. Результаты каждого проекта
+    возвращаются в порядке его задач. Если воркер аварийно завершился,
+    пул пересоздается, а пакеты, которые выполнялись, повторяются.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 max_pending: Optional[int] = None):
+        """
+        Args:
+            workers: Количество процессов, 0 или None - по числу ядер
+            chunk_size: Количество файлов в пакете
+            max_pending: Сколько пакетов может одновременно находиться в
+                пуле; по умолчанию - вдвое больше числа процессов
+        """
+        self.workers = workers if workers and workers > 0 else os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.max_pending = max_pending or self.workers * 2
+        self._lock = threading.Condition()
+        self._queues: Dict[str, Deque[_Chunk]] = {}
+        # Проекты с пакетами в очереди в порядке обслуживания
+        self._order: Deque[str] = deque()
+        self._running = 0
+        self._generation = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def __enter__(self) -> 'SharedWorkerPool':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start(self) -> None:
+        self._executor = self._new_executor()
+        self._thread = threading.Thread(target=self._dispatch, name='batch-dispatcher', daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # Воркеры создаются по мере необходимости из потока-диспетчера; fork
+        # процесса с несколькими потоками может унаследовать захваченные блокировки
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def run(self, project: str, tasks: List[Tuple], memory_limit: Optional[int] = None) -> Iterator[Tuple]:
+        """
+        Анализирует файлы проекта в пуле.
+
+        Args:
+            project: Уникальный ключ проекта
+            tasks: Задачи для _analyze_path
+            memory_limit: Ограничение прироста памяти воркера на пакет, байт
+
+        Returns:
+            Итератор результатов _analyze_path в порядке задач. Закрытие
+            итератора отменяет еще не выданные воркерам пакеты проекта
+        """
+        chunks = [_Chunk(project, tasks[i:i + self.chunk_size], memory_limit)
+                  for i in range(0, len(tasks), self.chunk_size)]
+        if not chunks:
+            return
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Pool is closed')
+            self._queues[project] = deque(chunks)
+            self._order.append(project)
+            self._lock.notify_all()
+        try:
+            for chunk in chunks:
+                yield from chunk.future.result()
+        finally:
+            with self._lock:
+                for chunk in self._queues.pop(project, ()):
+                    chunk.future.cancel()
+                if project in self._order:
+                    self._order.remove(project)
+
+    def _dispatch(self) -> None:
+        with self._lock:
+            while not self._closed:
+                if self._running >= self.max_pending or not self._order:
+                    self._lock.wait()
+                    continue
+                project = self._order.popleft()
+                queue = self._queues[project]
+                chunk = queue.popleft()
+                if queue:
+                    self._order.append(project)
+                if chunk.future.set_running_or_notify_cancel():
+                    self._submit(chunk)
+
+    def _submit(self, chunk: _Chunk) -> None:
+        self._running += 1
+        chunk.generation = self._generation
+        try:
+            future = self._executor.submit(_analyze_chunk, chunk.tasks, chunk.memory_limit)
+        except BrokenProcessPool as e:
+            future = Future()
+            future.set_exception(e)
+        future.add_done_callback(partial(self._chunk_done, chunk))
+
+    def _chunk_done(self, chunk: _Chunk, future: Future) -> None:
+        with self._lock:
+            self._running -= 1
+            if future.cancelled():
+                chunk.future.set_exception(CancelledError())
+            elif isinstance(future.exception(), BrokenProcessPool) and not self._closed \
+                    and chunk.attempts + 1 < MAX_CHUNK_ATTEMPTS and chunk.project in self._queues:
+                chunk.attempts += 1
+                if chunk.generation == self._generation:
+                    # Функция вызывается в служебном потоке старого пула, поэтому он не ожидается
+                    self._executor.shutdown(wait=False)
+                    self._executor = self._new_executor()
+                    self._generation += 1
+                self._submit(chunk)
+            elif future.exception() is not None:
+                chunk.future.set_exception(future.exception())
+            else:
+                chunk.future.set_result(future.result())
+            self._lock.notify_all()
+
+
+class _PooledAnalyzer(CodeAnalyzer):
+    """Анализатор, который выполняет задачи в общем пуле пакетного запуска"""
+
+    def __init__(self, project: BatchProject, pool: SharedWorkerPool, **kwargs):
+        super().__init__(project.path, **kwargs)
+        self._project = project
+        self._pool = pool
+
+    def _run_tasks(self, tasks, workers):
+        return self._pool.run(self._project.name, tasks, self._project.memory_limit)
+
+
+def _write_json_atomic(file_path: str, data: Dict[str, Any]) -> None:
+    """Записывает отчет атомарно, чтобы после сбоя не остался частично записанный файл"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'), default=json_default)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_journal(output_dir: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Возвращает последние записи журнала пакетного запуска по именам проектов.
+
+    Неполная последняя строка (сбой во время записи) пропускается.
+    """
+    journal = {}
+    try:
+        with open(os.path.join(output_dir, JOURNAL_NAME), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                journal[entry['name']] = entry
+    except FileNotFoundError:
+        pass
+    return journal
+
+
+def run_batch(projects: List[BatchProject], output_dir: str, workers: Optional[int] = None,
+              max_active: Optional[int] = None, cache_dir: Optional[str] = None, resume: bool = True,
+              report_options: Optional[Dict[str, Any]] = None, max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+              chunk_size: int = DEFAULT_CHUNK_SIZE,
+              on_finish: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    """
+    Анализирует проекты в общем пуле процессов.
+
+    Отчет каждого проекта записывается в output_dir/<имя>.json сразу после
+    анализа, после чего в журнал (batch_journal.jsonl) добавляется запись
+    о проекте. При resume проекты, успешно выполненные в прошлых запусках
+    (запись в журнале и файл отчета существуют), пропускаются.
+
+    Args:
+        projects: Проекты (см. load_manifest)
+        output_dir: Директория отчетов и журнала (создается при необходимости)
+        workers: Количество процессов общего пула, 0 или None - по числу ядер
+        max_active: Сколько проектов анализируется одновременно; результаты
+            незавершенных проектов хранятся в памяти, поэтому число
+            ограничено. По умолчанию - вдвое больше числа процессов
+        cache_dir: Директория постоянных кешей анализа (<имя>.sqlite)
+        resume: Пропускать проекты, выполненные в прошлых запусках
+        report_options: Параметры generate_project_report
+        max_file_size: Максимальный размер анализируемого файла, байт
+        chunk_size: Количество файлов в пакете, выдаваемом воркеру
+        on_finish: Функция, вызываемая с записью журнала после каждого проекта
+
+    Returns:
+        Записи журнала проектов этого запуска (status - done, failed или
+        skipped) в порядке завершения
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    journal = read_journal(output_dir) if resume else {}
+    journal_lock = threading.Lock()
+    results: List[Dict[str, Any]] = []
+
+    def finish(entry: Dict[str, Any]) -> None:
+        with journal_lock:
+            if entry['status'] != 'skipped':
+                with open(os.path.join(output_dir, JOURNAL_NAME), 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+            results.append(entry)
+        if on_finish is not None:
+            on_finish(entry)
+
+    pending = []
+    for project in projects:
+        done = journal.get(project.name)
+        report_path = os.path.join(output_dir, f'{project.name}.json')
+        if done is not None and done.get('status') == 'done' and os.path.isfile(report_path):
+            finish(dict(done, path=project.path, status='skipped', report=report_path))
+        else:
+            pending.append(project)
+
+    with SharedWorkerPool(workers, chunk_size) as pool:
+        run = partial(_run_project, pool=pool, output_dir=output_dir, cache_dir=cache_dir,
+                      report_options=report_options or {}, max_file_size=max_file_size)
+        with ThreadPoolExecutor(max_workers=max_active or pool.workers * 2,
+                                thread_name_prefix='batch-project') as threads:
+            for future in [threads.submit(run, project) for project in pending]:
+                future.add_done_callback(lambda f: finish(f.result()))
+    return results
+
+
+def _run_project(project: BatchProject, pool: SharedWorkerPool, output_dir: str, cache_dir: Optional[str],
+                 report_options: Dict[str, Any], max_file_size: Optional[int]) -> Dict[str, Any]:
+    """Анализирует один проект и записывает его отчет; возвращает запись журнала"""
+    started = time.perf_counter()
+    entry: Dict[str, Any] = {'name': project.name, 'path': project.path}
+    if not os.path.isdir(project.path):
+        entry.update(status='failed', error=f'Not a directory: {project.path}')
+        return entry
+
+    cache = None
+    try:
+        # Ошибка открытия кеша (поврежденный или недоступный файл) - ошибка проекта
+        if cache_dir:
+            cache = AnalysisCache(os.path.join(cache_dir, f'{project.name}.sqlite'), ANALYZER_VERSION)
+        discovery = FileDiscovery(project.path, include=project.include or ('*.py',),
+                                  exclude=project.exclude or (), max_file_size=max_file_size)
+        analyzer = _PooledAnalyzer(project, pool, cache=cache, discovery=discovery)
+        analyzer.scan_project()
+        report = analyzer.generate_project_report(**report_options)
+        report_path = os.path.join(output_dir, f'{project.name}.json')
+        _write_json_atomic(report_path, report)
+        entry.update(status='done', report=report_path, analysis_id=report['analysis_id'],
+                     modules=report['total_modules'])
+    except Exception as e:
+        entry.update(status='failed', error=f'{type(e).__name__}: {e}')
+    finally:
+        if cache is not None:
+            cache.close()
+    entry['seconds'] = round(time.perf_counter() - started, 3)
+    entry['finished'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+    return entry
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Пакетный анализ нескольких Python-проектов')
+    parser.add_argument('manifest', help='Манифест проектов: текстовый файл с путями или JSON')
+    parser.add_argument('--output-dir', '-o', required=True, help='Директория отчетов и журнала запуска')
+    parser.add_argument('--workers', type=int, default=0, help='Количество процессов (0 - по числу ядер)')
+    parser.add_argument('--max-active', type=int,
+                        help='Сколько проектов анализировать одновременно (по умолчанию - 2 на процесс)')
+    parser.add_argument('--memory-limit-mb', type=float,
+                        help='Ограничение прироста памяти воркера при анализе пакета файлов проекта, МБ '
+                             '(только Linux); в JSON-манифесте задается для проекта ключом memory_limit_mb')
+    parser.add_argument('--cache-dir', help='Директория постоянных кешей анализа проектов')
+    parser.add_argument('--restart', action='store_true',
+                        help='Анализировать все проекты заново, не учитывая журнал прошлых запусков')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Файлов в пакете воркера')
+    parser.add_argument('--max-file-size', type=int, default=DEFAULT_MAX_FILE_SIZE,
+                        help='Максимальный размер файла в байтах (0 - без ограничения)')
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K,
+                        help='Количество самых сложных функций в отчете (0 - все)')
+    parser.add_argument('--section', action='append', default=[], dest='sections', choices=OPTIONAL_SECTIONS,
+                        help='Добавить в отчеты раздел, который по умолчанию не строится, '
+                             'можно указать несколько раз')
+    args = parser.parse_args(argv)
+
+    memory_limit = int(args.memory_limit_mb * 1024 * 1024) if args.memory_limit_mb else None
+    try:
+        projects = load_manifest(args.manifest, memory_limit)
+    except (OSError, ManifestError) as e:
+        print(f'Manifest: {e}', file=sys.stderr)
+        return 2
+
+    total = len(projects)
+    counter = [0]
+
+    def report_progress(entry: Dict[str, Any]) -> None:
+        counter[0] += 1
+        details = entry.get('error') or f"{entry.get('modules', '-')} modules, {entry.get('seconds', 0)} s"
+        print(f"[{counter[0]}/{total}] {entry['name']}: {entry['status']} ({details})", file=sys.stderr)
+
+    results = run_batch(projects, args.output_dir, workers=args.workers, max_active=args.max_active,
+                        cache_dir=args.cache_dir, resume=not args.restart,
+                        report_options={'top_k': args.top_k or None, 'sections': args.sections},
+                        max_file_size=args.max_file_size or None, chunk_size=args.chunk_size,
+                        on_finish=report_progress)
+    return 1 if any(entry['status'] == 'failed' for entry in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+# analyzer/cache.py
+import hashlib
+import json
+import sqlite3
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+
+def content_digest(content: str) -> str:
+    """Возвращает хеш содержимого файла."""
+    return hashlib.sha1(content.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+class CacheEntry:
+    """Сохраненный результат analyze_file для одного файла."""
+
+    __slots__ = ('mtime_ns', 'size', 'digest', 'result')
+
+    def __init__(self, mtime_ns: int, size: int, digest: str, result: str):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        # Результат хранится в JSON и разбирается только при попадании
+        self.result = result
+
+    def matches_stat(self, mtime_ns: int, size: int) -> bool:
+        """Проверяет, совпадают ли время изменения и размер файла."""
+        return self.mtime_ns == mtime_ns and self.size == size
+
+    def load_result(self) -> Dict[str, Any]:
+        """Возвращает сохраненный результат анализа."""
+        return json.loads(self.result)
+
+
+class AnalysisCache:
+    """
+    Постоянный кеш результатов анализа файлов проекта в SQLite.
+
+    Результаты хранятся по относительному пути файла вместе со временем
+    изменения, размером и хешем содержимого. Если время и размер
+    совпадают, файл не читается; если изменились только они, файл
+    читается, но не разбирается повторно при совпадении хеша.
+    При смене версии анализатора кеш очищается.
+    """
+
+    def __init__(self, db_path: str, version: str):
+        """
+        Открывает (или создает) кеш.
+
+        Args:
+            db_path: Путь к файлу базы данных
+            version: Версия анализатора, с которой совместимы записи
+        """
+        self.db_path = db_path
+        self.version = version
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                result TEXT NOT NULL
+            );
+        ''')
+        self._check_version()
+
+    def _check_version(self) -> None:
+        """Очищает кеш, если он создан другой версией анализатора."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != self.version:
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Удаляет все записи кеша."""
+        with self._conn:
+            self._conn.execute('DELETE FROM files')
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                (self.version,)
+            )
+
+    def load(self) -> Dict[str, CacheEntry]:
+        """Загружает все записи кеша."""
+        return {
+            path: CacheEntry(mtime_ns, size, digest, result)
+            for path, mtime_ns, size, digest, result in self._conn.execute(
+                'SELECT path, mtime_ns, size, digest, result FROM files'
+            )
+        }
+
+    def store(self, rows: Iterable[Tuple[str, int, int, str, Dict[str, Any]]]) -> None:
+        """
+        Сохраняет результаты анализа.
+
+        Args:
+            rows: Кортежи (путь, mtime_ns, размер, хеш, результат analyze_file)
+        """
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO files (path, mtime_ns, size, digest, result) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (
+                    (path, mtime_ns, size, digest, json.dumps(result, separators=(',', ':')))
+                    for path, mtime_ns, size, digest, result in rows
+                )
+            )
+
+    def remove(self, paths: Iterable[str]) -> None:
+        """Удаляет записи для указанных путей."""
+        with self._conn:
+            self._conn.executemany('DELETE FROM files WHERE path = ?', ((path,) for path in paths))
+
+    def close(self) -> None:
+        """Закрывает соединение с базой данных."""
+        self._conn.close()
+
+    def __enter__(self) -> 'AnalysisCache':
+        return self
+
+    def __exit__(self, *exc_info: Optional[Any]) -> None:
+        self.close()
@@ -0,0 +1,557 @@
+# analyzer/call_graph.py
+"""
+Индекс символов проекта и межмодульный граф вызовов.
+
+Символ - функция, метод, класс или модуль - обозначается строкой
+'путь::полное имя' ('utils/file_manager.py::FileManager.save_to_file').
+Вызовы на уровне модуля относятся к псевдосимволу '<module>'.
+
+Вызовы разрешаются статически по таблице символов: локальные и вложенные
+определения, импорты с псевдонимами (в том числе относительные и через
+реэкспорт в __init__.py), методы self/cls/super() с учетом базовых классов.
+Динамические вызовы (getattr, вызовы результатов выражений) и вызовы
+внешних библиотек в граф не попадают.
+
+Кроме вызовов индекс разрешает ссылки на имена вне вызовов (передачу
+функций как значений, базовые классы, имена из __all__) - они образуют
+ребра использования, по которым analyzer.dead_code ищет недостижимый код.
+
+Ребра хранятся по модулю, вызовы которого их образуют, вместе со списком
+модулей, к которым обращалось разрешение. Поэтому при изменении файла
+пересчитываются только его вызовы, а если изменились определения или
+импорты модуля - еще и вызовы модулей, которые на него ссылались.
+"""
+import threading
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from .dependency_graph import ModuleIndex, _path_parts
+from .model import ModuleRecord
+
+MODULE_SYMBOL = '<module>'
+
+KIND_MODULE = 'module'
+KIND_FUNCTION = 'function'
+KIND_METHOD = 'method'
+KIND_CLASS = 'class'
+
+SYMBOL_KINDS = (KIND_MODULE, KIND_FUNCTION, KIND_METHOD, KIND_CLASS)
+_MODULE, _FUNCTION, _METHOD, _CLASS = range(len(SYMBOL_KINDS))
+
+# Предел длины цепочек реэкспортов и наследования при разрешении имени
+MAX_RESOLVE_DEPTH = 8
+
+_Target = Tuple[str, str]
+
+
+def symbol_id(path: str, qualname: str) -> str:
+    """Возвращает идентификатор символа по пути модуля и полному имени"""
+    return f'{path}::{qualname}'
+
+
+def _absolute_module(module_index: ModuleIndex, path: str, record: Dict[str, Any]) -> Optional[str]:
+    """Возвращает абсолютное имя модуля записи импорта (None, если выходит за корень)"""
+    module = record.get('module') or ''
+    level = record.get('level') or 0
+    if level:
+        base = module_index.package_of(path)
+        if level - 1 > len(base):
+            return None
+        base = base[:len(base) - (level - 1)]
+        module = '.'.join(base + ([module] if module else []))
+    return module
+
+
+class _ModuleSymbols:
+    """Определения, импортированные имена и вызовы одного модуля"""
+
+    __slots__ = ('path', 'record', 'defs', 'bases', 'bindings', 'stars', 'calls', 'refs')
+
+    def __init__(self, path: str, module: ModuleRecord, module_index: ModuleIndex):
+        self.path = path
+        self.record = module
+        # {полное имя: (вид, строка)}
+        self.defs: Dict[str, Tuple[int, int]] = {MODULE_SYMBOL: (_MODULE, 1)}
+        # {имя класса: имена базовых классов}
+        self.bases: Dict[str, Tuple[str, ...]] = {}
+        # {локальное имя: полное имя с точками импортированного объекта}
+        self.bindings: Dict[str, str] = {}
+        # Модули, импортированные через 'from ... import *'
+        self.stars: List[str] = []
+        # (полное имя вызывающего, имя вызываемого, строка)
+        self.calls: List[Tuple[str, str, int]] = []
+        # Ссылки на имена вне вызовов в том же виде
+        self.refs: List[Tuple[str, str, int]] = []
+
+        self._add_calls(MODULE_SYMBOL, module)
+        for func in module.get('functions', ()):
+            parent = func.get('parent')
+            qualname = f'{parent}.{func["name"]}' if parent else func['name']
+            self.defs.setdefault(qualname, (_FUNCTION, func['line']))
+            self._add_calls(qualname, func)
+        for cls in module.get('classes', ()):
+            self.defs.setdefault(cls['name'], (_CLASS, cls['line']))
+            self.bases.setdefault(cls['name'], tuple(cls.get('bases', ())))
+            for method in cls.get('methods', ()):
+                qualname = f'{cls["name"]}.{method["name"]}'
+                self.defs.setdefault(qualname, (_METHOD, method['line']))
+                self._add_calls(qualname, method)
+
+        for record in module.get('import_records', ()):
+            target = _absolute_module(module_index, path, record)
+            if target is None:
+                continue
+            name = record.get('name')
+            if name is None:
+                if record.get('asname'):
+                    self.bindings[record['asname']] = target
+                else:
+                    # 'import a.b' связывает имя 'a'
+                    top_level = target.split('.', 1)[0]
+                    self.bindings[top_level] = top_level
+            elif name == '*':
+                if target:
+                    self.stars.append(target)
+            else:
+                self.bindings[record.get('asname') or name] = f'{target}.{name}' if target else name
+
+    def _add_calls(self, caller: str, record: Any) -> None:
+        for name, line in record.get('calls') or ():
+            self.calls.append((caller, name, line))
+        for name, line in record.get('refs') or ():
+            self.refs.append((caller, name, line))
+
+    def surface(self) -> Tuple[Any, ...]:
+        """Все, от чего зависит разрешение вызовов других модулей в этот модуль"""
+        return {qualname: kind for qualname, (kind, _) in self.defs.items()}, self.bases, self.bindings, self.stars
+
+
+class SymbolIndex:
+    """
+    Таблица символов проекта и граф вызовов между ними.
+
+    Индекс обновляется на месте методом update; запросы и обновления
+    защищены блокировкой, поэтому индекс можно читать из потоков запросов,
+    пока поток наблюдения за проектом применяет изменения.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.module_index = ModuleIndex(())
+        self._modules: Dict[str, _ModuleSymbols] = {}
+
+        # Символы: {идентификатор: номер}, по номеру - (путь, полное имя, вид, строка)
+        self._ids: Dict[str, int] = {}
+        self._symbols: List[Optional[Tuple[str, str, int, int]]] = []
+        self._free: List[int] = []
+        # {короткое имя: номера символов} для поиска определений
+        self._by_name: Dict[str, Set[int]] = {}
+
+        # Ребра в обе стороны: {вызывающий: {вызываемый: строка вызова}}
+        self._callees: Dict[int, Dict[int, int]] = {}
+        self._callers: Dict[int, Dict[int, int]] = {}
+        # Ребра использования (ссылки вне вызовов): {ссылающийся: {символы}}
+        self._uses: Dict[int, Set[int]] = {}
+        # Ребра вызовов и использования, образованные модулем, и число неразрешенных вызовов
+        self._edges: Dict[str, List[Tuple[int, int]]] = {}
+        self._use_edges: Dict[str, List[Tuple[int, int]]] = {}
+        self._unresolved: Dict[str, int] = {}
+        # Модули, к которым обращалось разрешение вызовов модуля, и обратный индекс
+        self._references: Dict[str, Set[str]] = {}
+        self._referrers: Dict[str, Set[str]] = {}
+        # Имена верхнего уровня, не найденные среди модулей проекта, и обратный индекс
+        self._missing: Dict[str, Set[str]] = {}
+        self._waiting: Dict[str, Set[str]] = {}
+
+    @classmethod
+    def from_modules(cls, modules: Dict[str, ModuleRecord]) -> 'SymbolIndex':
+        """Строит индекс по записям модулей проекта"""
+        index = cls()
+        index.update(modules)
+        return index
+
+    def update(self, changes: Dict[str, Optional[ModuleRecord]]) -> None:
+        """
+        Применяет изменения модулей.
+
+        Args:
+            changes: Словарь {путь: новая запись модуля или None, если модуль
+                удален}, например результат CodeAnalyzer.update_files;
+                модули с синтаксическими ошибками считаются удаленными
+        """
+        with self._lock:
+            present = {path: record is not None and record.get('error') is None
+                       for path, record in changes.items()}
+            structural = {path for path, ok in present.items() if ok != (path in self._modules)}
+            if structural:
+                paths = set(self._modules) | {path for path in structural if present[path]}
+                self.module_index = ModuleIndex(paths - {path for path in structural if not present[path]})
+
+            records = {path: changes[path] if ok else None for path, ok in present.items()}
+            rebuild = any(_path_parts(path)[-1] == '__init__' for path in structural)
+            if rebuild:
+                # Изменилась структура пакетов: имена модулей и относительные
+                # импорты могли сместиться, поэтому пересобирается весь индекс
+                records = {path: symbols.record for path, symbols in self._modules.items()} | records
+
+            new_symbols = {
+                path: _ModuleSymbols(path, record, self.module_index) if record is not None else None
+                for path, record in records.items()
+            }
+            affected = set(records)
+            if not rebuild:
+                for path, symbols in new_symbols.items():
+                    old = self._modules.get(path)
+                    if old is None or symbols is None or old.surface() != symbols.surface():
+                        affected |= self._referrers.get(path, set())
+                    if path in structural and symbols is not None:
+                        for name in self.module_index.path_to_name.get(path, '').split('.'):
+                            affected |= self._waiting.get(name, set())
+
+            for path in affected:
+                self._clear_edges(path)
+            for path, symbols in new_symbols.items():
+                self._replace_definitions(path, symbols)
+            for path in sorted(affected):
+                if path in self._modules:
+                    self._resolve_module(path)
+
+    def _clear_edges(self, path: str) -> None:
+        """Удаляет ребра и ссылки, образованные вызовами модуля"""
+        for caller, callee in self._edges.pop(path, ()):
+            callees = self._callees[caller]
+            del callees[callee]
+            if not callees:
+                del self._callees[caller]
+            callers = self._callers[callee]
+            del callers[caller]
+            if not callers:
+                del self._callers[callee]
+        for source, target in self._use_edges.pop(path, ()):
+            self._discard(self._uses, source, target)
+        self._unresolved.pop(path, None)
+        for target in self._references.pop(path, ()):
+            self._discard(self._referrers, target, path)
+        for name in self._missing.pop(path, ()):
+            self._discard(self._waiting, name, path)
+
+    @staticmethod
+    def _discard(index: Dict[Any, Set[Any]], key: Any, value: Any) -> None:
+        values = index.get(key)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del index[key]
+
+    def _replace_definitions(self, path: str, symbols: Optional[_ModuleSymbols]) -> None:
+        """Заменяет символы модуля, сохраняя номера символов, которые остались"""
+        old = self._modules.pop(path, None)
+        old_defs = old.defs if old is not None else {}
+        new_defs = symbols.defs if symbols is not None else {}
+
+        for qualname in old_defs.keys() - new_defs.keys():
+            sid = self._ids.pop(symbol_id(path, qualname))
+            self._symbols[sid] = None
+            self._free.append(sid)
+            if qualname != MODULE_SYMBOL:
+                self._discard(self._by_name, qualname.rsplit('.', 1)[-1], sid)
+
+        for qualname, (kind, line) in new_defs.items():
+            key = symbol_id(path, qualname)
+            sid = self._ids.get(key)
+            if sid is None:
+                if self._free:
+                    sid = self._free.pop()
+                else:
+                    sid = len(self._symbols)
+                    self._symbols.append(None)
+                self._ids[key] = sid
+                if qualname != MODULE_SYMBOL:
+                    self._by_name.setdefault(qualname.rsplit('.', 1)[-1], set()).add(sid)
+            self._symbols[sid] = (path, qualname, kind, line)
+
+        if symbols is not None:
+            self._modules[path] = symbols
+
+    def _resolve_module(self, path: str) -> None:
+        """Разрешает вызовы модуля и добавляет образованные ими ребра"""
+        symbols = self._modules[path]
+        references: Set[str] = set()
+        missing: Set[str] = set()
+        edges: List[Tuple[int, int]] = []
+        unresolved = 0
+
+        uses: List[Tuple[int, int]] = []
+
+        def use(source_name: str, target: _Target) -> None:
+            source = self._ids[symbol_id(path, source_name)]
+            used = self._uses.setdefault(source, set())
+            target_id = self._ids[symbol_id(*target)]
+            if target_id not in used:
+                used.add(target_id)
+                uses.append((source, target_id))
+
+        for caller_name, name, line in symbols.calls:
+            named = self._resolve_name(symbols, caller_name, name, references, missing)
+            target = self._constructor(named, references, missing)
+            if target is None:
+                unresolved += 1
+                continue
+            if target != named:
+                # Вызов класса использует сам класс, даже если __init__ унаследован
+                use(caller_name, named)
+            caller = self._ids[symbol_id(path, caller_name)]
+            callee = self._ids[symbol_id(*target)]
+            callees = self._callees.setdefault(caller, {})
+            if callee not in callees:
+                callees[callee] = line
+                self._callers.setdefault(callee, {})[caller] = line
+                edges.append((caller, callee))
+
+        for source_name, name, _ in symbols.refs:
+            target = self._resolve_name(symbols, source_name, name, references, missing)
+            if target is not None:
+                use(source_name, target)
+
+        references.discard(path)
+        self._edges[path] = edges
+        self._use_edges[path] = uses
+        self._unresolved[path] = unresolved
+        self._references[path] = references
+        for target in references:
+            self._referrers.setdefault(target, set()).add(path)
+        self._missing[path] = missing
+        for name in missing:
+            self._waiting.setdefault(name, set()).add(path)
+
+    def _resolve_name(self, symbols: _ModuleSymbols, caller: str, name: str,
+                      references: Set[str], missing: Set[str]) -> Optional[_Target]:
+        """Находит определение, на которое ссылается имя name в символе caller"""
+        parts = name.split('.')
+        head = parts[0]
+
+        cls = caller.split('.', 1)[0]
+        if cls in symbols.bases and cls != caller and len(parts) == 2:
+            if head in ('self', 'cls'):
+                return self._method(symbols.path, cls, parts[1], references, missing, 0, set())
+            if head == 'super':
+                return self._inherited(symbols, cls, parts[1], references, missing, 0, {(symbols.path, cls)})
+
+        if len(parts) == 1 and caller != MODULE_SYMBOL:
+            # Вложенные функции объемлющих областей
+            scope = caller
+            while scope:
+                candidate = f'{scope}.{head}'
+                if symbols.defs.get(candidate, (None,))[0] == _FUNCTION:
+                    return symbols.path, candidate
+                scope = scope.rpartition('.')[0]
+
+        return self._locate(symbols.path, parts, references, missing, 0)
+
+    def _constructor(self, target: Optional[_Target], references: Set[str],
+                     missing: Set[str]) -> Optional[_Target]:
+        """Вызов класса разрешается в его __init__, если он определен"""
+        if target is None:
+            return None
+        path, qualname = target
+        if self._modules[path].defs[qualname][0] != _CLASS:
+            return target
+        return self._method(path, qualname, '__init__', references, missing, 0, set()) or target
+
+    def _locate(self, path: str, parts: List[str], references: Set[str], missing: Set[str],
+                depth: int) -> Optional[_Target]:
+        """Находит определение по имени с точками в области видимости модуля"""
+        symbols = self._modules.get(path)
+        if symbols is None or depth > MAX_RESOLVE_DEPTH:
+            return None
+        references.add(path)
+
+        qualname = '.'.join(parts)
+        if qualname in symbols.defs and qualname != MODULE_SYMBOL:
+            return path, qualname
+        head = parts[0]
+        if len(parts) == 2 and head in symbols.bases:
+            return self._method(path, head, parts[1], references, missing, depth, set())
+        if head in symbols.defs:
+            # Локальное определение скрывает импортированные имена
+            return None
+
+        binding = symbols.bindings.get(head)
+        if binding is not None:
+            return self._resolve_dotted(binding.split('.') + parts[1:], references, missing, depth + 1)
+        if len(parts) == 1:
+            for module in symbols.stars:
+                target = self._resolve_dotted(module.split('.') + parts, references, missing, depth + 1)
+                if target is not None:
+                    return target
+        return None
+
+    def _resolve_dotted(self, parts: List[str], references: Set[str], missing: Set[str],
+                        depth: int) -> Optional[_Target]:
+        """Разрешает абсолютное имя с точками через самый длинный префикс - модуль проекта"""
+        for i in range(len(parts) - 1, 0, -1):
+            path = self.module_index.name_to_path.get('.'.join(parts[:i]))
+            if path is not None:
+                if i < len(parts) - 1:
+                    # Имя может стать модулем проекта, когда появится файл
+                    missing.add(parts[0])
+                return self._locate(path, parts[i:], references, missing, depth)
+        missing.add(parts[0])
+        return None
+
+    def _method(self, path: str, cls: str, name: str, references: Set[str], missing: Set[str],
+                depth: int, seen: Set[_Target]) -> Optional[_Target]:
+        """Находит метод класса или его базовых классов"""
+        symbols = self._modules.get(path)
+        if symbols is None or depth > MAX_RESOLVE_DEPTH or (path, cls) in seen:
+            return None
+        references.add(path)
+        qualname = f'{cls}.{name}'
+        if qualname in symbols.defs:
+            return path, qualname
+        seen.add((path, cls))
+        return self._inherited(symbols, cls, name, references, missing, depth, seen)
+
+    def _inherited(self, symbols: _ModuleSymbols, cls: str, name: str, references: Set[str],
+                   missing: Set[str], depth: int, seen: Set[_Target]) -> Optional[_Target]:
+        """Находит метод в базовых классах в порядке их перечисления"""
+        for base in symbols.bases.get(cls, ()):
+            target = self._locate(symbols.path, base.split('.'), references, missing, depth + 1)
+            if target is None or self._modules[target[0]].defs[target[1]][0] != _CLASS:
+                continue
+            found = self._method(target[0], target[1], name, references, missing, depth + 1, seen)
+            if found is not None:
+                return found
+        return None
+
+    def _info(self, sid: int) -> Dict[str, Any]:
+        path, qualname, kind, line = self._symbols[sid]
+        return {
+            'symbol': symbol_id(path, qualname),
+            'module': path,
+            'qualname': qualname,
+            'kind': SYMBOL_KINDS[kind],
+            'line': line,
+            'fan_in': len(self._callers.get(sid, ())),
+            'fan_out': len(self._callees.get(sid, ()))
+        }
+
+    def symbol(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Возвращает описание символа или None, если символа нет"""
+        with self._lock:
+            sid = self._ids.get(symbol)
+            return self._info(sid) if sid is not None else None
+
+    def find_definitions(self, name: str, module: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Находит определения по имени.
+
+        Args:
+            name: Имя функции, класса или метода: короткое ('save_to_file'),
+                полное в модуле ('FileManager.save_to_file'), с именем модуля
+                ('utils.file_manager.FileManager') или идентификатор символа
+            module: Путь модуля, в области видимости которого разрешается имя
+                (с учетом импортов), как если бы его вызвали в этом модуле
+
+        Returns:
+            Описания найденных символов, упорядоченные по модулю и строке
+        """
+        with self._lock:
+            parts = name.split('.')
+            if module is not None:
+                target = self._locate(module, parts, set(), set(), 0) if module in self._modules else None
+                return [self._info(self._ids[symbol_id(*target)])] if target is not None else []
+
+            sid = self._ids.get(name)
+            if sid is not None:
+                return [self._info(sid)]
+
+            found = set()
+            for sid in self._by_name.get(parts[-1], ()):
+                qualname = self._symbols[sid][1]
+                if qualname == name or qualname.endswith('.' + name) or len(parts) == 1:
+                    found.add(sid)
+            if len(parts) > 1:
+                target = self._resolve_dotted(parts, set(), set(), 0)
+                if target is not None:
+                    found.add(self._ids[symbol_id(*target)])
+            return sorted((self._info(sid) for sid in found), key=lambda info: (info['module'], info['line']))
+
+    def callers(self, symbol: str) -> Optional[List[Dict[str, Any]]]:
+        """Возвращает символы, вызывающие symbol (None, если символа нет)"""
+        return self._neighbours(symbol, self._callers)
+
+    def callees(self, symbol: str) -> Optional[List[Dict[str, Any]]]:
+        """Возвращает символы, которые вызывает symbol (None, если символа нет)"""
+        return self._neighbours(symbol, self._callees)
+
+    def _neighbours(self, symbol: str, edges: Dict[int, Dict[int, int]]) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            sid = self._ids.get(symbol)
+            if sid is None:
+                return None
+            result = [dict(self._info(other), call_line=line) for other, line in edges.get(sid, {}).items()]
+        result.sort(key=lambda info: (info['module'], info['line']))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Возвращает граф вызовов в компактном виде.
+
+        Returns:
+            Словарь в формате CSR, как module_graph: nodes (идентификаторы
+            символов по возрастанию), kinds (индексы в SYMBOL_KINDS), lines,
+            offsets и targets (вызываемые символы), fan_in (число вызывающих),
+            а также число неразрешенных вызовов
+        """
+        with self._lock:
+            alive = sorted((sid for sid, entry in enumerate(self._symbols) if entry is not None),
+                           key=lambda sid: symbol_id(*self._symbols[sid][:2]))
+            position = {sid: i for i, sid in enumerate(alive)}
+
+            offsets = [0]
+            targets: List[int] = []
+            for sid in alive:
+                targets.extend(sorted(position[callee] for callee in self._callees.get(sid, ())))
+                offsets.append(len(targets))
+
+            return {
+                'nodes': [symbol_id(*self._symbols[sid][:2]) for sid in alive],
+                'kinds': [self._symbols[sid][2] for sid in alive],
+                'lines': [self._symbols[sid][3] for sid in alive],
+                'offsets': offsets,
+                'targets': targets,
+                'fan_in': [len(self._callers.get(sid, ())) for sid in alive],
+                'unresolved_calls': sum(self._unresolved.values())
+            }
+
+    def reference_table(self) -> 'ReferenceTable':
+        """Возвращает согласованный снимок символов и ребер для обхода графа ссылок"""
+        with self._lock:
+            edges = {sid: tuple(callees) for sid, callees in self._callees.items()}
+            for sid, used in self._uses.items():
+                edges[sid] = edges.get(sid, ()) + tuple(used)
+            return ReferenceTable(self.module_index, dict(self._modules), list(self._symbols),
+                                  dict(self._ids), edges)
+
+
+class ReferenceTable:
+    """
+    Снимок индекса символов: таблица ссылок для однократного обхода.
+
+    symbols - описания символов по номеру (путь, полное имя, вид, строка;
+    None для освободившихся номеров), ids - номера по идентификаторам,
+    edges - {номер: номера вызываемых и используемых символов}, modules -
+    символы модулей (_ModuleSymbols не изменяются после создания, поэтому
+    снимок не копирует их).
+    """
+
+    __slots__ = ('module_index', 'modules', 'symbols', 'ids', 'edges')
+
+    def __init__(self, module_index: ModuleIndex, modules: Dict[str, _ModuleSymbols],
+                 symbols: List[Optional[Tuple[str, str, int, int]]], ids: Dict[str, int],
+                 edges: Dict[int, Tuple[int, ...]]):
+        self.module_index = module_index
+        self.modules = modules
+        self.symbols = symbols
+        self.ids = ids
+        self.edges = edges
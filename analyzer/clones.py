@@ -0,0 +1,434 @@
+# analyzer/clones.py
+"""
+Поиск дублирующегося кода по нормализованным отпечаткам AST.
+
+Для каждой функции и метода вычисляется хеш поддерева AST, в котором
+имена (переменных, атрибутов, аргументов) и значения литералов заменены
+их видом, поэтому переименованные копии дают одинаковый отпечаток. Хеши
+поддеревьев тела функции образуют множество, по которому строится
+MinHash-эскиз: доля совпадающих позиций эскизов двух функций оценивает
+коэффициент Жаккара их множеств поддеревьев.
+
+Эскизы раскладываются по корзинам LSH (полосы по ROWS значений), и
+сравниваются только функции, попавшие в одну корзину, поэтому поиск
+кластеров занимает время, близкое к линейному по числу функций.
+"""
+import ast
+import hashlib
+import random
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+from .model import ModuleRecord
+
+SKETCH_SIZE = 32
+BANDS = 8
+ROWS = SKETCH_SIZE // BANDS
+
+# Функции меньшего размера (в узлах AST) не сравниваются: короткие функции
+# похожи друг на друга структурно, но их дублирование не важно
+MIN_FUNCTION_NODES = 40
+# Минимальный размер поддерева, хеш которого учитывается в эскизе
+MIN_SHINGLE_NODES = 4
+
+DEFAULT_SIMILARITY = 0.8
+# Порог сходства округляется до этого числа знаков: эскиз из SKETCH_SIZE
+# значений все равно не различает более близкие пороги
+SIMILARITY_DIGITS = 2
+# Для скольких последних порогов хранятся связи корзин и кластеры
+MAX_CACHED_THRESHOLDS = 4
+
+# Сколько строк матрицы сходства корзины сравнивается за один шаг
+_BLOCK_ROWS = 512
+
+_PRIME = (1 << 31) - 1
+_MASK = 0x7FFFFFFF
+
+# Параметры хеш-функций MinHash фиксированы, чтобы эскизы из кеша анализа
+# и из разных процессов были сравнимы
+_rng = random.Random(0x5EED)
+_A = np.array([_rng.randrange(1, _PRIME) for _ in range(SKETCH_SIZE)], dtype=np.uint64)[:, None]
+_B = np.array([_rng.randrange(0, _PRIME) for _ in range(SKETCH_SIZE)], dtype=np.uint64)[:, None]
+
+# Отпечатки хранятся в кеше анализа, поэтому не должны зависеть от процесса,
+# версии Python и разрядности сборки: виды узлов и литералов кодируются
+# CRC32 их имен, а хеш поддерева - blake2b от упакованных 64-битных чисел
+_node_ids: Dict[str, int] = {}
+_LITERAL_IDS = {name: zlib.crc32(f'literal:{name}'.encode()) for name in
+                ('NoneType', 'bool', 'int', 'float', 'complex', 'str', 'bytes', 'ellipsis')}
+_FIELD_END = 0xFFFFFFFFFFFFFFFF
+
+
+def _node_id(name: str) -> int:
+    node_id = _node_ids.get(name)
+    if node_id is None:
+        node_id = _node_ids[name] = zlib.crc32(name.encode())
+    return node_id
+
+
+_structs: Dict[int, struct.Struct] = {}
+
+
+def _hash_parts(parts: List[int]) -> int:
+    packer = _structs.get(len(parts))
+    if packer is None:
+        packer = _structs[len(parts)] = struct.Struct(f'<{len(parts)}Q')
+    return int.from_bytes(hashlib.blake2b(packer.pack(*parts), digest_size=8).digest(), 'little')
+
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+# (число узлов, отпечаток или None, эскиз или None)
+CloneInfo = Tuple[int, Optional[str], Optional[str]]
+
+
+class _Fingerprinter:
+    """Однократный обход AST модуля с хешированием всех поддеревьев"""
+
+    def __init__(self):
+        # {строка определения функции: (число узлов, хеш, хеши поддеревьев тела)}
+        self.functions: Dict[int, Tuple[int, int, List[int]]] = {}
+        self._shingles: Optional[List[int]] = None
+
+    def hash(self, node: ast.AST) -> Tuple[int, int]:
+        """Возвращает нормализованный хеш поддерева и число его узлов"""
+        is_function = isinstance(node, _FUNCTION_NODES)
+        if is_function:
+            outer, self._shingles = self._shingles, []
+
+        parts = [_node_id(node.__class__.__name__)]
+        size = 1
+        if isinstance(node, ast.Constant):
+            parts.append(_LITERAL_IDS.get(type(node.value).__name__, 0))
+
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        child_hash, child_size = self.hash(item)
+                        parts.append(child_hash)
+                        size += child_size
+                parts.append(_FIELD_END)
+            elif isinstance(value, ast.AST) and not isinstance(value, ast.expr_context):
+                child_hash, child_size = self.hash(value)
+                parts.append(child_hash)
+                size += child_size
+
+        node_hash = _hash_parts(parts)
+        if is_function:
+            shingles = self._shingles
+            self._shingles = outer
+            self.functions[node.lineno] = (size, node_hash, shingles)
+            if outer is not None:
+                # Вложенная функция - часть тела объемлющей
+                outer.extend(shingles)
+        elif self._shingles is not None and size >= MIN_SHINGLE_NODES:
+            self._shingles.append(node_hash & _MASK)
+        return node_hash, size
+
+
+def minhash(shingles: Iterable[int]) -> np.ndarray:
+    """Возвращает MinHash-эскиз множества 31-битных хешей"""
+    values = np.fromiter(set(shingles), dtype=np.uint64)
+    if not len(values):
+        return np.full(SKETCH_SIZE, _PRIME, dtype=np.uint32)
+    return ((_A * values + _B) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def fingerprint_functions(tree: ast.AST) -> Dict[int, CloneInfo]:
+    """
+    Вычисляет отпечатки и эскизы всех функций и методов модуля.
+
+    Returns:
+        Словарь {строка определения: (число узлов, отпечаток, эскиз)};
+        отпечаток и эскиз (hex-строки) заданы только для функций не меньше
+        MIN_FUNCTION_NODES узлов
+    """
+    fingerprinter = _Fingerprinter()
+    fingerprinter.hash(tree)
+
+    result = {}
+    for line, (size, node_hash, shingles) in fingerprinter.functions.items():
+        if size < MIN_FUNCTION_NODES:
+            result[line] = (size, None, None)
+        else:
+            sketch = minhash(shingles).astype('>u4').tobytes().hex()
+            result[line] = (size, f'{node_hash:016x}', sketch)
+    return result
+
+
+def _similar_pairs(sketches: np.ndarray, min_similarity: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Возвращает индексы пар строк (i < j) матрицы эскизов со сходством не ниже порога"""
+    count = len(sketches)
+    required = min_similarity * SKETCH_SIZE
+    positions = np.ascontiguousarray(sketches.T)
+    rows, columns = [], []
+    for start in range(0, count, _BLOCK_ROWS):
+        stop = min(start + _BLOCK_ROWS, count)
+        # Совпадения накапливаются по позициям эскиза: это быстрее и требует
+        # меньше памяти, чем сравнение трехмерного массива строк со столбцами
+        matches = np.zeros((stop - start, count - start), dtype=np.uint8)
+        for values in positions:
+            matches += values[start:stop, None] == values[None, start:]
+        i, j = np.nonzero(np.triu(matches >= required, 1))
+        rows.append(i + start)
+        columns.append(j + start)
+    return np.concatenate(rows), np.concatenate(columns)
+
+
+def _components(count: int, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """Возвращает для каждой вершины наименьшую вершину ее компоненты связности"""
+    labels = np.arange(count)
+    while True:
+        previous = labels
+        lowest = np.minimum(labels[rows], labels[columns])
+        labels = labels.copy()
+        np.minimum.at(labels, rows, lowest)
+        np.minimum.at(labels, columns, lowest)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
+
+
+def _parse_sketch(sketch: str) -> np.ndarray:
+    return np.frombuffer(bytes.fromhex(sketch), dtype='>u4').astype(np.uint32)
+
+
+class _Entry:
+    __slots__ = ('symbol', 'path', 'qualname', 'line', 'size', 'fingerprint', 'sketch')
+
+    def __init__(self, path: str, qualname: str, func: Dict[str, Any]):
+        self.symbol = f'{path}::{qualname}'
+        self.path = path
+        self.qualname = qualname
+        self.line = func['line']
+        self.size = func['size']
+        self.fingerprint = func['fingerprint']
+        self.sketch = _parse_sketch(func['sketch'])
+
+    def bands(self) -> List[Tuple[int, bytes]]:
+        return [(band, self.sketch[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'symbol': self.symbol, 'module': self.path, 'qualname': self.qualname,
+                'line': self.line, 'size': self.size}
+
+
+def _module_entries(path: str, module: ModuleRecord) -> List[_Entry]:
+    entries = []
+    for func in module.get('functions', ()):
+        if func.get('sketch'):
+            parent = func.get('parent')
+            entries.append(_Entry(path, f'{parent}.{func["name"]}' if parent else func['name'], func))
+    for cls in module.get('classes', ()):
+        for method in cls.get('methods', ()):
+            if method.get('sketch'):
+                entries.append(_Entry(path, f'{cls["name"]}.{method["name"]}', method))
+    return entries
+
+
+class CloneIndex:
+    """
+    LSH-индекс эскизов функций проекта.
+
+    Индекс обновляется по модулям (update), поэтому в режиме наблюдения
+    пересчитываются только корзины измененных файлов; эскизы функций
+    хранятся в записях модулей и в кеше анализа и не вычисляются повторно.
+    Найденные в корзине связи похожих функций запоминаются для каждого порога
+    сходства, и после обновления сравниваются заново только корзины, в
+    которые попали добавленные или удаленные функции.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: Dict[str, _Entry] = {}
+        self._modules: Dict[str, List[str]] = {}
+        # {(номер полосы, значения полосы): символы функций}
+        self._buckets: Dict[Tuple[int, bytes], Set[str]] = {}
+        # {порог сходства: {корзина: связи похожих функций}} и корзины, связи
+        # которых устарели после update; хранятся для MAX_CACHED_THRESHOLDS
+        # последних порогов
+        self._links: 'OrderedDict[float, Dict[Tuple[int, bytes], List[Tuple[str, str]]]]' = OrderedDict()
+        self._stale: Dict[float, Set[Tuple[int, bytes]]] = {}
+        self._clusters: Dict[float, List[Dict[str, Any]]] = {}
+
+    @classmethod
+    def from_modules(cls, modules: Dict[str, ModuleRecord]) -> 'CloneIndex':
+        index = cls()
+        index.update(modules)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, changes: Dict[str, Optional[ModuleRecord]]) -> None:
+        """
+        Применяет изменения модулей.
+
+        Args:
+            changes: Словарь {путь: новая запись модуля или None, если модуль удален}
+        """
+        with self._lock:
+            removed: Dict[str, _Entry] = {}
+            touched: Set[Tuple[int, bytes]] = set()
+            for path, module in changes.items():
+                for symbol in self._modules.pop(path, ()):
+                    entry = removed[symbol] = self._entries.pop(symbol)
+                    for key in entry.bands():
+                        bucket = self._buckets[key]
+                        bucket.discard(symbol)
+                        if not bucket:
+                            del self._buckets[key]
+                if module is None or module.get('error') is not None:
+                    continue
+
+                symbols = []
+                for entry in _module_entries(path, module):
+                    if entry.symbol in self._entries:
+                        continue
+                    self._entries[entry.symbol] = entry
+                    symbols.append(entry.symbol)
+                    previous = removed.pop(entry.symbol, None)
+                    # Функция с прежними отпечатком и эскизом остается в тех же
+                    # корзинах, и их связи не меняются
+                    unchanged = previous is not None and previous.fingerprint == entry.fingerprint and \
+                        np.array_equal(previous.sketch, entry.sketch)
+                    for key in entry.bands():
+                        if not unchanged:
+                            touched.add(key)
+                        self._buckets.setdefault(key, set()).add(entry.symbol)
+                if symbols:
+                    self._modules[path] = symbols
+
+            for entry in removed.values():
+                touched.update(entry.bands())
+            if touched:
+                for stale in self._stale.values():
+                    stale.update(touched)
+            if changes:
+                # Строки и размеры функций в кластерах могли измениться
+                self._clusters = {}
+
+    def clusters(self, min_similarity: float = DEFAULT_SIMILARITY) -> List[Dict[str, Any]]:
+        """
+        Возвращает кластеры похожих функций.
+
+        Args:
+            min_similarity: Минимальная оценка сходства (доля совпадающих
+                значений эскизов) для объединения функций. Пары со сходством
+                ниже примерно 0.6 редко попадают в общую корзину LSH.
+                Округляется до SIMILARITY_DIGITS знаков
+
+        Returns:
+            Кластеры по убыванию объема повторяющегося кода: сходство
+            (минимальное относительно первой функции), признак точных копий,
+            объем повторяющегося кода в узлах AST и функции кластера
+        """
+        min_similarity = round(min_similarity, SIMILARITY_DIGITS)
+        with self._lock:
+            cached = self._clusters.get(min_similarity)
+            if cached is None:
+                cached = self._clusters[min_similarity] = self._find_clusters(min_similarity)
+            else:
+                self._links.move_to_end(min_similarity)
+            return cached
+
+    def _bucket_links(self, bucket: Set[str], min_similarity: float) -> List[Tuple[str, str]]:
+        """
+        Возвращает связи похожих функций корзины.
+
+        Связей не больше, чем функций: каждая функция связывается с первой
+        функцией своей компоненты связности графа сходства корзины, поэтому
+        кластеры по связям совпадают с кластерами по всем похожим парам.
+        """
+        links = []
+        # Точные копии объединяются без сравнения эскизов
+        representatives: Dict[str, str] = {}
+        for symbol in sorted(bucket):
+            first = representatives.setdefault(self._entries[symbol].fingerprint, symbol)
+            if first != symbol:
+                links.append((first, symbol))
+        candidates = sorted(representatives.values())
+        if len(candidates) < 2:
+            return links
+
+        sketches = np.stack([self._entries[symbol].sketch for symbol in candidates])
+        labels = _components(len(candidates), *_similar_pairs(sketches, min_similarity))
+        for i in np.flatnonzero(labels != np.arange(len(candidates))):
+            links.append((candidates[labels[i]], candidates[i]))
+        return links
+
+    def _find_clusters(self, min_similarity: float) -> List[Dict[str, Any]]:
+        links = self._links.get(min_similarity)
+        if links is None:
+            links = self._links[min_similarity] = {}
+            keys: Iterable[Tuple[int, bytes]] = self._buckets
+            while len(self._links) > MAX_CACHED_THRESHOLDS:
+                evicted, _ = self._links.popitem(last=False)
+                self._stale.pop(evicted, None)
+                self._clusters.pop(evicted, None)
+        else:
+            self._links.move_to_end(min_similarity)
+            keys = self._stale[min_similarity]
+        for key in keys:
+            bucket = self._buckets.get(key)
+            if bucket is not None and len(bucket) > 1:
+                links[key] = self._bucket_links(bucket, min_similarity)
+            else:
+                links.pop(key, None)
+        self._stale[min_similarity] = set()
+
+        parent: Dict[str, str] = {}
+
+        def find(symbol: str) -> str:
+            root = symbol
+            while parent.get(root, root) != root:
+                root = parent[root]
+            while symbol != root:
+                parent[symbol], symbol = root, parent.get(symbol, symbol)
+            return root
+
+        def union(a: str, b: str) -> None:
+            a, b = find(a), find(b)
+            if a != b:
+                parent[min(a, b)] = min(a, b)
+                parent[max(a, b)] = min(a, b)
+
+        for bucket_links in links.values():
+            for a, b in bucket_links:
+                union(a, b)
+
+        groups: Dict[str, List[_Entry]] = {}
+        for symbol in parent:
+            groups.setdefault(find(symbol), []).append(self._entries[symbol])
+
+        clusters = []
+        for members in groups.values():
+            members.sort(key=lambda entry: (entry.path, entry.line))
+            first = members[0].sketch
+            similarity = min(float((entry.sketch == first).mean()) for entry in members[1:])
+            sizes = [entry.size for entry in members]
+            clusters.append({
+                'similarity': round(similarity, 3),
+                'exact': len({entry.fingerprint for entry in members}) == 1,
+                'duplicated_nodes': sum(sizes) - max(sizes),
+                'functions': [entry.to_dict() for entry in members]
+            })
+        clusters.sort(key=lambda cluster: (-cluster['duplicated_nodes'], cluster['functions'][0]['symbol']))
+        return clusters
+
+    def to_dict(self, min_similarity: float = DEFAULT_SIMILARITY) -> Dict[str, Any]:
+        """Возвращает раздел duplicates отчета"""
+        min_similarity = round(min_similarity, SIMILARITY_DIGITS)
+        clusters = self.clusters(min_similarity)
+        return {
+            'min_similarity': min_similarity,
+            'indexed_functions': len(self),
+            'duplicated_functions': sum(len(cluster['functions']) for cluster in clusters),
+            'clusters': clusters
+        }
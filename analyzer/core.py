@@ -1,40 +1,218 @@
 # analyzer/core.py
 import ast
+import hashlib
 import os
 import json
-from typing import Dict, List, Any, Tuple, Set
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Tuple, Set, Iterable, Iterator, Optional, Callable
+
+from .aggregates import MetricsAggregator
+from .cache import AnalysisCache, CacheEntry, content_digest
+from .call_graph import SymbolIndex
+from .clones import CloneIndex, fingerprint_functions
+from .dead_code import find_dead_code
+from .dependency_graph import DependencyGraph
+from .discovery import FileDiscovery, DEFAULT_EXCLUDE_DIRS, DEFAULT_EXCLUDE_NON_PACKAGE_DIRS, DEFAULT_MAX_FILE_SIZE
+from .instrumentation import FileTimings, Instrumentation, profiled
+from .metrics import SourceLines
+from .model import ModuleRecord, json_default
+from .ranking import DEFAULT_TOP_K, top_complex_functions, top_complex_functions_by_module
+from .report_stream import COMPRESSIONS, ReportStreamWriter, is_stream_report, write_report
+from .visitor import ModuleVisitor
+
+# Версия анализатора: при изменении формата результатов analyze_file
+# ее нужно увеличить, чтобы сбросить постоянный кеш
+ANALYZER_VERSION = '8'
+
+# Максимальный размер пакета файлов, передаваемого одному воркеру
+MAX_CHUNK_SIZE = 64
+
+# Разделы отчета, которые строятся по всему проекту заметно дольше
+# остальных и добавляются только по запросу; веб-интерфейс отдает их
+# через собственные маршруты (/symbols, /duplicates, /dead_code)
+OPTIONAL_SECTIONS = ('call_graph', 'duplicates', 'dead_code')
+
+
+class AnalysisCancelled(Exception):
+    """Анализ прерван по запросу пользователя."""
 
 
 class CodeAnalyzer:
     """Базовый класс для анализа кода на Python."""
 
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, cache: Optional[AnalysisCache] = None,
+                 discovery: Optional[FileDiscovery] = None,
+                 instrumentation: Optional[Instrumentation] = None):
         """
         Инициализирует анализатор кода.
 
         Args:
             project_root: Корневая директория проекта для анализа
+            cache: Постоянный кеш результатов анализа файлов
+            discovery: Правила поиска файлов; по умолчанию - все *.py-файлы
+                без служебных директорий, путей из .gitignore и слишком больших файлов
+            instrumentation: Замеры этапов анализа; по умолчанию выключены.
+                Включенные замеры попадают в раздел timings отчета
         """
         self.project_root = os.path.abspath(project_root)
         self.modules: Dict[str, Dict] = {}
         self.dependencies: Dict[str, Set[str]] = {}
+        self.cache = cache
+        self.cache_stats: Optional[Dict[str, int]] = None
+        self.discovery = discovery or FileDiscovery(self.project_root)
+        self.instrumentation = instrumentation or Instrumentation(enabled=False)
+        # Сводные метрики проекта; хранит значения модулей между отчетами
+        self.aggregator = MetricsAggregator()
+        # Производные индексы проекта (символов, дубликатов) и словарь
+        # modules, по которому построен каждый из них: {класс индекса: (modules, индекс)}
+        self._indexes: Dict[type, Tuple[Dict[str, Dict], Any]] = {}
+        # Хеши модулей для get_analysis_id: {путь: (запись модуля, хеш)};
+        # хеш действителен, пока в modules та же запись
+        self._digests: Dict[str, Tuple[ModuleRecord, str]] = {}
+
+    def scan_project(self, workers: Optional[int] = 1,
+                     progress: Optional[Callable[[int, int], None]] = None,
+                     on_module: Optional[Callable[[str, ModuleRecord], None]] = None) -> None:
+        """
+        Сканирует проект и собирает информацию о Python-файлах.
 
-    def scan_project(self) -> None:
-        """Сканирует проект и собирает информацию о Python-файлах."""
-        for root, _, files in os.walk(self.project_root):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(file_path, self.project_root)
+        Если задан кеш, повторно анализируются только измененные файлы,
+        а записи удаленных файлов удаляются из кеша.
 
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
+        Args:
+            workers: Количество процессов для анализа файлов. 1 - анализ в
+                текущем процессе, 0 или None - по числу ядер процессора
+            progress: Функция, вызываемая после каждого файла с аргументами
+                (обработано файлов, всего файлов). Может прервать анализ,
+                выбросив AnalysisCancelled
+            on_module: Функция, вызываемая для каждого проанализированного модуля
+                в порядке обхода с аргументами (относительный путь, запись модуля),
+                например ReportStreamWriter.write_module
+        """
+        instrumentation = self.instrumentation
+        timed = instrumentation.enabled
+        with instrumentation.phase('discovery'):
+            files = list(self._iter_python_files())
+
+        if not workers or workers < 0:
+            workers = os.cpu_count() or 1
+
+        use_cache = self.cache is not None
+        with instrumentation.phase('cache_load'):
+            cached = self.cache.load() if use_cache else {}
+        stats: Dict[str, Optional[Tuple[int, int]]] = {}
+        unchanged: Dict[str, CacheEntry] = {}
+        tasks = []
+
+        for file_path, rel_path in files:
+            entry = cached.get(rel_path)
+            if use_cache:
+                stats[rel_path] = _stat_file(file_path)
+                if entry is not None and stats[rel_path] and entry.matches_stat(*stats[rel_path]):
+                    unchanged[rel_path] = entry
+                    continue
+            # Хеш содержимого нужен и без кеша: из него строится get_analysis_id
+            tasks.append((file_path, rel_path, True, entry.digest if entry else None, timed))
+
+        results = self._run_tasks(tasks, workers)
+        hits = misses = 0
+        to_store = []
+
+        if progress is not None:
+            progress(0, len(files))
+
+        analyze_started = time.perf_counter() if timed else 0.0
+        try:
+            for done, (_, rel_path) in enumerate(files, 1):
+                if rel_path in unchanged:
+                    self._add_module(rel_path, unchanged[rel_path].load_result(), unchanged[rel_path].digest)
+                    hits += 1
+                else:
+                    _, module_info, error, digest, timings = next(results)
+                    if timed:
+                        self._record_file(rel_path, module_info, error, timings)
+                    if error:
+                        print(error)
+                    else:
+                        if module_info is None:
+                            module_info = cached[rel_path].load_result()
+                            hits += 1
+                        else:
+                            misses += 1
+
+                        if use_cache and stats[rel_path]:
+                            to_store.append((rel_path, *stats[rel_path], digest, module_info))
+                        self._add_module(rel_path, module_info, digest)
+
+                if on_module is not None and rel_path in self.modules:
+                    on_module(rel_path, self.modules[rel_path])
+                if progress is not None:
+                    progress(done, len(files))
+        finally:
+            results.close()
+            if timed:
+                instrumentation.add_phase('analyze', time.perf_counter() - analyze_started)
+
+        if use_cache:
+            removed = cached.keys() - stats.keys()
+            with instrumentation.phase('cache_store'):
+                self.cache.store(to_store)
+                self.cache.remove(removed)
+            self.cache_stats = {'hits': hits, 'misses': misses, 'removed': len(removed)}
+
+    def _record_file(self, rel_path: str, module_info: Optional[Dict[str, Any]], error: Optional[str],
+                     timings: Optional[FileTimings]) -> None:
+        """Передает замеры анализа файла в instrumentation"""
+        if error:
+            failure = 'read'
+        elif module_info is not None and 'error' in module_info:
+            failure = 'parse'
+        else:
+            failure = None
+        self.instrumentation.record_file(rel_path, timings, failure)
+
+    def _add_module(self, rel_path: str, module_info: Dict[str, Any], digest: Optional[str] = None) -> None:
+        """Добавляет результат анализа файла в данные проекта в компактном виде."""
+        record = self.modules[rel_path] = ModuleRecord.from_dict(module_info)
+        if digest is not None:
+            self._digests[rel_path] = (record, digest)
+        self._indexes.clear()
+        if 'error' not in module_info:
+            self.dependencies[rel_path] = set(module_info['imports'])
+
+    def _iter_python_files(self) -> Iterator[Tuple[str, str]]:
+        """Возвращает пары (абсолютный путь, относительный путь) Python-файлов проекта."""
+        return self.discovery.iter_files()
+
+    def _run_tasks(self, tasks: List[Tuple[str, str, bool, Optional[str], bool]], workers: int
+                   ) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str], Optional[str], Optional[FileTimings]]]:
+        """
+        Анализирует файлы в текущем процессе или в пуле процессов.
+
+        Файлы передаются воркерам пакетами, а результаты возвращаются
+        в порядке задач, поэтому отчет не зависит от того, какой процесс
+        закончил работу раньше.
 
-                        module_info = self.analyze_file(content, rel_path)
-                        self.modules[rel_path] = module_info
-                    except Exception as e:
-                        print(f"Error analyzing {file_path}: {e}")
+        Args:
+            tasks: Задачи для _analyze_path
+            workers: Количество процессов
+
+        Returns:
+            Итератор результатов _analyze_path в порядке задач
+        """
+        if workers == 1 or len(tasks) < 2:
+            yield from map(_analyze_path, tasks)
+            return
+
+        chunksize = max(1, min(MAX_CHUNK_SIZE, len(tasks) // (workers * 4)))
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            yield from executor.map(_analyze_path, tasks, chunksize=chunksize)
+        finally:
+            # При прерывании анализа не ждем обработки оставшихся пакетов
+            executor.shutdown(cancel_futures=True)
 
     def analyze_file(self, content: str, file_path: str) -> Dict[str, Any]:
         """
@@ -47,85 +225,76 @@ class CodeAnalyzer:
         Returns:
             Словарь с информацией о файле
         """
-        try:
-            tree = ast.parse(content)
-
-            imports = []
-            functions = []
-            classes = []
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for name in node.names:
-                        imports.append(name.name)
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        imports.append(node.module)
-                elif isinstance(node, ast.FunctionDef):
-                    func_info = {
-                        'name': node.name,
-                        'line': node.lineno,
-                        'args': [arg.arg for arg in node.args.args],
-                        'complexity': self._calculate_complexity(node)
-                    }
-                    functions.append(func_info)
-
-                elif isinstance(node, ast.ClassDef):
-                    class_info = {
-                        'name': node.name,
-                        'line': node.lineno,
-                        'methods': []
-                    }
-
-                    for class_node in ast.iter_child_nodes(node):
-                        if isinstance(class_node, ast.FunctionDef):
-                            method_info = {
-                                'name': class_node.name,
-                                'line': class_node.lineno,
-                                'args': [arg.arg for arg in class_node.args.args],
-                                'complexity': self._calculate_complexity(class_node)
-                            }
-                            class_info['methods'].append(method_info)
-
-                    classes.append(class_info)
-
-            self.dependencies[file_path] = set(imports)
-
-            return {
-                'path': file_path,
-                'imports': imports,
-                'functions': functions,
-                'classes': classes,
-                'loc': len(content.split('\n')),
-            }
-
-        except SyntaxError as e:
-            return {
-                'path': file_path,
-                'error': f"Syntax error: {e}",
-            }
-
-    def _calculate_complexity(self, node: ast.AST) -> int:
-        """
-        Вычисляет приблизительную цикломатическую сложность функции.
+        if not self.instrumentation.enabled:
+            module_info = _analyze_source(content, file_path)
+        else:
+            phases: Dict[str, float] = {}
+            module_info = _analyze_source(content, file_path, phases)
+            timings = (len(content.encode('utf-8')), 0.0, phases.get('parse', 0.0), phases.get('visit', 0.0))
+            self._record_file(file_path, module_info, None, timings)
 
-        Args:
-            node: AST-узел функции или метода
+        if 'error' not in module_info:
+            self.dependencies[file_path] = set(module_info['imports'])
 
-        Returns:
-            Значение цикломатической сложности
+        return module_info
+
+    def update_files(self, rel_paths: Iterable[str]) -> Dict[str, Optional[ModuleRecord]]:
         """
-        complexity = 1
+        Повторно анализирует только указанные файлы проекта.
+
+        Словари modules и dependencies заменяются обновленными копиями, а не
+        изменяются на месте, поэтому потоки, которые в этот момент сериализуют
+        прежний отчет, не видят изменений посреди обхода.
 
-        for child_node in ast.walk(node):
-            if isinstance(child_node, (ast.If, ast.While, ast.For)):
-                complexity += 1
-            elif isinstance(child_node, ast.ExceptHandler):
-                complexity += 1
-            elif isinstance(child_node, ast.BoolOp):
-                complexity += len(child_node.values) - 1
+        Args:
+            rel_paths: Относительные пути измененных, созданных или удаленных файлов
 
-        return complexity
+        Returns:
+            Словарь {путь: новая запись модуля или None, если модуль удален};
+            пути, не затрагивающие проект, не включаются
+        """
+        modules = dict(self.modules)
+        dependencies = dict(self.dependencies)
+        max_size = self.discovery.max_file_size
+        changes: Dict[str, Optional[ModuleRecord]] = {}
+
+        for rel_path in rel_paths:
+            file_path = os.path.join(self.project_root, rel_path)
+            stat = _stat_file(file_path) if os.path.isfile(file_path) else None
+            module_info = None
+            if stat is not None and (max_size is None or stat[1] <= max_size):
+                _, module_info, error, digest, timings = _analyze_path(
+                    (file_path, rel_path, True, None, self.instrumentation.enabled))
+                if self.instrumentation.enabled:
+                    self._record_file(rel_path, module_info, error, timings)
+                if error:
+                    print(error)
+
+            if module_info is None:
+                if rel_path in modules:
+                    del modules[rel_path]
+                    dependencies.pop(rel_path, None)
+                    changes[rel_path] = None
+                continue
+
+            record = ModuleRecord.from_dict(module_info)
+            modules[rel_path] = record
+            self._digests[rel_path] = (record, digest)
+            if 'error' in module_info:
+                dependencies.pop(rel_path, None)
+            else:
+                dependencies[rel_path] = set(module_info['imports'])
+            changes[rel_path] = record
+
+        for index_class, (indexed, index) in list(self._indexes.items()):
+            if indexed is self.modules:
+                index.update(changes)
+                self._indexes[index_class] = (modules, index)
+            else:
+                del self._indexes[index_class]
+        self.modules = modules
+        self.dependencies = dependencies
+        return changes
 
     def get_dependency_graph(self) -> Dict[str, List[str]]:
         """
@@ -136,70 +305,419 @@ class CodeAnalyzer:
         """
         graph = {}
         for module, deps in self.dependencies.items():
-            graph[module] = list(deps)
+            graph[module] = sorted(deps)
         return graph
 
-    def generate_project_report(self) -> Dict[str, Any]:
+    def get_module_graph(self) -> DependencyGraph:
+        """
+        Возвращает граф зависимостей с разрешенными импортами.
+
+        Returns:
+            Граф, в котором модули проекта представлены относительными путями,
+            а внешние зависимости - пакетами верхнего уровня
+        """
+        return DependencyGraph.from_modules(self.modules)
+
+    def get_symbol_index(self) -> SymbolIndex:
+        """
+        Возвращает индекс символов и граф вызовов проекта.
+
+        Индекс строится при первом обращении и затем обновляется
+        инкрементально в update_files.
+        """
+        return self._index(SymbolIndex)
+
+    def get_clone_index(self) -> CloneIndex:
+        """
+        Возвращает LSH-индекс эскизов функций для поиска дубликатов.
+
+        Эскизы вычисляются при анализе файлов и хранятся в кеше анализа,
+        поэтому построение индекса не требует повторного разбора файлов;
+        в update_files индекс обновляется только для измененных модулей.
+        """
+        return self._index(CloneIndex)
+
+    def find_dead_code(self, entry_points: Iterable[str] = (), include_tests: bool = True) -> Dict[str, Any]:
+        """
+        Находит недостижимые модули, неиспользуемые символы и импорты.
+
+        Args:
+            entry_points: Дополнительные точки входа - шаблоны путей модулей
+                или идентификаторов символов (см. analyzer.dead_code)
+            include_tests: Считать ли тесты pytest точками входа
+
+        Returns:
+            Результат analyzer.dead_code.find_dead_code
+        """
+        return find_dead_code(self.get_symbol_index(), entry_points, include_tests=include_tests)
+
+    def _index(self, index_class: type) -> Any:
+        """Возвращает индекс, построенный по текущему словарю modules"""
+        cached = self._indexes.get(index_class)
+        if cached is None or cached[0] is not self.modules:
+            cached = self._indexes[index_class] = (self.modules, index_class.from_modules(self.modules))
+        return cached[1]
+
+    def get_analysis_id(self) -> str:
+        """
+        Возвращает идентификатор результата анализа.
+
+        Идентификатор зависит только от путей и содержимого модулей и версии
+        анализатора, поэтому повторный анализ неизмененного проекта дает тот же
+        идентификатор. Используется как ETag и для проверки курсоров страниц.
+
+        Хешируются хеши содержимого файлов, вычисленные при анализе, а не
+        сами записи модулей; запись сериализуется только для модулей,
+        добавленных в modules без хеша содержимого.
+        """
+        digests = {}
+        digest = hashlib.sha1(ANALYZER_VERSION.encode('utf-8'))
+        for path in sorted(self.modules):
+            module = self.modules[path]
+            cached = self._digests.get(path)
+            if cached is None or cached[0] is not module:
+                record = json.dumps(module, sort_keys=True, separators=(',', ':'), default=json_default)
+                cached = (module, hashlib.sha1(record.encode('utf-8')).hexdigest())
+            digests[path] = cached
+            digest.update(f'{path}\0{cached[1]}\n'.encode('utf-8'))
+        # Хеши удаленных и замененных модулей больше не нужны
+        self._digests = digests
+        return digest.hexdigest()
+
+    def generate_project_report(self, top_k: Optional[int] = DEFAULT_TOP_K,
+                                min_complexity: Optional[int] = None,
+                                per_module_top_k: Optional[int] = None,
+                                entry_points: Iterable[str] = (),
+                                sections: Iterable[str] = ()) -> Dict[str, Any]:
         """
         Генерирует отчет о проекте.
 
+        Args:
+            top_k: Сколько самых сложных функций включить в отчет, None - все
+            min_complexity: Минимальная сложность функций в списке сложных функций
+            per_module_top_k: Если задано, в отчет добавляются самые сложные
+                функции каждого модуля (ключ complex_functions_by_module)
+            entry_points: Дополнительные точки входа для поиска
+                неиспользуемого кода (ключ dead_code)
+            sections: Дополнительные разделы отчета из OPTIONAL_SECTIONS
+
         Returns:
             Словарь с информацией о проекте
         """
+        sections = set(sections)
+        unknown = sections.difference(OPTIONAL_SECTIONS)
+        if unknown:
+            raise ValueError(f'Unknown report sections: {", ".join(sorted(unknown))}')
+
+        instrumentation = self.instrumentation
         total_loc = sum(module.get('loc', 0) for module in self.modules.values())
         total_functions = sum(len(module.get('functions', [])) for module in self.modules.values())
         total_classes = sum(len(module.get('classes', [])) for module in self.modules.values())
 
-        all_functions = []
-        for module_path, module_info in self.modules.items():
-            for func in module_info.get('functions', []):
-                func['module'] = module_path
-                all_functions.append(func)
-
-            for cls in module_info.get('classes', []):
-                for method in cls.get('methods', []):
-                    method['module'] = module_path
-                    method['class'] = cls['name']
-                    all_functions.append(method)
-
-        all_functions.sort(key=lambda x: x.get('complexity', 0), reverse=True)
-        complex_functions = all_functions[:10]  # Топ-10 самых сложных функций
+        with instrumentation.phase('report.complex_functions'):
+            complex_functions = top_complex_functions(self.modules, top_k, min_complexity)
+        with instrumentation.phase('report.module_graph'):
+            module_graph = self.get_module_graph().to_dict()
+        with instrumentation.phase('report.metrics'):
+            metrics = self.aggregator.aggregate(self.modules)
+        with instrumentation.phase('report.analysis_id'):
+            analysis_id = self.get_analysis_id()
 
-        return {
+        report = {
             'total_modules': len(self.modules),
             'total_loc': total_loc,
             'total_functions': total_functions,
             'total_classes': total_classes,
             'complex_functions': complex_functions,
-            'dependency_graph': self.get_dependency_graph()
+            'dependency_graph': self.get_dependency_graph(),
+            'module_graph': module_graph,
+            'modules': self.modules,
+            'metrics': metrics,
+            'analysis_id': analysis_id
         }
 
-    def save_report(self, output_path: str) -> None:
+        if 'call_graph' in sections:
+            with instrumentation.phase('report.call_graph'):
+                report['call_graph'] = self.get_symbol_index().to_dict()
+        if 'duplicates' in sections:
+            with instrumentation.phase('report.duplicates'):
+                report['duplicates'] = self.get_clone_index().to_dict()
+        if 'dead_code' in sections:
+            with instrumentation.phase('report.dead_code'):
+                report['dead_code'] = self.find_dead_code(entry_points)
+
+        if per_module_top_k is not None:
+            report['complex_functions_by_module'] = top_complex_functions_by_module(
+                self.modules, per_module_top_k, min_complexity)
+
+        if self.cache_stats is not None:
+            report['cache'] = self.cache_stats
+
+        if self.discovery.stats:
+            report['discovery'] = self.discovery.stats
+
+        if instrumentation.enabled:
+            report['timings'] = instrumentation.to_dict()
+
+        return report
+
+    def save_report(self, output_path: str, compression: Optional[str] = None) -> None:
         """
-        Сохраняет отчет в JSON-файл.
+        Сохраняет отчет в файл.
+
+        Файлы с расширением .ndjson (.ndjson.gz, .ndjson.bz2, .ndjson.xz)
+        записываются построчно в потоковом формате, остальные - в JSON.
 
         Args:
             output_path: Путь для сохранения отчета
+            compression: Сжатие потокового отчета; по умолчанию - по расширению файла
         """
         report = self.generate_project_report()
 
+        if compression is not None or is_stream_report(output_path):
+            write_report(output_path, report, compression)
+            return
+
         for key, value in report.items():
             if isinstance(value, set):
                 report[key] = list(value)
 
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2)
+            json.dump(report, f, indent=2, default=json_default)
+
+
+def _read_source(file_path: str) -> str:
+    """Читает исходный код файла."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _add_fingerprints(visitor: ModuleVisitor, clones: Dict[int, Any]) -> None:
+    """Дополняет функции и методы модуля размером, отпечатком и эскизом"""
+    functions = list(visitor.functions)
+    for class_info in visitor.classes:
+        functions.extend(class_info['methods'])
+    for func_info in functions:
+        clone = clones.get(func_info['line'])
+        if clone is not None:
+            func_info['size'] = clone[0]
+            if clone[1] is not None:
+                func_info['fingerprint'], func_info['sketch'] = clone[1], clone[2]
+
+
+def _analyze_source(content: str, file_path: str, phases: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Анализирует исходный код модуля без побочных эффектов.
+
+    Args:
+        content: Содержимое файла
+        file_path: Относительный путь к файлу
+        phases: Если задан, в него записывается время разбора ('parse')
+            и обхода AST ('visit'), с
+
+    Returns:
+        Словарь с информацией о файле
+    """
+    started = time.perf_counter() if phases is not None else 0.0
+    try:
+        tree = ast.parse(content)
+        if phases is not None:
+            parsed = time.perf_counter()
+            phases['parse'] = parsed - started
+        lines = content.split('\n')
+
+        visitor = ModuleVisitor(SourceLines(lines))
+        visitor.visit(tree)
+        _add_fingerprints(visitor, fingerprint_functions(tree))
+        if phases is not None:
+            phases['visit'] = time.perf_counter() - parsed
+
+        module_info = {
+            'path': file_path,
+            'imports': visitor.imports,
+            'import_records': visitor.import_records,
+            'functions': visitor.functions,
+            'classes': visitor.classes,
+            'loc': len(lines),
+            'metrics': visitor.module_metrics,
+            'calls': [[name, line] for name, line in visitor.module_calls.items()],
+            'refs': [[name, line] for name, line in visitor.module_refs.items()],
+        }
+        if visitor.main_line is not None:
+            module_info['main_line'] = visitor.main_line
+        return module_info
 
+    except SyntaxError as e:
+        if phases is not None:
+            phases['parse'] = time.perf_counter() - started
+        return {
+            'path': file_path,
+            'error': f"Syntax error: {e}",
+        }
+    except RecursionError:
+        # Корректный, но слишком глубоко вложенный код (длинные цепочки
+        # операций) превышает предел рекурсии разбора или обхода AST
+        if phases is not None:
+            phases.setdefault('parse', time.perf_counter() - started)
+        return {
+            'path': file_path,
+            'error': 'Nesting too deep to analyze: recursion limit exceeded',
+        }
 
-if __name__ == "__main__":
-    import sys
 
-    if len(sys.argv) > 1:
-        project_path = sys.argv[1]
-    else:
-        project_path = "."
+def _stat_file(file_path: str) -> Optional[Tuple[int, int]]:
+    """Возвращает время изменения (нс) и размер файла или None, если файл недоступен."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _analyze_path(task: Tuple[str, str, bool, Optional[str], bool]
+                  ) -> Tuple[str, Optional[Dict[str, Any]], Optional[str], Optional[str], Optional[FileTimings]]:
+    """
+    Читает и анализирует файл, в том числе в процессе-воркере.
+
+    Args:
+        task: Кортеж (абсолютный путь, относительный путь, вычислять ли хеш,
+            хеш содержимого из кеша или None, замерять ли этапы анализа)
+
+    Returns:
+        Кортеж (относительный путь, информация о файле, сообщение об ошибке,
+        хеш содержимого, замеры файла или None). Информация о файле равна
+        None, если хеш совпал с сохраненным в кеше
+    """
+    file_path, rel_path, with_digest, known_digest, timed = task
+    started = time.perf_counter() if timed else 0.0
+    try:
+        content = _read_source(file_path)
+        phases: Optional[Dict[str, float]] = None
+        if timed:
+            read = time.perf_counter() - started
+            stat = _stat_file(file_path)
+            size = stat[1] if stat else len(content)
+            phases = {}
+
+        digest = content_digest(content) if with_digest else None
+        if known_digest is not None and digest == known_digest:
+            return rel_path, None, None, digest, (size, read, 0.0, 0.0) if timed else None
+
+        module_info = _analyze_source(content, rel_path, phases)
+        timings = (size, read, phases.get('parse', 0.0), phases.get('visit', 0.0)) if timed else None
+        return rel_path, module_info, None, digest, timings
+    except MemoryError:
+        return rel_path, None, f"Error analyzing {file_path}: out of memory", None, None
+    except Exception as e:
+        return rel_path, None, f"Error analyzing {file_path}: {e}", None, None
 
-    analyzer = CodeAnalyzer(project_path)
-    analyzer.scan_project()
-    report = analyzer.generate_project_report()
-    print(json.dumps(report, indent=2))
\ No newline at end of file
+
+if __name__ == "__main__":
+    import argparse
+    from contextlib import nullcontext
+
+    parser = argparse.ArgumentParser(description='Анализ структуры Python-проекта')
+    parser.add_argument('project_path', nargs='?', default='.', help='Корневая директория проекта')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Количество процессов для анализа (0 - по числу ядер)')
+    parser.add_argument('--cache', help='Путь к файлу кеша результатов анализа')
+    parser.add_argument('--invalidate-cache', action='store_true',
+                        help='Очистить кеш перед анализом')
+    parser.add_argument('--include', action='append',
+                        help='Шаблон анализируемых файлов (по умолчанию *.py), можно указать несколько раз')
+    parser.add_argument('--exclude', action='append', default=[],
+                        help='Шаблон исключаемых путей, можно указать несколько раз')
+    parser.add_argument('--exclude-dir', action='append', default=[], dest='exclude_dirs',
+                        help='Шаблон имени директории, в которую не нужно заходить, можно указать несколько раз')
+    parser.add_argument('--no-default-excludes', action='store_true',
+                        help='Не пропускать служебные директории по умолчанию (venv, build, dist и др.)')
+    parser.add_argument('--max-file-size', type=int, default=DEFAULT_MAX_FILE_SIZE,
+                        help='Максимальный размер файла в байтах (0 - без ограничения)')
+    parser.add_argument('--no-gitignore', action='store_true', help='Не учитывать .gitignore')
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K,
+                        help='Количество самых сложных функций в отчете (0 - все)')
+    parser.add_argument('--min-complexity', type=int,
+                        help='Минимальная сложность функций в списке сложных функций')
+    parser.add_argument('--per-module-top-k', type=int,
+                        help='Добавить в отчет самые сложные функции каждого модуля')
+    parser.add_argument('--entry-point', action='append', default=[], dest='entry_points',
+                        help='Дополнительная точка входа для поиска неиспользуемого кода: шаблон пути '
+                             "модуля или символа ('scripts/*', 'lib/api.py::*'), можно указать несколько раз")
+    parser.add_argument('--section', action='append', default=[], dest='sections', choices=OPTIONAL_SECTIONS,
+                        help='Добавить в отчет раздел, который по умолчанию не строится, '
+                             'можно указать несколько раз')
+    parser.add_argument('--output', '-o',
+                        help='Файл отчета; .ndjson, .ndjson.gz, .ndjson.bz2 и .ndjson.xz '
+                             'записываются построчно во время анализа')
+    parser.add_argument('--compression', choices=sorted(COMPRESSIONS),
+                        help='Сжатие потокового отчета (по умолчанию - по расширению файла)')
+    parser.add_argument('--base',
+                        help='Базовая ревизия git: анализировать только изменения относительно нее')
+    parser.add_argument('--head', default='HEAD', help='Сравниваемая ревизия git (по умолчанию HEAD)')
+    parser.add_argument('--timings', action='store_true',
+                        help='Добавить в отчет раздел timings: время этапов, самые медленные файлы, ошибки разбора')
+    parser.add_argument('--profile', nargs='?', const='', metavar='PSTATS_FILE',
+                        help='Профилировать анализ (cProfile и tracemalloc) и вывести сводку в stderr; '
+                             'если указан файл, сохранить в него статистику cProfile. Включает --timings')
+    args = parser.parse_args()
+
+    exclude_dirs = list(args.exclude_dirs)
+    exclude_non_package_dirs: Tuple[str, ...] = ()
+    if not args.no_default_excludes:
+        exclude_dirs += DEFAULT_EXCLUDE_DIRS
+        exclude_non_package_dirs = DEFAULT_EXCLUDE_NON_PACKAGE_DIRS
+
+    if args.base:
+        import sys
+        from analyzer.git_diff import GitError, diff_revisions
+
+        try:
+            delta = diff_revisions(args.project_path, args.base, args.head, include=args.include or ('*.py',),
+                                   exclude_dirs=exclude_dirs, exclude_non_package_dirs=exclude_non_package_dirs)
+        except GitError as e:
+            sys.exit(f'git: {e}')
+        print(json.dumps(delta, indent=2))
+        sys.exit(0)
+
+    discovery = FileDiscovery(
+        args.project_path,
+        include=args.include or ('*.py',),
+        exclude=args.exclude,
+        exclude_dirs=exclude_dirs,
+        exclude_non_package_dirs=exclude_non_package_dirs,
+        max_file_size=args.max_file_size or None,
+        use_gitignore=not args.no_gitignore
+    )
+
+    cache = AnalysisCache(args.cache, ANALYZER_VERSION) if args.cache else None
+    if cache is not None and args.invalidate_cache:
+        cache.invalidate()
+
+    report_options = {
+        'top_k': args.top_k or None,
+        'min_complexity': args.min_complexity,
+        'per_module_top_k': args.per_module_top_k,
+        'entry_points': args.entry_points,
+        'sections': args.sections
+    }
+
+    instrumentation = Instrumentation(enabled=args.timings or args.profile is not None)
+    analyzer = CodeAnalyzer(args.project_path, cache=cache, discovery=discovery, instrumentation=instrumentation)
+    with profiled(args.profile) if args.profile is not None else nullcontext():
+        if args.output and (args.compression or is_stream_report(args.output)):
+            # Модули записываются по мере анализа, в конце - сводка
+            with ReportStreamWriter(args.output, args.compression,
+                                    header={'analyzer_version': ANALYZER_VERSION}) as writer:
+                analyzer.scan_project(workers=args.workers, on_module=writer.write_module)
+                writer.write_summary(analyzer.generate_project_report(**report_options))
+        else:
+            analyzer.scan_project(workers=args.workers)
+            report = analyzer.generate_project_report(**report_options)
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, indent=2, default=json_default)
+            else:
+                print(json.dumps(report, indent=2, default=json_default))
+
+    if cache is not None:
+        cache.close()
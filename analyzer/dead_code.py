@@ -0,0 +1,327 @@
+# analyzer/dead_code.py
+"""
+Поиск неиспользуемого кода проекта по достижимости от точек входа.
+
+Точки входа - модули с блоком if __name__ == '__main__', __main__.py,
+setup.py и conftest.py, функции с регистрирующими декораторами (маршруты
+Flask, команды CLI, фикстуры), тесты pytest и символы или модули,
+заданные шаблонами. От них выполняется один обход в ширину по таблице
+ссылок индекса символов (analyzer.call_graph.ReferenceTable): вызовы и
+ссылки вне вызовов, импорты модулей, а также неявные ребра - символ
+загружает свой модуль, метод - свой класс, а класс открывает методы,
+имена которых встречаются как атрибуты в достижимом коде (тип объекта
+статически неизвестен). Методы классов, унаследованных от внешних
+классов (ast.NodeVisitor, json.JSONEncoder, threading.Thread), может
+вызывать внешний код, поэтому они открываются вместе с классом. Каждый
+символ и каждая ссылка обрабатываются один раз, поэтому время обхода
+линейно по размеру проекта.
+
+Неиспользуемые импорты определяются отдельно по каждому модулю: имя,
+связанное импортом, не упоминается в модуле, не экспортируется через
+__all__ и не импортируется из этого модуля другими модулями. Импорты в
+__init__.py считаются реэкспортом и не проверяются.
+"""
+import fnmatch
+import re
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+
+from .call_graph import (
+    MODULE_SYMBOL, SYMBOL_KINDS, ReferenceTable, SymbolIndex, _CLASS, _METHOD, _absolute_module, symbol_id
+)
+
+# Модули, которые выполняются как точки входа (шаблоны путей)
+DEFAULT_ENTRY_POINTS = ('__main__.py', '*/__main__.py', 'setup.py', 'conftest.py', '*/conftest.py')
+
+# Модули тестов pytest: выполняются их функции и классы test*/Test*
+TEST_MODULES = ('test_*.py', '*/test_*.py', '*_test.py')
+
+# Последние части имен декораторов, которые регистрируют функцию во
+# внешнем коде ('app.route', 'bp.get', 'click.command', 'pytest.fixture')
+ENTRY_DECORATORS = frozenset((
+    'route', 'get', 'post', 'put', 'patch', 'delete', 'websocket', 'errorhandler',
+    'before_request', 'after_request', 'teardown_request', 'teardown_appcontext',
+    'context_processor', 'template_filter', 'command', 'group', 'fixture', 'register'
+))
+
+
+def _matcher(patterns: Iterable[str]) -> Optional[Any]:
+    """Объединяет шаблоны fnmatch в одно регулярное выражение"""
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{fnmatch.translate(pattern)})' for pattern in patterns)).match
+
+
+def _is_dunder(name: str) -> bool:
+    return name.startswith('__') and name.endswith('__')
+
+
+def _imported_name(record: Dict[str, Any]) -> Tuple[str, str]:
+    """Возвращает импортированное имя, как оно записано в коде, и связанное им локальное имя"""
+    module = '.' * (record.get('level') or 0) + (record.get('module') or '')
+    name = record.get('name')
+    if name is None:
+        # 'import a.b' связывает имя 'a'
+        return module, record.get('asname') or module.split('.', 1)[0]
+    separator = '.' if record.get('module') else ''
+    return f'{module}{separator}{name}', record.get('asname') or name
+
+
+def _imported_paths(table: ReferenceTable, target: str, name: Optional[str]) -> List[str]:
+    """Модули проекта, которые выполняет импорт: пакеты по пути к модулю и сам модуль"""
+    name_to_path = table.module_index.name_to_path
+    parts = target.split('.') if target else []
+    if name is not None and name != '*':
+        parts.append(name)
+    paths = []
+    for i in range(1, len(parts) + 1):
+        path = name_to_path.get('.'.join(parts[:i]))
+        if path is not None:
+            paths.append(path)
+    return paths
+
+
+def _module_attributes(table: ReferenceTable) -> Tuple[Set[Tuple[str, str]], Set[str]]:
+    """
+    Собирает обращения к именам модулей из других модулей.
+
+    Returns:
+        Множество пар (путь модуля, имя) - имен, импортированных из модуля
+        или прочитанных как атрибут модуля ('pkg.name'), и пути модулей,
+        импортированных через 'from ... import *'
+    """
+    name_to_path = table.module_index.name_to_path
+    used: Set[Tuple[str, str]] = set()
+    starred: Set[str] = set()
+    for path, symbols in table.modules.items():
+        for record in symbols.record.get('import_records', ()):
+            name = record.get('name')
+            if name is None:
+                continue
+            target = _absolute_module(table.module_index, path, record)
+            source = name_to_path.get(target) if target else None
+            if source is None:
+                continue
+            if name == '*':
+                starred.add(source)
+            else:
+                used.add((source, name))
+
+        seen: Set[str] = set()
+        for _, name, _ in symbols.calls + symbols.refs:
+            head, dot, rest = name.partition('.')
+            binding = symbols.bindings.get(head)
+            if not dot or binding is None or name in seen:
+                continue
+            seen.add(name)
+            parts = f'{binding}.{rest}'.split('.')
+            for i in range(len(parts) - 1, 0, -1):
+                source = name_to_path.get('.'.join(parts[:i]))
+                if source is not None:
+                    used.add((source, parts[i]))
+                    break
+    return used, starred
+
+
+def _unused_imports(table: ReferenceTable) -> List[Dict[str, Any]]:
+    """Находит импорты, связанные имена которых нигде не используются"""
+    exported, starred = _module_attributes(table)
+    unused = []
+    for path, symbols in table.modules.items():
+        if path in starred or path.rsplit('/', 1)[-1] == '__init__.py':
+            # Имена модуля переэкспортируются через 'import *' или пакет
+            continue
+        heads = {name.split('.', 1)[0] for _, name, _ in symbols.calls}
+        heads.update(name.split('.', 1)[0] for _, name, _ in symbols.refs)
+        for record in symbols.record.get('import_records', ()):
+            name = record.get('name')
+            if name == '*' or record.get('module') == '__future__':
+                continue
+            imported, local = _imported_name(record)
+            if local in heads or (path, local) in exported:
+                continue
+            unused.append({'module': path, 'line': record.get('line'), 'name': imported, 'local': local})
+    unused.sort(key=lambda item: (item['module'], item['line'] or 0, item['local']))
+    return unused
+
+
+def _has_external_base(table: ReferenceTable, module: Any, cls: str) -> bool:
+    """Проверяет, унаследован ли класс от класса вне проекта (кроме object)"""
+    name_to_path = table.module_index.name_to_path
+    for base in module.bases.get(cls, ()):
+        head, _, rest = base.partition('.')
+        if head in module.defs:
+            continue
+        binding = module.bindings.get(head)
+        if binding is None:
+            if head != 'object' and not module.stars:
+                return True
+            continue
+        parts = (f'{binding}.{rest}' if rest else binding).split('.')
+        if not any('.'.join(parts[:i]) in name_to_path for i in range(len(parts) - 1, 0, -1)):
+            return True
+    return False
+
+
+def _roots(table: ReferenceTable, entry_points: Iterable[str], entry_decorators: Iterable[str],
+           include_tests: bool) -> List[int]:
+    """Номера символов - точек входа"""
+    ids = table.ids
+    entry_decorators = frozenset(entry_decorators)
+    entry_points = tuple(entry_points)
+    module_entry = _matcher(DEFAULT_ENTRY_POINTS + entry_points)
+    symbol_entry = _matcher(pattern for pattern in entry_points if '::' in pattern)
+    test_module = _matcher(TEST_MODULES) if include_tests else None
+
+    roots = []
+    for path, symbols in table.modules.items():
+        record = symbols.record
+        is_test = test_module is not None and test_module(path) is not None
+        if record.get('main_line') is not None or module_entry(path) is not None or is_test:
+            roots.append(ids[symbol_id(path, MODULE_SYMBOL)])
+
+        definitions = [(func.get('parent'), func) for func in record.get('functions', ())]
+        for cls in record.get('classes', ()):
+            definitions.append((None, cls))
+            definitions.extend((cls['name'], method) for method in cls.get('methods', ()))
+        for parent, definition in definitions:
+            decorators = definition.get('decorators') or ()
+            if any(decorator.rsplit('.', 1)[-1] in entry_decorators for decorator in decorators) or \
+                    (is_test and definition['name'].lower().startswith('test')):
+                qualname = f'{parent}.{definition["name"]}' if parent else definition['name']
+                roots.append(ids[symbol_id(path, qualname)])
+
+        if symbol_entry is not None:
+            for qualname in symbols.defs:
+                if symbol_entry(symbol_id(path, qualname)) is not None:
+                    roots.append(ids[symbol_id(path, qualname)])
+    return roots
+
+
+def find_dead_code(index: SymbolIndex, entry_points: Iterable[str] = (),
+                   entry_decorators: Iterable[str] = ENTRY_DECORATORS,
+                   include_tests: bool = True) -> Dict[str, Any]:
+    """
+    Находит недостижимые модули, неиспользуемые функции, классы и методы
+    и неиспользуемые импорты проекта.
+
+    Args:
+        index: Индекс символов проекта
+        entry_points: Дополнительные точки входа - шаблоны fnmatch путей
+            модулей ('app.py', 'scripts/*') или идентификаторов символов
+            ('lib/api.py::*'); модуль-точка входа выполняется целиком
+        entry_decorators: Последние части имен декораторов, которые делают
+            функцию или класс точкой входа
+        include_tests: Считать ли тесты pytest точками входа; без них
+            код, который используется только тестами, считается неиспользуемым
+
+    Returns:
+        Словарь: entry_points (число точек входа), total_symbols и
+        reachable_symbols, unreachable_modules (пути), unused_symbols
+        (описания символов достижимых модулей, кроме вложенных в уже
+        неиспользуемые) и unused_imports (модуль, строка, импортированное
+        имя и связанное локальное имя)
+    """
+    table = index.reference_table()
+    symbols, ids, edges = table.symbols, table.ids, table.edges
+
+    # Неявные ребра и имена атрибутов, которые упоминает каждый символ
+    module_of: Dict[str, int] = {path: ids[symbol_id(path, MODULE_SYMBOL)] for path in table.modules}
+    imports: Dict[int, List[int]] = {}
+    attributes: Dict[int, Set[str]] = {}
+    class_methods: Dict[int, List[Tuple[str, int]]] = {}
+    open_classes: Set[int] = set()
+    for path, module in table.modules.items():
+        module_id = module_of[path]
+        imported = []
+        for record in module.record.get('import_records', ()):
+            target = _absolute_module(table.module_index, path, record)
+            if target is not None:
+                imported.extend(module_of[source] for source in _imported_paths(table, target, record.get('name')))
+        if imported:
+            imports[module_id] = imported
+
+        by_caller: Dict[str, Set[str]] = {}
+        for caller, name, _ in module.calls + module.refs:
+            if '.' in name:
+                by_caller.setdefault(caller, set()).add(name.rsplit('.', 1)[1])
+        for caller, names in by_caller.items():
+            attributes[ids[symbol_id(path, caller)]] = names
+
+        for qualname, (kind, _) in module.defs.items():
+            if kind == _METHOD:
+                cls, name = qualname.split('.', 1)
+                class_methods.setdefault(ids[symbol_id(path, cls)], []).append((name, ids[symbol_id(path, qualname)]))
+            elif kind == _CLASS and _has_external_base(table, module, qualname):
+                open_classes.add(ids[symbol_id(path, qualname)])
+
+    roots = _roots(table, entry_points, entry_decorators, include_tests)
+
+    reached = bytearray(len(symbols))
+    queue: List[int] = []
+    used_attributes: Set[str] = set()
+    # Методы достижимых классов, ожидающие обращения к атрибуту с их именем
+    pending: Dict[str, List[int]] = {}
+
+    def reach(sid: int) -> None:
+        if not reached[sid]:
+            reached[sid] = 1
+            queue.append(sid)
+
+    for sid in roots:
+        reach(sid)
+    position = 0
+    while position < len(queue):
+        sid = queue[position]
+        position += 1
+        path, qualname, kind, _ = symbols[sid]
+        reach(module_of[path])
+        if kind == _METHOD:
+            reach(ids[symbol_id(path, qualname.split('.', 1)[0])])
+        elif kind == _CLASS:
+            opened = sid in open_classes
+            for name, method in class_methods.get(sid, ()):
+                if opened or _is_dunder(name) or name in used_attributes:
+                    reach(method)
+                else:
+                    pending.setdefault(name, []).append(method)
+        for target in edges.get(sid, ()):
+            reach(target)
+        for target in imports.get(sid, ()):
+            reach(target)
+        for name in attributes.get(sid, ()):
+            if name not in used_attributes:
+                used_attributes.add(name)
+                for method in pending.pop(name, ()):
+                    reach(method)
+
+    unreachable_modules = sorted(path for path, sid in module_of.items() if not reached[sid])
+    unused_symbols = []
+    for path, module in table.modules.items():
+        if not reached[module_of[path]]:
+            continue
+        for qualname, (kind, line) in module.defs.items():
+            if qualname == MODULE_SYMBOL or reached[ids[symbol_id(path, qualname)]]:
+                continue
+            parent = qualname.rpartition('.')[0]
+            if parent and parent in module.defs and not reached[ids[symbol_id(path, parent)]]:
+                # Символ вложен в неиспользуемый: достаточно сообщить о внешнем
+                continue
+            unused_symbols.append({
+                'symbol': symbol_id(path, qualname),
+                'module': path,
+                'qualname': qualname,
+                'kind': SYMBOL_KINDS[kind],
+                'line': line
+            })
+    unused_symbols.sort(key=lambda info: (info['module'], info['line'], info['qualname']))
+
+    alive = [entry for entry in symbols if entry is not None]
+    return {
+        'entry_points': len(set(roots)),
+        'total_symbols': len(alive),
+        'reachable_symbols': sum(reached),
+        'unreachable_modules': unreachable_modules,
+        'unused_symbols': unused_symbols,
+        'unused_imports': _unused_imports(table)
+    }
@@ -0,0 +1,412 @@
+# analyzer/dependency_graph.py
+import os
+import sys
+from array import array
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+KIND_INTERNAL = 'internal'
+KIND_STDLIB = 'stdlib'
+KIND_THIRD_PARTY = 'third_party'
+
+KINDS = (KIND_INTERNAL, KIND_STDLIB, KIND_THIRD_PARTY)
+
+STDLIB_MODULES = frozenset(getattr(sys, 'stdlib_module_names', ())) | frozenset(sys.builtin_module_names)
+
+
+def classify_external(module_name: str) -> str:
+    """Определяет, относится ли внешний модуль к стандартной библиотеке"""
+    top_level = module_name.split('.', 1)[0]
+    return KIND_STDLIB if top_level in STDLIB_MODULES else KIND_THIRD_PARTY
+
+
+class ModuleIndex:
+    """
+    Индекс модулей проекта: сопоставляет имена с точками файлам проекта.
+
+    Модуль регистрируется под полным именем от корня проекта
+    ('utils/file_manager.py' -> 'utils.file_manager'), а также под
+    укороченными именами от директорий без __init__.py, которые могут
+    быть корнями sys.path (например, 'src/pkg/mod.py' -> 'pkg.mod').
+    """
+
+    def __init__(self, module_paths: Iterable[str]):
+        """
+        Args:
+            module_paths: Относительные пути модулей проекта
+        """
+        paths = sorted(module_paths)
+        self.path_to_name: Dict[str, str] = {}
+        self.name_to_path: Dict[str, str] = {}
+
+        packages = set()
+        for path in paths:
+            parts = _path_parts(path)
+            if parts[-1] == '__init__':
+                packages.add(tuple(parts[:-1]))
+
+        suffixes = []
+        for path in paths:
+            parts = _path_parts(path)
+            if parts[-1] == '__init__':
+                parts = parts[:-1]
+            if not parts:
+                continue
+
+            name = '.'.join(parts)
+            self.path_to_name[path] = name
+            self.name_to_path.setdefault(name, path)
+
+            for i in range(1, len(parts)):
+                if tuple(parts[:i]) not in packages:
+                    suffixes.append(('.'.join(parts[i:]), path))
+
+        # Полные имена имеют приоритет над укороченными
+        for name, path in suffixes:
+            self.name_to_path.setdefault(name, path)
+
+    def package_of(self, path: str) -> List[str]:
+        """Возвращает части имени пакета, в котором находится модуль"""
+        name = self.path_to_name.get(path, '')
+        parts = name.split('.') if name else []
+        if _path_parts(path)[-1] != '__init__':
+            parts = parts[:-1]
+        return parts
+
+    def resolve(self, importer: str, record: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Разрешает запись импорта.
+
+        Args:
+            importer: Относительный путь импортирующего модуля
+            record: Запись импорта из import_records
+
+        Returns:
+            Пара (цель, тип): для модулей проекта цель - относительный путь
+            файла, для внешних - имя пакета верхнего уровня
+        """
+        module = record.get('module') or ''
+        level = record.get('level') or 0
+        name = record.get('name')
+
+        if level:
+            base = self.package_of(importer)
+            if level - 1 > len(base):
+                return '.' * level + module, KIND_INTERNAL
+            base = base[:len(base) - (level - 1)]
+            module = '.'.join(base + ([module] if module else []))
+
+        candidates = []
+        if name and name != '*':
+            candidates.append(f'{module}.{name}' if module else name)
+        if module:
+            parts = module.split('.')
+            candidates.extend('.'.join(parts[:i]) for i in range(len(parts), 0, -1))
+
+        for candidate in candidates:
+            path = self.name_to_path.get(candidate)
+            if path is not None:
+                return path, KIND_INTERNAL
+
+        if level:
+            # Относительный импорт вне проекта: оставляем его внутренним, но неразрешенным
+            return module or '.', KIND_INTERNAL
+
+        return module.split('.', 1)[0], classify_external(module)
+
+
+class DependencyGraph:
+    """
+    Граф зависимостей модулей в компактных массивах смежности (CSR).
+
+    Узлы - модули проекта и внешние пакеты верхнего уровня. Исходящие
+    ребра узла i - targets[offsets[i]:offsets[i + 1]]. Все запросы
+    (компоненты сильной связности, зависимые модули, слои) выполняются
+    за линейное время от числа узлов и ребер.
+    """
+
+    def __init__(self, nodes: List[str], kinds: Iterable[int], offsets: Iterable[int], targets: Iterable[int]):
+        self.nodes = nodes
+        self.kinds = array('b', kinds)
+        self.offsets = array('l', offsets)
+        self.targets = array('l', targets)
+        self.index: Dict[str, int] = {node: i for i, node in enumerate(nodes)}
+        self._reverse: Optional[Tuple[array, array]] = None
+
+    @classmethod
+    def from_modules(cls, modules: Dict[str, Dict[str, Any]]) -> 'DependencyGraph':
+        """
+        Строит граф по результатам analyze_file.
+
+        Args:
+            modules: Словарь {относительный путь: информация о модуле}
+
+        Returns:
+            Граф зависимостей
+        """
+        module_index = ModuleIndex(modules.keys())
+        nodes = list(modules.keys())
+        kinds = [0] * len(nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        adjacency: List[List[int]] = [[] for _ in nodes]
+
+        for source, module_info in modules.items():
+            source_id = index[source]
+            seen = set()
+            for record in module_info.get('import_records', ()):
+                target, kind = module_index.resolve(source, record)
+                target_id = index.get(target)
+                if target_id is None:
+                    target_id = len(nodes)
+                    index[target] = target_id
+                    nodes.append(target)
+                    kinds.append(KINDS.index(kind))
+                    adjacency.append([])
+                if target_id != source_id and target_id not in seen:
+                    seen.add(target_id)
+                    adjacency[source_id].append(target_id)
+
+        offsets = [0]
+        targets: List[int] = []
+        for edges in adjacency:
+            targets.extend(edges)
+            offsets.append(len(targets))
+
+        return cls(nodes, kinds, offsets, targets)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DependencyGraph':
+        """Восстанавливает граф из словаря, созданного to_dict"""
+        return cls(data['nodes'], data['kinds'], data['offsets'], data['targets'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает граф в виде JSON-совместимого словаря"""
+        return {
+            'nodes': list(self.nodes),
+            'kinds': self.kinds.tolist(),
+            'offsets': self.offsets.tolist(),
+            'targets': self.targets.tolist()
+        }
+
+    def kind(self, node_id: int) -> str:
+        return KINDS[self.kinds[node_id]]
+
+    def add_node(self, node: str, kind: str) -> int:
+        """Добавляет узел без ребер (или возвращает существующий) и возвращает его идентификатор"""
+        node_id = self.index.get(node)
+        if node_id is None:
+            node_id = len(self.nodes)
+            self.nodes.append(node)
+            self.kinds.append(KINDS.index(kind))
+            self.offsets.append(self.offsets[-1])
+            self.index[node] = node_id
+            self._reverse = None
+        return node_id
+
+    def set_successors(self, node_id: int, targets: Iterable[int]) -> None:
+        """
+        Заменяет исходящие ребра узла.
+
+        Используется для обновления графа после повторного анализа одного
+        модуля: сдвиг массивов выполняется за O(V + E) без пересборки графа.
+        """
+        start, end = self.offsets[node_id], self.offsets[node_id + 1]
+        new_targets = array('l', targets)
+        self.targets[start:end] = new_targets
+
+        delta = len(new_targets) - (end - start)
+        if delta:
+            offsets = self.offsets
+            for i in range(node_id + 1, len(offsets)):
+                offsets[i] += delta
+        self._reverse = None
+
+    def update_module(self, module_index: 'ModuleIndex', path: str, module_info: Dict[str, Any]) -> None:
+        """
+        Пересчитывает зависимости одного модуля проекта.
+
+        Индекс модулей должен соответствовать текущему набору модулей:
+        при добавлении или удалении модулей граф нужно построить заново.
+        """
+        source_id = self.add_node(path, KIND_INTERNAL)
+        targets: List[int] = []
+        for record in module_info.get('import_records', ()):
+            target, kind = module_index.resolve(path, record)
+            target_id = self.add_node(target, kind)
+            if target_id != source_id and target_id not in targets:
+                targets.append(target_id)
+        self.set_successors(source_id, targets)
+
+    def successors(self, node_id: int) -> array:
+        return self.targets[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def _reverse_csr(self) -> Tuple[array, array]:
+        """Строит (и кеширует) обратные массивы смежности подсчетом степеней"""
+        if self._reverse is None:
+            n = len(self.nodes)
+            counts = [0] * (n + 1)
+            for target in self.targets:
+                counts[target + 1] += 1
+            for i in range(n):
+                counts[i + 1] += counts[i]
+
+            sources = array('l', bytes(len(self.targets) * array('l').itemsize))
+            position = counts[:]
+            for source in range(n):
+                for k in range(self.offsets[source], self.offsets[source + 1]):
+                    target = self.targets[k]
+                    sources[position[target]] = source
+                    position[target] += 1
+            self._reverse = (array('l', counts), sources)
+        return self._reverse
+
+    def adjacency(self) -> Dict[str, List[str]]:
+        """Возвращает разрешенный граф в виде {модуль: [зависимости]} для модулей проекта"""
+        return {
+            self.nodes[i]: [self.nodes[t] for t in self.successors(i)]
+            for i in range(len(self.nodes))
+            if self.offsets[i] != self.offsets[i + 1] or self.kinds[i] == 0
+        }
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """
+        Находит компоненты сильной связности итеративным алгоритмом Тарьяна.
+
+        Returns:
+            Список компонент (списков идентификаторов узлов) в обратном
+            топологическом порядке: компонента идет раньше тех, кто от нее зависит
+        """
+        n = len(self.nodes)
+        offsets, targets = self.offsets, self.targets
+        index_of = [-1] * n
+        lowlink = [0] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+
+        for root in range(n):
+            if index_of[root] != -1:
+                continue
+
+            # Стек вызовов: (узел, позиция следующего ребра)
+            call_stack = [(root, offsets[root])]
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+
+            while call_stack:
+                node, edge = call_stack[-1]
+                if edge < offsets[node + 1]:
+                    call_stack[-1] = (node, edge + 1)
+                    target = targets[edge]
+                    if index_of[target] == -1:
+                        index_of[target] = lowlink[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack[target] = True
+                        call_stack.append((target, offsets[target]))
+                    elif on_stack[target] and index_of[target] < lowlink[node]:
+                        lowlink[node] = index_of[target]
+                    continue
+
+                call_stack.pop()
+                if call_stack:
+                    parent = call_stack[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        return components
+
+    def cycles(self) -> List[List[str]]:
+        """Возвращает циклы зависимостей (компоненты сильной связности из нескольких модулей)"""
+        return [
+            sorted(self.nodes[i] for i in component)
+            for component in self.strongly_connected_components()
+            if len(component) > 1
+        ]
+
+    def transitive_dependents(self, node: str) -> List[str]:
+        """
+        Возвращает все модули, которые прямо или транзитивно зависят от модуля.
+
+        Args:
+            node: Относительный путь модуля или имя внешнего пакета
+
+        Returns:
+            Список зависимых модулей в порядке обхода в ширину
+        """
+        start = self.index.get(node)
+        if start is None:
+            return []
+
+        offsets, sources = self._reverse_csr()
+        visited = bytearray(len(self.nodes))
+        visited[start] = 1
+        queue = [start]
+        for current in queue:
+            for k in range(offsets[current], offsets[current + 1]):
+                source = sources[k]
+                if not visited[source]:
+                    visited[source] = 1
+                    queue.append(source)
+
+        return [self.nodes[i] for i in queue[1:]]
+
+    def topological_layers(self, internal_only: bool = True) -> List[List[str]]:
+        """
+        Разбивает граф на слои: модули слоя зависят только от модулей предыдущих слоев.
+
+        Модули одного цикла попадают в один слой.
+
+        Args:
+            internal_only: Учитывать только модули проекта
+
+        Returns:
+            Список слоев, начиная с модулей без зависимостей
+        """
+        components = self.strongly_connected_components()
+        component_of = [0] * len(self.nodes)
+        for c, component in enumerate(components):
+            for node_id in component:
+                component_of[node_id] = c
+
+        # Тарьян возвращает компоненты так, что зависимости идут раньше
+        # зависимых, поэтому слой вычисляется одним проходом
+        layer_of = [0] * len(components)
+        for c, component in enumerate(components):
+            layer = 0
+            for node_id in component:
+                for target in self.successors(node_id):
+                    target_c = component_of[target]
+                    if target_c == c or (internal_only and self.kinds[target] != 0):
+                        continue
+                    if layer_of[target_c] + 1 > layer:
+                        layer = layer_of[target_c] + 1
+            layer_of[c] = layer
+
+        layers: List[List[str]] = []
+        for c, component in enumerate(components):
+            members = [i for i in component if not internal_only or self.kinds[i] == 0]
+            if not members:
+                continue
+            while len(layers) <= layer_of[c]:
+                layers.append([])
+            layers[layer_of[c]].extend(self.nodes[i] for i in members)
+
+        return [sorted(layer) for layer in layers]
+
+
+def _path_parts(path: str) -> List[str]:
+    """Разбивает относительный путь модуля на части имени без расширения"""
+    return os.path.splitext(path)[0].replace('\\', '/').split('/')
@@ -0,0 +1,366 @@
+# analyzer/discovery.py
+import fnmatch
+import os
+import re
+from typing import Dict, List, Iterable, Iterator, Optional, Pattern, Set, Tuple
+
+# Директории, в которых нет кода проекта: VCS, окружения, кеши
+DEFAULT_EXCLUDE_DIRS = (
+    '.git', '.hg', '.svn', '.tox', '.nox', '.eggs', '.venv', 'venv',
+    'node_modules', '__pycache__', '.mypy_cache', '.pytest_cache', '.ruff_cache',
+    'site-packages', '*.egg-info',
+)
+
+# Обычные имена окружений и результатов сборки; такие директории
+# пропускаются, только если это не пакеты (в них нет __init__.py)
+DEFAULT_EXCLUDE_NON_PACKAGE_DIRS = ('env', 'build', 'dist')
+
+# Файлы больше этого размера обычно сгенерированы и не анализируются
+DEFAULT_MAX_FILE_SIZE = 2 * 1024 * 1024
+
+
+def _translate_gitignore_pattern(pattern: str) -> str:
+    """Преобразует шаблон .gitignore в регулярное выражение для пути относительно .gitignore"""
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+
+    regex = ''
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == len(pattern):
+            regex += '/.*'
+            i += 3
+        elif pattern[i] == '*':
+            regex += '.*' if pattern.startswith('**', i) else '[^/]*'
+            i += 2 if pattern.startswith('**', i) else 1
+        elif pattern[i] == '?':
+            regex += '[^/]'
+            i += 1
+        elif pattern[i] == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                regex += re.escape(pattern[i])
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                regex += f'[{body}]'
+                i = end + 1
+        elif pattern[i] == '\\' and i + 1 < len(pattern):
+            regex += re.escape(pattern[i + 1])
+            i += 2
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+
+    prefix = '' if anchored else '(?:.*/)?'
+    return f'{prefix}{regex}'
+
+
+class GitIgnore:
+    """Правила одного файла .gitignore."""
+
+    def __init__(self, base: str, lines: Iterable[str]):
+        """
+        Args:
+            base: Путь директории с .gitignore относительно корня проекта ('' - корень)
+            lines: Строки файла .gitignore
+        """
+        self.base = base
+        self.rules: List[Tuple[Pattern, bool, bool]] = []
+
+        for line in lines:
+            line = line.rstrip('\n').rstrip('\r')
+            if not line.strip() or line.startswith('#'):
+                continue
+            line = line.rstrip(' ')
+
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            elif line.startswith('\\'):
+                line = line[1:]
+
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+
+            self.rules.append((re.compile(_translate_gitignore_pattern(line) + r'\Z'), negate, dir_only))
+
+    @classmethod
+    def load(cls, dir_path: str, base: str) -> Optional['GitIgnore']:
+        """Загружает .gitignore из директории, если он существует и содержит правила"""
+        try:
+            with open(os.path.join(dir_path, '.gitignore'), 'r', encoding='utf-8', errors='replace') as f:
+                ignore = cls(base, f)
+        except OSError:
+            return None
+        return ignore if ignore.rules else None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Проверяет путь по правилам файла.
+
+        Returns:
+            True - путь игнорируется, False - явно возвращен правилом '!',
+            None - ни одно правило не подошло
+        """
+        if self.base:
+            rel_path = rel_path[len(self.base) + 1:]
+
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negate
+        return result
+
+
+class FileDiscovery:
+    """
+    Ленивый поиск файлов проекта на основе os.scandir.
+
+    Пропускает служебные директории, пути из .gitignore и исключающих
+    шаблонов, слишком большие файлы и циклы символических ссылок.
+    Статистика пропущенных путей доступна в атрибуте stats.
+    """
+
+    def __init__(self, project_root: str,
+                 include: Iterable[str] = ('*.py',),
+                 exclude: Iterable[str] = (),
+                 exclude_dirs: Iterable[str] = DEFAULT_EXCLUDE_DIRS,
+                 exclude_non_package_dirs: Iterable[str] = DEFAULT_EXCLUDE_NON_PACKAGE_DIRS,
+                 max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+                 use_gitignore: bool = True):
+        """
+        Args:
+            project_root: Корневая директория проекта
+            include: Шаблоны файлов для анализа; шаблон без '/' сравнивается
+                с именем файла, иначе - с относительным путем
+            exclude: Шаблоны относительных путей файлов и директорий, которые нужно пропустить
+            exclude_dirs: Шаблоны имен директорий, в которые не нужно заходить
+            exclude_non_package_dirs: Шаблоны имен директорий, в которые не нужно
+                заходить, если в них нет __init__.py
+            max_file_size: Максимальный размер файла в байтах, None - без ограничения
+            use_gitignore: Учитывать ли файлы .gitignore
+        """
+        self.project_root = os.path.abspath(project_root)
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.max_file_size = max_file_size
+        self.use_gitignore = use_gitignore
+
+        self._exclude_dir_names = {name for name in exclude_dirs if not _is_glob(name)}
+        self._exclude_dir_globs = [name for name in exclude_dirs if _is_glob(name)]
+        self._exclude_non_package_dirs = list(exclude_non_package_dirs)
+
+        self.stats: Dict[str, int] = {}
+
+    def _reset_stats(self) -> None:
+        self.stats = {
+            'files': 0,
+            'directories': 0,
+            'excluded_dirs': 0,
+            'excluded_files': 0,
+            'gitignored': 0,
+            'too_large': 0,
+            'symlink_loops': 0,
+            'errors': 0,
+        }
+
+    def iter_files(self) -> Iterator[Tuple[str, str]]:
+        """
+        Обходит проект и лениво возвращает найденные файлы.
+
+        Записи директории обходятся в порядке имен, поэтому результат
+        детерминирован.
+
+        Returns:
+            Итератор пар (абсолютный путь, путь относительно корня)
+        """
+        for abs_path, rel_path, is_dir in self._walk():
+            if not is_dir:
+                yield abs_path, rel_path
+
+    def iter_directories(self) -> Iterator[Tuple[str, str]]:
+        """
+        Возвращает директории, которые обходит iter_files, включая корень ('').
+
+        Используется для установки наблюдения за изменениями файлов.
+        """
+        for abs_path, rel_path, is_dir in self._walk():
+            if is_dir:
+                yield abs_path, rel_path
+
+    def is_candidate(self, rel_path: str) -> bool:
+        """
+        Быстро проверяет, может ли файл быть найден обходом проекта.
+
+        Учитываются шаблоны include и exclude и служебные директории;
+        правила .gitignore и размер файла не проверяются.
+
+        Args:
+            rel_path: Путь файла относительно корня проекта
+        """
+        rel_path = rel_path.replace(os.sep, '/')
+        parts = rel_path.split('/')
+        name = parts[-1]
+
+        if not any(fnmatch.fnmatchcase(rel_path if '/' in p else name, p) for p in self.include):
+            return False
+        if self._is_excluded(rel_path):
+            return False
+        return len(parts) == 1 or not self.is_excluded_dir('/'.join(parts[:-1]))
+
+    def is_excluded_dir(self, rel_dir: str) -> bool:
+        """Проверяет, исключена ли директория или одна из ее родительских директорий"""
+        parts = rel_dir.replace(os.sep, '/').split('/')
+        for i, part in enumerate(parts):
+            rel_path = '/'.join(parts[:i + 1])
+            if self._is_excluded_name(part, os.path.join(self.project_root, rel_path)) \
+                    or self._is_excluded(rel_path):
+                return True
+        return False
+
+    def _is_excluded_name(self, name: str, dir_path: str) -> bool:
+        """Проверяет имя директории по шаблонам exclude_dirs и exclude_non_package_dirs"""
+        if name in self._exclude_dir_names or any(fnmatch.fnmatchcase(name, p) for p in self._exclude_dir_globs):
+            return True
+        return any(fnmatch.fnmatchcase(name, p) for p in self._exclude_non_package_dirs) \
+            and not os.path.isfile(os.path.join(dir_path, '__init__.py'))
+
+    def _walk(self) -> Iterator[Tuple[str, str, bool]]:
+        """Обходит проект и возвращает тройки (абсолютный путь, относительный путь, директория ли)"""
+        self._reset_stats()
+        visited: Set[Tuple[int, int]] = set()
+
+        root_ignores = []
+        if self.use_gitignore:
+            root_ignore = GitIgnore.load(self.project_root, '')
+            if root_ignore:
+                root_ignores.append(root_ignore)
+
+        try:
+            root_stat = os.stat(self.project_root)
+        except OSError:
+            self.stats['errors'] += 1
+            return
+        visited.add((root_stat.st_dev, root_stat.st_ino))
+        yield self.project_root, '', True
+
+        # Стек директорий: (абсолютный путь, относительный путь, правила .gitignore)
+        stack = [(self.project_root, '', root_ignores)]
+        while stack:
+            dir_path, rel_dir, ignores = stack.pop()
+            self.stats['directories'] += 1
+
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                self.stats['errors'] += 1
+                continue
+
+            subdirs = []
+            for entry in entries:
+                rel_path = f'{rel_dir}/{entry.name}' if rel_dir else entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    self.stats['errors'] += 1
+                    continue
+
+                if is_dir:
+                    subdir = self._check_dir(entry, rel_path, ignores, visited)
+                    if subdir is not None:
+                        subdirs.append(subdir)
+                        yield entry.path, _native(rel_path), True
+                elif self._check_file(entry, rel_path, ignores):
+                    self.stats['files'] += 1
+                    yield entry.path, _native(rel_path), False
+
+            # Обратный порядок в стеке сохраняет порядок обхода по именам
+            stack.extend(reversed(subdirs))
+
+    def _check_dir(self, entry: os.DirEntry, rel_path: str, ignores: List[GitIgnore],
+                   visited: Set[Tuple[int, int]]) -> Optional[Tuple[str, str, List[GitIgnore]]]:
+        """Возвращает элемент стека для директории или None, если ее нужно пропустить"""
+        if self._is_excluded_name(entry.name, entry.path) or self._is_excluded(rel_path):
+            self.stats['excluded_dirs'] += 1
+            return None
+
+        if _is_ignored(ignores, rel_path, True):
+            self.stats['gitignored'] += 1
+            return None
+
+        try:
+            st = entry.stat()
+        except OSError:
+            self.stats['errors'] += 1
+            return None
+
+        key = (st.st_dev, st.st_ino)
+        if key in visited:
+            # Директория уже обойдена: это цикл или повторная ссылка
+            self.stats['symlink_loops'] += 1
+            return None
+        visited.add(key)
+
+        if self.use_gitignore:
+            ignore = GitIgnore.load(entry.path, rel_path)
+            if ignore:
+                ignores = ignores + [ignore]
+
+        return entry.path, rel_path, ignores
+
+    def _check_file(self, entry: os.DirEntry, rel_path: str, ignores: List[GitIgnore]) -> bool:
+        """Проверяет, нужно ли анализировать файл"""
+        if not any(fnmatch.fnmatchcase(rel_path if '/' in p else entry.name, p) for p in self.include):
+            return False
+
+        if self._is_excluded(rel_path):
+            self.stats['excluded_files'] += 1
+            return False
+
+        if _is_ignored(ignores, rel_path, False):
+            self.stats['gitignored'] += 1
+            return False
+
+        if self.max_file_size is not None:
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                self.stats['errors'] += 1
+                return False
+            if size > self.max_file_size:
+                self.stats['too_large'] += 1
+                return False
+
+        return True
+
+    def _is_excluded(self, rel_path: str) -> bool:
+        return any(fnmatch.fnmatchcase(rel_path, pattern) for pattern in self.exclude)
+
+
+def _native(rel_path: str) -> str:
+    return rel_path if os.sep == '/' else rel_path.replace('/', os.sep)
+
+
+def _is_glob(pattern: str) -> bool:
+    return any(char in pattern for char in '*?[')
+
+
+def _is_ignored(ignores: List[GitIgnore], rel_path: str, is_dir: bool) -> bool:
+    """Применяет правила .gitignore от корня к вложенным; последнее совпадение побеждает"""
+    ignored = False
+    for ignore in ignores:
+        result = ignore.match(rel_path, is_dir)
+        if result is not None:
+            ignored = result
+    return ignored
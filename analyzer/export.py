@@ -0,0 +1,291 @@
+# analyzer/export.py
+"""
+Экспорт отчета в HTML, Mermaid и SVG.
+
+Генераторы выдают результат частями, поэтому большой отчет не
+собирается в памяти целиком: части пишутся в файл или передаются
+клиенту по мере формирования.
+"""
+import datetime
+import html
+import json
+import os
+import re
+from typing import Dict, List, Any, Callable, Iterator
+
+from .dependency_graph import DependencyGraph
+from .graph_view import build_graph_view
+from .model import json_default
+
+# Меняется при изменении шаблонов: сохраненные экспорты прежней версии не используются
+EXPORT_VERSION = '1'
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Code Analysis Report - {date}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 20px; line-height: 1.6; }}
+        .container {{ max-width: 1200px; margin: 0 auto; }}
+        h1, h2, h3 {{ color: #333; }}
+        table {{ border-collapse: collapse; width: 100%; margin-bottom: 20px; }}
+        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+        th {{ background-color: #f2f2f2; }}
+        tr:nth-child(even) {{ background-color: #f9f9f9; }}
+        .card {{ border: 1px solid #ddd; border-radius: 4px; padding: 15px; margin-bottom: 20px; }}
+        .summary-item {{ display: inline-block; width: 22%; margin: 1%; padding: 10px;
+                       text-align: center; background-color: #f8f9fa; border-radius: 4px; }}
+        .footer {{ margin-top: 30px; text-align: center; font-size: 12px; color: #777; }}
+        pre {{ background-color: #f8f9fa; padding: 10px; border-radius: 4px; overflow-x: auto; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Code Analysis Report</h1>
+        <p>Generated on: {generated}</p>
+
+        <div class="card">
+            <h2>Project Summary</h2>
+            <div>
+                <div class="summary-item">
+                    <h3>{total_modules}</h3>
+                    <p>Modules</p>
+                </div>
+                <div class="summary-item">
+                    <h3>{total_loc}</h3>
+                    <p>Lines of Code</p>
+                </div>
+                <div class="summary-item">
+                    <h3>{total_functions}</h3>
+                    <p>Functions</p>
+                </div>
+                <div class="summary-item">
+                    <h3>{total_classes}</h3>
+                    <p>Classes</p>
+                </div>
+            </div>
+        </div>
+
+        <div class="card">
+            <h2>Complex Functions</h2>
+"""
+
+_HTML_FUNCTIONS_HEAD = """            <table>
+                <thead>
+                    <tr>
+                        <th>Name</th>
+                        <th>Module</th>
+                        <th>Class</th>
+                        <th>Complexity</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+
+_HTML_FUNCTION_ROW = """                    <tr>
+                        <td>{name}</td>
+                        <td>{module}</td>
+                        <td>{cls}</td>
+                        <td>{complexity}</td>
+                    </tr>
+"""
+
+_HTML_FUNCTIONS_TAIL = """                </tbody>
+            </table>
+            <div>
+                <p><strong>About Cyclomatic Complexity:</strong></p>
+                <ul>
+                    <li>1-4: Low complexity - easy to test and understand</li>
+                    <li>5-10: Moderate complexity - pay attention to these functions</li>
+                    <li>11-20: High complexity - consider refactoring</li>
+                    <li>21+: Very high complexity - refactoring required</li>
+                </ul>
+            </div>
+"""
+
+_HTML_DEPENDENCIES_HEAD = """        </div>
+
+        <div class="card">
+            <h2>Dependency Graph</h2>
+            <p>Module dependencies represented as a graph:</p>
+            <pre>"""
+
+_HTML_TAIL = """</pre>
+        </div>
+
+        <div class="footer">
+            <p>Generated by Code Analyzer Tool | {timestamp}</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
+def iter_html_report(report: Dict[str, Any]) -> Iterator[str]:
+    """
+    Формирует HTML-отчет: сводку, сложные функции и граф зависимостей.
+
+    Args:
+        report: Отчет, созданный CodeAnalyzer.generate_project_report
+
+    Yields:
+        Части HTML-документа
+    """
+    now = datetime.datetime.now()
+    yield _HTML_HEAD.format(
+        date=now.strftime('%Y-%m-%d'),
+        generated=now.strftime('%Y-%m-%d %H:%M:%S'),
+        total_modules=report.get('total_modules', 0),
+        total_loc=report.get('total_loc', 0),
+        total_functions=report.get('total_functions', 0),
+        total_classes=report.get('total_classes', 0)
+    )
+
+    functions = report.get('complex_functions') or []
+    if functions:
+        yield _HTML_FUNCTIONS_HEAD
+        for func in functions:
+            yield _HTML_FUNCTION_ROW.format(
+                name=html.escape(func.get('name') or 'Unnamed'),
+                module=html.escape(func.get('module') or 'Unknown'),
+                cls=html.escape(func.get('class') or '-'),
+                complexity=func.get('complexity') or 0
+            )
+        yield _HTML_FUNCTIONS_TAIL
+    else:
+        yield '            <p>No complex functions found in the project.</p>\n'
+
+    yield _HTML_DEPENDENCIES_HEAD
+    encoder = json.JSONEncoder(indent=2, ensure_ascii=False, default=json_default)
+    for chunk in encoder.iterencode(report.get('dependency_graph', {})):
+        yield html.escape(chunk, quote=False)
+    yield _HTML_TAIL.format(timestamp=now.isoformat(timespec='seconds'))
+
+
+def _mermaid_name(name: str) -> str:
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+def _module_name(path: str) -> str:
+    return os.path.splitext(re.split(r'[/\\]', path)[-1])[0]
+
+
+def iter_mermaid(report: Dict[str, Any]) -> Iterator[str]:
+    """
+    Формирует диаграмму классов Mermaid по графу зависимостей модулей.
+
+    Каждый модуль проекта представлен классом, импорт - связью. Импорт,
+    не совпадающий ни с одним модулем проекта, представлен отдельным классом.
+
+    Yields:
+        Строки диаграммы
+    """
+    dependencies: Dict[str, List[str]] = report.get('dependency_graph', {})
+    yield 'classDiagram\n'
+
+    classes: Dict[str, str] = {}
+    by_file_name: Dict[str, str] = {}
+    for path in dependencies:
+        module_name = _module_name(path)
+        classes[path] = _mermaid_name(module_name)
+        by_file_name.setdefault(module_name, classes[path])
+
+        methods = ['+process()']
+        if 'manager' in module_name.lower():
+            methods.append('+manage(options)')
+        if 'helper' in module_name.lower():
+            methods.append('+provide_assistance()')
+        yield f'    class {classes[path]} {{\n'
+        for method in methods:
+            yield f'        {method}\n'
+        yield '    }\n'
+
+    yield '\n    %% Relationships between classes\n'
+    relationships_found = False
+    for path, targets in dependencies.items():
+        source = classes[path]
+        for dependency in targets:
+            target = classes.get(dependency) or by_file_name.get(dependency)
+            if target is None:
+                target = _mermaid_name(dependency)
+                classes[dependency] = target
+                yield f'    class {target} {{\n        +process()\n    }}\n'
+            yield f'    {source} --> {target}\n'
+            relationships_found = True
+
+    if not relationships_found:
+        yield '    %% No relationships found between classes\n'
+
+
+_SVG_COLORS = {'internal': '#4c8cd8', 'stdlib': '#9aa5b1', 'third_party': '#f0a15c'}
+
+
+def iter_svg(report: Dict[str, Any]) -> Iterator[str]:
+    """
+    Формирует SVG-изображение графа зависимостей.
+
+    Используется сжатое представление графа с кластерами пакетов и
+    раскладкой, вычисленной на сервере (см. build_graph_view).
+
+    Yields:
+        Части SVG-документа
+    """
+    view = build_graph_view(DependencyGraph.from_dict(report['module_graph']))
+    nodes = {node['id']: node for node in view['nodes']}
+    margin = 60
+    if nodes:
+        min_x = min(node['x'] for node in nodes.values()) - margin
+        min_y = min(node['y'] for node in nodes.values()) - margin
+        width = max(node['x'] for node in nodes.values()) - min_x + margin + 160
+        height = max(node['y'] for node in nodes.values()) - min_y + margin
+    else:
+        min_x = min_y = 0
+        width = height = 2 * margin
+
+    yield ('<?xml version="1.0" encoding="UTF-8"?>\n'
+           f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+           f'viewBox="{min_x:.0f} {min_y:.0f} {width:.0f} {height:.0f}">\n'
+           '<defs><marker id="arrowhead" viewBox="0 -5 10 10" refX="20" refY="0" orient="auto" '
+           'markerWidth="6" markerHeight="6"><path d="M0,-5L10,0L0,5" fill="#999"/></marker></defs>\n'
+           '<style>line { stroke: #999; stroke-opacity: 0.6; } '
+           'circle { stroke: #fff; stroke-width: 1.5px; } '
+           'text { font-size: 12px; font-family: Arial, sans-serif; }</style>\n'
+           '<g class="links">\n')
+
+    for link in view['links']:
+        source, target = nodes[link['source']], nodes[link['target']]
+        yield (f'<line x1="{source["x"]:.1f}" y1="{source["y"]:.1f}" x2="{target["x"]:.1f}" '
+               f'y2="{target["y"]:.1f}" stroke-width="{min(1 + link["weight"] / 2, 6):.1f}" '
+               'marker-end="url(#arrowhead)"/>\n')
+
+    yield '</g>\n<g class="nodes">\n'
+    for node in nodes.values():
+        radius = 6 + min(18, node['size'] ** 0.5 * 2) if node['cluster'] else 6
+        label = f'{node["label"]} ({node["size"]})' if node['cluster'] else node['label']
+        yield (f'<g transform="translate({node["x"]:.1f},{node["y"]:.1f})">'
+               f'<title>{html.escape(node["id"])}</title>'
+               f'<circle r="{radius:.1f}" fill="{_SVG_COLORS.get(node["kind"], "#999")}"/>'
+               f'<text x="{radius + 3:.1f}" y="4">{html.escape(label)}</text></g>\n')
+    yield '</g>\n</svg>\n'
+
+
+# Формат экспорта -> (генератор, расширение файла, MIME-тип)
+EXPORT_FORMATS: Dict[str, tuple] = {
+    'html': (iter_html_report, '.html', 'text/html'),
+    'mermaid': (iter_mermaid, '.mermaid', 'text/plain'),
+    'svg': (iter_svg, '.svg', 'image/svg+xml'),
+}
+
+
+def get_exporter(export_format: str) -> Callable[[Dict[str, Any]], Iterator[str]]:
+    """
+    Возвращает генератор экспорта для формата.
+
+    Raises:
+        ValueError: Если формат не поддерживается
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f'Unsupported export format: {export_format}')
+    return EXPORT_FORMATS[export_format][0]
@@ -0,0 +1,293 @@
+# analyzer/git_diff.py
+import fnmatch
+import subprocess
+from typing import AbstractSet, Dict, List, Any, Iterable, Optional, Set, Tuple
+
+from .core import _analyze_source
+from .dependency_graph import ModuleIndex
+from .discovery import DEFAULT_EXCLUDE_DIRS, DEFAULT_EXCLUDE_NON_PACKAGE_DIRS
+
+
+class GitError(Exception):
+    """Ошибка выполнения команды git"""
+
+
+class GitRepository:
+    """
+    Доступ к объектам локального git-репозитория через командную строку git.
+
+    Содержимое файлов читается из объектов репозитория одним процессом
+    git cat-file --batch, без переключения рабочей копии.
+    """
+
+    def __init__(self, repo_path: str):
+        """
+        Args:
+            repo_path: Путь к рабочей копии или к bare-репозиторию
+        """
+        self.repo_path = repo_path
+
+    def _run(self, *args: str) -> bytes:
+        try:
+            result = subprocess.run(['git', '-C', self.repo_path, *args],
+                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        except FileNotFoundError:
+            raise GitError('git executable not found')
+        except subprocess.CalledProcessError as e:
+            raise GitError(e.stderr.decode('utf-8', 'replace').strip() or f'git {args[0]} failed')
+        return result.stdout
+
+    def resolve(self, revision: str) -> str:
+        """Возвращает хеш коммита для ревизии (ветки, тега, HEAD~1 и т.п.)"""
+        try:
+            return self._run('rev-parse', '--verify', '--quiet', f'{revision}^{{commit}}').decode('ascii').strip()
+        except GitError:
+            raise GitError(f'Unknown revision: {revision}')
+
+    def list_files(self, revision: str) -> List[str]:
+        """Возвращает пути всех файлов ревизии"""
+        output = self._run('ls-tree', '-r', '-z', '--name-only', revision)
+        return [path.decode('utf-8', 'surrogateescape') for path in output.split(b'\0') if path]
+
+    def changed_files(self, base: str, head: str) -> List[Tuple[str, str]]:
+        """
+        Возвращает файлы, измененные между ревизиями.
+
+        Переименования представлены удалением и добавлением.
+
+        Returns:
+            Список пар (статус A/M/D, путь)
+        """
+        output = self._run('diff', '--name-status', '-z', '--no-renames', base, head)
+        parts = [part.decode('utf-8', 'surrogateescape') for part in output.split(b'\0') if part]
+        return [(parts[i][0], parts[i + 1]) for i in range(0, len(parts) - 1, 2)]
+
+    def read_files(self, revision: str, paths: Iterable[str]) -> Dict[str, Optional[bytes]]:
+        """
+        Читает содержимое файлов ревизии из объектов git.
+
+        Returns:
+            Словарь {путь: содержимое или None, если файла нет в ревизии}
+        """
+        paths = list(paths)
+        if not paths:
+            return {}
+
+        request = ''.join(f'{revision}:{path}\n' for path in paths).encode('utf-8', 'surrogateescape')
+        try:
+            result = subprocess.run(['git', '-C', self.repo_path, 'cat-file', '--batch'],
+                                    input=request, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        except FileNotFoundError:
+            raise GitError('git executable not found')
+        except subprocess.CalledProcessError as e:
+            raise GitError(e.stderr.decode('utf-8', 'replace').strip() or 'git cat-file failed')
+
+        output = result.stdout
+        contents: Dict[str, Optional[bytes]] = {}
+        position = 0
+        for path in paths:
+            header_end = output.index(b'\n', position)
+            header = output[position:header_end].split()
+            position = header_end + 1
+            if len(header) != 3 or header[1] != b'blob':
+                contents[path] = None
+                continue
+
+            size = int(header[2])
+            contents[path] = output[position:position + size]
+            # После содержимого объекта git выводит перевод строки
+            position += size + 1
+
+        return contents
+
+
+def _is_source_path(path: str, include: Tuple[str, ...], exclude_dirs: Tuple[str, ...],
+                    non_package_dirs: Tuple[str, ...] = (), packages: AbstractSet[str] = frozenset()) -> bool:
+    parts = path.split('/')
+    if not any(fnmatch.fnmatchcase(path if '/' in p else parts[-1], p) for p in include):
+        return False
+    for i, part in enumerate(parts[:-1]):
+        if any(fnmatch.fnmatchcase(part, pattern) for pattern in exclude_dirs):
+            return False
+        if any(fnmatch.fnmatchcase(part, pattern) for pattern in non_package_dirs) \
+                and '/'.join(parts[:i + 1]) not in packages:
+            return False
+    return True
+
+
+def _packages(paths: Iterable[str]) -> Set[str]:
+    """Возвращает директории с __init__.py"""
+    return {path[:-len('/__init__.py')] for path in paths if path.endswith('/__init__.py')}
+
+
+def _function_complexities(module_info: Dict[str, Any]) -> Dict[Tuple[Optional[str], str, int], Dict[str, Any]]:
+    """
+    Сопоставляет функции модуля ключам (класс, имя, номер повторного определения).
+
+    Номер различает функции с одинаковым именем в одной области.
+    """
+    result: Dict[Tuple[Optional[str], str, int], Dict[str, Any]] = {}
+
+    def add(class_name: Optional[str], func: Dict[str, Any]) -> None:
+        occurrence = 0
+        while (class_name, func['name'], occurrence) in result:
+            occurrence += 1
+        result[(class_name, func['name'], occurrence)] = func
+
+    for func in module_info.get('functions', ()):
+        add(None, func)
+    for cls in module_info.get('classes', ()):
+        for method in cls.get('methods', ()):
+            add(cls['name'], method)
+    return result
+
+
+def _edges(index: ModuleIndex, path: str, module_info: Optional[Dict[str, Any]]) -> Set[Tuple[str, str, str]]:
+    if not module_info:
+        return set()
+    edges = set()
+    for record in module_info.get('import_records', ()):
+        target, kind = index.resolve(path, record)
+        if target != path:
+            edges.add((path, target, kind))
+    return edges
+
+
+def _function_entry(module: str, key: Tuple[Optional[str], str, int], func: Dict[str, Any]) -> Dict[str, Any]:
+    entry = {'name': key[1], 'module': module, 'line': func['line'], 'complexity': func.get('complexity', 0)}
+    if key[0] is not None:
+        entry['class'] = key[0]
+    return entry
+
+
+def diff_revisions(repo_path: str, base: str, head: str = 'HEAD',
+                   include: Iterable[str] = ('*.py',),
+                   exclude_dirs: Iterable[str] = DEFAULT_EXCLUDE_DIRS,
+                   exclude_non_package_dirs: Iterable[str] = DEFAULT_EXCLUDE_NON_PACKAGE_DIRS) -> Dict[str, Any]:
+    """
+    Анализирует только файлы, измененные между двумя ревизиями git.
+
+    Содержимое файлов читается из объектов git. Зависимости измененных
+    модулей разрешаются по списку модулей соответствующей ревизии;
+    ребра неизмененных модулей не пересчитываются.
+
+    Args:
+        repo_path: Путь к git-репозиторию
+        base: Базовая ревизия
+        head: Сравниваемая ревизия
+        include: Шаблоны анализируемых файлов
+        exclude_dirs: Шаблоны имен директорий, файлы в которых пропускаются
+        exclude_non_package_dirs: Шаблоны имен директорий, файлы в которых
+            пропускаются, если директория не пакет (в ней нет __init__.py)
+
+    Returns:
+        Отчет об изменениях: добавленные, удаленные и измененные модули,
+        функции с изменившейся сложностью, добавленные и удаленные
+        зависимости, синтаксические ошибки в новой ревизии
+
+    Raises:
+        GitError: Если ревизия не найдена или git завершился с ошибкой
+    """
+    include = tuple(include)
+    exclude_dirs = tuple(exclude_dirs)
+    non_package_dirs = tuple(exclude_non_package_dirs)
+    repo = GitRepository(repo_path)
+    base_sha = repo.resolve(base)
+    head_sha = repo.resolve(head)
+    base_files = repo.list_files(base_sha)
+    head_files = repo.list_files(head_sha)
+    base_packages = _packages(base_files)
+    head_packages = _packages(head_files)
+
+    changes = [
+        (status, path) for status, path in repo.changed_files(base_sha, head_sha)
+        if _is_source_path(path, include, exclude_dirs, non_package_dirs, base_packages | head_packages)
+    ]
+    base_paths = [path for status, path in changes if status != 'A']
+    head_paths = [path for status, path in changes if status != 'D']
+
+    base_blobs = repo.read_files(base_sha, base_paths)
+    head_blobs = repo.read_files(head_sha, head_paths)
+
+    def analyze(blobs: Dict[str, Optional[bytes]], path: str) -> Optional[Dict[str, Any]]:
+        content = blobs.get(path)
+        if content is None:
+            return None
+        return _analyze_source(content.decode('utf-8', 'replace'), path)
+
+    # Индексы модулей нужны только для разрешения импортов измененных файлов
+    base_index = ModuleIndex(p for p in base_files
+                             if _is_source_path(p, include, exclude_dirs, non_package_dirs, base_packages))
+    head_index = ModuleIndex(p for p in head_files
+                             if _is_source_path(p, include, exclude_dirs, non_package_dirs, head_packages))
+
+    report: Dict[str, Any] = {
+        'base': base_sha,
+        'head': head_sha,
+        'files_changed': len(changes),
+        'modules_added': [],
+        'modules_removed': [],
+        'modules_modified': [],
+        'functions': {
+            'complexity_increased': [],
+            'complexity_decreased': [],
+            'added': [],
+            'removed': []
+        },
+        'dependencies': {'added': [], 'removed': []},
+        'errors': []
+    }
+    functions = report['functions']
+    added_edges: Set[Tuple[str, str, str]] = set()
+    removed_edges: Set[Tuple[str, str, str]] = set()
+
+    for status, path in changes:
+        before = analyze(base_blobs, path)
+        after = analyze(head_blobs, path)
+
+        if before is None:
+            report['modules_added'].append(path)
+        elif after is None:
+            report['modules_removed'].append(path)
+        else:
+            report['modules_modified'].append(path)
+
+        if after is not None and 'error' in after:
+            report['errors'].append({'path': path, 'error': after['error']})
+            # Модуль с ошибкой нельзя сравнить: изменения функций и зависимостей неизвестны
+            continue
+        if before is not None and 'error' in before:
+            before = None
+
+        before_functions = _function_complexities(before) if before else {}
+        after_functions = _function_complexities(after) if after else {}
+
+        for key, func in after_functions.items():
+            old = before_functions.get(key)
+            if old is None:
+                functions['added'].append(_function_entry(path, key, func))
+                continue
+            delta = func.get('complexity', 0) - old.get('complexity', 0)
+            if delta:
+                entry = _function_entry(path, key, func)
+                entry['base_complexity'] = old.get('complexity', 0)
+                entry['delta'] = delta
+                functions['complexity_increased' if delta > 0 else 'complexity_decreased'].append(entry)
+
+        for key, func in before_functions.items():
+            if key not in after_functions:
+                functions['removed'].append(_function_entry(path, key, func))
+
+        old_edges = _edges(base_index, path, before)
+        new_edges = _edges(head_index, path, after)
+        added_edges |= new_edges - old_edges
+        removed_edges |= old_edges - new_edges
+
+    functions['complexity_increased'].sort(key=lambda f: f['delta'], reverse=True)
+    functions['complexity_decreased'].sort(key=lambda f: f['delta'])
+    report['dependencies'] = {
+        'added': [{'source': s, 'target': t, 'kind': k} for s, t, k in sorted(added_edges)],
+        'removed': [{'source': s, 'target': t, 'kind': k} for s, t, k in sorted(removed_edges)]
+    }
+    return report
+
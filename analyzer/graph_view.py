@@ -0,0 +1,187 @@
+# analyzer/graph_view.py
+"""
+Сжатое представление графа зависимостей для отображения больших проектов.
+
+Модули проекта объединяются в кластеры по пакетам, внешние зависимости
+можно скрыть по виду, а число ребер узла ограничить. Координаты узлов
+вычисляются на сервере послойной раскладкой за линейное время, поэтому
+клиенту не нужно моделировать силы для тысяч узлов.
+"""
+import os
+from collections import defaultdict
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from .dependency_graph import DependencyGraph, KIND_INTERNAL, KINDS
+
+# Расстояние между столбцами и между узлами в столбце
+COLUMN_SPACING = 220
+ROW_SPACING = 36
+# Сколько узлов слоя размещается в одном столбце
+COLUMN_SIZE = 40
+
+
+def cluster_of(path: str, expanded: Iterable[str] = ()) -> str:
+    """
+    Возвращает узел представления для модуля проекта.
+
+    Модуль попадает в кластер своего пакета верхнего уровня
+    ('pkg/sub/mod.py' -> 'pkg/'); если кластер раскрыт - в кластер
+    следующего уровня ('pkg/sub/'), и так далее до самого модуля.
+    """
+    parts = path.split(os.sep)
+    prefix = ''
+    for part in parts[:-1]:
+        prefix = f'{prefix}{part}{os.sep}'
+        if prefix not in expanded:
+            return prefix
+    return path
+
+
+def _label(node: str) -> str:
+    if node.endswith(os.sep):
+        return node.rstrip(os.sep).rsplit(os.sep, 1)[-1] + os.sep
+    return node.rsplit(os.sep, 1)[-1]
+
+
+def _cap_edges(weights: Dict[Tuple[int, int], int], max_degree: Optional[int]) -> Dict[Tuple[int, int], int]:
+    """Оставляет у каждого узла не более max_degree самых тяжелых исходящих ребер"""
+    if max_degree is None:
+        return weights
+
+    by_source: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+    for (source, target), weight in weights.items():
+        by_source[source].append((weight, target))
+
+    capped = {}
+    for source, edges in by_source.items():
+        edges.sort(key=lambda edge: (-edge[0], edge[1]))
+        for weight, target in edges[:max_degree]:
+            capped[(source, target)] = weight
+    return capped
+
+
+def _layout(view: DependencyGraph) -> List[Tuple[float, float]]:
+    """
+    Размещает узлы послойно: зависимости левее зависимых модулей.
+
+    Порядок узлов в слое выбирается по среднему положению их зависимостей,
+    что уменьшает число пересечений ребер. Большие слои разбиваются на
+    несколько столбцов.
+    """
+    positions: List[Tuple[float, float]] = [(0.0, 0.0)] * len(view.nodes)
+    order_key = [0.0] * len(view.nodes)
+    column = 0
+
+    for layer in view.topological_layers(internal_only=False):
+        ids = [view.index[node] for node in layer]
+
+        def barycenter(node_id: int) -> Tuple[float, int, str]:
+            targets = view.successors(node_id)
+            if not targets:
+                return (0.0, view.kinds[node_id], view.nodes[node_id])
+            return (sum(order_key[t] for t in targets) / len(targets), view.kinds[node_id], view.nodes[node_id])
+
+        ids.sort(key=barycenter)
+        columns = (len(ids) + COLUMN_SIZE - 1) // COLUMN_SIZE
+        rows = (len(ids) + columns - 1) // columns
+        for position, node_id in enumerate(ids):
+            col, row = divmod(position, rows)
+            y = (row - (rows - 1) / 2) * ROW_SPACING
+            # Соседние столбцы слоя смещены на полстроки, чтобы ребра не совпадали
+            positions[node_id] = ((column + col) * COLUMN_SPACING, y + (col % 2) * ROW_SPACING / 2)
+            order_key[node_id] = position / max(1, len(ids) - 1)
+        column += columns
+
+    return positions
+
+
+def build_graph_view(graph: DependencyGraph, expanded: Iterable[str] = (),
+                     hide_kinds: Iterable[str] = (), max_degree: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Строит сжатое представление графа с координатами узлов.
+
+    Args:
+        graph: Граф зависимостей проекта
+        expanded: Раскрытые кластеры (пути пакетов с разделителем в конце)
+        hide_kinds: Скрываемые виды узлов ('stdlib', 'third_party')
+        max_degree: Максимальное число исходящих ребер узла представления
+
+    Returns:
+        Словарь с узлами (id, label, kind, cluster, size, x, y, in_degree,
+        out_degree), ребрами (source, target, weight) и числом скрытых
+        узлов и ребер
+    """
+    expanded = set(expanded)
+    hidden = {KINDS.index(kind) for kind in hide_kinds if kind in KINDS and kind != KIND_INTERNAL}
+
+    view_index: Dict[str, int] = {}
+    view_nodes: List[str] = []
+    view_kinds: List[int] = []
+    sizes: List[int] = []
+    node_view = [-1] * len(graph.nodes)
+
+    for node_id, node in enumerate(graph.nodes):
+        kind = graph.kinds[node_id]
+        if kind in hidden:
+            continue
+        key = cluster_of(node, expanded) if kind == 0 else node
+        view_id = view_index.get(key)
+        if view_id is None:
+            view_id = view_index[key] = len(view_nodes)
+            view_nodes.append(key)
+            view_kinds.append(kind)
+            sizes.append(0)
+        sizes[view_id] += 1
+        node_view[node_id] = view_id
+
+    weights: Dict[Tuple[int, int], int] = defaultdict(int)
+    for node_id, view_id in enumerate(node_view):
+        if view_id < 0:
+            continue
+        for target in graph.successors(node_id):
+            target_view = node_view[target]
+            if target_view >= 0 and target_view != view_id:
+                weights[(view_id, target_view)] += 1
+
+    edges = _cap_edges(weights, max_degree)
+    ordered = sorted(edges)
+
+    offsets = [0] * (len(view_nodes) + 1)
+    for source, _ in ordered:
+        offsets[source + 1] += 1
+    for i in range(len(view_nodes)):
+        offsets[i + 1] += offsets[i]
+    view = DependencyGraph(view_nodes, view_kinds, offsets, [target for _, target in ordered])
+    positions = _layout(view)
+
+    in_degree = [0] * len(view_nodes)
+    for _, target in ordered:
+        in_degree[target] += 1
+
+    nodes = []
+    for view_id, node in enumerate(view_nodes):
+        x, y = positions[view_id]
+        nodes.append({
+            'id': node,
+            'label': _label(node),
+            'kind': KINDS[view_kinds[view_id]],
+            'cluster': node.endswith(os.sep),
+            'size': sizes[view_id],
+            'x': x,
+            'y': y,
+            'in_degree': in_degree[view_id],
+            'out_degree': offsets[view_id + 1] - offsets[view_id]
+        })
+
+    return {
+        'nodes': nodes,
+        'links': [
+            {'source': view_nodes[source], 'target': view_nodes[target], 'weight': edges[(source, target)]}
+            for source, target in ordered
+        ],
+        'expanded': sorted(expanded),
+        'total_nodes': len(graph.nodes),
+        'total_links': len(graph.targets),
+        'hidden_nodes': sum(1 for view_id in node_view if view_id < 0),
+        'hidden_links': len(weights) - len(edges)
+    }
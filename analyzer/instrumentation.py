@@ -0,0 +1,181 @@
+# analyzer/instrumentation.py
+"""
+Необязательные замеры анализа: время этапов, самые медленные файлы,
+объем прочитанных данных и ошибки разбора.
+
+Выключенный экземпляр (Instrumentation(enabled=False)) не вызывает
+таймеры: этапы оборачиваются общим пустым контекстным менеджером, а
+воркеры не замеряют файлы, поэтому стоимость выключенных замеров - одна
+проверка флага на этап и на файл.
+"""
+import cProfile
+import heapq
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Any, ContextManager, Iterator, Optional, TextIO, Tuple
+
+DEFAULT_SLOWEST_FILES = 10
+# Сколько путей файлов с ошибками хранить в отчете
+MAX_FAILED_FILES = 20
+
+# Этапы анализа одного файла, замеряемые в воркерах
+FILE_PHASES = ('read', 'parse', 'visit')
+
+# (прочитано байт, время чтения, разбора и обхода AST, с)
+FileTimings = Tuple[int, float, float, float]
+
+_NULL_CONTEXT = nullcontext()
+
+
+class Instrumentation:
+    """Накопитель замеров анализа одного или нескольких запусков"""
+
+    def __init__(self, enabled: bool = True, slowest: int = DEFAULT_SLOWEST_FILES):
+        """
+        Args:
+            enabled: Включены ли замеры
+            slowest: Сколько самых медленных файлов хранить
+        """
+        self.enabled = enabled
+        self.slowest = slowest
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Сбрасывает накопленные замеры"""
+        # {этап: [суммарное время, с; количество]}
+        self.phases: Dict[str, List[float]] = {}
+        self.files = 0
+        self.bytes_read = 0
+        self.parse_failures = 0
+        self.read_errors = 0
+        self.failed_files: List[str] = []
+        # Минимальная куча (время, путь, байт) самых медленных файлов
+        self._slowest: List[Tuple[float, str, int]] = []
+
+    def phase(self, name: str) -> ContextManager:
+        """Контекстный менеджер, замеряющий время этапа"""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - start)
+
+    def add_phase(self, name: str, seconds: float, count: int = 1) -> None:
+        with self._lock:
+            totals = self.phases.setdefault(name, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += count
+
+    def record_file(self, rel_path: str, timings: Optional[FileTimings], error: Optional[str] = None) -> None:
+        """
+        Учитывает анализ одного файла.
+
+        Args:
+            rel_path: Относительный путь файла
+            timings: Замеры файла из _analyze_path (None - файл не замерялся)
+            error: 'parse' при синтаксической ошибке, 'read' при ошибке чтения
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.files += 1
+            if error is not None:
+                if error == 'parse':
+                    self.parse_failures += 1
+                else:
+                    self.read_errors += 1
+                if len(self.failed_files) < MAX_FAILED_FILES:
+                    self.failed_files.append(rel_path)
+            if timings is None:
+                return
+
+            size, *seconds = timings
+            self.bytes_read += size
+            for name, value in zip(FILE_PHASES, seconds):
+                totals = self.phases.setdefault(name, [0.0, 0])
+                totals[0] += value
+                totals[1] += 1
+
+            entry = (sum(seconds), rel_path, size)
+            if len(self._slowest) < self.slowest:
+                heapq.heappush(self._slowest, entry)
+            elif self.slowest:
+                heapq.heappushpop(self._slowest, entry)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Возвращает замеры для раздела timings отчета.
+
+        Время этапов чтения, разбора и обхода файлов суммируется по всем
+        воркерам, поэтому при анализе в нескольких процессах оно может
+        превышать время этапа analyze.
+        """
+        with self._lock:
+            return {
+                'phases': {
+                    name: {'seconds': round(seconds, 6), 'count': int(count)}
+                    for name, (seconds, count) in self.phases.items()
+                },
+                'files': self.files,
+                'bytes_read': self.bytes_read,
+                'parse_failures': self.parse_failures,
+                'read_errors': self.read_errors,
+                'failed_files': list(self.failed_files),
+                'slowest_files': [
+                    {'path': path, 'seconds': round(seconds, 6), 'bytes': size}
+                    for seconds, path, size in sorted(self._slowest, reverse=True)
+                ]
+            }
+
+
+@contextmanager
+def profiled(output: Optional[str] = None, limit: int = 25, stream: TextIO = sys.stderr) -> Iterator[None]:
+    """
+    Профилирует блок с помощью cProfile и tracemalloc.
+
+    После выхода из блока в stream выводятся функции с наибольшим
+    суммарным временем и места, где выделено больше всего памяти.
+    Профилируется только текущий процесс: при анализе в нескольких
+    процессах время воркеров видно лишь как ожидание результатов.
+
+    Args:
+        output: Файл для сохранения статистики cProfile (pstats, например
+            для snakeviz); None - только вывод в stream
+        limit: Сколько строк выводить в каждом разделе
+        stream: Поток вывода сводки
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        if not tracing:
+            tracemalloc.stop()
+
+        if output:
+            profiler.dump_stats(output)
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(limit)
+        print(text.getvalue(), file=stream)
+
+        print(f'Peak traced memory: {peak / 1024 / 1024:.1f} MB', file=stream)
+        for stat in snapshot.statistics('lineno')[:limit]:
+            print(f'  {stat}', file=stream)
@@ -0,0 +1,400 @@
+# analyzer/metrics.py
+"""
+Метрики кода, вычисляемые за один обход AST.
+
+Метрика - подключаемый объект с обработчиками узлов нужных типов.
+ModuleVisitor вызывает обработчики во время обхода дерева, а при выходе
+из функции или модуля метрика добавляет свои значения в результат.
+Новая метрика добавляется в набор MetricSet без изменения обхода.
+"""
+import ast
+import math
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+# Узлы, появившиеся в новых версиях Python: match (3.10) и except* (3.11)
+_MATCH_NODES = (ast.Match,) if hasattr(ast, 'Match') else ()
+_CASE_NODES = (ast.match_case,) if hasattr(ast, 'match_case') else ()
+_TRY_NODES = (ast.Try,) + ((ast.TryStar,) if hasattr(ast, 'TryStar') else ())
+
+# Узлы, тело которых увеличивает уровень вложенности
+NESTING_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.ExceptHandler) + _MATCH_NODES
+
+
+def is_elif(node: ast.If) -> bool:
+    """Проверяет, что ветка else условия - это elif, а не вложенный if"""
+    return (len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If)
+            and node.orelse[0].col_offset == node.col_offset)
+
+
+class SourceLines:
+    """
+    Классификация строк исходного кода.
+
+    Хранит префиксные суммы строк кода и комментариев, поэтому число
+    строк любого диапазона (функции или модуля) вычисляется за O(1).
+    Строка комментария - строка, первый непробельный символ которой '#'.
+    """
+
+    __slots__ = ('code', 'comments')
+
+    def __init__(self, lines: Iterable[str]):
+        code = [0]
+        comments = [0]
+        code_count = comment_count = 0
+        for line in lines:
+            stripped = line.lstrip()
+            if stripped:
+                if stripped[0] == '#':
+                    comment_count += 1
+                else:
+                    code_count += 1
+            code.append(code_count)
+            comments.append(comment_count)
+        self.code = code
+        self.comments = comments
+
+    def __len__(self) -> int:
+        return len(self.code) - 1
+
+    def count(self, first: int, last: int) -> Tuple[int, int, int]:
+        """
+        Возвращает число строк кода, комментариев и пустых строк диапазона.
+
+        Args:
+            first: Номер первой строки (с 1)
+            last: Номер последней строки включительно
+        """
+        first = max(first, 1)
+        last = min(last, len(self))
+        if last < first:
+            return 0, 0, 0
+        code = self.code[last] - self.code[first - 1]
+        comments = self.comments[last] - self.comments[first - 1]
+        return code, comments, last - first + 1 - code - comments
+
+
+class Scope:
+    """Область вычисления метрик: функция или модуль"""
+
+    __slots__ = ('name', 'first_line', 'last_line', 'lines', 'nesting', 'state')
+
+    def __init__(self, name: Optional[str], first_line: int, last_line: int, lines: Optional[SourceLines]):
+        self.name = name
+        self.first_line = first_line
+        self.last_line = last_line
+        self.lines = lines
+        # Текущий уровень вложенности управляющих конструкций; ведет ModuleVisitor
+        self.nesting = 0
+        # Промежуточные значения метрик {имя метрики: состояние}
+        self.state: Dict[str, Any] = {}
+
+
+class Metric:
+    """
+    Базовый класс метрики.
+
+    Состояние метрики хранится в области (scope.state[name]), поэтому один
+    объект метрики используется для всех файлов и процессов.
+    """
+
+    name = ''
+    # Типы узлов, для которых вызывается visit; None - все узлы
+    node_types: Optional[Tuple[type, ...]] = ()
+
+    def start(self) -> Any:
+        """Возвращает начальное состояние метрики для новой области"""
+        return 0
+
+    def visit(self, node: ast.AST, scope: Scope) -> None:
+        """Обрабатывает узел области (до обхода его дочерних узлов)"""
+
+    def merge(self, scope: Scope, child: Scope) -> None:
+        """Добавляет к области значения вложенной функции"""
+        scope.state[self.name] += child.state[self.name]
+
+    def finish(self, scope: Scope, values: Dict[str, Any]) -> None:
+        """Добавляет итоговые значения метрики в values"""
+        values[self.name] = scope.state[self.name]
+
+
+class CyclomaticComplexity(Metric):
+    """
+    Цикломатическая сложность по Маккейбу: 1 + число точек ветвления.
+
+    Точки ветвления: if, тернарный оператор, циклы (и их ветка else),
+    except, ветка else у try, assert, каждое for и if в генераторах,
+    каждый case (кроме case _ без условия) и условие case, а также
+    каждый дополнительный операнд and/or.
+    """
+
+    name = 'complexity'
+    node_types = (ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While, ast.ExceptHandler, ast.Assert,
+                  ast.comprehension, ast.BoolOp) + _TRY_NODES + _CASE_NODES
+
+    def visit(self, node: ast.AST, scope: Scope) -> None:
+        if isinstance(node, (ast.If, ast.IfExp, ast.ExceptHandler, ast.Assert)):
+            points = 1
+        elif isinstance(node, (ast.For, ast.AsyncFor, ast.While)):
+            points = 1 + bool(node.orelse)
+        elif isinstance(node, _TRY_NODES):
+            points = int(bool(node.orelse))
+        elif isinstance(node, ast.comprehension):
+            points = 1 + len(node.ifs)
+        elif isinstance(node, ast.BoolOp):
+            points = len(node.values) - 1
+        else:
+            wildcard = isinstance(node.pattern, ast.MatchAs) and node.pattern.pattern is None
+            points = (not wildcard) + (node.guard is not None)
+        scope.state[self.name] += points
+
+    def finish(self, scope: Scope, values: Dict[str, Any]) -> None:
+        values[self.name] = 1 + scope.state[self.name]
+
+
+class CognitiveComplexity(Metric):
+    """
+    Когнитивная сложность (SonarSource).
+
+    Условия, циклы, except, match и тернарный оператор добавляют 1 плюс
+    текущий уровень вложенности; elif, else и каждая последовательность
+    and/or добавляют 1; рекурсивный вызов функции добавляет 1.
+    """
+
+    name = 'cognitive_complexity'
+    node_types = (ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While, ast.ExceptHandler,
+                  ast.BoolOp, ast.Call) + _MATCH_NODES
+
+    def start(self) -> Any:
+        # [сумма, id узлов if, являющихся ветками elif]
+        return [0, set()]
+
+    def visit(self, node: ast.AST, scope: Scope) -> None:
+        state = scope.state[self.name]
+        if isinstance(node, ast.Call):
+            func = node.func
+            if scope.name is not None and isinstance(func, ast.Name) and func.id == scope.name:
+                state[0] += 1
+        elif isinstance(node, ast.BoolOp):
+            state[0] += 1
+        elif isinstance(node, ast.If):
+            if id(node) in state[1]:
+                state[1].discard(id(node))
+                state[0] += 1
+            else:
+                state[0] += 1 + scope.nesting
+            if is_elif(node):
+                state[1].add(id(node.orelse[0]))
+            elif node.orelse:
+                state[0] += 1
+        else:
+            state[0] += 1 + scope.nesting
+            if isinstance(node, (ast.For, ast.AsyncFor, ast.While)) and node.orelse:
+                state[0] += 1
+
+    def merge(self, scope: Scope, child: Scope) -> None:
+        scope.state[self.name][0] += child.state[self.name][0]
+
+    def finish(self, scope: Scope, values: Dict[str, Any]) -> None:
+        values[self.name] = scope.state[self.name][0]
+
+
+class NestingDepth(Metric):
+    """Максимальная глубина вложенности условий, циклов, except и match"""
+
+    name = 'max_nesting'
+    node_types = NESTING_NODES
+
+    def visit(self, node: ast.AST, scope: Scope) -> None:
+        depth = scope.nesting + 1
+        if depth > scope.state[self.name]:
+            scope.state[self.name] = depth
+
+    def merge(self, scope: Scope, child: Scope) -> None:
+        # Глубина вложенной функции отсчитывается от места ее определения
+        scope.state[self.name] = max(scope.state[self.name], scope.nesting + child.state[self.name])
+
+
+class _HalsteadCounts:
+    __slots__ = ('operators', 'operands', 'total_operators', 'total_operands')
+
+    def __init__(self):
+        self.operators = set()
+        self.operands = set()
+        self.total_operators = 0
+        self.total_operands = 0
+
+
+# Узлы-контейнеры и контексты, которые не являются ни операторами, ни операндами
+_HALSTEAD_SKIP = frozenset((
+    ast.Module, ast.Expr, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.arguments,
+    ast.Load, ast.Store, ast.Del, ast.comprehension, ast.withitem
+) + _CASE_NODES)
+
+
+class HalsteadMetrics(Metric):
+    """
+    Метрики Холстеда: объем, трудность и усилия.
+
+    Операнды - имена, атрибуты, аргументы, имена импортов и определений,
+    константы; операторы - остальные узлы AST (знаки операций, вызовы,
+    присваивания, управляющие конструкции), различаемые по типу узла.
+    """
+
+    name = 'halstead'
+    node_types = None
+
+    def start(self) -> Any:
+        return _HalsteadCounts()
+
+    def visit(self, node: ast.AST, scope: Scope) -> None:
+        cls = node.__class__
+        if cls in _HALSTEAD_SKIP:
+            return
+        counts = scope.state['halstead']
+        if cls is ast.Name:
+            operand = node.id
+        elif cls is ast.Constant:
+            value = node.value
+            operand = (value.__class__, value)
+        elif cls is ast.arg:
+            operand = node.arg
+        elif cls is ast.alias:
+            operand = node.name
+        else:
+            counts.operators.add(cls)
+            counts.total_operators += 1
+            if cls is ast.Attribute:
+                operand = node.attr
+            elif cls in (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef):
+                operand = node.name
+            else:
+                return
+        counts.operands.add(operand)
+        counts.total_operands += 1
+
+    def merge(self, scope: Scope, child: Scope) -> None:
+        counts, child_counts = scope.state[self.name], child.state[self.name]
+        counts.operators |= child_counts.operators
+        counts.operands |= child_counts.operands
+        counts.total_operators += child_counts.total_operators
+        counts.total_operands += child_counts.total_operands
+
+    def finish(self, scope: Scope, values: Dict[str, Any]) -> None:
+        counts = scope.state[self.name]
+        distinct_operators, distinct_operands = len(counts.operators), len(counts.operands)
+        vocabulary = distinct_operators + distinct_operands
+        length = counts.total_operators + counts.total_operands
+        volume = length * math.log2(vocabulary) if vocabulary > 1 else 0.0
+        difficulty = (distinct_operators / 2 * counts.total_operands / distinct_operands
+                      if distinct_operands else 0.0)
+        values['halstead_volume'] = round(volume, 2)
+        values['halstead_difficulty'] = round(difficulty, 2)
+        values['halstead_effort'] = round(volume * difficulty, 2)
+
+
+class LineCounts(Metric):
+    """Число строк кода, комментариев и пустых строк области"""
+
+    name = 'lines'
+
+    def start(self) -> Any:
+        return None
+
+    def merge(self, scope: Scope, child: Scope) -> None:
+        pass
+
+    def finish(self, scope: Scope, values: Dict[str, Any]) -> None:
+        if scope.lines is None:
+            return
+        values['sloc'], values['comments'], values['blank'] = scope.lines.count(scope.first_line, scope.last_line)
+
+
+class MaintainabilityIndex(Metric):
+    """
+    Индекс сопровождаемости (0-100) в варианте SEI с учетом комментариев:
+    171 - 5.2 ln V - 0.23 G - 16.2 ln L + 50 sin(sqrt(2.46 C)),
+    где V - объем Холстеда, G - цикломатическая сложность, L - строки
+    кода, C - доля комментариев в радианах. Вычисляется по значениям
+    предыдущих метрик набора.
+    """
+
+    name = 'maintainability_index'
+
+    def start(self) -> Any:
+        return None
+
+    def merge(self, scope: Scope, child: Scope) -> None:
+        pass
+
+    def finish(self, scope: Scope, values: Dict[str, Any]) -> None:
+        volume = values.get('halstead_volume')
+        complexity = values.get('complexity')
+        sloc = values.get('sloc')
+        if volume is None or complexity is None or sloc is None:
+            return
+        if not (volume and sloc):
+            values[self.name] = 100.0
+            return
+        comments = values.get('comments', 0)
+        comment_ratio = comments / (sloc + comments)
+        index = (171 - 5.2 * math.log(volume) - 0.23 * complexity - 16.2 * math.log(sloc)
+                 + 50 * math.sin(math.sqrt(2.46 * math.radians(comment_ratio * 100))))
+        values[self.name] = round(min(max(index * 100 / 171, 0.0), 100.0), 2)
+
+
+class MetricSet:
+    """
+    Набор метрик, вычисляемых ModuleVisitor.
+
+    Метрики завершаются в порядке набора, поэтому метрика может
+    использовать значения предыдущих (как MaintainabilityIndex).
+    """
+
+    def __init__(self, metrics: Iterable[Metric]):
+        self.metrics: Tuple[Metric, ...] = tuple(metrics)
+        self._all_nodes = tuple(metric.visit for metric in self.metrics if metric.node_types is None)
+        self._handlers: Dict[type, Tuple] = {}
+
+    def handlers(self, node_type: type) -> Tuple:
+        """Возвращает обработчики узлов типа node_type"""
+        handlers = self._handlers.get(node_type)
+        if handlers is None:
+            handlers = self._all_nodes + tuple(
+                metric.visit for metric in self.metrics
+                if metric.node_types and issubclass(node_type, metric.node_types)
+            )
+            self._handlers[node_type] = handlers
+        return handlers
+
+    def new_scope(self, name: Optional[str], first_line: int, last_line: int,
+                  lines: Optional[SourceLines]) -> Scope:
+        scope = Scope(name, first_line, last_line, lines)
+        for metric in self.metrics:
+            scope.state[metric.name] = metric.start()
+        return scope
+
+    def merge(self, scope: Scope, child: Scope) -> None:
+        for metric in self.metrics:
+            metric.merge(scope, child)
+
+    def finish(self, scope: Scope) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        for metric in self.metrics:
+            metric.finish(scope, values)
+        return values
+
+
+DEFAULT_METRICS = MetricSet((
+    CyclomaticComplexity(),
+    CognitiveComplexity(),
+    NestingDepth(),
+    HalsteadMetrics(),
+    LineCounts(),
+    MaintainabilityIndex(),
+))
+
+# Метрики функций и модулей, по которым строится сводка проекта (см. aggregates)
+FUNCTION_METRICS: List[str] = ['complexity', 'cognitive_complexity', 'max_nesting', 'sloc',
+                               'halstead_volume', 'maintainability_index']
+MODULE_METRICS: List[str] = ['sloc', 'comments', 'blank', 'complexity', 'cognitive_complexity',
+                             'halstead_volume', 'maintainability_index']
@@ -0,0 +1,224 @@
+# analyzer/model.py
+import sys
+from collections.abc import Mapping
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple
+
+_intern = sys.intern
+
+
+def _intern_optional(value: Optional[str]) -> Optional[str]:
+    return None if value is None else _intern(value)
+
+
+class Record(Mapping):
+    """
+    Компактная запись результата анализа.
+
+    Хранит значения в __slots__ вместо словаря и поддерживает интерфейс
+    неизменяемого словаря только для чтения (record['name'], record.get(...),
+    dict(record)), поэтому код, работающий со словарями результатов,
+    работает и с записями. В JSON запись превращается только при
+    сериализации через json_default.
+    """
+
+    __slots__ = ()
+
+    # Поля записи в порядке ключей JSON
+    _fields: Tuple[str, ...] = ()
+    # Поля, которые не выводятся, если их значение None
+    _optional: frozenset = frozenset()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fields:
+            value = getattr(self, key)
+            if value is not None or key not in self._optional:
+                return value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for field in self._fields:
+            if field not in self._optional or getattr(self, field) is not None:
+                yield field
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.to_dict()!r})'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает запись в виде словаря; вложенные записи не преобразуются"""
+        return {field: getattr(self, field) for field in self}
+
+
+class ImportRecord(Record):
+    """Запись импорта (см. ModuleVisitor.import_records)"""
+
+    __slots__ = ('module', 'name', 'asname', 'level', 'line')
+    _fields = __slots__
+
+    def __init__(self, module: Optional[str], name: Optional[str], asname: Optional[str], level: int, line: int):
+        self.module = _intern_optional(module)
+        self.name = _intern_optional(name)
+        self.asname = _intern_optional(asname)
+        self.level = level
+        self.line = line
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ImportRecord':
+        return cls(data.get('module'), data.get('name'), data.get('asname'), data.get('level') or 0, data['line'])
+
+
+def _intern_metrics(metrics: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Копирует словарь метрик с общими для всех записей ключами"""
+    return None if metrics is None else {_intern(key): value for key, value in metrics.items()}
+
+
+def _names(names: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+    """Преобразует список имен в кортеж общих строк"""
+    return None if names is None else tuple(_intern(name) for name in names)
+
+
+def _calls(calls: Optional[Iterable[Tuple[str, int]]]) -> Optional[Tuple[Tuple[str, int], ...]]:
+    """Преобразует список вызовов [[имя, строка], ...] в кортеж пар"""
+    return None if calls is None else tuple((_intern(name), line) for name, line in calls)
+
+
+class FunctionRecord(Record):
+    """
+    Запись функции или метода.
+
+    calls - вызовы в теле функции: пары (имя вида 'a.b.c', строка первого
+    вызова); refs - ссылки на имена вне вызовов в том же виде (без
+    локальных имен функции; '.имя' - атрибут результата выражения,
+    например 'items[0].save'); decorators - имена декораторов; parent -
+    полное имя объемлющей функции для вложенных функций.
+    size - число узлов AST функции; fingerprint и sketch - нормализованный
+    отпечаток и MinHash-эскиз для поиска дубликатов (см. analyzer.clones),
+    заданы только для достаточно больших функций.
+    """
+
+    __slots__ = ('name', 'line', 'args', 'is_async', 'complexity', 'metrics', 'parent', 'calls',
+                 'refs', 'decorators', 'size', 'fingerprint', 'sketch')
+    _fields = __slots__
+    _optional = frozenset(('metrics', 'parent', 'calls', 'refs', 'decorators', 'size', 'fingerprint', 'sketch'))
+
+    def __init__(self, name: str, line: int, args: Tuple[str, ...], complexity: int,
+                 is_async: bool = False, metrics: Optional[Dict[str, Any]] = None,
+                 parent: Optional[str] = None, calls: Optional[Iterable[Tuple[str, int]]] = None,
+                 size: Optional[int] = None, fingerprint: Optional[str] = None, sketch: Optional[str] = None,
+                 refs: Optional[Iterable[Tuple[str, int]]] = None, decorators: Optional[Iterable[str]] = None):
+        self.name = _intern(name)
+        self.line = line
+        self.args = tuple(_intern(arg) for arg in args)
+        self.is_async = is_async
+        self.complexity = complexity
+        self.metrics = _intern_metrics(metrics)
+        self.parent = _intern_optional(parent)
+        self.calls = _calls(calls)
+        self.refs = _calls(refs)
+        self.decorators = _names(decorators)
+        self.size = size
+        self.fingerprint = fingerprint
+        self.sketch = sketch
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FunctionRecord':
+        return cls(data['name'], data['line'], data.get('args', ()), data.get('complexity', 1),
+                   data.get('is_async', False), data.get('metrics'), data.get('parent'), data.get('calls'),
+                   data.get('size'), data.get('fingerprint'), data.get('sketch'),
+                   data.get('refs'), data.get('decorators'))
+
+
+class ClassRecord(Record):
+    """Запись класса с методами"""
+
+    __slots__ = ('name', 'line', 'bases', 'methods', 'decorators')
+    _fields = __slots__
+    _optional = frozenset(('decorators',))
+
+    def __init__(self, name: str, line: int, methods: Tuple[FunctionRecord, ...], bases: Tuple[str, ...] = (),
+                 decorators: Optional[Iterable[str]] = None):
+        self.name = _intern(name)
+        self.line = line
+        self.bases = tuple(_intern(base) for base in bases)
+        self.methods = methods
+        self.decorators = _names(decorators)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ClassRecord':
+        methods = tuple(FunctionRecord.from_dict(method) for method in data.get('methods', ()))
+        return cls(data['name'], data['line'], methods, data.get('bases', ()), data.get('decorators'))
+
+
+class ModuleRecord(Record):
+    """
+    Запись результата анализа модуля.
+
+    Для модуля с синтаксической ошибкой заполнены только path и error,
+    как в словаре, который возвращает analyze_file. calls - вызовы
+    вне функций (в теле модуля и классов, в декораторах), refs - ссылки
+    на имена вне функций и имена из __all__, main_line - строка блока
+    if __name__ == '__main__'.
+    """
+
+    __slots__ = ('path', 'imports', 'import_records', 'functions', 'classes', 'loc', 'metrics', 'calls',
+                 'refs', 'main_line', 'error')
+    _fields = __slots__
+    _optional = frozenset(('imports', 'import_records', 'functions', 'classes', 'loc', 'metrics', 'calls',
+                           'refs', 'main_line', 'error'))
+
+    def __init__(self, path: str,
+                 imports: Optional[Tuple[str, ...]] = None,
+                 import_records: Optional[Tuple[ImportRecord, ...]] = None,
+                 functions: Optional[Tuple[FunctionRecord, ...]] = None,
+                 classes: Optional[Tuple[ClassRecord, ...]] = None,
+                 loc: Optional[int] = None,
+                 error: Optional[str] = None,
+                 metrics: Optional[Dict[str, Any]] = None,
+                 calls: Optional[Iterable[Tuple[str, int]]] = None,
+                 refs: Optional[Iterable[Tuple[str, int]]] = None,
+                 main_line: Optional[int] = None):
+        self.path = _intern(path)
+        self.imports = None if imports is None else tuple(_intern(name) for name in imports)
+        self.import_records = import_records
+        self.functions = functions
+        self.classes = classes
+        self.loc = loc
+        self.metrics = _intern_metrics(metrics)
+        self.calls = _calls(calls)
+        self.refs = _calls(refs)
+        self.main_line = main_line
+        self.error = error
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ModuleRecord':
+        """Создает запись из словаря analyze_file"""
+        if 'error' in data:
+            return cls(data['path'], error=data['error'])
+
+        return cls(
+            data['path'],
+            imports=data.get('imports', ()),
+            import_records=tuple(ImportRecord.from_dict(record) for record in data.get('import_records', ())),
+            functions=tuple(FunctionRecord.from_dict(func) for func in data.get('functions', ())),
+            classes=tuple(ClassRecord.from_dict(cls_info) for cls_info in data.get('classes', ())),
+            loc=data.get('loc', 0),
+            metrics=data.get('metrics'),
+            calls=data.get('calls'),
+            refs=data.get('refs'),
+            main_line=data.get('main_line')
+        )
+
+
+def json_default(obj: Any) -> Any:
+    """
+    Функция default для json.dump: преобразует записи в словари.
+
+    Преобразование поверхностное - вложенные записи json преобразует
+    тем же вызовом, поэтому полная копия отчета в виде словарей
+    не создается.
+    """
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
@@ -0,0 +1,97 @@
+# analyzer/ranking.py
+import heapq
+from operator import itemgetter
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+# Количество самых сложных функций в отчете по умолчанию
+DEFAULT_TOP_K = 10
+
+_FunctionRef = Tuple[int, str, Optional[str], Dict[str, Any]]
+
+_complexity = itemgetter(0)
+
+
+def iter_function_refs(modules: Dict[str, Dict[str, Any]],
+                       min_complexity: Optional[int] = None) -> Iterator[_FunctionRef]:
+    """
+    Обходит функции и методы проекта без копирования записей модулей.
+
+    Args:
+        modules: Словарь {относительный путь: информация о модуле}
+        min_complexity: Пропускать функции со сложностью ниже порога
+
+    Returns:
+        Итератор кортежей (сложность, модуль, класс или None, запись функции)
+    """
+    for module_path, module_info in modules.items():
+        yield from _iter_module_refs(module_path, module_info, min_complexity)
+
+
+def _iter_module_refs(module_path: str, module_info: Dict[str, Any],
+                      min_complexity: Optional[int]) -> Iterator[_FunctionRef]:
+    for func in module_info.get('functions', ()):
+        complexity = func.get('complexity', 0)
+        if min_complexity is None or complexity >= min_complexity:
+            yield complexity, module_path, None, func
+
+    for cls in module_info.get('classes', ()):
+        for method in cls.get('methods', ()):
+            complexity = method.get('complexity', 0)
+            if min_complexity is None or complexity >= min_complexity:
+                yield complexity, module_path, cls['name'], method
+
+
+def _to_record(ref: _FunctionRef) -> Dict[str, Any]:
+    """Создает запись результата, не изменяя исходную запись функции"""
+    _, module_path, class_name, func = ref
+    record = dict(func, module=module_path)
+    if class_name is not None:
+        record['class'] = class_name
+    return record
+
+
+def top_complex_functions(modules: Dict[str, Dict[str, Any]], k: Optional[int] = DEFAULT_TOP_K,
+                          min_complexity: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Выбирает самые сложные функции проекта за один проход.
+
+    Используется куча размера k, поэтому время O(n log k), а память O(k).
+    Функции с одинаковой сложностью идут в порядке обхода проекта.
+
+    Args:
+        modules: Словарь {относительный путь: информация о модуле}
+        k: Сколько функций вернуть, None - все функции выше порога
+        min_complexity: Минимальная сложность функции
+
+    Returns:
+        Список новых записей функций с ключами module и class (для методов),
+        отсортированный по убыванию сложности
+    """
+    refs = iter_function_refs(modules, min_complexity)
+    if k is None:
+        selected = sorted(refs, key=_complexity, reverse=True)
+    else:
+        selected = heapq.nlargest(k, refs, key=_complexity)
+    return [_to_record(ref) for ref in selected]
+
+
+def top_complex_functions_by_module(modules: Dict[str, Dict[str, Any]], k: int = DEFAULT_TOP_K,
+                                    min_complexity: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Выбирает самые сложные функции каждого модуля.
+
+    Args:
+        modules: Словарь {относительный путь: информация о модуле}
+        k: Сколько функций вернуть для каждого модуля
+        min_complexity: Минимальная сложность функции
+
+    Returns:
+        Словарь {модуль: список записей функций}; модули без подходящих
+        функций не включаются
+    """
+    result = {}
+    for module_path, module_info in modules.items():
+        selected = heapq.nlargest(k, _iter_module_refs(module_path, module_info, min_complexity), key=_complexity)
+        if selected:
+            result[module_path] = [_to_record(ref) for ref in selected]
+    return result
@@ -0,0 +1,187 @@
+# analyzer/report_stream.py
+"""
+Потоковый формат отчета NDJSON: одна JSON-запись на строку.
+
+Первая строка - заголовок, затем по строке на каждый модуль и в конце
+сводка (отчет без модулей). Модули записываются по мере анализа, поэтому
+прерванный анализ оставляет в файле готовые модули, а читатель
+(iter_report) обрабатывает отчет по строке, не загружая его целиком.
+Пиковую память анализа формат не снижает: CodeAnalyzer хранит записи всех
+модулей до конца сканирования, а сводка (метрики, граф модулей и
+дополнительные разделы) сериализуется одной строкой. Файлы можно сжимать
+gzip, bz2 или xz средствами стандартной библиотеки.
+"""
+import bz2
+import gzip
+import io
+import json
+import lzma
+from typing import Dict, Any, Callable, Iterator, Mapping, Optional, Tuple
+
+from .model import json_default
+
+REPORT_FORMAT = 'code-analyzer-ndjson'
+REPORT_FORMAT_VERSION = 1
+
+RECORD_HEADER = 'header'
+RECORD_MODULE = 'module'
+RECORD_SUMMARY = 'summary'
+
+# Сжатие: функция открытия файла и расширение
+COMPRESSIONS: Dict[str, Tuple[Callable[..., Any], str]] = {
+    'none': (open, ''),
+    'gzip': (gzip.open, '.gz'),
+    'bz2': (bz2.open, '.bz2'),
+    'xz': (lzma.open, '.xz'),
+}
+
+
+def detect_compression(path: str) -> str:
+    """Определяет сжатие по расширению файла"""
+    for name, (_, extension) in COMPRESSIONS.items():
+        if extension and path.endswith(extension):
+            return name
+    return 'none'
+
+
+def report_filename(stem: str, compression: str = 'none') -> str:
+    """Возвращает имя файла потокового отчета с расширением для сжатия"""
+    if compression not in COMPRESSIONS:
+        raise ValueError(f'Unknown compression: {compression}')
+    return f'{stem}.ndjson{COMPRESSIONS[compression][1]}'
+
+
+def is_stream_report(path: str) -> bool:
+    """Проверяет, является ли файл потоковым отчетом, по расширению"""
+    extension = COMPRESSIONS[detect_compression(path)][1]
+    return path[:len(path) - len(extension)].endswith('.ndjson')
+
+
+def _open_text(path: str, mode: str, compression: Optional[str]) -> io.TextIOBase:
+    opener = COMPRESSIONS[compression or detect_compression(path)][0]
+    return opener(path, mode + 't', encoding='utf-8', newline='\n')
+
+
+class ReportStreamWriter:
+    """
+    Запись отчета в формате NDJSON по мере получения модулей.
+
+    Пример:
+        with ReportStreamWriter('report.ndjson.gz') as writer:
+            analyzer.scan_project(on_module=writer.write_module)
+            writer.write_summary(analyzer.generate_project_report())
+    """
+
+    def __init__(self, path: str, compression: Optional[str] = None, header: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            path: Путь к файлу отчета
+            compression: 'none', 'gzip', 'bz2' или 'xz'; по умолчанию - по расширению файла
+            header: Дополнительные поля заголовка
+        """
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f'Unknown compression: {compression}')
+
+        self.path = path
+        self.modules_written = 0
+        self._file = _open_text(path, 'w', compression)
+        self._write({'type': RECORD_HEADER, 'format': REPORT_FORMAT,
+                     'version': REPORT_FORMAT_VERSION, **(header or {})})
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, separators=(',', ':'), default=json_default))
+        self._file.write('\n')
+
+    def write_module(self, path: str, module_info: Mapping[str, Any]) -> None:
+        """Записывает результат анализа одного модуля"""
+        self._write({'type': RECORD_MODULE, 'path': path, 'data': module_info})
+        self.modules_written += 1
+
+    def write_summary(self, report: Mapping[str, Any]) -> None:
+        """Записывает сводку отчета; ключ modules пропускается, модули уже записаны построчно"""
+        summary = {key: value for key, value in report.items() if key != 'modules'}
+        self._write({'type': RECORD_SUMMARY, 'data': summary})
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'ReportStreamWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def write_report(path: str, report: Mapping[str, Any], compression: Optional[str] = None) -> None:
+    """
+    Записывает готовый отчет в формате NDJSON.
+
+    Args:
+        path: Путь к файлу отчета
+        report: Отчет generate_project_report
+        compression: Сжатие; по умолчанию - по расширению файла
+    """
+    with ReportStreamWriter(path, compression) as writer:
+        for module_path, module_info in report.get('modules', {}).items():
+            writer.write_module(module_path, module_info)
+        writer.write_summary(report)
+
+
+def iter_report(path: str, compression: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Читает отчет NDJSON построчно.
+
+    Args:
+        path: Путь к файлу отчета
+        compression: Сжатие; по умолчанию - по расширению файла
+
+    Returns:
+        Итератор пар (тип записи, запись). Для модулей запись содержит
+        ключи path и data, для сводки и заголовка - поля записи
+
+    Raises:
+        ValueError: Если файл не является отчетом в формате NDJSON
+    """
+    with _open_text(path, 'r', compression) as f:
+        first = f.readline()
+        try:
+            header = json.loads(first)
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get('format') != REPORT_FORMAT:
+            raise ValueError(f'Not a {REPORT_FORMAT} report: {path}')
+        if header.get('version', 0) > REPORT_FORMAT_VERSION:
+            raise ValueError(f'Unsupported report format version: {header.get("version")}')
+        yield RECORD_HEADER, header
+
+        for line_number, line in enumerate(f, 2):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f'{path}:{line_number}: invalid record: {e}')
+
+            record_type = record.get('type')
+            if record_type == RECORD_SUMMARY:
+                yield record_type, record['data']
+            else:
+                yield record_type, record
+
+
+def read_report(path: str, compression: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Загружает отчет NDJSON целиком в формате generate_project_report.
+
+    Для больших отчетов лучше обрабатывать записи через iter_report.
+    """
+    modules: Dict[str, Any] = {}
+    report: Dict[str, Any] = {}
+    for record_type, record in iter_report(path, compression):
+        if record_type == RECORD_MODULE:
+            modules[record['path']] = record['data']
+        elif record_type == RECORD_SUMMARY:
+            report.update(record)
+
+    report['modules'] = modules
+    return report
@@ -0,0 +1,325 @@
+# analyzer/visitor.py
+import ast
+from typing import Dict, List, Any, Optional, Set
+
+from .metrics import DEFAULT_METRICS, MetricSet, Scope, SourceLines, is_elif
+
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+_SEQUENCE_NODES = (ast.List, ast.Tuple)
+
+
+def dotted_name(node: ast.AST) -> Optional[str]:
+    """
+    Возвращает имя вида 'a.b.c' для цепочки атрибутов от имени.
+
+    Вызов super() в начале цепочки обозначается именем 'super'. Для
+    остальных выражений (вызовов, индексов) возвращается None.
+    """
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+    elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'super':
+        parts.append('super')
+    else:
+        return None
+    return '.'.join(reversed(parts))
+
+
+def _decorator_names(decorators: List[ast.expr]) -> List[str]:
+    """Имена декораторов; для '@app.route(...)' - имя вызываемого 'app.route'"""
+    names = []
+    for decorator in decorators:
+        name = dotted_name(decorator.func if isinstance(decorator, ast.Call) else decorator)
+        if name is not None:
+            names.append(name)
+    return names
+
+
+def _is_main_check(test: ast.expr) -> bool:
+    """Проверяет, что условие - __name__ == '__main__'"""
+    if not (isinstance(test, ast.Compare) and len(test.ops) == 1 and isinstance(test.ops[0], ast.Eq)):
+        return False
+    operands = (test.left, test.comparators[0])
+    return any(isinstance(node, ast.Name) and node.id == '__name__' for node in operands) and \
+        any(isinstance(node, ast.Constant) and node.value == '__main__' for node in operands)
+
+
+class ModuleVisitor(ast.NodeVisitor):
+    """
+    Однопроходный обход AST модуля.
+
+    За один обход дерева собирает импорты, функции (в том числе async),
+    классы с методами и базовыми классами, вызовы и ссылки на имена в
+    каждой функции и метрики кода (см. analyzer.metrics). Метрики
+    вложенных функций добавляются к метрикам объемлющих функций при
+    выходе из них, поэтому каждый узел посещается ровно один раз.
+    """
+
+    def __init__(self, lines: Optional[SourceLines] = None, metrics: MetricSet = DEFAULT_METRICS):
+        """
+        Args:
+            lines: Классификация строк исходного кода для подсчета строк
+                кода и комментариев; без нее эти метрики не вычисляются
+            metrics: Набор вычисляемых метрик
+        """
+        self.imports: List[str] = []
+        # Подробные записи импортов, включая относительные, для разрешения зависимостей
+        self.import_records: List[Dict[str, Any]] = []
+        self.functions: List[Dict[str, Any]] = []
+        self.classes: List[Dict[str, Any]] = []
+        # Метрики модуля целиком; заполняются после обхода ast.Module
+        self.module_metrics: Dict[str, Any] = {}
+        # Вызовы вне функций {имя вызываемого: строка первого вызова}
+        self.module_calls: Dict[str, int] = {}
+        self._calls = self.module_calls
+        # Имена, которые читаются, но не вызываются (передача функций,
+        # базовые классы, атрибуты модулей), и имена из __all__
+        self.module_refs: Dict[str, int] = {}
+        self._refs = self.module_refs
+        # Локальные имена текущей функции: ссылки на них не выходят за ее пределы
+        self._locals: Optional[Set[str]] = None
+        # Строка блока if __name__ == '__main__' или None
+        self.main_line: Optional[int] = None
+        # Узел вызываемого выражения текущего вызова и признак обхода
+        # цепочки атрибутов, имя которой уже записано
+        self._callee: Optional[ast.AST] = None
+        self._in_chain = False
+        # Полное имя функции, которая обходится сейчас (None - уровень модуля)
+        self._qualname: Optional[str] = None
+        self.lines = lines
+        self.metrics = metrics
+        self._scope: Scope = metrics.new_scope(None, 1, len(lines) if lines is not None else 0, lines)
+
+    def visit(self, node: ast.AST) -> Any:
+        self._notify(node)
+        return getattr(self, 'visit_' + node.__class__.__name__, self.generic_visit)(node)
+
+    def _notify(self, node: ast.AST) -> None:
+        """Передает узел обработчикам метрик текущей области"""
+        scope = self._scope
+        for handler in self.metrics.handlers(node.__class__):
+            handler(node, scope)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        # Контексты Load/Store/Del не несут информации для метрик и не обходятся
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        self.visit(item)
+            elif isinstance(value, ast.AST) and not isinstance(value, ast.expr_context):
+                self.visit(value)
+
+    def visit_Constant(self, node: ast.Constant) -> None:
+        pass
+
+    def visit_Module(self, node: ast.Module) -> None:
+        self.generic_visit(node)
+        self.module_metrics = self.metrics.finish(self._scope)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for name in node.names:
+            self.imports.append(name.name)
+            self.import_records.append({
+                'module': name.name,
+                'name': None,
+                'asname': name.asname,
+                'level': 0,
+                'line': node.lineno
+            })
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module:
+            self.imports.append(node.module)
+        for name in node.names:
+            self.import_records.append({
+                'module': node.module,
+                'name': name.name,
+                'asname': name.asname,
+                'level': node.level or 0,
+                'line': node.lineno
+            })
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        class_info = {
+            'name': node.name,
+            'line': node.lineno,
+            'bases': [name for name in map(dotted_name, node.bases) if name is not None],
+            'methods': []
+        }
+        decorators = _decorator_names(node.decorator_list)
+        if decorators:
+            class_info['decorators'] = decorators
+        self.classes.append(class_info)
+
+        for child in node.decorator_list + node.bases + node.keywords:
+            self.visit(child)
+
+        # Методы - только непосредственные функции тела класса
+        for child in node.body:
+            if isinstance(child, _FUNCTION_NODES):
+                self._notify(child)
+                self._visit_function(child, class_info['methods'], f'{node.name}.{child.name}')
+            else:
+                self.visit(child)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        qualname = node.name if self._qualname is None else f'{self._qualname}.{node.name}'
+        self._visit_function(node, self.functions, qualname)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def _visit_function(self, node: ast.FunctionDef, target: List[Dict[str, Any]], qualname: str) -> None:
+        """Собирает информацию о функции и вычисляет ее метрики при обходе тела."""
+        func_info = {
+            'name': node.name,
+            'line': node.lineno,
+            'args': [arg.arg for arg in node.args.args],
+            'is_async': isinstance(node, ast.AsyncFunctionDef),
+            'complexity': 1,
+            'metrics': {}
+        }
+        if self._qualname is not None:
+            # Вложенная функция: полное имя объемлющей функции
+            func_info['parent'] = self._qualname
+        decorators = _decorator_names(node.decorator_list)
+        if decorators:
+            func_info['decorators'] = decorators
+        target.append(func_info)
+
+        # Декораторы вычисляются в объемлющей области
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+
+        parent, outer_calls, outer_qualname = self._scope, self._calls, self._qualname
+        outer_refs, outer_locals = self._refs, self._locals
+        self._scope = self.metrics.new_scope(node.name, node.lineno, node.end_lineno, self.lines)
+        self._calls, self._refs = {}, {}
+        self._qualname = qualname
+        args = node.args
+        self._locals = {arg.arg for arg in args.posonlyargs + args.args + args.kwonlyargs}
+        self._locals.update(arg.arg for arg in (args.vararg, args.kwarg) if arg is not None)
+        self.visit(node.args)
+        if node.returns is not None:
+            self.visit(node.returns)
+        for child in node.body:
+            self.visit(child)
+        scope, calls, refs, local_names = self._scope, self._calls, self._refs, self._locals
+        self._scope, self._calls, self._qualname = parent, outer_calls, outer_qualname
+        self._refs, self._locals = outer_refs, outer_locals
+
+        values = self.metrics.finish(scope)
+        func_info['complexity'] = values.pop('complexity', 1)
+        func_info['metrics'] = values
+        func_info['calls'] = [[name, line] for name, line in calls.items()]
+        # Локальные переменные не ссылаются на определения проекта, а их
+        # атрибуты нужны, чтобы находить используемые методы
+        func_info['refs'] = [[name, line] for name, line in refs.items() if name not in local_names]
+        self.metrics.merge(parent, scope)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        name = dotted_name(node.func)
+        if name is not None and name not in self._calls:
+            self._calls[name] = node.lineno
+        # Имя вызываемого записано как вызов, а не как ссылка
+        self._callee = node.func
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Load):
+            if not self._in_chain and node is not self._callee and node.id not in self._refs:
+                self._refs[node.id] = node.lineno
+        elif self._locals is not None:
+            self._locals.add(node.id)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if self._in_chain or not isinstance(node.ctx, ast.Load):
+            self.generic_visit(node)
+            return
+        name = dotted_name(node)
+        if name is None:
+            # Атрибут результата выражения ('items[0].save'): тип объекта
+            # неизвестен, но имя атрибута указывает на используемый метод
+            name = '.' + node.attr
+            if name not in self._refs:
+                self._refs[name] = node.lineno
+            self.generic_visit(node)
+            return
+        if node is not self._callee and name not in self._refs:
+            self._refs[name] = node.lineno
+        # Части цепочки 'a.b' и 'a' отдельными ссылками не записываются
+        self._in_chain = True
+        self.generic_visit(node)
+        self._in_chain = False
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        if self._qualname is None and any(isinstance(target, ast.Name) and target.id == '__all__'
+                                          for target in node.targets):
+            self._add_exports(node.value)
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        if self._qualname is None and isinstance(node.target, ast.Name) and node.target.id == '__all__':
+            self._add_exports(node.value)
+        self.generic_visit(node)
+
+    def _add_exports(self, value: ast.AST) -> None:
+        """Записывает имена из __all__ как ссылки уровня модуля"""
+        if isinstance(value, _SEQUENCE_NODES):
+            for item in value.elts:
+                if isinstance(item, ast.Constant) and isinstance(item.value, str):
+                    self.module_refs.setdefault(item.value, item.lineno)
+
+    def _visit_nested(self, nodes: List[ast.AST]) -> None:
+        """Обходит узлы на следующем уровне вложенности"""
+        self._scope.nesting += 1
+        for node in nodes:
+            self.visit(node)
+        self._scope.nesting -= 1
+
+    def visit_If(self, node: ast.If) -> None:
+        if self._qualname is None and self.main_line is None and _is_main_check(node.test):
+            self.main_line = node.lineno
+        self.visit(node.test)
+        self._visit_nested(node.body)
+        if is_elif(node):
+            # Цепочка elif остается на уровне исходного if
+            self.visit(node.orelse[0])
+        else:
+            self._visit_nested(node.orelse)
+
+    def visit_For(self, node: ast.For) -> None:
+        self.visit(node.target)
+        self.visit(node.iter)
+        self._visit_nested(node.body)
+        self._visit_nested(node.orelse)
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node: ast.While) -> None:
+        self.visit(node.test)
+        self._visit_nested(node.body)
+        self._visit_nested(node.orelse)
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> None:
+        if node.type is not None:
+            self.visit(node.type)
+        self._visit_nested(node.body)
+
+    def visit_Match(self, node: ast.AST) -> None:
+        self.visit(node.subject)
+        self._visit_nested(node.cases)
+
+    def visit_IfExp(self, node: ast.IfExp) -> None:
+        self.visit(node.test)
+        self._visit_nested([node.body, node.orelse])
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        self.visit(node.args)
+        self._visit_nested([node.body])
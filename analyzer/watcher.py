@@ -0,0 +1,267 @@
+# analyzer/watcher.py
+"""
+Наблюдение за изменениями файлов проекта.
+
+На Linux используется inotify (через ctypes, без внешних зависимостей),
+на остальных системах - периодический опрос времени изменения файлов.
+Оба наблюдателя возвращают изменения пакетами: за одно сохранение файла
+редактор может сгенерировать несколько событий.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Optional, Set, Tuple
+
+from .discovery import FileDiscovery
+
+# Пауза после первого события, в течение которой собираются связанные события, с
+DEFAULT_SETTLE_TIME = 0.02
+# Интервал опроса для PollingWatcher, с
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Изменения: (измененные файлы, измененные директории). Директория ''
+# означает, что нужно пересканировать весь проект
+Changes = Tuple[Set[str], Set[str]]
+
+
+class Watcher:
+    """Базовый класс наблюдателя за файлами проекта"""
+
+    def __init__(self, discovery: FileDiscovery, settle_time: float = DEFAULT_SETTLE_TIME):
+        """
+        Args:
+            discovery: Правила поиска файлов проекта
+            settle_time: Сколько ждать связанных событий после первого изменения, с
+        """
+        self.discovery = discovery
+        self.project_root = discovery.project_root
+        self.settle_time = settle_time
+
+    def poll(self, timeout: Optional[float] = None) -> Changes:
+        """
+        Ожидает изменений не дольше timeout секунд.
+
+        Returns:
+            Пара множеств относительных путей (файлы, директории); пустые
+            множества, если за время ожидания изменений не было
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'Watcher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# Константы из <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+               | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class InotifyWatcher(Watcher):
+    """
+    Наблюдатель на основе inotify.
+
+    Наблюдение устанавливается на каждую директорию проекта, которую обходит
+    FileDiscovery; новые директории добавляются по мере появления. События
+    приходят только для измененных путей, поэтому стоимость не зависит от
+    размера проекта.
+    """
+
+    def __init__(self, discovery: FileDiscovery, settle_time: float = DEFAULT_SETTLE_TIME):
+        super().__init__(discovery, settle_time)
+        self._libc = _load_libc()
+        if self._libc is None:
+            raise OSError('inotify is not available')
+
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        # Дескриптор наблюдения -> относительный путь директории ('/' как разделитель)
+        self._watches: Dict[int, str] = {}
+        for abs_path, rel_path in discovery.iter_directories():
+            self._add_watch(abs_path, rel_path.replace(os.sep, '/'))
+
+    def _add_watch(self, abs_path: str, rel_path: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(abs_path), _WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = rel_path
+
+    def _add_tree(self, rel_dir: str, files: Set[str]) -> None:
+        """Добавляет наблюдение за новой директорией и сообщает о файлах, созданных до его установки"""
+        if self.discovery.is_excluded_dir(rel_dir):
+            return
+        abs_dir = os.path.join(self.project_root, rel_dir)
+        for dir_path, dir_names, file_names in os.walk(abs_dir):
+            rel = os.path.relpath(dir_path, self.project_root).replace(os.sep, '/')
+            dir_names[:] = [name for name in dir_names if not self.discovery.is_excluded_dir(f'{rel}/{name}')]
+            self._add_watch(dir_path, rel)
+            for name in file_names:
+                file_rel = f'{rel}/{name}'
+                if self.discovery.is_candidate(file_rel):
+                    files.add(file_rel)
+
+    def _read_events(self, files: Set[str], dirs: Set[str]) -> None:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + name_len].rstrip(b'\0'))
+            offset += name_len
+
+            if mask & IN_Q_OVERFLOW:
+                # Очередь событий переполнена: изменения неизвестны
+                dirs.add('')
+                continue
+
+            base = self._watches.get(wd)
+            if base is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._watches[wd]
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                continue
+
+            rel_path = f'{base}/{name}' if base else name
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(rel_path, files)
+                dirs.add(rel_path)
+            elif self.discovery.is_candidate(rel_path):
+                files.add(rel_path)
+
+    def poll(self, timeout: Optional[float] = None) -> Changes:
+        files: Set[str] = set()
+        dirs: Set[str] = set()
+
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return files, dirs
+
+        self._read_events(files, dirs)
+        deadline = time.monotonic() + self.settle_time
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if ready:
+                self._read_events(files, dirs)
+
+        return _native_paths(files), _native_paths(dirs)
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher(Watcher):
+    """
+    Наблюдатель, периодически сравнивающий время изменения и размер файлов.
+
+    Каждый опрос обходит весь проект, поэтому используется только там,
+    где inotify недоступен.
+    """
+
+    def __init__(self, discovery: FileDiscovery, settle_time: float = DEFAULT_SETTLE_TIME,
+                 interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Args:
+            discovery: Правила поиска файлов проекта
+            settle_time: Не используется, оставлен для единообразия
+            interval: Интервал между обходами проекта, с
+        """
+        super().__init__(discovery, settle_time)
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+        self._next_scan = time.monotonic() + interval
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for abs_path, rel_path in self.discovery.iter_files():
+            try:
+                st = os.stat(abs_path)
+            except OSError:
+                continue
+            snapshot[rel_path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def poll(self, timeout: Optional[float] = None) -> Changes:
+        wait = max(0.0, self._next_scan - time.monotonic())
+        if timeout is not None and wait > timeout:
+            time.sleep(timeout)
+            return set(), set()
+
+        time.sleep(wait)
+        self._next_scan = time.monotonic() + self.interval
+
+        snapshot = self._take_snapshot()
+        old = self._snapshot
+        self._snapshot = snapshot
+        changed = {path for path, stat in snapshot.items() if old.get(path) != stat}
+        changed.update(old.keys() - snapshot.keys())
+        return changed, set()
+
+
+def _native_paths(paths: Set[str]) -> Set[str]:
+    return paths if os.sep == '/' else {path.replace('/', os.sep) for path in paths}
+
+
+def create_watcher(discovery: FileDiscovery, settle_time: float = DEFAULT_SETTLE_TIME,
+                   poll_interval: float = DEFAULT_POLL_INTERVAL) -> Watcher:
+    """
+    Создает наблюдатель: inotify, если он доступен, иначе - опрос.
+
+    Args:
+        discovery: Правила поиска файлов проекта
+        settle_time: Сколько ждать связанных событий после первого изменения, с
+        poll_interval: Интервал опроса, если inotify недоступен, с
+    """
+    try:
+        return InotifyWatcher(discovery, settle_time)
+    except OSError:
+        return PollingWatcher(discovery, settle_time, poll_interval)
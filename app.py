@@ -1,119 +1,780 @@
 # app.py
 import os
 import json
-
-from typing import Dict, Tuple
-from flask import Flask, render_template, request, jsonify, send_from_directory
-from analyzer.core import CodeAnalyzer
+import hashlib
+import shutil
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from typing import Dict, List, Tuple, Any, Callable, Optional
+from flask import Flask, Response, g, render_template, request, jsonify, send_file, send_from_directory
+from flask.json import JSONEncoder
+from analyzer.cache import AnalysisCache
+from analyzer.call_graph import SymbolIndex
+from analyzer.clones import DEFAULT_SIMILARITY, CloneIndex
+from analyzer.core import CodeAnalyzer, ANALYZER_VERSION
+from analyzer.dead_code import find_dead_code
+from analyzer.dependency_graph import DependencyGraph
+from analyzer.export import EXPORT_FORMATS, get_exporter
+from analyzer.discovery import DEFAULT_EXCLUDE_DIRS, DEFAULT_EXCLUDE_NON_PACKAGE_DIRS, FileDiscovery
+from analyzer.git_diff import GitError, diff_revisions
+from analyzer.graph_view import build_graph_view
+from analyzer.instrumentation import Instrumentation
+from analyzer.model import Record, json_default
+from analyzer.ranking import DEFAULT_TOP_K, top_complex_functions, top_complex_functions_by_module
+from analyzer.report_stream import COMPRESSIONS, report_filename, write_report
+from analyzer.watcher import create_watcher
+from utils.export_cache import ExportCache
 from utils.file_manager import FileManager
+from utils.job_manager import JobManager, JobLimitExceeded
+from utils.live_session import LiveSession, LiveSessionManager, WatchLimitExceeded
+from utils.metrics_history import MetricsHistory
+from utils.report_catalog import ReportCatalog
+from utils.pagination import ReportPaginator, PageRequestError, Collection, MODULES, FUNCTIONS, EDGES
 from utils.project_manager import ProjectManager
+from utils.prometheus import CONTENT_TYPE as PROMETHEUS_CONTENT_TYPE, COUNTER, PrometheusRegistry
+from utils.result_store import create_result_store
 
-app = Flask(__name__, static_folder='static')
 
-analysis_results = {}
+class ReportJSONEncoder(JSONEncoder):
+    """Сериализует компактные записи анализа в словари при формировании ответа"""
+
+    def default(self, o):
+        if isinstance(o, Record):
+            return o.to_dict()
+        return super().default(o)
+
+
+app = Flask(__name__, static_folder='static')
+app.json_encoder = ReportJSONEncoder
+
+# 'memory' - отчеты в памяти процесса с вытеснением на диск,
+# 'shared' - общая директория для нескольких воркеров (gunicorn)
+RESULT_STORE_BACKEND = os.environ.get('CODE_ANALYZER_RESULT_STORE', 'memory')
+RESULT_STORE_MAX_BYTES = int(os.environ.get('CODE_ANALYZER_RESULT_MAX_BYTES', 256 * 1024 * 1024))
+RESULT_STORE_TTL = float(os.environ.get('CODE_ANALYZER_RESULT_TTL', 0)) or None
+# Объем вытесненных на диск отчетов бэкенда 'memory' (0 - без ограничения)
+RESULT_SPILL_MAX_BYTES = int(os.environ.get('CODE_ANALYZER_RESULT_SPILL_MAX_BYTES', 1024 * 1024 * 1024))
+
+# Директория данных приложения (reports/, cache/, results/, exports/ и т.д.);
+# директории и базы данных создаются при первой записи, а не при импорте
+FileManager.base_dir = os.environ.get('CODE_ANALYZER_DATA_DIR') or None
+
+analysis_results = create_result_store(
+    RESULT_STORE_BACKEND,
+    FileManager.get_data_path(FileManager.RESULTS_DIR),
+    RESULT_STORE_MAX_BYTES,
+    RESULT_STORE_TTL,
+    RESULT_SPILL_MAX_BYTES or None
+)
 
 project_manager = ProjectManager(analysis_results)
 
+# Не более MAX_CONCURRENT_JOBS анализов одновременно, остальные ждут в очереди
+MAX_CONCURRENT_JOBS = int(os.environ.get('CODE_ANALYZER_MAX_JOBS', 2))
+MAX_QUEUED_JOBS = int(os.environ.get('CODE_ANALYZER_MAX_QUEUED_JOBS', 8))
+# Процессы ядра делятся между одновременными заданиями
+MAX_WORKERS_PER_JOB = max(1, (os.cpu_count() or 1) // MAX_CONCURRENT_JOBS)
+
+job_manager = JobManager(MAX_CONCURRENT_JOBS, MAX_QUEUED_JOBS)
+
+report_paginator = ReportPaginator()
+
+export_cache = ExportCache(FileManager.get_data_path(FileManager.EXPORTS_DIR))
+
+# Сколько проектов можно одновременно наблюдать в режиме живого обновления
+MAX_WATCHED_PROJECTS = int(os.environ.get('CODE_ANALYZER_MAX_WATCHES', 4))
+
+watch_manager = LiveSessionManager(MAX_WATCHED_PROJECTS)
+# Сохранение отчетов сеансов наблюдения сверяется с текущим отчетом проекта под этой блокировкой
+live_persist_lock = threading.Lock()
+
+# Индексы символов и дубликатов проектов без наблюдения:
+# {(класс индекса, project_id): (analysis_id, индекс)}
+MAX_PROJECT_INDEXES = int(os.environ.get('CODE_ANALYZER_MAX_PROJECT_INDEXES', 8))
+project_indexes: 'OrderedDict[Tuple[type, str], Tuple[Optional[str], Any]]' = OrderedDict()
+project_indexes_lock = threading.Lock()
+
+# Допустимые значения порога сходства для /duplicates: ниже 0.5 пары
+# почти не попадают в общие корзины LSH, и порог теряет смысл
+MIN_DUPLICATE_SIMILARITY = 0.5
+
+# Замеры этапов анализа (раздел timings отчета) и счетчики запросов для /metrics
+INSTRUMENTATION_ENABLED = os.environ.get('CODE_ANALYZER_INSTRUMENTATION', '1') != '0'
+
+metrics_registry = PrometheusRegistry()
+metrics_registry.describe('code_analyzer_analyses_total', COUNTER, 'Completed project analyses')
+metrics_registry.describe('code_analyzer_files_analyzed_total', COUNTER, 'Files read and analyzed')
+metrics_registry.describe('code_analyzer_bytes_read_total', COUNTER, 'Bytes of source code read')
+metrics_registry.describe('code_analyzer_parse_failures_total', COUNTER, 'Files with syntax errors')
+metrics_registry.describe('code_analyzer_read_errors_total', COUNTER, 'Files that could not be read')
+metrics_registry.describe('code_analyzer_phase_seconds_total', COUNTER,
+                          'Time spent in analysis phases (file phases are summed over workers)')
+metrics_registry.describe('code_analyzer_http_requests_total', COUNTER, 'HTTP requests by endpoint and status')
+metrics_registry.describe('code_analyzer_http_request_seconds_total', COUNTER,
+                          'Time spent handling HTTP requests by endpoint')
+metrics_registry.gauge_callback('code_analyzer_watched_projects', 'Projects in live update mode',
+                                lambda: {(): len(watch_manager)})
+metrics_registry.gauge_callback('code_analyzer_jobs', 'Analysis jobs by status',
+                                lambda: {(('status', status),): count
+                                         for status, count in job_manager.status_counts().items()})
+
 REPORTS_DIR = FileManager.REPORTS_DIR
 GRAPHS_DIR = FileManager.GRAPHS_DIR
 MERMAID_DIR = FileManager.MERMAID_DIR
 FILE_TYPES = FileManager.FILE_TYPES
 CONTENT_TYPES = FileManager.CONTENT_TYPES
 
+# Политика хранения сохраненных отчетов: возраст в днях и суммарный размер в байтах (0 - без ограничения)
+REPORT_MAX_AGE_DAYS = float(os.environ.get('CODE_ANALYZER_REPORT_MAX_AGE_DAYS', 0))
+REPORT_MAX_BYTES = int(os.environ.get('CODE_ANALYZER_REPORT_MAX_BYTES', 0))
+
+report_catalog = ReportCatalog(
+    FileManager.get_data_path(FileManager.CACHE_DIR, 'reports_catalog.sqlite3'),
+    {
+        'reports': FileManager.get_data_path(REPORTS_DIR),
+        'graphs': FileManager.get_data_path(GRAPHS_DIR),
+        'mermaid': FileManager.get_data_path(MERMAID_DIR)
+    },
+    FILE_TYPES,
+    max_age=REPORT_MAX_AGE_DAYS * 86400 or None,
+    max_total_bytes=REPORT_MAX_BYTES or None
+)
+FileManager.catalog = report_catalog
+
+# История метрик сохраненных отчетов (тренды, изменения, регрессии)
+metrics_history = MetricsHistory(os.environ.get(
+    'CODE_ANALYZER_HISTORY_DB', FileManager.get_data_path(FileManager.CACHE_DIR, 'metrics_history.sqlite3')))
+
+# Формат экспорта -> (директория сохраненных файлов, префикс имени, название для сообщений)
+EXPORT_TARGETS = {
+    'html': (REPORTS_DIR, 'code_analysis_report', 'HTML отчет'),
+    'mermaid': (MERMAID_DIR, 'dependency_graph', 'Mermaid'),
+    'svg': (GRAPHS_DIR, 'dependency_graph', 'Граф'),
+}
+
 @app.route('/')
 def index():
     """Отображает главную страницу приложения"""
     return render_template('index.html')
 
 
+if INSTRUMENTATION_ENABLED:
+    @app.before_request
+    def _start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def _count_request(response):
+        endpoint = request.endpoint or 'unknown'
+        metrics_registry.inc('code_analyzer_http_requests_total', endpoint=endpoint, method=request.method,
+                             status=str(response.status_code))
+        started = g.pop('request_started', None)
+        if started is not None:
+            metrics_registry.inc('code_analyzer_http_request_seconds_total', time.perf_counter() - started,
+                                 endpoint=endpoint)
+        return response
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Возвращает метрики приложения в текстовом формате Prometheus"""
+    return Response(metrics_registry.render(), mimetype=None, content_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @app.route('/analyze', methods=['POST'])
 def analyze():
     """Анализирует указанный путь к проекту Python"""
     project_path = request.form.get('project_path')
+    workers = _clamp_workers(request.form.get('workers', 1, type=int))
 
-    if not os.path.exists(project_path):
+    if not project_path or not os.path.exists(project_path):
         return jsonify({'error': f'Path does not exist: {project_path}'}), 400
 
     try:
-        analyzer = CodeAnalyzer(project_path)
-        analyzer.scan_project()
-        report = analyzer.generate_project_report()
+        return jsonify(_run_analysis(project_path, workers, _get_discovery_options()))
+    except Exception as e:
+        return jsonify({'error': f'Error analyzing project: {str(e)}'}), 500
 
-        project_id = str(hash(project_path))
-        analysis_results[project_id] = report
 
-        return jsonify({
-            'project_id': project_id,
-            'summary': {
-                'total_modules': report['total_modules'],
-                'total_loc': report['total_loc'],
-                'total_functions': report['total_functions'],
-                'total_classes': report['total_classes']
-            }
-        })
+@app.route('/diff', methods=['POST'])
+def diff():
+    """Анализирует только файлы, измененные между ревизиями base и head git-репозитория"""
+    project_path = request.form.get('project_path')
+    base = request.form.get('base')
+    head = request.form.get('head', 'HEAD')
+
+    if not project_path or not os.path.exists(project_path):
+        return jsonify({'error': f'Path does not exist: {project_path}'}), 400
+    if not base:
+        return jsonify({'error': 'Base revision is required'}), 400
+
+    try:
+        return jsonify(diff_revisions(project_path, base, head, **_get_exclude_dirs()))
+    except GitError as e:
+        return jsonify({'error': f'Git error: {str(e)}'}), 400
+
+
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    """Запускает анализ проекта в фоне и сразу возвращает идентификатор задания"""
+    project_path = request.form.get('project_path')
+    workers = _clamp_workers(request.form.get('workers', 1, type=int))
+
+    if not project_path or not os.path.exists(project_path):
+        return jsonify({'error': f'Path does not exist: {project_path}'}), 400
+
+    discovery_options = _get_discovery_options()
+
+    try:
+        job = job_manager.submit(
+            project_path,
+            lambda job: _run_analysis(project_path, workers, discovery_options, progress=job.report_progress)
+        )
+    except JobLimitExceeded as e:
+        return jsonify({'error': f'Сервер занят, повторите попытку позже: {str(e)}'}), 429
+
+    return jsonify(job.to_dict()), 202
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Возвращает состояние задания анализа"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    return jsonify(job.to_dict())
+
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Поток Server-Sent Events с прогрессом задания анализа"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    return Response(
+        job_manager.stream_events(job),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Отменяет задание анализа"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    job.cancel()
+    return jsonify(job.to_dict())
+
+
+@app.route('/watch', methods=['POST'])
+def start_watch():
+    """
+    Анализирует проект и начинает наблюдение за его файлами.
+
+    Измененные файлы анализируются повторно, отчет и граф зависимостей
+    обновляются без полного сканирования; обновления доступны через
+    /watch/<project_id>/events.
+    """
+    project_path = request.form.get('project_path')
+
+    if not project_path or not os.path.isdir(project_path):
+        return jsonify({'error': f'Path does not exist: {project_path}'}), 400
+
+    try:
+        analyzer, report = _analyze_project(project_path, MAX_WORKERS_PER_JOB, _get_discovery_options())
     except Exception as e:
         return jsonify({'error': f'Error analyzing project: {str(e)}'}), 500
 
+    project_id = ProjectManager.make_project_id(project_path)
+    # Прежний сеанс сохраняет последние изменения при остановке, поэтому
+    # он останавливается до записи нового отчета, а не после
+    watch_manager.stop(project_id)
+    analysis_results[project_id] = report
+
+    watcher = create_watcher(analyzer.discovery)
+    session = LiveSession(project_id, analyzer, report, watcher,
+                          persist=lambda updated, persisted_id: _persist_live_report(project_id, updated,
+                                                                                     persisted_id))
+    try:
+        watch_manager.start(session)
+    except WatchLimitExceeded as e:
+        watcher.close()
+        return jsonify({'error': f'Сервер занят, повторите попытку позже: {str(e)}'}), 429
+
+    return jsonify({
+        'project_id': project_id,
+        'summary': _summary(report),
+        'watcher': type(watcher).__name__
+    })
+
+
+@app.route('/watch/<project_id>/events', methods=['GET'])
+def watch_events(project_id):
+    """Поток Server-Sent Events с инкрементальными обновлениями отчета"""
+    session = watch_manager.get(project_id)
+    if session is None:
+        return jsonify({'error': 'Project is not watched'}), 404
+
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    return Response(
+        session.stream_events(last_event_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/watch/<project_id>/stop', methods=['POST'])
+def stop_watch(project_id):
+    """Останавливает наблюдение за проектом"""
+    if not watch_manager.stop(project_id):
+        return jsonify({'error': 'Project is not watched'}), 404
+
+    return jsonify({'project_id': project_id, 'status': 'stopped'})
+
 
 @app.route('/report/<project_id>', methods=['GET'])
 def get_report(project_id):
     """Возвращает полный отчет анализа проекта"""
-    if not project_manager.check_project_exists(project_id):
+    report = analysis_results.get(project_id)
+    if report is None:
         return jsonify({'error': 'Project not found'}), 404
 
-    return jsonify(analysis_results[project_id])
+    fields = [field.strip() for field in request.args.get('fields', '').split(',') if field.strip()]
+
+    def build(report):
+        if not fields:
+            return report
+        return {field: report[field] for field in fields if field in report}
+
+    return _conditional_json(report, build)
+
+
+@app.route('/report/<project_id>/modules', methods=['GET'])
+def get_report_modules(project_id):
+    """Возвращает страницу модулей проекта (limit, cursor, fields, sort, order, path, q, min_loc)"""
+    return _paginated_json(project_id, MODULES)
+
+
+@app.route('/report/<project_id>/functions', methods=['GET'])
+def get_report_functions(project_id):
+    """Возвращает страницу функций проекта (limit, cursor, fields, sort, order, module, class, q, min_complexity)"""
+    return _paginated_json(project_id, FUNCTIONS)
+
+
+@app.route('/report/<project_id>/edges', methods=['GET'])
+def get_report_edges(project_id):
+    """Возвращает страницу ребер графа зависимостей (limit, cursor, sort, order, source, target, kind)"""
+    return _paginated_json(project_id, EDGES)
 
 
 @app.route('/dependencies/<project_id>', methods=['GET'])
 def get_dependencies(project_id):
     """Возвращает граф зависимостей для указанного проекта"""
-    if not project_manager.check_project_exists(project_id):
+    report = analysis_results.get(project_id)
+    if report is None:
+        return jsonify({'error': 'Project not found'}), 404
+
+    def build(report):
+        return report['dependency_graph'] or project_manager.generate_demo_dependencies(project_id)
+
+    return _conditional_json(report, build)
+
+
+@app.route('/dependencies/<project_id>/resolved', methods=['GET'])
+def get_resolved_dependencies(project_id):
+    """Возвращает граф зависимостей с разрешенными импортами и типами модулей"""
+    report = analysis_results.get(project_id)
+    if report is None:
+        return jsonify({'error': 'Project not found'}), 404
+
+    graph = _load_module_graph(report)
+
+    return jsonify({
+        'nodes': [{'id': node, 'kind': graph.kind(i)} for i, node in enumerate(graph.nodes)],
+        'dependencies': graph.adjacency()
+    })
+
+
+@app.route('/dependencies/<project_id>/cycles', methods=['GET'])
+def get_dependency_cycles(project_id):
+    """Возвращает циклические зависимости между модулями"""
+    report = analysis_results.get(project_id)
+    if report is None:
+        return jsonify({'error': 'Project not found'}), 404
+
+    return jsonify({'cycles': _load_module_graph(report).cycles()})
+
+
+@app.route('/dependencies/<project_id>/dependents/<path:module>', methods=['GET'])
+def get_dependents(project_id, module):
+    """Возвращает модули, прямо или транзитивно зависящие от указанного модуля"""
+    report = analysis_results.get(project_id)
+    if report is None:
+        return jsonify({'error': 'Project not found'}), 404
+
+    graph = _load_module_graph(report)
+    if module not in graph.index:
+        return jsonify({'error': f'Module not found: {module}'}), 404
+
+    return jsonify({'module': module, 'dependents': graph.transitive_dependents(module)})
+
+
+@app.route('/dependencies/<project_id>/layers', methods=['GET'])
+def get_dependency_layers(project_id):
+    """Возвращает топологические слои модулей проекта"""
+    report = analysis_results.get(project_id)
+    if report is None:
+        return jsonify({'error': 'Project not found'}), 404
+
+    internal_only = request.args.get('internal_only', '1') != '0'
+
+    return jsonify({'layers': _load_module_graph(report).topological_layers(internal_only)})
+
+
+@app.route('/symbols/<project_id>', methods=['GET'])
+def find_symbol(project_id):
+    """
+    Находит определения функций, классов и методов по имени.
+
+    Параметры: name - короткое или полное имя, module - путь модуля, в
+    области видимости которого (с учетом импортов) разрешается имя.
+    """
+    report = analysis_results.get(project_id)
+    if report is None:
         return jsonify({'error': 'Project not found'}), 404
 
-    dependency_graph = analysis_results[project_id]['dependency_graph']
+    name = request.args.get('name', '').strip()
+    if not name:
+        return jsonify({'error': 'name is required'}), 400
+    module = request.args.get('module') or None
+    index = _symbol_index(project_id, report)
+
+    return _conditional_json(report, lambda report: {'definitions': index.find_definitions(name, module)})
 
-    if not dependency_graph:
-        dependency_graph = project_manager.generate_demo_dependencies(project_id)
 
-    return jsonify(dependency_graph)
+@app.route('/symbols/<project_id>/callers', methods=['GET'])
+def get_symbol_callers(project_id):
+    """Возвращает функции, вызывающие символ (параметр symbol - 'путь::полное имя')"""
+    return _symbol_neighbours(project_id, 'callers')
+
+
+@app.route('/symbols/<project_id>/callees', methods=['GET'])
+def get_symbol_callees(project_id):
+    """Возвращает функции, которые вызывает символ (параметр symbol - 'путь::полное имя')"""
+    return _symbol_neighbours(project_id, 'callees')
+
+
+def _symbol_neighbours(project_id: str, direction: str) -> Any:
+    report = analysis_results.get(project_id)
+    if report is None:
+        return jsonify({'error': 'Project not found'}), 404
+
+    symbol = request.args.get('symbol', '')
+    index = _symbol_index(project_id, report)
+    info = index.symbol(symbol)
+    if info is None:
+        return jsonify({'error': f'Symbol not found: {symbol}'}), 404
+
+    return _conditional_json(report, lambda report: {
+        'symbol': info,
+        direction: getattr(index, direction)(symbol) or []
+    })
+
+
+@app.route('/duplicates/<project_id>', methods=['GET'])
+def get_duplicates(project_id):
+    """
+    Возвращает кластеры похожих функций проекта.
+
+    Параметры: min_similarity - порог сходства (от 0.5 до 1, по умолчанию
+    0.8), module - только кластеры с функциями этого модуля, limit -
+    максимальное число кластеров.
+    """
+    report = analysis_results.get(project_id)
+    if report is None:
+        return jsonify({'error': 'Project not found'}), 404
+
+    try:
+        min_similarity = float(request.args.get('min_similarity', DEFAULT_SIMILARITY))
+        limit = int(request.args['limit']) if 'limit' in request.args else None
+    except ValueError:
+        return jsonify({'error': 'min_similarity and limit must be numbers'}), 400
+    if not MIN_DUPLICATE_SIMILARITY <= min_similarity <= 1 or (limit is not None and limit < 0):
+        return jsonify({'error': f'min_similarity must be between {MIN_DUPLICATE_SIMILARITY} and 1, '
+                                 'limit must not be negative'}), 400
+    module = request.args.get('module') or None
+    index = _clone_index(project_id, report)
+
+    def build(report):
+        result = index.to_dict(min_similarity)
+        clusters = result['clusters']
+        if module is not None:
+            clusters = [cluster for cluster in clusters
+                        if any(func['module'] == module for func in cluster['functions'])]
+        result['total_clusters'] = len(clusters)
+        result['clusters'] = clusters[:limit] if limit is not None else clusters
+        return result
+
+    return _conditional_json(report, build)
+
+
+@app.route('/dead_code/<project_id>', methods=['GET'])
+def get_dead_code(project_id):
+    """
+    Возвращает неиспользуемый код проекта: недостижимые модули, функции,
+    классы и методы и неиспользуемые импорты.
+
+    Параметры: entry - дополнительная точка входа (шаблон пути модуля или
+    символа, можно указать несколько раз), tests=0 - не считать тесты
+    точками входа, module - только символы и импорты этого модуля.
+    """
+    report = analysis_results.get(project_id)
+    if report is None:
+        return jsonify({'error': 'Project not found'}), 404
+
+    entry_points = [pattern for pattern in request.args.getlist('entry') if pattern]
+    include_tests = request.args.get('tests', '1') != '0'
+    module = request.args.get('module') or None
+    index = _symbol_index(project_id, report)
+
+    def build(report):
+        result = find_dead_code(index, entry_points, include_tests=include_tests)
+        if module is not None:
+            result['unused_symbols'] = [info for info in result['unused_symbols'] if info['module'] == module]
+            result['unused_imports'] = [info for info in result['unused_imports'] if info['module'] == module]
+        return result
+
+    return _conditional_json(report, build)
+
+
+@app.route('/graph_view/<project_id>', methods=['GET'])
+def get_graph_view(project_id):
+    """
+    Возвращает сжатое представление графа зависимостей с координатами узлов.
+
+    Параметры: expand - раскрытые кластеры через запятую, hide - скрываемые
+    виды внешних узлов (stdlib, third_party), max_degree - максимальное
+    число исходящих ребер узла.
+    """
+    report = analysis_results.get(project_id)
+    if report is None:
+        return jsonify({'error': 'Project not found'}), 404
+
+    expanded = [item for item in request.args.get('expand', '').split(',') if item]
+    hide_kinds = [item for item in request.args.get('hide', '').split(',') if item]
+    max_degree = request.args.get('max_degree', 0, type=int)
+
+    def build(report):
+        graph = DependencyGraph.from_dict(report['module_graph'])
+        return build_graph_view(graph, expanded, hide_kinds, max_degree if max_degree > 0 else None)
+
+    return _conditional_json(report, build)
 
 
 @app.route('/complex_functions/<project_id>', methods=['GET'])
 def get_complex_functions(project_id):
-    """Возвращает список сложных функций проекта"""
+    """
+    Возвращает список сложных функций проекта.
 
-    if not project_manager.check_project_exists(project_id):
+    Параметры запроса: k - количество функций (0 - все), min_complexity -
+    порог сложности, per_module - количество функций для каждого модуля
+    (ответ группируется по модулям).
+    """
+
+    report = analysis_results.get(project_id)
+    if report is None:
         return jsonify({'error': 'Project not found'}), 404
 
-    complex_functions = analysis_results[project_id]['complex_functions']
+    k = request.args.get('k', DEFAULT_TOP_K, type=int)
+    min_complexity = request.args.get('min_complexity', type=int)
+    per_module = request.args.get('per_module', type=int)
 
-    if not complex_functions:
-        complex_functions = project_manager.generate_demo_complex_functions(project_id)
+    def build(report):
+        if per_module is not None:
+            return top_complex_functions_by_module(report.get('modules', {}), per_module, min_complexity)
+        if 'k' in request.args or min_complexity is not None:
+            return top_complex_functions(report.get('modules', {}), k or None, min_complexity)
+        return report['complex_functions'] or project_manager.generate_demo_complex_functions(project_id)
 
-    return jsonify(complex_functions)
+    return _conditional_json(report, build)
 
 
 @app.route('/save_report/<project_id>', methods=['GET'])
 def save_report(project_id):
-    """Сохраняет отчет анализа в JSON файл на сервере"""
-    if not project_manager.check_project_exists(project_id):
+    """
+    Сохраняет отчет анализа на сервере.
+
+    Параметр format=ndjson сохраняет отчет построчно (NDJSON), параметр
+    compression (gzip, bz2, xz) включает сжатие потокового отчета.
+    """
+    report = analysis_results.get(project_id)
+    if report is None:
         return jsonify({'error': 'Project not found'}), 404
 
-    try:
-        report = analysis_results[project_id]
+    report_format = request.args.get('format', 'json')
+    compression = request.args.get('compression', 'none')
+    if report_format not in ('json', 'ndjson') or compression not in COMPRESSIONS:
+        return jsonify({'error': 'Unsupported report format or compression'}), 400
+    if compression != 'none':
+        report_format = 'ndjson'
 
+    try:
         timestamp = FileManager.get_timestamp()
-        filename = f'report_{timestamp}.json'
 
-        filepath = FileManager.save_to_file(REPORTS_DIR, filename, lambda f: json.dump(report, f, indent=2))
+        if report_format == 'ndjson':
+            filename = report_filename(f'report_{timestamp}', compression)
+            filepath = FileManager.get_output_path(REPORTS_DIR, filename)
+            version = report_catalog.directory_version(REPORTS_DIR)
+            write_report(filepath, report, compression)
+            FileManager.register_file(REPORTS_DIR, filepath, version)
+        else:
+            filename = f'report_{timestamp}.json'
+            filepath = FileManager.save_to_file(REPORTS_DIR, filename,
+                                                lambda f: json.dump(report, f, indent=2, default=json_default))
+
+    except Exception as e:
+        return _handle_save_error('report', str(e))
+
+    # Ошибка истории метрик не отменяет сохранение отчета
+    try:
+        snapshot = metrics_history.record(project_id, report, report_file=filename)
+    except sqlite3.Error as e:
+        print(f'Не удалось добавить отчет в историю метрик: {e}')
+        snapshot = None
+
+    return jsonify({
+        'success': True,
+        'message': f'Отчет сохранен как {filename}',
+        'filepath': filepath,
+        'history_snapshot': snapshot
+    })
+
+
+@app.route('/history/<project_id>', methods=['GET'])
+def get_history(project_id):
+    """Возвращает снимки истории метрик проекта (параметры limit, since, until)"""
+    try:
+        return jsonify(metrics_history.snapshots(project_id, request.args))
+    except PageRequestError as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/history/<project_id>/trend', methods=['GET'])
+def get_history_trend(project_id):
+    """
+    Возвращает изменение метрики по сохраненным отчетам.
+
+    Параметры: metric, since, until и module с function (функция), module
+    (модуль) или package с agg (сумма, среднее или максимум по пакету).
+    """
+    return _history_query(metrics_history.trend, project_id)
+
+
+@app.route('/history/<project_id>/movers', methods=['GET'])
+def get_history_movers(project_id):
+    """
+    Возвращает функции или модули с наибольшим изменением метрики.
+
+    Параметры: metric, level, base или since, head, direction, limit.
+    """
+    return _history_query(metrics_history.top_movers, project_id)
+
+
+@app.route('/history/<project_id>/regressions', methods=['GET'])
+def get_history_regressions(project_id):
+    """
+    Возвращает функции или модули, метрика которых ухудшилась между снимками.
+
+    Параметры: metric, level, base (по умолчанию предыдущий снимок), head,
+    threshold, limit.
+    """
+    return _history_query(metrics_history.regressions, project_id)
+
+
+def _history_query(query: Callable[[str, Dict[str, str]], Optional[Dict[str, Any]]], project_id: str) -> Any:
+    try:
+        result = query(project_id, request.args)
+    except PageRequestError as e:
+        return jsonify({'error': str(e)}), 400
+    if result is None:
+        return jsonify({'error': 'No history for project'}), 404
+    return jsonify(result)
+
+
+@app.route('/export/<project_id>/<export_format>', methods=['GET'])
+def export_report(project_id, export_format):
+    """
+    Возвращает отчет в формате html, mermaid или svg.
+
+    Экспорт формируется на сервере и сохраняется в кеш по идентификатору
+    анализа: повторный запрос того же анализа отдается с диска. Параметр
+    download отдает файл как вложение.
+    """
+    report = analysis_results.get(project_id)
+    if report is None:
+        return jsonify({'error': 'Project not found'}), 404
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f'Unsupported export format: {export_format}'}), 400
+
+    analysis_id = report.get('analysis_id')
+    _, extension, mime_type = EXPORT_FORMATS[export_format]
+    download_name = f'{EXPORT_TARGETS[export_format][1]}_{project_id}{extension}'
+    as_attachment = 'download' in request.args
+
+    cached = export_cache.get(project_id, analysis_id, export_format) if analysis_id else None
+    if cached is not None:
+        return send_file(cached, mimetype=mime_type, as_attachment=as_attachment, download_name=download_name)
+
+    chunks = get_exporter(export_format)(report)
+    if analysis_id:
+        body = export_cache.stream(project_id, analysis_id, export_format, chunks)
+    else:
+        body = (chunk.encode('utf-8') for chunk in chunks)
+
+    disposition = 'attachment' if as_attachment else 'inline'
+    return Response(body, mimetype=mime_type,
+                    headers={'Content-Disposition': f'{disposition}; filename="{download_name}"'})
+
+
+@app.route('/export/<project_id>/<export_format>/save', methods=['POST'])
+def save_export(project_id, export_format):
+    """Сохраняет экспорт отчета в директорию сохраненных отчетов без передачи содержимого клиентом"""
+    report = analysis_results.get(project_id)
+    if report is None:
+        return jsonify({'error': 'Project not found'}), 404
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f'Unsupported export format: {export_format}'}), 400
+
+    directory, prefix, title = EXPORT_TARGETS[export_format]
+    try:
+        exporter = get_exporter(export_format)
+        filename = f'{prefix}_{FileManager.get_timestamp()}{EXPORT_FORMATS[export_format][1]}'
+        filepath = FileManager.get_output_path(directory, filename)
+
+        analysis_id = report.get('analysis_id')
+        if analysis_id:
+            source = export_cache.ensure(project_id, analysis_id, export_format, lambda: exporter(report))
+            version = report_catalog.directory_version(directory)
+            shutil.copyfile(source, filepath)
+            FileManager.register_file(directory, filepath, version)
+        else:
+            FileManager.save_to_file(directory, filename, lambda f: f.writelines(exporter(report)))
 
         return jsonify({
             'success': True,
-            'message': f'Отчет сохранен как {filename}',
+            'message': f'{title} сохранен как {filename}',
             'filepath': filepath
         })
     except Exception as e:
-        return _handle_save_error('report', str(e))
+        return _handle_save_error(export_format, str(e))
 
 
 @app.route('/save_html_report/<project_id>', methods=['POST'])
@@ -198,24 +859,16 @@ def save_mermaid(project_id):
 
 @app.route('/list_reports', methods=['GET'])
 def list_reports():
-    """Возвращает список всех сохраненных отчетов и диаграмм"""
-    try:
-        directories = {
-            'reports': os.path.join(os.getcwd(), REPORTS_DIR),
-            'graphs': os.path.join(os.getcwd(), GRAPHS_DIR),
-            'mermaid': os.path.join(os.getcwd(), MERMAID_DIR)
-        }
-
-        reports = []
-        for dir_name, dir_path in directories.items():
-            if not os.path.exists(dir_path):
-                continue
+    """
+    Возвращает страницу сохраненных отчетов и диаграмм, начиная с самых новых.
 
-            reports.extend(FileManager.scan_directory_for_reports(dir_name, dir_path))
-
-        reports.sort(key=lambda x: x['created'], reverse=True)
-
-        return jsonify({'reports': reports})
+    Параметры запроса: category, type, q (подстрока имени), since и until
+    (дата ISO 8601), limit и cursor (значение next_cursor предыдущей страницы).
+    """
+    try:
+        return jsonify(report_catalog.list(request.args))
+    except PageRequestError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'Ошибка при получении списка отчетов: {str(e)}'}), 500
 
@@ -223,27 +876,21 @@ def list_reports():
 @app.route('/download_report/<filename>', methods=['GET'])
 def download_report(filename):
     """Скачивание или просмотр сохраненного отчета/диаграммы"""
-    possible_dirs = [
-        os.path.join(os.getcwd(), REPORTS_DIR),
-        os.path.join(os.getcwd(), GRAPHS_DIR),
-        os.path.join(os.getcwd(), MERMAID_DIR)
-    ]
+    found = report_catalog.lookup(filename)
+    if found is None:
+        return jsonify({'error': 'Файл не найден'}), 404
+
+    _, directory = found
     _, ext = os.path.splitext(filename)
     mime_type = CONTENT_TYPES.get(ext.lower(), 'application/octet-stream')
+    as_attachment = 'download' in request.args or ext.lower() not in ['.svg', '.html']
 
-    for directory in possible_dirs:
-        file_path = os.path.join(directory, filename)
-        if os.path.exists(file_path) and os.path.isfile(file_path):
-            as_attachment = 'download' in request.args or ext.lower() not in ['.svg', '.html']
-
-            return send_from_directory(
-                directory,
-                filename,
-                mimetype=mime_type,
-                as_attachment=as_attachment
-            )
-
-    return jsonify({'error': 'Файл не найден'}), 404
+    return send_from_directory(
+        directory,
+        filename,
+        mimetype=mime_type,
+        as_attachment=as_attachment
+    )
 
 
 def _handle_save_error(content_type: str, error_msg: str) -> Tuple[Dict[str, str], int]:
@@ -251,5 +898,194 @@ def _handle_save_error(content_type: str, error_msg: str) -> Tuple[Dict[str, str
     return jsonify({'error': f'Ошибка при сохранении {content_type}: {error_msg}'}), 500
 
 
+def _conditional_json(report: Dict[str, Any], build: Callable[[Dict[str, Any]], Any]) -> Response:
+    """
+    Возвращает JSON-ответ по отчету проекта с поддержкой ETag.
+
+    ETag вычисляется из идентификатора анализа и адреса запроса до
+    построения ответа, поэтому повторный запрос неизмененного анализа
+    с заголовком If-None-Match получает 304 без сериализации отчета.
+    Отчет передается маршрутом, который уже получил его из хранилища:
+    повторное обращение могло бы не найти отчет, вытесненный между ними.
+    """
+    analysis_id = report.get('analysis_id')
+    if not analysis_id:
+        return jsonify(build(report))
+
+    etag = hashlib.sha1(f'{analysis_id}:{request.full_path}'.encode('utf-8')).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(build(report))
+    response.set_etag(etag)
+    # Браузер хранит ответ, но каждый раз проверяет его актуальность
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _paginated_json(project_id: str, collection: Collection) -> Any:
+    """Возвращает страницу коллекции отчета или ошибку 400 при неверных параметрах"""
+    report = analysis_results.get(project_id)
+    if report is None:
+        return jsonify({'error': 'Project not found'}), 404
+
+    args = request.args.to_dict()
+    try:
+        return _conditional_json(report, lambda report: report_paginator.page(report, collection, args))
+    except PageRequestError as e:
+        return jsonify({'error': str(e)}), 400
+
+
+def _symbol_index(project_id: str, report: Dict[str, Any]) -> SymbolIndex:
+    """Возвращает индекс символов проекта"""
+    session = watch_manager.get(project_id)
+    return session.symbols if session is not None else _project_index(project_id, report, SymbolIndex)
+
+
+def _clone_index(project_id: str, report: Dict[str, Any]) -> CloneIndex:
+    """Возвращает индекс дубликатов проекта"""
+    session = watch_manager.get(project_id)
+    return session.clones if session is not None else _project_index(project_id, report, CloneIndex)
+
+
+def _project_index(project_id: str, report: Dict[str, Any], index_class: type) -> Any:
+    """
+    Возвращает индекс (SymbolIndex, CloneIndex) проекта без наблюдения.
+
+    Для наблюдаемых проектов используются индексы сессии, которые
+    обновляются вместе с отчетом; для остальных индекс строится по модулям
+    отчета и кешируется до изменения идентификатора анализа.
+    """
+    analysis_id = report.get('analysis_id')
+    key = (index_class, project_id)
+    with project_indexes_lock:
+        cached = project_indexes.get(key)
+        if cached is not None and analysis_id and cached[0] == analysis_id:
+            project_indexes.move_to_end(key)
+            return cached[1]
+
+    index = index_class.from_modules(report.get('modules', {}))
+    with project_indexes_lock:
+        project_indexes[key] = (analysis_id, index)
+        project_indexes.move_to_end(key)
+        while len(project_indexes) > MAX_PROJECT_INDEXES:
+            project_indexes.popitem(last=False)
+    return index
+
+
+def _load_module_graph(report: Dict[str, Any]) -> DependencyGraph:
+    """Восстанавливает граф зависимостей проекта из сохраненного отчета"""
+    return DependencyGraph.from_dict(report['module_graph'])
+
+
+def _get_form_patterns(field: str) -> List[str]:
+    """Возвращает шаблоны из поля формы (через запятую или с новой строки)"""
+    raw = request.form.get(field, '')
+    return [pattern.strip() for pattern in raw.replace('\n', ',').split(',') if pattern.strip()]
+
+
+def _get_exclude_dirs() -> Dict[str, List[str]]:
+    """
+    Возвращает шаблоны пропускаемых директорий для FileDiscovery и diff_revisions.
+
+    Поле формы exclude_dir добавляет шаблоны имен директорий, флаг
+    no_default_excludes отключает директории, пропускаемые по умолчанию.
+    """
+    exclude_dirs = _get_form_patterns('exclude_dir')
+    if request.form.get('no_default_excludes', '0').lower() in ('1', 'true', 'on'):
+        return {'exclude_dirs': exclude_dirs, 'exclude_non_package_dirs': []}
+    return {
+        'exclude_dirs': list(DEFAULT_EXCLUDE_DIRS) + exclude_dirs,
+        'exclude_non_package_dirs': list(DEFAULT_EXCLUDE_NON_PACKAGE_DIRS)
+    }
+
+
+def _get_discovery_options() -> Dict[str, Any]:
+    """Возвращает параметры FileDiscovery из полей формы exclude, exclude_dir и no_default_excludes"""
+    return {'exclude': _get_form_patterns('exclude'), **_get_exclude_dirs()}
+
+
+def _analyze_project(project_path: str, workers: int, discovery_options: Dict[str, Any],
+                     progress: Optional[Callable[[int, int], None]] = None) -> Tuple[CodeAnalyzer, Dict[str, Any]]:
+    """Сканирует проект с использованием кеша анализа и возвращает анализатор и отчет"""
+    discovery = FileDiscovery(project_path, **discovery_options)
+    instrumentation = Instrumentation(enabled=INSTRUMENTATION_ENABLED)
+
+    with AnalysisCache(FileManager.get_cache_path(project_path), ANALYZER_VERSION) as cache:
+        analyzer = CodeAnalyzer(project_path, cache=cache, discovery=discovery, instrumentation=instrumentation)
+        analyzer.scan_project(workers=workers, progress=progress)
+        report = analyzer.generate_project_report()
+
+    # Кеш закрыт; повторный анализ отдельных файлов выполняется без него
+    analyzer.cache = None
+    if instrumentation.enabled:
+        _observe_analysis(report['timings'])
+    return analyzer, report
+
+
+def _observe_analysis(timings: Dict[str, Any]) -> None:
+    """Добавляет замеры завершенного анализа к счетчикам /metrics"""
+    metrics_registry.inc('code_analyzer_analyses_total')
+    metrics_registry.inc('code_analyzer_files_analyzed_total', timings['files'])
+    metrics_registry.inc('code_analyzer_bytes_read_total', timings['bytes_read'])
+    metrics_registry.inc('code_analyzer_parse_failures_total', timings['parse_failures'])
+    metrics_registry.inc('code_analyzer_read_errors_total', timings['read_errors'])
+    for phase, totals in timings['phases'].items():
+        metrics_registry.inc('code_analyzer_phase_seconds_total', totals['seconds'], phase=phase)
+
+
+def _summary(report: Dict[str, Any]) -> Dict[str, int]:
+    """Возвращает сводные показатели отчета"""
+    return {
+        'total_modules': report['total_modules'],
+        'total_loc': report['total_loc'],
+        'total_functions': report['total_functions'],
+        'total_classes': report['total_classes']
+    }
+
+
+def _clamp_workers(workers: int) -> int:
+    """Ограничивает число процессов анализа, запрошенное клиентом, значением MAX_WORKERS_PER_JOB"""
+    if workers <= 0 or workers > MAX_WORKERS_PER_JOB:
+        return MAX_WORKERS_PER_JOB
+    return workers
+
+
+def _persist_live_report(project_id: str, report: Dict[str, Any], persisted_id: Optional[str]) -> bool:
+    """
+    Сохраняет отчет сеанса наблюдения, если в хранилище все еще отчет этого сеанса.
+
+    Args:
+        project_id: Идентификатор проекта
+        report: Обновленный отчет сеанса
+        persisted_id: analysis_id отчета, сохраненного сеансом ранее
+
+    Returns:
+        False, если отчет проекта удален или заменен другим анализом
+    """
+    with live_persist_lock:
+        current = analysis_results.get(project_id)
+        if current is None or (current is not report and current.get('analysis_id') != persisted_id):
+            return False
+        analysis_results.put(project_id, report)
+        return True
+
+
+def _run_analysis(project_path: str, workers: int, discovery_options: Dict[str, Any],
+                  progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """Анализирует проект, сохраняет отчет и возвращает идентификатор проекта со сводкой"""
+    _, report = _analyze_project(project_path, workers, discovery_options, progress)
+
+    project_id = ProjectManager.make_project_id(project_path)
+    # Сеанс наблюдения с прежними настройками анализа иначе перезаписал бы новый отчет
+    watch_manager.stop(project_id)
+    analysis_results[project_id] = report
+
+    return {
+        'project_id': project_id,
+        'summary': _summary(report)
+    }
+
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
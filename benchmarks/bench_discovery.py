@@ -0,0 +1,55 @@
+# benchmarks/bench_discovery.py
+"""
+Сравнение времени поиска файлов прежним os.walk и FileDiscovery.
+
+Запуск:
+    python -m benchmarks.bench_discovery /путь/к/проекту
+"""
+import os
+import sys
+import time
+from typing import Callable, Iterable, Tuple
+
+from analyzer.discovery import FileDiscovery
+
+
+def legacy_walk(project_root: str) -> Iterable[Tuple[str, str]]:
+    """Поиск файлов, как в прежнем scan_project."""
+    for root, _, files in os.walk(project_root):
+        for file in files:
+            if file.endswith('.py'):
+                file_path = os.path.join(root, file)
+                yield file_path, os.path.relpath(file_path, project_root)
+
+
+def _measure(name: str, func: Callable[[], Iterable], repeat: int) -> None:
+    best = None
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(1 for _ in func())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{name:40} {count:>10} files {best * 1000:>10.1f} ms")
+
+
+def run(project_root: str, repeat: int = 3) -> None:
+    """
+    Выполняет бенчмарк поиска файлов.
+
+    Args:
+        project_root: Корневая директория проекта
+        repeat: Количество повторов, выводится лучшее время
+    """
+    _measure('os.walk (before)', lambda: legacy_walk(project_root), repeat)
+
+    unfiltered = FileDiscovery(project_root, exclude_dirs=(), max_file_size=None, use_gitignore=False)
+    _measure('FileDiscovery, no rules', unfiltered.iter_files, repeat)
+
+    discovery = FileDiscovery(project_root)
+    _measure('FileDiscovery, default rules (after)', discovery.iter_files, repeat)
+    print(f"skipped: {discovery.stats}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else ".")
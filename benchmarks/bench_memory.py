@@ -0,0 +1,77 @@
+# benchmarks/bench_memory.py
+"""
+Сравнение объема памяти, занимаемой результатами анализа в виде
+словарей и в виде компактных записей analyzer.model.
+
+Результаты каждого файла загружаются из JSON (как из кеша анализа),
+поэтому строки не разделяются между модулями, пока их не интернирует
+ModuleRecord. Проект повторяется copies раз под разными путями, чтобы
+получить объем, сравнимый с большими проектами.
+
+Запуск:
+    python -m benchmarks.bench_memory /путь/к/проекту [copies]
+"""
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Callable, Dict, List, Any, Tuple
+
+from analyzer.core import CodeAnalyzer
+from analyzer.model import ModuleRecord
+
+
+def _serialized_results(project_root: str, copies: int) -> List[Tuple[str, str]]:
+    analyzer = CodeAnalyzer(project_root)
+    results = []
+    for file_path, rel_path in analyzer._iter_python_files():
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            results.append((rel_path, json.dumps(analyzer.analyze_file(f.read(), rel_path))))
+
+    return [
+        (f'copy{i}/{rel_path}', data)
+        for i in range(copies)
+        for rel_path, data in results
+    ]
+
+
+def _retained_size(build: Callable[[], Dict[str, Any]]) -> Tuple[int, Dict[str, Any]]:
+    """Возвращает объем памяти, оставшийся занятым построенной структурой"""
+    gc.collect()
+    tracemalloc.start()
+    modules = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, modules
+
+
+def run(project_root: str, copies: int = 10) -> None:
+    """
+    Выполняет бенчмарк памяти.
+
+    Args:
+        project_root: Проект, результаты анализа которого используются
+        copies: Сколько раз повторить результаты проекта
+    """
+    results = _serialized_results(project_root, copies)
+    functions = 0
+
+    dict_size, modules = _retained_size(lambda: {path: json.loads(data) for path, data in results})
+    for module in modules.values():
+        functions += len(module.get('functions', []))
+        functions += sum(len(cls['methods']) for cls in module.get('classes', []))
+    del modules
+
+    record_size, modules = _retained_size(
+        lambda: {path: ModuleRecord.from_dict(json.loads(data)) for path, data in results})
+    del modules
+
+    print(f"{len(results)} modules, {functions} functions and methods")
+    print(f"{'dict':20} {dict_size / 1024 / 1024:>10.2f} MB")
+    print(f"{'ModuleRecord':20} {record_size / 1024 / 1024:>10.2f} MB")
+    print(f"{'ratio':20} {dict_size / max(record_size, 1):>10.2f}x")
+
+
+if __name__ == '__main__':
+    run(sys.argv[1] if len(sys.argv) > 1 else '.', int(sys.argv[2]) if len(sys.argv) > 2 else 10)
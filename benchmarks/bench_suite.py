@@ -0,0 +1,291 @@
+# benchmarks/bench_suite.py
+"""
+Набор бенчмарков анализатора на синтетическом проекте (benchmarks.corpus).
+
+Замеряются analyze_file, scan_project, generate_project_report (без
+разделов OPTIONAL_SECTIONS и со всеми ними) и основные эндпоинты Flask-приложения: лучшее время из repeat запусков,
+производительность (файлов или запросов в секунду), пиковый RSS и пиковый
+объем выделенной Python-памяти (tracemalloc). Каждый бенчмарк выполняется
+в отдельном процессе, чтобы пиковый RSS относился только к нему.
+
+Результаты можно сохранить как базовые (--save) и сравнить с ними
+следующий запуск (--baseline): при ухудшении любой метрики больше чем на
+порог (--threshold) программа завершается с кодом 1.
+
+Запуск:
+    python -m benchmarks.bench_suite --scale small --save benchmarks/baseline.json
+    python -m benchmarks.bench_suite --scale small --baseline benchmarks/baseline.json
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from analyzer.core import OPTIONAL_SECTIONS, CodeAnalyzer
+from benchmarks.corpus import SCALES, generate_project
+
+DEFAULT_THRESHOLD = 0.25
+
+# Метрики, по которым определяется регрессия (больше - хуже)
+COMPARED_METRICS = ('wall_ms', 'peak_rss_kb', 'alloc_peak_kb')
+
+_ENDPOINTS = (
+    '/report/bench?fields=total_modules,metrics',
+    '/report/bench/modules?limit=100&sort=loc&order=desc',
+    '/report/bench/functions?limit=100&sort=complexity&order=desc',
+    '/complex_functions/bench?k=50',
+    '/graph_view/bench',
+    '/symbols/bench?name=func0',
+    '/symbols/bench/callers?symbol=pkg0/mod0.py::func0',
+    '/duplicates/bench?limit=20',
+    '/dead_code/bench',
+)
+
+
+def _read_sources(root: str) -> List[Tuple[str, str]]:
+    analyzer = CodeAnalyzer(root)
+    sources = []
+    for file_path, rel_path in analyzer._iter_python_files():
+        with open(file_path, 'r', encoding='utf-8') as f:
+            sources.append((rel_path, f.read()))
+    return sources
+
+
+def _scanned(root: str) -> CodeAnalyzer:
+    analyzer = CodeAnalyzer(root)
+    analyzer.scan_project()
+    return analyzer
+
+
+def _setup_analyze_file(root: str) -> Tuple[Any, int]:
+    sources = _read_sources(root)
+    return sources, len(sources)
+
+
+def _run_analyze_file(sources: List[Tuple[str, str]]) -> None:
+    analyzer = CodeAnalyzer('.')
+    for rel_path, source in sources:
+        analyzer.analyze_file(source, rel_path)
+
+
+def _setup_scan_project(root: str) -> Tuple[Any, int]:
+    return root, len(_read_sources(root))
+
+
+def _run_scan_project(root: str) -> None:
+    CodeAnalyzer(root).scan_project()
+
+
+def _setup_report(root: str) -> Tuple[Any, int]:
+    analyzer = _scanned(root)
+    return (root, analyzer.modules), len(analyzer.modules)
+
+
+def _run_report(state: Tuple[str, Dict]) -> None:
+    # Новый анализатор: сводные метрики строятся с нуля; разделы
+    # OPTIONAL_SECTIONS по умолчанию не строятся и замеряются отдельно
+    root, modules = state
+    analyzer = CodeAnalyzer(root)
+    analyzer.modules = modules
+    analyzer.generate_project_report()
+
+
+def _run_full_report(state: Tuple[str, Dict]) -> None:
+    # Новый анализатор: граф вызовов, индекс дубликатов и поиск
+    # неиспользуемого кода строятся с нуля
+    root, modules = state
+    analyzer = CodeAnalyzer(root)
+    analyzer.modules = modules
+    analyzer.generate_project_report(sections=OPTIONAL_SECTIONS)
+
+
+def _setup_endpoints(root: str) -> Tuple[Any, int]:
+    import app as app_module
+
+    app_module.analysis_results['bench'] = _scanned(root).generate_project_report()
+    return app_module.app.test_client(), len(_ENDPOINTS)
+
+
+def _run_endpoints(client) -> None:
+    for url in _ENDPOINTS:
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f'{url}: HTTP {response.status_code}')
+        response.get_data()
+
+
+# {имя: (подготовка -> (состояние, число единиц работы), замеряемая функция, единица работы)}
+BENCHMARKS: Dict[str, Tuple[Callable[[str], Tuple[Any, int]], Callable[[Any], None], str]] = {
+    'analyze_file': (_setup_analyze_file, _run_analyze_file, 'files'),
+    'scan_project': (_setup_scan_project, _run_scan_project, 'files'),
+    'generate_project_report': (_setup_report, _run_report, 'modules'),
+    'generate_project_report_full': (_setup_report, _run_full_report, 'modules'),
+    'endpoints': (_setup_endpoints, _run_endpoints, 'requests'),
+}
+
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS сообщает байты, Linux - килобайты
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def run_benchmark(name: str, root: str, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Выполняет один бенчмарк в текущем процессе.
+
+    Args:
+        name: Имя бенчмарка из BENCHMARKS
+        root: Директория синтетического проекта
+        repeat: Количество замеров времени, берется лучший
+
+    Returns:
+        Словарь метрик: wall_ms, per_sec, unit, units, peak_rss_kb, alloc_peak_kb
+    """
+    setup, func, unit = BENCHMARKS[name]
+    state, units = setup(root)
+    # Первый запуск прогревает кеши импорта и интернирования строк
+    func(state)
+
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func(state)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    gc.collect()
+    tracemalloc.start()
+    func(state)
+    alloc_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'wall_ms': round(best * 1000, 2),
+        'per_sec': round(units / best, 1) if best else None,
+        'unit': unit,
+        'units': units,
+        'peak_rss_kb': _peak_rss_kb(),
+        'alloc_peak_kb': alloc_peak // 1024,
+    }
+
+
+def run_suite(root: str, names: Optional[List[str]] = None, repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    """Выполняет бенчмарки, каждый в отдельном процессе"""
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    for name in names or list(BENCHMARKS):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results[name] = executor.submit(run_benchmark, name, root, repeat).result()
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Сравнивает результаты с базовыми.
+
+    Args:
+        results: Результаты текущего запуска {бенчмарк: метрики}
+        baseline: Базовые результаты в том же формате
+        threshold: Допустимое относительное ухудшение (0.25 - на 25%)
+
+    Returns:
+        Описания регрессий; пустой список, если регрессий нет
+    """
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in COMPARED_METRICS:
+            before, after = base.get(metric), metrics.get(metric)
+            if not before or after is None:
+                continue
+            change = after / before - 1
+            if change > threshold:
+                regressions.append(f'{name}.{metric}: {before} -> {after} (+{change:.0%})')
+    return regressions
+
+
+def _print_results(results: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]]) -> None:
+    print(f"{'benchmark':26} {'wall ms':>10} {'per sec':>14} {'peak RSS MB':>12} {'alloc MB':>10} {'vs base':>8}")
+    for name, metrics in results.items():
+        base = (baseline or {}).get(name, {})
+        delta = f"{metrics['wall_ms'] / base['wall_ms'] - 1:+.0%}" if base.get('wall_ms') else ''
+        rss = f"{metrics['peak_rss_kb'] / 1024:.1f}" if metrics['peak_rss_kb'] is not None else '-'
+        print(f"{name:26} {metrics['wall_ms']:>10.1f} {metrics['per_sec']:>8} {metrics['unit']:<5} "
+              f"{rss:>12} {metrics['alloc_peak_kb'] / 1024:>10.1f} {delta:>8}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Бенчмарки анализатора на синтетическом проекте')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small', help='Размер синтетического проекта')
+    parser.add_argument('--seed', type=int, default=0, help='Начальное значение генератора проекта')
+    parser.add_argument('--corpus', help='Директория для проекта (по умолчанию временная)')
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS), help='Выполнить только указанные бенчмарки')
+    parser.add_argument('--repeat', type=int, default=3, help='Количество замеров времени')
+    parser.add_argument('--save', help='Сохранить результаты как базовые в JSON-файл')
+    parser.add_argument('--baseline', help='JSON-файл с базовыми результатами для сравнения')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Допустимое ухудшение метрик относительно базовых (0.25 - 25%%)')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='code-analyzer-bench-') as tmp:
+        root = args.corpus or os.path.join(tmp, 'project')
+        generate_project(root, seed=args.seed, **SCALES[args.scale])
+        results = run_suite(root, args.only, args.repeat)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved.get('scale') != args.scale or saved.get('seed') != args.seed:
+            print(f"Baseline was recorded for scale {saved.get('scale')}, seed {saved.get('seed')}", file=sys.stderr)
+            return 2
+        baseline = saved['results']
+
+    _print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({
+                'scale': args.scale,
+                'seed': args.seed,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results
+            }, f, indent=2)
+        print(f'Baseline saved to {args.save}')
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print('Regressions:', file=sys.stderr)
+            for line in regressions:
+                print(f'  {line}', file=sys.stderr)
+            return 1
+        print(f'No regressions above {args.threshold:.0%}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
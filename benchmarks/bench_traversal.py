@@ -0,0 +1,110 @@
+# benchmarks/bench_traversal.py
+"""
+Сравнение числа посещенных AST-узлов и времени анализа файлов
+для прежнего алгоритма (ast.walk + отдельный обход каждой функции)
+и однопроходного ModuleVisitor.
+
+Запуск:
+    python -m benchmarks.bench_traversal /путь/к/проекту
+"""
+import ast
+import os
+import sys
+import time
+from typing import Dict, Tuple
+
+from analyzer.visitor import ModuleVisitor
+
+
+class _CountingVisitor(ModuleVisitor):
+    """ModuleVisitor, подсчитывающий посещенные узлы."""
+
+    def __init__(self):
+        super().__init__()
+        self.nodes_visited = 0
+
+    def visit(self, node):
+        self.nodes_visited += 1
+        return super().visit(node)
+
+
+def _count_walk(node: ast.AST) -> int:
+    return sum(1 for _ in ast.walk(node))
+
+
+def legacy_nodes_visited(tree: ast.AST) -> int:
+    """Число узлов, которые посещал прежний analyze_file."""
+    visited = 0
+    for node in ast.walk(tree):
+        visited += 1
+        if isinstance(node, ast.FunctionDef):
+            visited += _count_walk(node)
+        elif isinstance(node, ast.ClassDef):
+            for class_node in ast.iter_child_nodes(node):
+                visited += 1
+                if isinstance(class_node, ast.FunctionDef):
+                    visited += _count_walk(class_node)
+    return visited
+
+
+def visitor_nodes_visited(tree: ast.AST) -> int:
+    """Число узлов, которые посещает ModuleVisitor."""
+    visitor = _CountingVisitor()
+    visitor.visit(tree)
+    return visitor.nodes_visited
+
+
+def _time_call(func, tree: ast.AST, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(tree)
+    return (time.perf_counter() - start) / repeat
+
+
+def run(project_root: str, repeat: int = 3) -> Dict[str, Tuple[int, int]]:
+    """
+    Выполняет бенчмарк для всех Python-файлов проекта.
+
+    Args:
+        project_root: Корневая директория проекта
+        repeat: Количество повторов для замера времени
+
+    Returns:
+        Словарь {относительный путь: (узлов до, узлов после)}
+    """
+    results = {}
+    legacy_time = 0.0
+    visitor_time = 0.0
+
+    for root, _, files in os.walk(project_root):
+        for file in files:
+            if not file.endswith('.py'):
+                continue
+            file_path = os.path.join(root, file)
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    tree = ast.parse(f.read())
+            except (SyntaxError, UnicodeDecodeError, OSError):
+                continue
+
+            rel_path = os.path.relpath(file_path, project_root)
+            results[rel_path] = (legacy_nodes_visited(tree), visitor_nodes_visited(tree))
+            legacy_time += _time_call(legacy_nodes_visited, tree, repeat)
+            visitor_time += _time_call(lambda t: ModuleVisitor().visit(t), tree, repeat)
+
+    print(f"{'file':60} {'before':>10} {'after':>10} {'ratio':>7}")
+    for rel_path, (before, after) in sorted(results.items()):
+        ratio = before / after if after else 0
+        print(f"{rel_path[-60:]:60} {before:>10} {after:>10} {ratio:>7.2f}")
+
+    total_before = sum(before for before, _ in results.values())
+    total_after = sum(after for _, after in results.values())
+    print(f"{'TOTAL':60} {total_before:>10} {total_after:>10} "
+          f"{(total_before / total_after if total_after else 0):>7.2f}")
+    print(f"traversal time: before {legacy_time * 1000:.1f} ms, after {visitor_time * 1000:.1f} ms")
+
+    return results
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else ".")
@@ -0,0 +1,157 @@
+# benchmarks/corpus.py
+"""
+Детерминированный генератор синтетических Python-проектов для бенчмарков.
+
+Один и тот же набор параметров и seed всегда дает одинаковые файлы,
+поэтому результаты замеров сравнимы между запусками и машинами.
+
+Запуск:
+    python -m benchmarks.corpus /путь/к/директории [files]
+"""
+import os
+import random
+import sys
+from typing import Dict, List, Any
+
+# Размеры корпуса для бенчмарков
+SCALES: Dict[str, Dict[str, Any]] = {
+    'small': {'files': 40, 'functions': 8, 'classes': 2, 'nesting': 3, 'import_density': 2.0},
+    'medium': {'files': 300, 'functions': 12, 'classes': 3, 'nesting': 4, 'import_density': 3.0},
+    'large': {'files': 2000, 'functions': 15, 'classes': 4, 'nesting': 5, 'import_density': 4.0},
+}
+
+_STDLIB_IMPORTS = ('os', 'sys', 'json', 're', 'itertools', 'collections', 'functools', 'typing')
+_BLOCKS = ('if', 'for', 'while', 'try', 'with')
+
+
+def _module_paths(files: int, packages: int) -> List[str]:
+    return [f'pkg{i % packages}/mod{i}.py' for i in range(files)]
+
+
+def _statement(rng: random.Random, indent: str, callees: List[str]) -> str:
+    if callees and rng.random() < 0.4:
+        return f'{indent}total += {rng.choice(callees)}(total)'
+    op = rng.choice(('+', '-', '*', '//'))
+    return f'{indent}total = total {op} {rng.randint(1, 9)}'
+
+
+def _block(rng: random.Random, depth: int, indent: str, callees: List[str]) -> List[str]:
+    """Тело блока со случайными вложенными управляющими конструкциями глубиной до depth"""
+    lines = []
+    for _ in range(rng.randint(1, 3)):
+        if depth > 0 and rng.random() < 0.6:
+            kind = rng.choice(_BLOCKS)
+            inner = indent + '    '
+            if kind == 'if':
+                lines.append(f'{indent}if total > {rng.randint(0, 100)} and x:')
+                lines.extend(_block(rng, depth - 1, inner, callees))
+                lines.append(f'{indent}elif total < 0:')
+                lines.append(f'{inner}total = -total')
+            elif kind == 'for':
+                lines.append(f'{indent}for i in range({rng.randint(2, 10)}):')
+                lines.extend(_block(rng, depth - 1, inner, callees))
+            elif kind == 'while':
+                lines.append(f'{indent}while total > {rng.randint(100, 1000)}:')
+                lines.append(f'{inner}total //= 2')
+                lines.extend(_block(rng, depth - 1, inner, callees))
+            elif kind == 'try':
+                lines.append(f'{indent}try:')
+                lines.extend(_block(rng, depth - 1, inner, callees))
+                lines.append(f'{indent}except (ValueError, ZeroDivisionError):')
+                lines.append(f'{inner}total = 0')
+            else:
+                lines.append(f'{indent}with open(__file__) as handle:')
+                lines.append(f'{inner}total += len(handle.readline())')
+                lines.extend(_block(rng, depth - 1, inner, callees))
+        else:
+            lines.append(_statement(rng, indent, callees))
+    return lines
+
+
+def _function(rng: random.Random, name: str, args: List[str], indent: str, nesting: int,
+              callees: List[str]) -> List[str]:
+    lines = [
+        f'{indent}def {name}({", ".join(args)}):',
+        f'{indent}    """Синтетическая функция {name}."""',
+        f'{indent}    total = 0',
+        f'{indent}    # Вложенные блоки глубиной до {nesting}',
+    ]
+    lines.extend(_block(rng, rng.randint(0, nesting), indent + '    ', callees))
+    lines.append(f'{indent}    return total')
+    lines.append('')
+    return lines
+
+
+def generate_module(rng: random.Random, index: int, paths: List[str], functions: int, classes: int,
+                    nesting: int, import_density: float) -> str:
+    """Возвращает исходный код модуля с номером index"""
+    lines = [f'"""Синтетический модуль {index}."""']
+    lines.extend(f'import {name}' for name in rng.sample(_STDLIB_IMPORTS, rng.randint(1, 3)))
+
+    callees = []
+    # Импортируются только модули с меньшими номерами, чтобы граф был похож на реальный
+    for target in range(index):
+        if rng.random() < import_density / index:
+            package, module = paths[target][:-3].split('/')
+            alias = f'm{target}'
+            lines.append(f'from {package} import {module} as {alias}')
+            callees.append(f'{alias}.func0')
+    lines.append('')
+    lines.append(f'CONSTANT = {rng.randint(0, 1000)}')
+    lines.append('')
+
+    for i in range(functions):
+        lines.extend(_function(rng, f'func{i}', ['x'], '', nesting, callees + [f'func{j}' for j in range(i)]))
+
+    for c in range(classes):
+        lines.append(f'class Class{c}({"Class" + str(c - 1) if c else "object"}):')
+        lines.append(f'    """Синтетический класс {c}."""')
+        lines.append('')
+        methods = [f'self.method{j}' for j in range(2)]
+        for m in range(rng.randint(1, 4)):
+            lines.extend(_function(rng, f'method{m}', ['self', 'x'], '    ', nesting, callees + methods[:m]))
+
+    lines.append('if __name__ == "__main__":')
+    lines.append('    func0(1)')
+    return '\n'.join(lines) + '\n'
+
+
+def generate_project(root: str, files: int = 40, functions: int = 8, classes: int = 2, nesting: int = 3,
+                     import_density: float = 2.0, packages: int = 8, seed: int = 0) -> List[str]:
+    """
+    Создает синтетический проект.
+
+    Args:
+        root: Директория проекта (создается при необходимости)
+        files: Количество модулей
+        functions: Количество функций верхнего уровня в модуле
+        classes: Количество классов в модуле
+        nesting: Максимальная глубина вложенности блоков в функциях
+        import_density: Среднее число импортов модулей проекта в модуле
+        packages: Количество пакетов, по которым распределяются модули
+        seed: Начальное значение генератора случайных чисел
+
+    Returns:
+        Относительные пути созданных модулей
+    """
+    rng = random.Random(seed)
+    packages = max(1, min(packages, files))
+    paths = _module_paths(files, packages)
+
+    for package in range(packages):
+        os.makedirs(os.path.join(root, f'pkg{package}'), exist_ok=True)
+        with open(os.path.join(root, f'pkg{package}', '__init__.py'), 'w', encoding='utf-8') as f:
+            f.write(f'"""Синтетический пакет {package}."""\n')
+
+    for index, rel_path in enumerate(paths):
+        source = generate_module(rng, index, paths, functions, classes, nesting, import_density)
+        with open(os.path.join(root, rel_path), 'w', encoding='utf-8') as f:
+            f.write(source)
+
+    return paths
+
+
+if __name__ == '__main__':
+    created = generate_project(sys.argv[1] if len(sys.argv) > 1 else 'synthetic_project',
+                               files=int(sys.argv[2]) if len(sys.argv) > 2 else 40)
+    print(f'{len(created)} modules')
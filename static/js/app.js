@@ -67,19 +67,30 @@ const App = {
     async _performAnalysis(projectPath) {
         this._showLoadingState();
 
-        console.log(`Sending analysis request: ${projectPath}`);
-        const response = await fetch('/analyze', {
+        console.log(`Sending analysis job: ${projectPath}`);
+        const response = await fetch('/jobs', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/x-www-form-urlencoded',
             },
-            body: `project_path=${encodeURIComponent(projectPath)}`
+            body: Utils.analysisFormBody(projectPath)
         });
 
-        const data = await response.json();
-        console.log('Received response from server:', data);
+        const job = await response.json();
+        console.log('Analysis job created:', job);
 
-        if (response.ok) {
+        if (!response.ok) {
+            this._hideProgress();
+            alert(`Error: ${job.error}`);
+            document.getElementById('results').classList.add('d-none');
+            return;
+        }
+
+        const finishedJob = await this._waitForJob(job.job_id);
+        this._hideProgress();
+
+        if (finishedJob.status === 'done') {
+            const data = finishedJob.result;
             window.currentProjectId = data.project_id;
 
             this._updateSummary(data.summary);
@@ -98,12 +109,121 @@ const App = {
             }
 
             console.log('Visualization complete');
+        } else if (finishedJob.status === 'cancelled') {
+            Utils.showNotification('Анализ отменен', 'warning');
+            document.getElementById('results').classList.add('d-none');
         } else {
-            alert(`Error: ${data.error}`);
+            alert(`Error: ${finishedJob.error}`);
             document.getElementById('results').classList.add('d-none');
         }
     },
 
+    /**
+     * Follow analysis job progress via Server-Sent Events
+     * @param {string} jobId - Job identifier
+     * @returns {Promise<Object>} Final job state
+     * @private
+     */
+    _waitForJob(jobId) {
+        this._showProgress(jobId);
+
+        return new Promise((resolve, reject) => {
+            const events = new EventSource(`/jobs/${jobId}/events`);
+
+            events.addEventListener('progress', (event) => {
+                this._updateProgress(JSON.parse(event.data));
+            });
+
+            events.addEventListener('finished', (event) => {
+                events.close();
+                const job = JSON.parse(event.data);
+                this._updateProgress(job);
+                resolve(job);
+            });
+
+            events.onerror = async () => {
+                // The stream was interrupted; fall back to the status endpoint
+                events.close();
+                try {
+                    const response = await fetch(`/jobs/${jobId}`);
+                    const job = await response.json();
+                    if (!response.ok) {
+                        throw new Error(job.error || response.status);
+                    }
+                    resolve(job.status === 'queued' || job.status === 'running' ? await this._waitForJob(jobId) : job);
+                } catch (error) {
+                    reject(error);
+                }
+            };
+        });
+    },
+
+    /**
+     * Show analysis progress bar with cancel button
+     * @param {string} jobId - Job identifier
+     * @private
+     */
+    _showProgress(jobId) {
+        let progress = document.getElementById('analysis-progress');
+
+        if (!progress) {
+            progress = document.createElement('div');
+            progress.id = 'analysis-progress';
+            progress.className = 'mt-3';
+            progress.innerHTML = `
+                <div class="progress mb-2">
+                    <div class="progress-bar progress-bar-striped progress-bar-animated" role="progressbar" style="width: 0%"></div>
+                </div>
+                <div class="d-flex justify-content-between align-items-center">
+                    <small class="text-muted" id="analysis-progress-text">Ожидание в очереди...</small>
+                    <button type="button" class="btn btn-sm btn-outline-danger" id="analysis-cancel">Отменить</button>
+                </div>
+            `;
+
+            const analyzeForm = document.getElementById('analyze-form');
+            analyzeForm.parentNode.insertBefore(progress, analyzeForm.nextSibling);
+        }
+
+        document.getElementById('analysis-cancel').onclick = () => {
+            fetch(`/jobs/${jobId}/cancel`, { method: 'POST' })
+                .catch(error => Utils.handleError(error, 'cancelling analysis'));
+        };
+    },
+
+    /**
+     * Update analysis progress bar
+     * @param {Object} job - Job state from the server
+     * @private
+     */
+    _updateProgress(job) {
+        const bar = document.querySelector('#analysis-progress .progress-bar');
+        const text = document.getElementById('analysis-progress-text');
+        if (!bar || !text) {
+            return;
+        }
+
+        const percent = job.files_total > 0 ? Math.round(job.files_done / job.files_total * 100) : 0;
+        bar.style.width = `${percent}%`;
+
+        if (job.status === 'queued') {
+            text.textContent = 'Ожидание в очереди...';
+        } else {
+            const eta = job.eta !== null ? `, осталось ~${Math.ceil(job.eta)} с` : '';
+            text.textContent = `${job.files_done} / ${job.files_total} файлов (${job.throughput} файлов/с${eta})`;
+        }
+    },
+
+    /**
+     * Remove analysis progress bar
+     * @private
+     */
+    _hideProgress() {
+        const progress = document.getElementById('analysis-progress');
+        if (progress) {
+            progress.remove();
+        }
+    },
+
     /**
      * Show loading state for analysis
      * @private
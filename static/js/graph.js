@@ -5,6 +5,11 @@ const Graph = {
     currentGraph: null,
     svg: null,
     simulation: null,
+    nodes: [],
+    links: [],
+    liveEvents: null,
+    // Graphs with more nodes are rendered from the clustered server view on canvas
+    LARGE_GRAPH_NODES: 500,
 
     /**
      * Load and visualize dependency graph
@@ -15,6 +20,17 @@ const Graph = {
         try {
             const container = document.getElementById('dependency-graph');
             container.innerHTML = '<div class="text-center"><div class="spinner-border" role="status"><span class="visually-hidden">Loading...</span></div></div>';
+
+            if (GraphView.projectId !== projectId) {
+                GraphView.expanded.clear();
+            }
+            const view = await GraphView.fetchView(projectId);
+            if (view.total_nodes > this.LARGE_GRAPH_NODES) {
+                this.simulation = null;
+                GraphView.render(container, projectId, view);
+                return;
+            }
+
             const response = await fetch(`/dependencies/${projectId}`);
             const dependencies = await response.json();
 
@@ -167,16 +183,13 @@ const Graph = {
             .attr('stroke', '#f5f5f5')
             .attr('stroke-width', 1);
 
-        const link = mainGroup.append('g')
-            .selectAll('line')
-            .data(links)
-            .join('line')
-            .attr('stroke', '#999')
-            .attr('stroke-opacity', 0.6)
-            .attr('stroke-width', 1.5)
-            .attr('marker-end', 'url(#arrowhead)');
-
-        const tooltip = d3.select('body').append('div')
+        this.width = width;
+        this.height = height;
+        this.nodes = nodes;
+        this.links = links;
+        this.linkLayer = mainGroup.append('g');
+
+        this.tooltip = d3.select('body').append('div')
             .attr('class', 'graph-tooltip')
             .style('display', 'none')
             .style('position', 'absolute')
@@ -188,77 +201,20 @@ const Graph = {
             .style('pointer-events', 'none')
             .style('z-index', '1000');
 
-        const nodeGroup = mainGroup.append('g')
-            .selectAll('g')
-            .data(nodes)
-            .join('g')
-            .call(this._dragBehavior(simulation))
-            .on('mouseover', function(event, d) {
-                d3.select(this).select('circle').transition()
-                    .attr('r', d => d.isProjectModule ? 12 : 8)
-                    .attr('stroke-width', 3);
-                tooltip.style('display', 'block')
-                    .html(`<strong>${d.id}</strong>`)
-                    .style('left', (event.pageX + 10) + 'px')
-                    .style('top', (event.pageY - 20) + 'px');
-            })
-            .on('mouseout', function(event, d) {
-                d3.select(this).select('circle').transition()
-                    .attr('r', d => d.isProjectModule ? 10 : 6)
-                    .attr('stroke-width', 1.5);
-
-                tooltip.style('display', 'none');
-            });
-
-        nodeGroup.append('circle')
-            .attr('r', d => d.isProjectModule ? 10 : 6)
-            .attr('fill', d => {
-                if (d.isProjectModule) {
-                    const depCount = links.filter(l => l.source.id === d.id).length;
-                    return d3.interpolateBlues(0.3 + Math.min(depCount / 10, 0.7));
-                } else {
-                    return '#f0c297';
-                }
-            })
-            .attr('stroke', window.Theme && window.Theme.current === 'dark' ? '#333' : '#f5f5f5')
-            .attr('stroke-width', 1.5);
-
-		nodeGroup.append('rect')
-			.attr('rx', 3)
-			.attr('ry', 3)
-			.attr('x', 12)
-			.attr('y', -9)
-			.attr('fill', window.Theme && window.Theme.current === 'dark' ? '#333' : 'white')
-			.attr('opacity', 0.8)
-			.attr('stroke', window.Theme && window.Theme.current === 'dark' ? '#555' : '#eee')
-			.attr('stroke-width', 0.5)
-			.attr('width', d => Math.min(d.displayName.length * 6.5 + 6, 150))
-			.attr('height', 18);
-
-        nodeGroup.append('text')
-            .text(d => {
-                if (d.displayName.length > 20) {
-                    return d.displayName.substring(0, 18) + '...';
-                }
-                return d.displayName;
-            })
-            .attr('font-size', 12)
-            .attr('font-family', 'Arial, sans-serif')
-            .attr('fill', window.Theme && window.Theme.current === 'dark' ? '#f5f5f5' : 'inherit')
-            .attr('x', 15)
-            .attr('y', 3);
+        this.nodeLayer = mainGroup.append('g');
+        this._joinElements();
 
 		if (window.Theme) {
 			window.Theme.updateGraphTheme();
 		}
 
         simulation.on('tick', () => {
-            nodes.forEach(d => {
+            simulation.nodes().forEach(d => {
                 d.x = Math.max(30, Math.min(width - 30, d.x));
                 d.y = Math.max(30, Math.min(height - 30, d.y));
             });
 
-            link
+            this.linkSelection
                 .attr('x1', d => d.source.x)
                 .attr('y1', d => d.source.y)
                 .attr('x2', d => {
@@ -278,13 +234,218 @@ const Graph = {
                     return dist === 0 ? d.target.y : d.source.y + dy * (1 - targetRadius / dist);
                 });
 
-            nodeGroup
+            this.nodeSelection
                 .attr('transform', d => `translate(${d.x}, ${d.y})`);
         });
 
         this._addGraphControls(container, svg, zoom);
     },
 
+    /**
+     * Create, update and remove SVG elements for the current nodes and links.
+     * Elements are keyed by node id, so existing nodes keep their positions.
+     * @private
+     */
+    _joinElements() {
+        const dark = window.Theme && window.Theme.current === 'dark';
+        const tooltip = this.tooltip;
+
+        this.linkSelection = this.linkLayer.selectAll('line')
+            .data(this.links, d => `${d.source.id}->${d.target.id}`)
+            .join(enter => enter.append('line')
+                .attr('stroke', '#999')
+                .attr('stroke-opacity', 0.6)
+                .attr('stroke-width', 1.5)
+                .attr('marker-end', 'url(#arrowhead)'));
+
+        this.nodeSelection = this.nodeLayer.selectAll('g')
+            .data(this.nodes, d => d.id)
+            .join(enter => {
+                const nodeGroup = enter.append('g')
+                    .call(this._dragBehavior(this.simulation))
+                    .on('mouseover', function(event, d) {
+                        d3.select(this).select('circle').transition()
+                            .attr('r', d => d.isProjectModule ? 12 : 8)
+                            .attr('stroke-width', 3);
+                        tooltip.style('display', 'block')
+                            .html(`<strong>${d.id}</strong>`)
+                            .style('left', (event.pageX + 10) + 'px')
+                            .style('top', (event.pageY - 20) + 'px');
+                    })
+                    .on('mouseout', function(event, d) {
+                        d3.select(this).select('circle').transition()
+                            .attr('r', d => d.isProjectModule ? 10 : 6)
+                            .attr('stroke-width', 1.5);
+
+                        tooltip.style('display', 'none');
+                    });
+
+                nodeGroup.append('circle')
+                    .attr('r', d => d.isProjectModule ? 10 : 6)
+                    .attr('stroke', dark ? '#333' : '#f5f5f5')
+                    .attr('stroke-width', 1.5);
+
+                nodeGroup.append('rect')
+                    .attr('rx', 3)
+                    .attr('ry', 3)
+                    .attr('x', 12)
+                    .attr('y', -9)
+                    .attr('fill', dark ? '#333' : 'white')
+                    .attr('opacity', 0.8)
+                    .attr('stroke', dark ? '#555' : '#eee')
+                    .attr('stroke-width', 0.5)
+                    .attr('width', d => Math.min(d.displayName.length * 6.5 + 6, 150))
+                    .attr('height', 18);
+
+                nodeGroup.append('text')
+                    .text(d => {
+                        if (d.displayName.length > 20) {
+                            return d.displayName.substring(0, 18) + '...';
+                        }
+                        return d.displayName;
+                    })
+                    .attr('font-size', 12)
+                    .attr('font-family', 'Arial, sans-serif')
+                    .attr('fill', dark ? '#f5f5f5' : 'inherit')
+                    .attr('x', 15)
+                    .attr('y', 3);
+
+                return nodeGroup;
+            });
+
+        const depCounts = new Map();
+        this.links.forEach(l => depCounts.set(l.source.id, (depCounts.get(l.source.id) || 0) + 1));
+
+        this.nodeSelection.select('circle')
+            .attr('fill', d => {
+                if (d.isProjectModule) {
+                    const depCount = depCounts.get(d.id) || 0;
+                    return d3.interpolateBlues(0.3 + Math.min(depCount / 10, 0.7));
+                } else {
+                    return '#f0c297';
+                }
+            });
+    },
+
+    /**
+     * Start watching the project and apply incremental updates to the graph
+     * @param {string} projectPath - Path to the project
+     * @returns {Promise<void>}
+     */
+    async startLiveUpdates(projectPath) {
+        this.stopLiveUpdates();
+
+        const response = await fetch('/watch', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/x-www-form-urlencoded',
+            },
+            body: Utils.analysisFormBody(projectPath)
+        });
+        const result = await response.json();
+
+        if (!response.ok) {
+            Utils.showNotification(result.error, 'danger');
+            return;
+        }
+
+        const projectId = result.project_id;
+        window.currentProjectId = projectId;
+        if (!this.simulation) {
+            await this.loadDependencyGraph(projectId);
+        }
+
+        const events = new EventSource(`/watch/${projectId}/events`);
+        events.addEventListener('update', (event) => {
+            const update = JSON.parse(event.data);
+            console.log(`Live update ${update.version}: ${update.elapsed_ms} ms`);
+            this._applyUpdate(update);
+            if (window.App) {
+                App._updateSummary(update.summary);
+            }
+        });
+        events.addEventListener('reset', () => {
+            this.loadDependencyGraph(projectId);
+        });
+        events.addEventListener('stopped', () => {
+            events.close();
+        });
+
+        this.liveEvents = { projectId, events };
+        Utils.showNotification('Живое обновление графа включено');
+    },
+
+    /**
+     * Stop watching the project
+     * @returns {Promise<void>}
+     */
+    async stopLiveUpdates() {
+        if (!this.liveEvents) {
+            return;
+        }
+
+        const { projectId, events } = this.liveEvents;
+        this.liveEvents = null;
+        events.close();
+        await fetch(`/watch/${projectId}/stop`, { method: 'POST' });
+    },
+
+    /**
+     * Apply changed modules and dependency edges without re-rendering the graph
+     * @param {Object} update - Update event from /watch/<project_id>/events
+     * @private
+     */
+    _applyUpdate(update) {
+        if (!this.simulation) {
+            // Large graphs are laid out on the server: fetch the updated view
+            if (GraphView.view) {
+                GraphView.reload();
+            }
+            return;
+        }
+
+        const removedModules = new Set(update.modules.removed);
+        const removedLinks = new Set(update.dependencies.removed.map(([source, target]) => `${source}->${target}`));
+        const links = this.links.filter(l => !removedModules.has(l.source.id) &&
+                                             !removedModules.has(l.target.id) &&
+                                             !removedLinks.has(`${l.source.id}->${l.target.id}`));
+
+        const nodeById = new Map(this.nodes.map(node => [node.id, node]));
+        const getNode = (id, isProjectModule) => {
+            if (!nodeById.has(id)) {
+                nodeById.set(id, {
+                    id: id,
+                    displayName: Utils.getFilenameFromPath(id),
+                    isProjectModule: isProjectModule,
+                    x: this.width / 2,
+                    y: this.height / 2
+                });
+            }
+            return nodeById.get(id);
+        };
+
+        update.modules.added.forEach(module => getNode(module, true));
+        update.dependencies.added.forEach(([source, target]) => {
+            links.push({ source: getNode(source, true), target: getNode(target, false) });
+        });
+
+        // External modules are shown only while something still imports them
+        const linked = new Set();
+        links.forEach(l => {
+            linked.add(l.source.id);
+            linked.add(l.target.id);
+        });
+
+        this.links = links;
+        this.nodes = Array.from(nodeById.values())
+            .filter(node => !removedModules.has(node.id) && (node.isProjectModule || linked.has(node.id)));
+
+        this.simulation.nodes(this.nodes);
+        this.simulation.force('link').links(this.links);
+        this._joinElements();
+        this.simulation.alpha(0.3).restart();
+    },
+
     /**
      * Create drag behavior for graph nodes
      * @param {d3.Simulation} simulation - D3 force simulation
@@ -353,6 +514,9 @@ const Graph = {
                 <button id="reset-view" class="btn btn-sm btn-outline-secondary">
                     <i class="bi bi-arrows-fullscreen"></i> Сбросить
                 </button>
+                <button id="live-toggle" class="btn btn-sm btn-outline-success">
+                    <i class="bi bi-broadcast"></i> ${this.liveEvents ? 'Остановить наблюдение' : 'Живое обновление'}
+                </button>
             </div>
             <div class="form-inline">
                 <div class="form-group mr-2">
@@ -375,6 +539,19 @@ const Graph = {
             svg.transition().call(zoom.transform, d3.zoomIdentity);
         });
 
+        document.getElementById('live-toggle').addEventListener('click', async (e) => {
+            const button = e.currentTarget;
+            if (this.liveEvents) {
+                await this.stopLiveUpdates();
+                button.innerHTML = '<i class="bi bi-broadcast"></i> Живое обновление';
+            } else {
+                await this.startLiveUpdates(document.getElementById('project-path').value);
+                if (this.liveEvents) {
+                    button.innerHTML = '<i class="bi bi-broadcast"></i> Остановить наблюдение';
+                }
+            }
+        });
+
         document.getElementById('filter-input').addEventListener('input', (e) => {
             const filterTerm = e.target.value.toLowerCase();
 
@@ -415,60 +592,16 @@ const Graph = {
     },
 
     /**
-     * Export graph as SVG image
+     * Export dependency graph as SVG image generated on the server
      * @param {string} projectId - Project identifier
      * @returns {Promise<void>}
      */
     async exportGraphAsSVG(projectId) {
-        try {
-            const svgElement = document.querySelector('#dependency-graph svg');
-            if (!svgElement) {
-                console.error('SVG element not found');
-                Utils.showNotification('SVG element not found for export', 'danger');
-                return;
-            }
-
-            const svgClone = svgElement.cloneNode(true);
-            svgClone.setAttribute('xmlns', 'http://www.w3.org/2000/svg');
-            svgClone.setAttribute('width', svgElement.getAttribute('width'));
-            svgClone.setAttribute('height', svgElement.getAttribute('height'));
-            const style = document.createElement('style');
-            style.textContent = `
-                line { stroke: #999; stroke-opacity: 0.6; stroke-width: 2px; }
-                circle { stroke: #fff; stroke-width: 1.5px; }
-                text { font-size: 10px; font-family: Arial, sans-serif; }
-            `;
-            svgClone.insertBefore(style, svgClone.firstChild);
-            const svgData = new XMLSerializer().serializeToString(svgClone);
-            const blob = new Blob([svgData], { type: 'image/svg+xml;charset=utf-8' });
-
-            Utils.triggerDownload(blob, 'dependency_graph.svg');
-            if (projectId) {
-                try {
-                    const response = await fetch(`/save_graph/${projectId}`, {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify({ svg_data: svgData })
-                    });
-
-                    const result = await response.json();
-
-                    if (response.ok) {
-                        console.log('Graph saved successfully on server:', result.message);
-                        Utils.showNotification(result.message);
-                    } else {
-                        console.error('Error saving graph on server:', result.error);
-                        Utils.showNotification(result.error, 'danger');
-                    }
-                } catch (error) {
-                    Utils.handleError(error, 'saving graph to server');
-                }
-            }
-        } catch (error) {
-            Utils.handleError(error, 'exporting graph as SVG');
+        if (!projectId) {
+            Utils.showNotification('Project not found for export', 'danger');
+            return;
         }
+        await Export._exportFromServer(projectId, 'svg', 'graph');
     }
 };
 
@@ -0,0 +1,367 @@
+/**
+ * Canvas renderer for large dependency graphs.
+ *
+ * The server aggregates modules into package clusters and precomputes
+ * node coordinates (/graph_view), so the client only draws: nodes and
+ * links outside the viewport are skipped, and labels and thin links are
+ * dropped when zoomed out.
+ */
+const GraphView = {
+    projectId: null,
+    view: null,
+    expanded: new Set(),
+    hiddenKinds: new Set(['stdlib']),
+    maxDegree: 25,
+    canvas: null,
+    context: null,
+    transform: null,
+    quadtree: null,
+    nodeById: new Map(),
+    hoveredNode: null,
+    frameRequested: false,
+    resizeHandler: null,
+
+    KIND_COLORS: {
+        internal: '#4c8cd8',
+        stdlib: '#9aa5b1',
+        third_party: '#f0a15c'
+    },
+    // Zoom levels below which labels and single-import links are not drawn
+    LABEL_ZOOM: 0.6,
+    LINK_ZOOM: 0.25,
+
+    /**
+     * Build the query string for the current view state
+     * @returns {string} Query string
+     * @private
+     */
+    _query() {
+        const params = new URLSearchParams();
+        if (this.expanded.size) {
+            params.set('expand', Array.from(this.expanded).join(','));
+        }
+        if (this.hiddenKinds.size) {
+            params.set('hide', Array.from(this.hiddenKinds).join(','));
+        }
+        if (this.maxDegree) {
+            params.set('max_degree', this.maxDegree);
+        }
+        return params.toString();
+    },
+
+    /**
+     * Fetch the clustered graph view from the server
+     * @param {string} projectId - Project identifier
+     * @returns {Promise<Object>} Graph view
+     */
+    async fetchView(projectId) {
+        const response = await fetch(`/graph_view/${projectId}?${this._query()}`);
+        const view = await response.json();
+        if (!response.ok) {
+            throw new Error(view.error);
+        }
+        return view;
+    },
+
+    /**
+     * Render a graph view into the container
+     * @param {HTMLElement} container - Container element
+     * @param {string} projectId - Project identifier
+     * @param {Object} view - Graph view from /graph_view
+     */
+    render(container, projectId, view) {
+        this.projectId = projectId;
+        container.innerHTML = '';
+        this._addControls(container);
+
+        const canvas = document.createElement('canvas');
+        canvas.style.width = '100%';
+        canvas.style.height = '800px';
+        canvas.style.border = '1px solid #ddd';
+        canvas.style.borderRadius = '4px';
+        canvas.style.cursor = 'grab';
+        container.appendChild(canvas);
+
+        this.canvas = canvas;
+        this.context = canvas.getContext('2d');
+        this._resizeCanvas();
+
+        this.zoom = d3.zoom()
+            .scaleExtent([0.02, 4])
+            .on('zoom', (event) => {
+                this.transform = event.transform;
+                this._requestDraw();
+            });
+        d3.select(canvas).call(this.zoom);
+
+        canvas.addEventListener('mousemove', (event) => this._onHover(event));
+        canvas.addEventListener('click', (event) => this._onClick(event));
+        // The window outlives the canvas: keep a single handler across re-renders
+        if (!this.resizeHandler) {
+            this.resizeHandler = () => {
+                if (this.canvas && this.canvas.isConnected) {
+                    this._resizeCanvas();
+                    this._requestDraw();
+                }
+            };
+            window.addEventListener('resize', this.resizeHandler);
+        }
+
+        this._setView(view, true);
+    },
+
+    /**
+     * Replace the displayed view, keeping the current zoom unless asked to fit
+     * @param {Object} view - Graph view
+     * @param {boolean} fit - Fit the whole graph into the canvas
+     * @private
+     */
+    _setView(view, fit) {
+        this.view = view;
+        this.nodeById = new Map(view.nodes.map(node => [node.id, node]));
+        view.links.forEach(link => {
+            link.sourceNode = this.nodeById.get(link.source);
+            link.targetNode = this.nodeById.get(link.target);
+        });
+        this.quadtree = d3.quadtree(view.nodes, d => d.x, d => d.y);
+
+        const info = document.getElementById('graph-view-info');
+        if (info) {
+            info.textContent = `Узлов: ${view.nodes.length} (модулей и пакетов: ${view.total_nodes}), ` +
+                `ребер: ${view.links.length}, скрыто узлов: ${view.hidden_nodes}, ребер: ${view.hidden_links}`;
+        }
+
+        if (fit) {
+            this._fit();
+        } else {
+            this._requestDraw();
+        }
+    },
+
+    /**
+     * Reload the view after expanding a cluster or changing filters
+     * @returns {Promise<void>}
+     */
+    async reload() {
+        try {
+            const view = await this.fetchView(this.projectId);
+            this._setView(view, false);
+        } catch (error) {
+            Utils.handleError(error, 'loading graph view');
+        }
+    },
+
+    _resizeCanvas() {
+        const ratio = window.devicePixelRatio || 1;
+        const rect = this.canvas.getBoundingClientRect();
+        this.width = rect.width;
+        this.height = rect.height;
+        this.canvas.width = Math.round(rect.width * ratio);
+        this.canvas.height = Math.round(rect.height * ratio);
+        this.context.setTransform(ratio, 0, 0, ratio, 0, 0);
+    },
+
+    _fit() {
+        const nodes = this.view.nodes;
+        if (!nodes.length) {
+            this._requestDraw();
+            return;
+        }
+        const [minX, maxX] = d3.extent(nodes, d => d.x);
+        const [minY, maxY] = d3.extent(nodes, d => d.y);
+        const scale = Math.min(2, 0.9 * Math.min(this.width / (maxX - minX + 100), this.height / (maxY - minY + 100)));
+        const transform = d3.zoomIdentity
+            .translate(this.width / 2, this.height / 2)
+            .scale(scale)
+            .translate(-(minX + maxX) / 2, -(minY + maxY) / 2);
+        d3.select(this.canvas).call(this.zoom.transform, transform);
+    },
+
+    _requestDraw() {
+        if (this.frameRequested) {
+            return;
+        }
+        this.frameRequested = true;
+        window.requestAnimationFrame(() => {
+            this.frameRequested = false;
+            this._draw();
+        });
+    },
+
+    _radius(node) {
+        return node.cluster ? 6 + Math.min(18, Math.sqrt(node.size) * 2) : 5;
+    },
+
+    /**
+     * Draw visible links and nodes; everything outside the viewport is culled
+     * @private
+     */
+    _draw() {
+        const ctx = this.context;
+        const t = this.transform || d3.zoomIdentity;
+        const dark = window.Theme && window.Theme.current === 'dark';
+
+        ctx.save();
+        ctx.clearRect(0, 0, this.width, this.height);
+        ctx.translate(t.x, t.y);
+        ctx.scale(t.k, t.k);
+
+        // Visible area in graph coordinates with a margin for labels
+        const margin = 150 / t.k;
+        const x0 = -t.x / t.k - margin;
+        const y0 = -t.y / t.k - margin;
+        const x1 = (this.width - t.x) / t.k + margin;
+        const y1 = (this.height - t.y) / t.k + margin;
+        const visible = (x, y) => x >= x0 && x <= x1 && y >= y0 && y <= y1;
+
+        const hovered = this.hoveredNode;
+        ctx.lineWidth = 1 / t.k;
+        ctx.strokeStyle = dark ? 'rgba(200, 200, 200, 0.25)' : 'rgba(120, 120, 120, 0.3)';
+        ctx.beginPath();
+        for (const link of this.view.links) {
+            const s = link.sourceNode;
+            const d = link.targetNode;
+            if (!visible(s.x, s.y) && !visible(d.x, d.y)) {
+                continue;
+            }
+            if (t.k < this.LINK_ZOOM && link.weight < 2 && s !== hovered && d !== hovered) {
+                continue;
+            }
+            ctx.moveTo(s.x, s.y);
+            ctx.lineTo(d.x, d.y);
+        }
+        ctx.stroke();
+
+        if (hovered) {
+            ctx.strokeStyle = '#d9534f';
+            ctx.lineWidth = 2 / t.k;
+            ctx.beginPath();
+            for (const link of this.view.links) {
+                if (link.sourceNode === hovered || link.targetNode === hovered) {
+                    ctx.moveTo(link.sourceNode.x, link.sourceNode.y);
+                    ctx.lineTo(link.targetNode.x, link.targetNode.y);
+                }
+            }
+            ctx.stroke();
+        }
+
+        const showLabels = t.k >= this.LABEL_ZOOM;
+        ctx.font = '12px Arial, sans-serif';
+        ctx.textBaseline = 'middle';
+        for (const node of this.view.nodes) {
+            if (!visible(node.x, node.y)) {
+                continue;
+            }
+            const r = this._radius(node);
+            ctx.beginPath();
+            ctx.arc(node.x, node.y, r, 0, 2 * Math.PI);
+            ctx.fillStyle = this.KIND_COLORS[node.kind] || '#999';
+            ctx.fill();
+            if (node.cluster) {
+                ctx.lineWidth = 2 / t.k;
+                ctx.strokeStyle = dark ? '#f5f5f5' : '#333';
+                ctx.stroke();
+            }
+            if (showLabels || (node.cluster && t.k >= this.LINK_ZOOM) || node === hovered) {
+                ctx.fillStyle = dark ? '#f5f5f5' : '#222';
+                const label = node.cluster ? `${node.label} (${node.size})` : node.label;
+                ctx.fillText(label, node.x + r + 3, node.y);
+            }
+        }
+
+        ctx.restore();
+    },
+
+    /**
+     * Find the node under the mouse pointer
+     * @param {MouseEvent} event - Mouse event
+     * @returns {Object|undefined} Node
+     * @private
+     */
+    _nodeAt(event) {
+        const rect = this.canvas.getBoundingClientRect();
+        const t = this.transform || d3.zoomIdentity;
+        const [x, y] = t.invert([event.clientX - rect.left, event.clientY - rect.top]);
+        const node = this.quadtree.find(x, y, 30);
+        if (node && Math.hypot(node.x - x, node.y - y) <= this._radius(node) + 3 / t.k) {
+            return node;
+        }
+        return undefined;
+    },
+
+    _onHover(event) {
+        const node = this._nodeAt(event);
+        if (node === this.hoveredNode) {
+            return;
+        }
+        this.hoveredNode = node;
+        this.canvas.style.cursor = node ? 'pointer' : 'grab';
+        this.canvas.title = node ?
+            `${node.id}\nмодулей: ${node.size}, зависимостей: ${node.out_degree}, зависимых: ${node.in_degree}` : '';
+        this._requestDraw();
+    },
+
+    _onClick(event) {
+        const node = this._nodeAt(event);
+        if (node && node.cluster) {
+            this.expanded.add(node.id);
+            this.reload();
+        }
+    },
+
+    /**
+     * Add controls for filters and cluster expansion
+     * @param {HTMLElement} container - Container element
+     * @private
+     */
+    _addControls(container) {
+        const controlPanel = document.createElement('div');
+        controlPanel.className = 'graph-controls mt-3 mb-3';
+        controlPanel.innerHTML = `
+            <div class="mb-2">
+                <button id="graph-view-fit" class="btn btn-sm btn-outline-secondary">
+                    <i class="bi bi-arrows-fullscreen"></i> Показать все
+                </button>
+                <button id="graph-view-collapse" class="btn btn-sm btn-outline-secondary">
+                    <i class="bi bi-arrows-collapse"></i> Свернуть пакеты
+                </button>
+                <label class="ms-3"><input type="checkbox" id="graph-view-stdlib"> Стандартная библиотека</label>
+                <label class="ms-2"><input type="checkbox" id="graph-view-third-party"> Сторонние пакеты</label>
+                <label class="ms-3">Макс. ребер узла:
+                    <input type="number" id="graph-view-degree" min="0" style="width: 5em" value="${this.maxDegree}">
+                </label>
+            </div>
+            <div class="text-muted small" id="graph-view-info"></div>
+            <div class="text-muted small">Щелчок по пакету раскрывает его модули.</div>
+        `;
+        container.appendChild(controlPanel);
+
+        const stdlib = document.getElementById('graph-view-stdlib');
+        const thirdParty = document.getElementById('graph-view-third-party');
+        stdlib.checked = !this.hiddenKinds.has('stdlib');
+        thirdParty.checked = !this.hiddenKinds.has('third_party');
+
+        const toggleKind = (kind, shown) => {
+            if (shown) {
+                this.hiddenKinds.delete(kind);
+            } else {
+                this.hiddenKinds.add(kind);
+            }
+            this.reload();
+        };
+        stdlib.addEventListener('change', (e) => toggleKind('stdlib', e.target.checked));
+        thirdParty.addEventListener('change', (e) => toggleKind('third_party', e.target.checked));
+
+        document.getElementById('graph-view-degree').addEventListener('change', (e) => {
+            this.maxDegree = Math.max(0, parseInt(e.target.value, 10) || 0);
+            this.reload();
+        });
+        document.getElementById('graph-view-fit').addEventListener('click', () => this._fit());
+        document.getElementById('graph-view-collapse').addEventListener('click', () => {
+            this.expanded.clear();
+            this.reload();
+        });
+    }
+};
+
+window.GraphView = GraphView;
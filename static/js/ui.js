@@ -83,6 +83,7 @@ const UI = {
             `;
 
             document.body.appendChild(historyModal);
+            this._setupReportFilters();
         }
 
         const modal = new bootstrap.Modal(historyModal);
@@ -91,20 +92,33 @@ const UI = {
     },
 
     /**
-     * Load and display reports list
+     * Load and display reports list. Filtering and paging are done on the server.
+     * @param {boolean} append - Append the next page to the table instead of replacing it
      * @returns {Promise<void>}
      */
-    async loadReportsList() {
+    async loadReportsList(append = false) {
+        const requestId = (this._reportsRequestId || 0) + 1;
+        this._reportsRequestId = requestId;
+
         try {
-            const reports = await this._fetchReports();
+            const data = await this._fetchReports(this._reportsQuery(append ? this._reportsCursor : null));
+            if (requestId !== this._reportsRequestId) {
+                // A newer request (e.g. another filter) has been started
+                return;
+            }
+            this._reportsCursor = data.next_cursor;
             const reportsListContainer = document.getElementById('reports-list-container');
 
-            if (reports.length === 0) {
+            if (append) {
+                document.getElementById('reports-table-body')
+                    .insertAdjacentHTML('beforeend', this._generateReportsTableRows(data.reports));
+            } else if (data.reports.length === 0) {
                 reportsListContainer.innerHTML = `
                     <div class="alert alert-info">
-                        История отчетов пуста. Сохраните хотя бы один отчет.
+                        ${this._reportsFiltered() ? 'Нет отчетов, подходящих под фильтр.' : 'История отчетов пуста. Сохраните хотя бы один отчет.'}
                     </div>
                 `;
+                return;
             } else {
                 reportsListContainer.innerHTML = `
                     <table class="table table-striped table-hover">
@@ -118,13 +132,21 @@ const UI = {
                             </tr>
                         </thead>
                         <tbody id="reports-table-body">
-                            ${this._generateReportsTableRows(reports)}
+                            ${this._generateReportsTableRows(data.reports)}
                         </tbody>
                     </table>
+                    <div class="d-flex justify-content-between align-items-center">
+                        <small class="text-muted" id="reports-total"></small>
+                        <button type="button" class="btn btn-sm btn-outline-secondary" id="reports-load-more">Загрузить еще</button>
+                    </div>
                 `;
-
-                this._setupReportFilters();
+                document.getElementById('reports-load-more')
+                    .addEventListener('click', () => this.loadReportsList(true));
             }
+
+            const shown = document.querySelectorAll('#reports-table-body tr.report-item').length;
+            document.getElementById('reports-total').textContent = `Показано ${shown} из ${data.total}`;
+            document.getElementById('reports-load-more').style.display = data.next_cursor ? '' : 'none';
         } catch (error) {
             Utils.handleError(error, 'loading reports list');
 
@@ -138,20 +160,55 @@ const UI = {
     },
 
     /**
-     * Fetch reports from server
-     * @returns {Promise<Array>} Array of report objects
+     * Build the /list_reports query from the current filters
+     * @param {string|null} cursor - Cursor of the next page
+     * @returns {URLSearchParams} Query parameters
+     * @private
+     */
+    _reportsQuery(cursor) {
+        const params = new URLSearchParams();
+        const filterText = document.getElementById('reports-filter').value.trim();
+        const activeTypeButton = document.querySelector('.btn-group[aria-label="Фильтры по типу"] button.active');
+        const selectedType = activeTypeButton ? activeTypeButton.getAttribute('data-type') : 'all';
+
+        if (filterText) {
+            params.set('q', filterText);
+        }
+        if (selectedType !== 'all') {
+            params.set('type', selectedType);
+        }
+        if (cursor) {
+            params.set('cursor', cursor);
+        }
+        return params;
+    },
+
+    /**
+     * Check whether any report filter is active
+     * @returns {boolean}
      * @private
      */
-    async _fetchReports() {
+    _reportsFiltered() {
+        const params = this._reportsQuery(null);
+        return params.has('q') || params.has('type');
+    },
+
+    /**
+     * Fetch a page of reports from server
+     * @param {URLSearchParams} params - Query parameters
+     * @returns {Promise<Object>} Page with reports, total and next_cursor
+     * @private
+     */
+    async _fetchReports(params) {
         try {
-            const response = await fetch('/list_reports');
+            const response = await fetch(`/list_reports?${params.toString()}`);
             const data = await response.json();
 
             if (response.ok) {
-                return data.reports;
+                return data;
             } else {
                 console.error('Error loading reports list:', data.error);
-                return [];
+                return { reports: [], total: 0, next_cursor: null };
             }
         } catch (error) {
             console.error('Error fetching reports:', error);
@@ -213,7 +270,11 @@ const UI = {
     _setupReportFilters() {
         const filterInput = document.getElementById('reports-filter');
         if (filterInput) {
-            filterInput.addEventListener('input', () => this._filterReports());
+            let debounceTimer = null;
+            filterInput.addEventListener('input', () => {
+                clearTimeout(debounceTimer);
+                debounceTimer = setTimeout(() => this.loadReportsList(), 250);
+            });
         }
 
         const modal = document.getElementById('reports-history-modal');
@@ -223,28 +284,9 @@ const UI = {
             button.addEventListener('click', function() {
                 typeButtons.forEach(btn => btn.classList.remove('active'));
                 this.classList.add('active');
-                UI._filterReports();
+                UI.loadReportsList();
             });
         });
-    },
-
-    /**
-     * Filter reports based on current filters
-     * @private
-     */
-    _filterReports() {
-        const filterText = document.getElementById('reports-filter').value.toLowerCase();
-        const activeTypeButton = document.querySelector('.btn-group[aria-label="Фильтры по типу"] button.active');
-        const selectedType = activeTypeButton.getAttribute('data-type');
-        const allRows = document.querySelectorAll('#reports-table-body tr.report-item');
-
-        allRows.forEach(row => {
-            const filename = row.querySelector('td:first-child span').textContent.toLowerCase();
-            const type = row.getAttribute('data-type');
-            const matchesFilter = filename.includes(filterText);
-            const matchesType = selectedType === 'all' || type === selectedType;
-            row.style.display = (matchesFilter && matchesType) ? '' : 'none';
-        });
     }
 };
 
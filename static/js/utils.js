@@ -109,6 +109,39 @@ const Utils = {
         document.body.removeChild(link);
 
         URL.revokeObjectURL(url);
+    },
+
+    /**
+     * Trigger a download of a file served by the application
+     * @param {string} url - File URL
+     * @param {string} [filename] - Name for the downloaded file
+     */
+    downloadUrl: function(url, filename = '') {
+        const link = document.createElement('a');
+        link.href = url;
+        link.download = filename;
+
+        document.body.appendChild(link);
+        link.click();
+        document.body.removeChild(link);
+    },
+
+    /**
+     * Build the form body of an analysis request from the analysis form
+     * @param {string} projectPath - Path to the project
+     * @returns {string} URL-encoded form body
+     */
+    analysisFormBody: function(projectPath) {
+        const params = new URLSearchParams({project_path: projectPath});
+        const excludeDirs = document.getElementById('exclude-dirs');
+        if (excludeDirs && excludeDirs.value.trim()) {
+            params.append('exclude_dir', excludeDirs.value.trim());
+        }
+        const noDefaults = document.getElementById('no-default-excludes');
+        if (noDefaults && noDefaults.checked) {
+            params.append('no_default_excludes', '1');
+        }
+        return params.toString();
     }
 };
 
@@ -0,0 +1,17 @@
+# tests/conftest.py
+import os
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope='session')
+def app_data_dir(tmp_path_factory):
+    """Директории и базы данных приложения создаются во временной директории, а не в рабочей"""
+    data_dir = tmp_path_factory.mktemp('app_data')
+    previous = os.environ.get('CODE_ANALYZER_DATA_DIR')
+    os.environ['CODE_ANALYZER_DATA_DIR'] = str(data_dir)
+    yield data_dir
+    if previous is None:
+        os.environ.pop('CODE_ANALYZER_DATA_DIR', None)
+    else:
+        os.environ['CODE_ANALYZER_DATA_DIR'] = previous
@@ -0,0 +1,123 @@
+# tests/test_batch.py
+import json
+import threading
+import time
+
+import pytest
+
+from analyzer.batch import (
+    JOURNAL_NAME, ManifestError, SharedWorkerPool, load_manifest, read_journal, run_batch
+)
+from analyzer.core import CodeAnalyzer
+
+
+def _write(root, sources):
+    for path, source in sources.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(source, encoding='utf-8')
+
+
+def _project(root, modules):
+    _write(root, {f'pkg/mod{i}.py': f'import os\n\ndef func{i}(x):\n    return x + {i}\n' for i in range(modules)})
+    return root
+
+
+def _manifest(root, *paths):
+    (root / 'projects.txt').write_text(''.join(f'{path}\n' for path in paths), encoding='utf-8')
+    return root / 'projects.txt'
+
+
+def test_load_manifest(tmp_path):
+    (tmp_path / 'projects.txt').write_text('# nightly\nrepos/api\n\nrepos/web\n/abs/api\n', encoding='utf-8')
+    projects = load_manifest(str(tmp_path / 'projects.txt'), memory_limit=1024)
+    assert [project.name for project in projects] == ['api', 'web', 'api-2']
+    assert projects[0].path == str(tmp_path / 'repos' / 'api')
+    assert projects[2].path == '/abs/api'
+    assert all(project.memory_limit == 1024 for project in projects)
+
+    (tmp_path / 'projects.json').write_text(json.dumps({'projects': [
+        'repos/api', {'path': 'repos/web', 'name': 'frontend', 'memory_limit_mb': 0.5, 'exclude': ['tests/*']}
+    ]}), encoding='utf-8')
+    projects = load_manifest(str(tmp_path / 'projects.json'))
+    assert [project.name for project in projects] == ['api', 'frontend']
+    assert projects[0].memory_limit is None
+    assert projects[1].memory_limit == 512 * 1024
+    assert projects[1].exclude == ['tests/*']
+
+    (tmp_path / 'bad.json').write_text('[{"name": "no path"}]', encoding='utf-8')
+    with pytest.raises(ManifestError):
+        load_manifest(str(tmp_path / 'bad.json'))
+
+
+def test_pool_serves_projects_round_robin(tmp_path):
+    _project(tmp_path, 6)
+    submitted = []
+
+    class RecordingPool(SharedWorkerPool):
+        def _submit(self, chunk):
+            submitted.append(chunk.project)
+            super()._submit(chunk)
+
+    def tasks(indexes):
+        return [(str(tmp_path / f'pkg/mod{i}.py'), f'pkg/mod{i}.py', False, None, False) for i in indexes]
+
+    pool = RecordingPool(workers=1, chunk_size=1, max_pending=1)
+    results = {}
+
+    def consume(project, indexes):
+        results[project] = [rel_path for rel_path, *_ in pool.run(project, tasks(indexes))]
+
+    threads = [threading.Thread(target=consume, args=('big', range(4))),
+               threading.Thread(target=consume, args=('small', range(4, 6)))]
+    for thread in threads:
+        thread.start()
+    # Пул запускается, когда оба проекта поставили пакеты в очередь
+    deadline = time.monotonic() + 10
+    while len(pool._order) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    with pool:
+        for thread in threads:
+            thread.join(60)
+
+    assert results == {'big': [f'pkg/mod{i}.py' for i in range(4)], 'small': ['pkg/mod4.py', 'pkg/mod5.py']}
+    assert submitted == ['big', 'small', 'big', 'small', 'big', 'big']
+
+
+def test_run_batch_writes_reports_and_resumes(tmp_path):
+    _project(tmp_path / 'alpha', 3)
+    _project(tmp_path / 'beta', 5)
+    (tmp_path / 'projects.txt').write_text('alpha\nbeta\nmissing\n', encoding='utf-8')
+    projects = load_manifest(str(tmp_path / 'projects.txt'))
+    output = tmp_path / 'reports'
+
+    finished = []
+    results = run_batch(projects, str(output), workers=1, chunk_size=2, on_finish=finished.append)
+    statuses = {entry['name']: entry['status'] for entry in results}
+    assert statuses == {'alpha': 'done', 'beta': 'done', 'missing': 'failed'}
+    assert len(finished) == 3
+
+    expected = CodeAnalyzer(str(tmp_path / 'beta'))
+    expected.scan_project()
+    report = json.loads((output / 'beta.json').read_text(encoding='utf-8'))
+    assert report['analysis_id'] == expected.get_analysis_id()
+    assert report['total_modules'] == 5
+
+    # Повторный запуск пропускает выполненные проекты, но повторяет неудачные
+    (output / 'alpha.json').unlink()
+    results = run_batch(projects, str(output), workers=1)
+    assert {entry['name']: entry['status'] for entry in results} == \
+        {'alpha': 'done', 'beta': 'skipped', 'missing': 'failed'}
+    assert read_journal(str(output))['alpha']['status'] == 'done'
+    assert len((output / JOURNAL_NAME).read_text(encoding='utf-8').splitlines()) == 5
+
+
+def test_unusable_cache_fails_only_its_project(tmp_path):
+    _project(tmp_path / 'alpha', 2)
+    # Каталог на месте файла кеша: sqlite не может открыть базу проекта
+    (tmp_path / 'cache' / 'alpha.sqlite').mkdir(parents=True)
+    projects = load_manifest(str(_manifest(tmp_path, 'alpha')))
+
+    results = run_batch(projects, str(tmp_path / 'reports'), workers=1, cache_dir=str(tmp_path / 'cache'))
+    assert [entry['status'] for entry in results] == ['failed']
+    assert read_journal(str(tmp_path / 'reports'))['alpha']['status'] == 'failed'
@@ -0,0 +1,43 @@
+# tests/test_benchmarks.py
+import ast
+
+from benchmarks.bench_suite import compare, run_benchmark
+from benchmarks.corpus import generate_project
+
+
+def _read(root, paths):
+    return {path: (root / path).read_text(encoding='utf-8') for path in paths}
+
+
+def test_corpus_is_deterministic(tmp_path):
+    first = generate_project(str(tmp_path / 'a'), files=12, nesting=4, seed=7)
+    second = generate_project(str(tmp_path / 'b'), files=12, nesting=4, seed=7)
+    other = generate_project(str(tmp_path / 'c'), files=12, nesting=4, seed=8)
+
+    sources = _read(tmp_path / 'a', first)
+    assert sources == _read(tmp_path / 'b', second)
+    assert sources != _read(tmp_path / 'c', other)
+    for source in sources.values():
+        ast.parse(source)
+    assert any('from pkg' in source for source in sources.values())
+
+
+def test_benchmark_reports_metrics(tmp_path):
+    generate_project(str(tmp_path), files=5, functions=3)
+    result = run_benchmark('analyze_file', str(tmp_path), repeat=1)
+
+    # Пять модулей и __init__.py пяти пакетов
+    assert result['units'] == 10 and result['unit'] == 'files'
+    assert result['wall_ms'] > 0 and result['per_sec'] > 0
+    assert result['alloc_peak_kb'] >= 0
+
+
+def test_compare_flags_regressions_above_threshold():
+    baseline = {'scan_project': {'wall_ms': 100.0, 'peak_rss_kb': 1000, 'alloc_peak_kb': 50}}
+    results = {
+        'scan_project': {'wall_ms': 120.0, 'peak_rss_kb': 1600, 'alloc_peak_kb': None},
+        'endpoints': {'wall_ms': 10.0, 'peak_rss_kb': 10, 'alloc_peak_kb': 1},
+    }
+
+    assert compare(results, baseline, threshold=0.25) == ['scan_project.peak_rss_kb: 1000 -> 1600 (+60%)']
+    assert compare(results, baseline, threshold=1.0) == []
@@ -0,0 +1,65 @@
+# tests/test_cache.py
+import os
+
+from analyzer.cache import AnalysisCache
+from analyzer.core import CodeAnalyzer
+
+
+def _scan(root, db_path, version='test', workers=1):
+    with AnalysisCache(db_path, version) as cache:
+        analyzer = CodeAnalyzer(str(root), cache=cache)
+        analyzer.scan_project(workers=workers)
+        return analyzer
+
+
+def _write(path, text):
+    path.write_text(text, encoding='utf-8')
+
+
+def test_cache_reuses_unchanged_files(tmp_path):
+    project = tmp_path / 'project'
+    project.mkdir()
+    _write(project / 'a.py', 'import os\n')
+    _write(project / 'b.py', 'def f(x):\n    return x\n')
+    db_path = str(tmp_path / 'cache.sqlite3')
+
+    first = _scan(project, db_path)
+    assert first.cache_stats == {'hits': 0, 'misses': 2, 'removed': 0}
+
+    second = _scan(project, db_path)
+    assert second.cache_stats == {'hits': 2, 'misses': 0, 'removed': 0}
+    assert second.modules == first.modules
+    assert second.get_dependency_graph() == first.get_dependency_graph()
+    assert second.generate_project_report()['cache']['hits'] == 2
+
+
+def test_cache_detects_changes_and_deletions(tmp_path):
+    project = tmp_path / 'project'
+    project.mkdir()
+    _write(project / 'a.py', 'import os\n')
+    _write(project / 'b.py', 'import sys\n')
+    _write(project / 'c.py', 'import json\n')
+    db_path = str(tmp_path / 'cache.sqlite3')
+    _scan(project, db_path)
+
+    # Изменено только время модификации - содержимое берется из кеша по хешу
+    stat = os.stat(project / 'a.py')
+    os.utime(project / 'a.py', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    _write(project / 'b.py', 'import sys\nimport re\n')
+    os.remove(project / 'c.py')
+
+    analyzer = _scan(project, db_path)
+    assert analyzer.cache_stats == {'hits': 1, 'misses': 1, 'removed': 1}
+    assert list(analyzer.modules['b.py']['imports']) == ['sys', 're']
+    assert 'c.py' not in analyzer.modules
+
+
+def test_cache_is_invalidated_on_version_change(tmp_path):
+    project = tmp_path / 'project'
+    project.mkdir()
+    _write(project / 'a.py', 'import os\n')
+    db_path = str(tmp_path / 'cache.sqlite3')
+
+    _scan(project, db_path, version='1')
+    analyzer = _scan(project, db_path, version='2')
+    assert analyzer.cache_stats == {'hits': 0, 'misses': 1, 'removed': 0}
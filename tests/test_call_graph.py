@@ -0,0 +1,146 @@
+# tests/test_call_graph.py
+import pytest
+
+from analyzer.call_graph import SymbolIndex
+from analyzer.core import CodeAnalyzer
+
+SOURCES = {
+    'app.py': (
+        'from pkg import helpers as h\n'
+        'from pkg.models import Model\n'
+        'import pkg.service\n'
+        '\n'
+        'def main():\n'
+        '    m = Model()\n'
+        '    h.run()\n'
+        '    pkg.service.serve()\n'
+        '    return m\n'
+        '\n'
+        'if __name__ == "__main__":\n'
+        '    main()\n'
+    ),
+    'pkg/__init__.py': 'from .helpers import run\n',
+    'pkg/helpers.py': (
+        'def run():\n'
+        '    def inner():\n'
+        '        return prepare()\n'
+        '    return inner()\n'
+        '\n'
+        'def prepare():\n'
+        '    return 1\n'
+    ),
+    'pkg/models.py': (
+        'class Base:\n'
+        '    def save(self):\n'
+        '        return self.validate()\n'
+        '\n'
+        '    def validate(self):\n'
+        '        return True\n'
+        '\n'
+        'class Model(Base):\n'
+        '    def __init__(self):\n'
+        '        super().__init__()\n'
+        '        self.save()\n'
+    ),
+    'pkg/service.py': (
+        'from . import run\n'
+        'from .models import Model\n'
+        '\n'
+        'def serve():\n'
+        '    run()\n'
+        '    Model().save()\n'
+    ),
+}
+
+
+def _write(root, sources):
+    for path, source in sources.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(source, encoding='utf-8')
+
+
+def _analyzer(root):
+    analyzer = CodeAnalyzer(str(root))
+    analyzer.scan_project()
+    return analyzer
+
+
+def _callees(index, symbol):
+    return {info['symbol'] for info in index.callees(symbol)}
+
+
+def test_calls_are_resolved_across_modules(tmp_path):
+    _write(tmp_path, SOURCES)
+    index = _analyzer(tmp_path).get_symbol_index()
+
+    assert _callees(index, 'app.py::main') == {
+        'pkg/models.py::Model.__init__', 'pkg/helpers.py::run', 'pkg/service.py::serve'}
+    assert _callees(index, 'app.py::<module>') == {'app.py::main'}
+    assert _callees(index, 'pkg/helpers.py::run') == {'pkg/helpers.py::run.inner'}
+    assert _callees(index, 'pkg/helpers.py::run.inner') == {'pkg/helpers.py::prepare'}
+    # self.save() находится в базовом классе, super().__init__ - не определен
+    assert _callees(index, 'pkg/models.py::Model.__init__') == {'pkg/models.py::Base.save'}
+    assert _callees(index, 'pkg/models.py::Base.save') == {'pkg/models.py::Base.validate'}
+
+    callers = index.callers('pkg/helpers.py::run')
+    assert [info['symbol'] for info in callers] == ['app.py::main', 'pkg/service.py::serve']
+    assert callers[0]['call_line'] == 7
+    assert index.symbol('pkg/helpers.py::run')['fan_in'] == 2
+    assert index.callers('pkg/missing.py::f') is None
+
+    assert [info['symbol'] for info in index.find_definitions('save')] == ['pkg/models.py::Base.save']
+    assert [info['symbol'] for info in index.find_definitions('run', module='pkg/service.py')] == \
+        ['pkg/helpers.py::run']
+    assert [info['symbol'] for info in index.find_definitions('pkg.models.Model')] == ['pkg/models.py::Model']
+
+
+def test_incremental_update_matches_full_build(tmp_path):
+    _write(tmp_path, SOURCES)
+    analyzer = _analyzer(tmp_path)
+    index = analyzer.get_symbol_index()
+
+    # Функция переехала в новый модуль, а helpers реэкспортирует ее
+    _write(tmp_path, {
+        'pkg/helpers.py': 'from .tools import prepare\n\ndef run():\n    return prepare()\n',
+        'pkg/tools.py': 'def prepare():\n    return 2\n',
+    })
+    (tmp_path / 'pkg' / 'service.py').unlink()
+    analyzer.update_files(['pkg/helpers.py', 'pkg/tools.py', 'pkg/service.py'])
+
+    assert analyzer.get_symbol_index() is index
+    assert _callees(index, 'pkg/helpers.py::run') == {'pkg/tools.py::prepare'}
+    assert index.symbol('pkg/service.py::serve') is None
+    assert index.to_dict() == SymbolIndex.from_modules(analyzer.modules).to_dict()
+
+    # Новый пакет смещает имена модулей
+    _write(tmp_path, {'__init__.py': '', 'app.py': SOURCES['app.py'].replace('pkg.service', 'pkg.tools')})
+    analyzer.update_files(['__init__.py', 'app.py'])
+    assert index.to_dict() == _analyzer(tmp_path).get_symbol_index().to_dict()
+
+
+def test_symbol_endpoints(tmp_path):
+    pytest.importorskip('flask')
+    import app as app_module
+
+    _write(tmp_path, SOURCES)
+    app_module.analysis_results['symbols-project'] = _analyzer(tmp_path).generate_project_report()
+    client = app_module.app.test_client()
+
+    response = client.get('/symbols/symbols-project?name=Model.__init__')
+    assert response.status_code == 200
+    assert [info['symbol'] for info in response.get_json()['definitions']] == ['pkg/models.py::Model.__init__']
+
+    response = client.get('/symbols/symbols-project/callers?symbol=pkg/models.py::Base.save')
+    # Вызов метода у результата выражения (Model().save()) статически не разрешается
+    assert [info['symbol'] for info in response.get_json()['callers']] == ['pkg/models.py::Model.__init__']
+    cached = client.get('/symbols/symbols-project/callers?symbol=pkg/models.py::Base.save',
+                        headers={'If-None-Match': response.headers['ETag']})
+    assert cached.status_code == 304
+
+    response = client.get('/symbols/symbols-project/callees?symbol=app.py::main')
+    assert response.get_json()['symbol']['fan_out'] == 3
+
+    assert client.get('/symbols/symbols-project').status_code == 400
+    assert client.get('/symbols/symbols-project/callers?symbol=nope').status_code == 404
+    assert client.get('/symbols/missing?name=x').status_code == 404
@@ -0,0 +1,151 @@
+# tests/test_clones.py
+import pytest
+
+from analyzer.clones import MAX_CACHED_THRESHOLDS, CloneIndex
+from analyzer.core import CodeAnalyzer
+
+PARSE = (
+    'def parse_config(path, defaults):\n'
+    '    result = dict(defaults)\n'
+    '    with open(path) as handle:\n'
+    '        for line in handle:\n'
+    '            line = line.strip()\n'
+    '            if not line or line.startswith("#"):\n'
+    '                continue\n'
+    '            key, _, value = line.partition("=")\n'
+    '            result[key.strip()] = value.strip()\n'
+    '    return result\n'
+)
+
+# Та же функция с другими именами и литералами
+RENAMED = (
+    'class Loader:\n'
+    '    def load(self, filename):\n'
+    '        settings = dict(self)\n'
+    '        with open(filename) as f:\n'
+    '            for row in f:\n'
+    '                row = row.strip()\n'
+    '                if not row or row.startswith(";"):\n'
+    '                    continue\n'
+    '                name, _, item = row.partition(":")\n'
+    '                settings[name.strip()] = item.strip()\n'
+    '        return settings\n'
+)
+
+# Копия с небольшим изменением
+EDITED = PARSE.replace('def parse_config', 'def parse_env').replace(
+    '    return result\n', '    result["source"] = path\n    return result\n')
+
+UNRELATED = (
+    'def fibonacci(n):\n'
+    '    a, b = 0, 1\n'
+    '    while n > 0:\n'
+    '        a, b = b, a + b\n'
+    '        n -= 1\n'
+    '    return a\n'
+    '\n'
+    'def render(items, width=80):\n'
+    '    lines = []\n'
+    '    for index, item in enumerate(sorted(items, key=len)):\n'
+    '        text = f"{index:>4} {item}"\n'
+    '        lines.append(text[:width] if len(text) > width else text.ljust(width))\n'
+    '    return "\\n".join(lines)\n'
+)
+
+
+def _write(root, sources):
+    for path, source in sources.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(source, encoding='utf-8')
+
+
+def _analyzer(root):
+    analyzer = CodeAnalyzer(str(root))
+    analyzer.scan_project()
+    return analyzer
+
+
+def _cluster_symbols(index):
+    return [[func['symbol'] for func in cluster['functions']] for cluster in index.clusters()]
+
+
+def test_renamed_and_edited_copies_are_clustered(tmp_path):
+    _write(tmp_path, {'config.py': PARSE, 'loader.py': RENAMED, 'env.py': EDITED, 'misc.py': UNRELATED})
+    analyzer = _analyzer(tmp_path)
+
+    parse = analyzer.modules['config.py']['functions'][0]
+    load = analyzer.modules['loader.py']['classes'][0]['methods'][0]
+    assert parse['size'] >= 40
+    assert parse['fingerprint'] == load['fingerprint']
+    # Отпечатки кешируются, поэтому не зависят от процесса и версии Python
+    assert parse['fingerprint'] == '47b4f213199dc975'
+    assert analyzer.modules['env.py']['functions'][0]['fingerprint'] != parse['fingerprint']
+    # Короткие функции не индексируются
+    assert 'sketch' not in analyzer.modules['misc.py']['functions'][0]
+
+    clusters = analyzer.get_clone_index().clusters()
+    assert _cluster_symbols(analyzer.get_clone_index()) == [
+        ['config.py::parse_config', 'env.py::parse_env', 'loader.py::Loader.load']]
+    assert not clusters[0]['exact']
+    assert 0.8 <= clusters[0]['similarity'] < 1
+
+    report = analyzer.generate_project_report(sections=['duplicates'])
+    assert report['duplicates']['duplicated_functions'] == 3
+    assert report['duplicates']['clusters'] == clusters
+
+
+def test_incremental_update_matches_full_build(tmp_path):
+    _write(tmp_path, {'config.py': PARSE, 'loader.py': RENAMED, 'misc.py': UNRELATED})
+    analyzer = _analyzer(tmp_path)
+    index = analyzer.get_clone_index()
+    assert _cluster_symbols(index) == [['config.py::parse_config', 'loader.py::Loader.load']]
+
+    (tmp_path / 'loader.py').unlink()
+    _write(tmp_path, {'misc.py': UNRELATED + '\n\n' + EDITED})
+    analyzer.update_files(['loader.py', 'misc.py'])
+
+    assert analyzer.get_clone_index() is index
+    assert _cluster_symbols(index) == [['config.py::parse_config', 'misc.py::parse_env']]
+    assert index.to_dict() == CloneIndex.from_modules(_analyzer(tmp_path).modules).to_dict()
+
+    # Сдвиг функции без изменения ее кода не требует нового сравнения корзин,
+    # но строки в кластерах обновляются
+    _write(tmp_path, {'config.py': '# moved\n\n' + PARSE})
+    analyzer.update_files(['config.py'])
+    assert index.to_dict() == CloneIndex.from_modules(_analyzer(tmp_path).modules).to_dict()
+    assert index.clusters()[0]['functions'][0]['line'] == 3
+
+
+def test_cached_thresholds_are_bounded(tmp_path):
+    _write(tmp_path, {'config.py': PARSE, 'loader.py': RENAMED, 'misc.py': UNRELATED})
+    index = _analyzer(tmp_path).get_clone_index()
+
+    # Близкие пороги округляются и используют одни и те же связи корзин
+    assert index.clusters(0.8 + 1e-5) is index.clusters(0.8)
+    for i in range(20):
+        index.clusters(0.6 + i * 0.01)
+    assert len(index._links) == len(index._stale) == MAX_CACHED_THRESHOLDS
+    assert len(index._clusters) <= MAX_CACHED_THRESHOLDS
+    assert index.to_dict(0.80001)['min_similarity'] == 0.8
+
+
+def test_duplicates_endpoint(tmp_path):
+    pytest.importorskip('flask')
+    import app as app_module
+
+    _write(tmp_path, {'config.py': PARSE, 'loader.py': RENAMED, 'env.py': EDITED, 'misc.py': UNRELATED})
+    app_module.analysis_results['clones-project'] = _analyzer(tmp_path).generate_project_report()
+    client = app_module.app.test_client()
+
+    response = client.get('/duplicates/clones-project?module=loader.py')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['total_clusters'] == 1
+    assert len(data['clusters'][0]['functions']) == 3
+
+    exact = client.get('/duplicates/clones-project?min_similarity=1').get_json()
+    assert [len(cluster['functions']) for cluster in exact['clusters']] == [2]
+    assert client.get('/duplicates/clones-project?module=misc.py').get_json()['clusters'] == []
+    assert client.get('/duplicates/clones-project?min_similarity=0.1').status_code == 400
+    assert client.get('/duplicates/missing').status_code == 404
@@ -0,0 +1,203 @@
+# tests/test_core.py
+import ast
+import copy
+import json
+import textwrap
+
+from analyzer.core import CodeAnalyzer
+from analyzer.model import ModuleRecord, json_default
+from analyzer.ranking import top_complex_functions
+
+
+SAMPLE = textwrap.dedent('''
+    import os, sys
+    from collections import OrderedDict
+
+    def outer(a, b):
+        if a and b or a:
+            for i in range(a):
+                pass
+
+        def inner(c):
+            while c:
+                c -= 1
+        return inner
+
+    @decorator
+    class Service(Base):
+        def method(self, x):
+            try:
+                import json
+            except ImportError:
+                return None
+            else:
+                assert json
+
+            async def fetch():
+                async for item in x:
+                    yield item if item else None
+
+            def helper():
+                if x:
+                    return 1
+
+        class Nested:
+            def deep(self):
+                return [y for y in range(3) if y]
+''')
+
+
+def _legacy_analyze(content):
+    """Эталонная реализация analyze_file на ast.walk с отдельным обходом каждой функции."""
+    def complexity(node):
+        value = 1
+        for child in ast.walk(node):
+            if isinstance(child, (ast.If, ast.IfExp, ast.ExceptHandler, ast.Assert)):
+                value += 1
+            elif isinstance(child, (ast.While, ast.For, ast.AsyncFor)):
+                value += 1 + bool(child.orelse)
+            elif isinstance(child, ast.Try):
+                value += bool(child.orelse)
+            elif isinstance(child, ast.comprehension):
+                value += 1 + len(child.ifs)
+            elif isinstance(child, ast.BoolOp):
+                value += len(child.values) - 1
+        return value
+
+    imports, functions, classes = [], [], []
+    for node in ast.walk(ast.parse(content)):
+        if isinstance(node, ast.Import):
+            imports.extend(name.name for name in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            imports.append(node.module)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.append((node.name, node.lineno, complexity(node)))
+        elif isinstance(node, ast.ClassDef):
+            methods = [(m.name, m.lineno, complexity(m)) for m in node.body
+                       if isinstance(m, (ast.FunctionDef, ast.AsyncFunctionDef))]
+            classes.append((node.name, node.lineno, methods))
+    return imports, functions, classes
+
+
+def test_visitor_matches_legacy_walk_without_duplicates():
+    info = CodeAnalyzer('.').analyze_file(SAMPLE, 'sample.py')
+    imports, functions, classes = _legacy_analyze(SAMPLE)
+
+    methods = {(name, line, value) for _, _, ms in classes for name, line, value in ms}
+    expected_functions = [f for f in functions if f not in methods]
+
+    assert sorted(info['imports']) == sorted(imports)
+    assert sorted((f['name'], f['line'], f['complexity']) for f in info['functions']) == \
+        sorted(expected_functions)
+    assert sorted(
+        (c['name'], c['line'], [(m['name'], m['line'], m['complexity']) for m in c['methods']])
+        for c in info['classes']
+    ) == sorted(classes)
+
+
+def test_syntax_error_is_reported():
+    info = CodeAnalyzer('.').analyze_file('def broken(:\n', 'broken.py')
+    assert info['path'] == 'broken.py'
+    assert info['error'].startswith('Syntax error')
+
+
+def test_deeply_nested_code_is_reported_as_module_error(tmp_path):
+    # Корректный код, обход которого превышает предел рекурсии
+    source = 'def f(a):\n    return ' + ' + '.join(['a'] * 3000) + '\n'
+    info = CodeAnalyzer('.').analyze_file(source, 'deep.py')
+    assert info['error'].startswith('Nesting too deep')
+
+    (tmp_path / 'deep.py').write_text(source, encoding='utf-8')
+    (tmp_path / 'ok.py').write_text('def g():\n    return 1\n', encoding='utf-8')
+    analyzer = CodeAnalyzer(str(tmp_path))
+    analyzer.scan_project()
+    assert 'error' in analyzer.modules['deep.py']
+    assert analyzer.modules['ok.py']['functions'][0]['name'] == 'g'
+
+
+def _make_project(root, count=6):
+    for i in range(count):
+        package = root / f'pkg{i % 2}'
+        package.mkdir(exist_ok=True)
+        (package / f'mod{i}.py').write_text(
+            f'import os\nimport pkg{(i + 1) % 2}\n\ndef func{i}(x):\n    if x:\n        return {i}\n',
+            encoding='utf-8'
+        )
+    (root / 'broken.py').write_text('def broken(:\n', encoding='utf-8')
+
+
+def test_parallel_scan_matches_serial(tmp_path):
+    _make_project(tmp_path)
+
+    serial = CodeAnalyzer(str(tmp_path))
+    serial.scan_project(workers=1)
+    parallel = CodeAnalyzer(str(tmp_path))
+    parallel.scan_project(workers=2)
+
+    assert list(parallel.modules) == list(serial.modules)
+    assert parallel.modules == serial.modules
+    assert parallel.get_dependency_graph() == serial.get_dependency_graph()
+
+
+def test_analysis_id_follows_module_contents(tmp_path):
+    _make_project(tmp_path)
+    analyzer = CodeAnalyzer(str(tmp_path))
+    analyzer.scan_project()
+    first = analyzer.get_analysis_id()
+    assert analyzer.get_analysis_id() == first
+
+    (tmp_path / 'pkg0' / 'mod0.py').write_text('def changed():\n    pass\n', encoding='utf-8')
+    analyzer.update_files(['pkg0/mod0.py'])
+    changed = analyzer.get_analysis_id()
+    assert changed != first
+
+    # Инкрементальное обновление дает тот же идентификатор, что и новый анализ
+    rescanned = CodeAnalyzer(str(tmp_path))
+    rescanned.scan_project(workers=2)
+    assert rescanned.get_analysis_id() == changed
+
+    # Модуль, добавленный без хеша содержимого, хешируется по записи
+    rescanned.modules = dict(rescanned.modules, extra=ModuleRecord.from_dict(rescanned.modules['pkg0/mod0.py']))
+    assert rescanned.get_analysis_id() not in (first, changed)
+
+
+def test_top_complex_functions_do_not_mutate_modules(tmp_path):
+    _make_project(tmp_path)
+    analyzer = CodeAnalyzer(str(tmp_path))
+    analyzer.scan_project()
+    snapshot = copy.deepcopy(analyzer.modules)
+
+    first = analyzer.generate_project_report(top_k=3, per_module_top_k=1)
+    second = analyzer.generate_project_report(top_k=3, per_module_top_k=1)
+
+    assert analyzer.modules == snapshot
+    assert first['complex_functions'] == second['complex_functions']
+
+    everything = top_complex_functions(analyzer.modules, k=None)
+    complexities = [func['complexity'] for func in everything]
+    assert complexities == sorted(complexities, reverse=True)
+    assert first['complex_functions'] == everything[:3]
+    assert all('module' in func for func in everything)
+
+    threshold = top_complex_functions(analyzer.modules, k=None, min_complexity=2)
+    assert threshold == [func for func in everything if func['complexity'] >= 2]
+
+    for module, functions in first['complex_functions_by_module'].items():
+        assert len(functions) == 1
+        assert functions[0] == top_complex_functions({module: analyzer.modules[module]}, k=1)[0]
+
+
+def test_module_records_serialize_like_dicts():
+    analyzer = CodeAnalyzer('.')
+    info = analyzer.analyze_file(SAMPLE, 'pkg/sample.py')
+    broken = analyzer.analyze_file('def broken(:\n', 'broken.py')
+
+    for source in (info, broken):
+        record = ModuleRecord.from_dict(json.loads(json.dumps(source)))
+        assert json.dumps(record, default=json_default) == json.dumps(source)
+        assert set(record) == set(source)
+
+    record = ModuleRecord.from_dict(info)
+    assert record.get('error') is None
+    assert record['functions'][0]['name'] == info['functions'][0]['name']
+    assert dict(record['classes'][0])['name'] == info['classes'][0]['name']
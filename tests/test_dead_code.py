@@ -0,0 +1,169 @@
+# tests/test_dead_code.py
+import pytest
+
+from analyzer.call_graph import SymbolIndex
+from analyzer.core import CodeAnalyzer
+from analyzer.dead_code import find_dead_code
+
+SOURCES = {
+    'app.py': (
+        'import os\n'
+        'from flask import Flask\n'
+        'from pkg.service import Service, helper\n'
+        '\n'
+        'app = Flask(__name__)\n'
+        'HANDLERS = [helper]\n'
+        '\n'
+        '@app.route("/")\n'
+        'def index():\n'
+        '    return Service().run()\n'
+        '\n'
+        'def unused_view():\n'
+        '    return "old"\n'
+    ),
+    'pkg/__init__.py': 'from .service import Service\n',
+    'pkg/service.py': (
+        'import ast\n'
+        'import json\n'
+        '\n'
+        'def helper():\n'
+        '    return 1\n'
+        '\n'
+        'def tested_only():\n'
+        '    return 2\n'
+        '\n'
+        'class Service:\n'
+        '    def __init__(self):\n'
+        '        self.items = []\n'
+        '    def run(self):\n'
+        '        return [item.render() for item in self.items]\n'
+        '    def cleanup(self):\n'
+        '        pass\n'
+        '\n'
+        'class Item:\n'
+        '    def render(self):\n'
+        '        return ""\n'
+        '\n'
+        'class Dead:\n'
+        '    def go(self):\n'
+        '        pass\n'
+        '\n'
+        'class Visitor(ast.NodeVisitor):\n'
+        '    def visit_Name(self, node):\n'
+        '        pass\n'
+        '\n'
+        'Visitor().visit(ast.parse("x"))\n'
+    ),
+    'pkg/legacy.py': 'def old():\n    return 0\n',
+    'tools/cli.py': (
+        'import sys\n'
+        'from pkg import service\n'
+        '\n'
+        'def main():\n'
+        '    return service.Item()\n'
+        '\n'
+        'if __name__ == "__main__":\n'
+        '    sys.exit(main())\n'
+    ),
+    'tests/test_service.py': (
+        'from pkg.service import tested_only\n'
+        '\n'
+        'def test_tested_only():\n'
+        '    assert tested_only() == 2\n'
+    ),
+}
+
+
+def _write(root, sources):
+    for path, source in sources.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(source, encoding='utf-8')
+
+
+def _analyzer(root):
+    analyzer = CodeAnalyzer(str(root))
+    analyzer.scan_project()
+    return analyzer
+
+
+def _unused(result):
+    return {info['symbol'] for info in result['unused_symbols']}
+
+
+def test_visitor_collects_references():
+    analyzer = CodeAnalyzer('.')
+    result = analyzer.analyze_file(
+        '__all__ = ["exported"]\n'
+        'import os\n'
+        '\n'
+        '@app.route("/", methods=["GET"])\n'
+        '@cached\n'
+        'def view(request):\n'
+        '    handler = os.path.join\n'
+        '    items = [handler, request, callback]\n'
+        '    return items[0].render(Base)\n'
+        '\n'
+        'if __name__ == "__main__":\n'
+        '    view(None)\n',
+        'mod.py')
+
+    view = result['functions'][0]
+    assert view['decorators'] == ['app.route', 'cached']
+    # Локальные имена и аргументы не считаются ссылками, вызовы записываются отдельно
+    assert [name for name, _ in view['refs']] == ['os.path.join', 'callback', '.render', 'Base']
+    assert view['calls'] == []
+    assert [name for name, _ in result['refs']] == ['exported', 'cached', '__name__']
+    assert result['main_line'] == 11
+
+
+def test_reachability_from_entry_points(tmp_path):
+    _write(tmp_path, SOURCES)
+    analyzer = _analyzer(tmp_path)
+    result = analyzer.find_dead_code()
+
+    assert result['unreachable_modules'] == ['pkg/legacy.py']
+    assert _unused(result) == {'app.py::unused_view', 'pkg/service.py::Service.cleanup', 'pkg/service.py::Dead'}
+    # Реэкспорт в __init__.py и импорт, используемый только как значение, не сообщаются
+    assert [(item['module'], item['name']) for item in result['unused_imports']] == \
+        [('app.py', 'os'), ('pkg/service.py', 'json')]
+
+    # Без тестов функция, которую вызывают только тесты, не используется
+    without_tests = analyzer.find_dead_code(include_tests=False)
+    assert without_tests['unreachable_modules'] == ['pkg/legacy.py', 'tests/test_service.py']
+    assert 'pkg/service.py::tested_only' in _unused(without_tests)
+
+    configured = analyzer.find_dead_code(['pkg/legacy.py', 'app.py::unused_*'])
+    assert configured['unreachable_modules'] == []
+    assert 'app.py::unused_view' not in _unused(configured)
+
+    # Инкрементальное обновление индекса дает тот же результат, что и полное построение
+    _write(tmp_path, {'app.py': SOURCES['app.py'] + '\nunused_view()\n'})
+    analyzer.update_files(['app.py'])
+    updated = analyzer.find_dead_code()
+    assert updated == find_dead_code(SymbolIndex.from_modules(analyzer.modules))
+    assert 'app.py::unused_view' not in _unused(updated)
+
+
+def test_dead_code_endpoint(tmp_path):
+    pytest.importorskip('flask')
+    import app as app_module
+
+    _write(tmp_path, SOURCES)
+    analyzer = _analyzer(tmp_path)
+    report = analyzer.generate_project_report()
+    assert 'dead_code' not in report
+    assert analyzer.generate_project_report(sections=['dead_code'])['dead_code']['unreachable_modules'] == \
+        ['pkg/legacy.py']
+    with pytest.raises(ValueError):
+        analyzer.generate_project_report(sections=['dead-code'])
+    app_module.analysis_results['dead-code-project'] = report
+    client = app_module.app.test_client()
+
+    result = client.get('/dead_code/dead-code-project?module=app.py').get_json()
+    assert [info['symbol'] for info in result['unused_symbols']] == ['app.py::unused_view']
+    assert [info['local'] for info in result['unused_imports']] == ['os']
+
+    configured = client.get('/dead_code/dead-code-project?entry=pkg/legacy.py&tests=0').get_json()
+    assert configured['unreachable_modules'] == ['tests/test_service.py']
+    assert client.get('/dead_code/missing').status_code == 404
@@ -0,0 +1,94 @@
+# tests/test_dependency_graph.py
+import random
+
+from analyzer.core import CodeAnalyzer
+from analyzer.dependency_graph import DependencyGraph
+from analyzer.graph_view import build_graph_view
+
+
+def _modules(sources):
+    analyzer = CodeAnalyzer('.')
+    return {path: analyzer.analyze_file(source, path) for path, source in sources.items()}
+
+
+def test_imports_are_resolved_and_classified():
+    graph = DependencyGraph.from_modules(_modules({
+        'app.py': 'import os\nimport flask\nfrom utils.file_manager import FileManager\n',
+        'utils/__init__.py': '',
+        'utils/file_manager.py': 'from . import helpers\nfrom .helpers import tool\nimport os.path\n',
+        'utils/helpers.py': 'from ..app import something\n',
+        'src/pkg/mod.py': 'import pkg.other\n',
+        'src/pkg/other.py': '',
+    }))
+
+    adjacency = graph.adjacency()
+    assert adjacency['app.py'] == ['os', 'flask', 'utils/file_manager.py']
+    assert adjacency['utils/file_manager.py'] == ['utils/helpers.py', 'os']
+    assert adjacency['utils/helpers.py'] == ['app.py']
+    assert adjacency['src/pkg/mod.py'] == ['src/pkg/other.py']
+    assert graph.kind(graph.index['os']) == 'stdlib'
+    assert graph.kind(graph.index['flask']) == 'third_party'
+    assert graph.kind(graph.index['utils/helpers.py']) == 'internal'
+
+
+def test_cycles_dependents_and_layers():
+    graph = DependencyGraph.from_modules(_modules({
+        'a.py': 'import b\n',
+        'b.py': 'import c\n',
+        'c.py': 'import a\nimport d\n',
+        'd.py': 'import json\n',
+        'e.py': 'import a\n',
+    }))
+
+    assert graph.cycles() == [['a.py', 'b.py', 'c.py']]
+    assert sorted(graph.transitive_dependents('d.py')) == ['a.py', 'b.py', 'c.py', 'e.py']
+    assert graph.topological_layers() == [['d.py'], ['a.py', 'b.py', 'c.py'], ['e.py']]
+
+    restored = DependencyGraph.from_dict(graph.to_dict())
+    assert restored.adjacency() == graph.adjacency()
+
+
+def test_queries_scale_linearly():
+    rng = random.Random(1)
+    n, m = 20000, 100000
+    edges = [[] for _ in range(n)]
+    for _ in range(m):
+        edges[rng.randrange(n)].append(rng.randrange(n))
+
+    offsets, targets = [0], []
+    for row in edges:
+        targets.extend(row)
+        offsets.append(len(targets))
+    graph = DependencyGraph([f'm{i}.py' for i in range(n)], [0] * n, offsets, targets)
+
+    components = graph.strongly_connected_components()
+    assert sum(len(c) for c in components) == n
+    assert graph.transitive_dependents('m0.py')
+    assert sum(len(layer) for layer in graph.topological_layers()) == n
+
+
+def test_graph_view_clusters_filters_and_layout():
+    graph = DependencyGraph.from_modules(_modules({
+        'app.py': 'import os\nimport flask\nfrom pkg.sub import a\nfrom pkg import b\n',
+        'pkg/__init__.py': '',
+        'pkg/b.py': 'import os\nimport json\nfrom pkg.sub import a\n',
+        'pkg/sub/__init__.py': '',
+        'pkg/sub/a.py': 'import json\n',
+    }))
+
+    view = build_graph_view(graph)
+    nodes = {node['id']: node for node in view['nodes']}
+    assert set(nodes) == {'app.py', 'pkg/', 'os', 'flask', 'json'}
+    assert nodes['pkg/']['cluster'] and nodes['pkg/']['size'] == 4
+    links = {(link['source'], link['target']): link['weight'] for link in view['links']}
+    assert links[('app.py', 'pkg/')] == 2
+    assert links[('pkg/', 'json')] == 2
+    # Модули располагаются правее своих зависимостей
+    assert nodes['app.py']['x'] > nodes['pkg/']['x'] > nodes['json']['x']
+
+    view = build_graph_view(graph, expanded=['pkg/'], hide_kinds=['stdlib'], max_degree=1)
+    nodes = {node['id']: node for node in view['nodes']}
+    assert set(nodes) == {'app.py', 'pkg/__init__.py', 'pkg/b.py', 'pkg/sub/', 'flask'}
+    assert view['hidden_nodes'] == 2
+    assert all(node['out_degree'] <= 1 for node in view['nodes'])
+    assert view['hidden_links'] == 2
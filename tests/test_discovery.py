@@ -0,0 +1,93 @@
+# tests/test_discovery.py
+import os
+
+import pytest
+
+from analyzer.discovery import FileDiscovery, GitIgnore
+
+
+def _touch(path, text='x = 1\n'):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+
+
+def _found(root, **kwargs):
+    discovery = FileDiscovery(str(root), **kwargs)
+    return [rel_path.replace(os.sep, '/') for _, rel_path in discovery.iter_files()], discovery.stats
+
+
+def test_default_excludes_gitignore_and_size_limit(tmp_path):
+    _touch(tmp_path / 'app.py')
+    _touch(tmp_path / 'pkg' / 'mod.py')
+    _touch(tmp_path / 'pkg' / 'generated_pb2.py')
+    _touch(tmp_path / 'pkg' / 'keep_pb2.py')
+    _touch(tmp_path / 'venv' / 'lib' / 'dep.py')
+    _touch(tmp_path / '.git' / 'hooks' / 'hook.py')
+    _touch(tmp_path / 'node_modules' / 'x.py')
+    _touch(tmp_path / 'data' / 'big.py', 'x = 1\n' * 100)
+    _touch(tmp_path / 'notes.txt')
+    _touch(tmp_path / '.gitignore', '# generated\n*_pb2.py\n!keep_pb2.py\n/out/\n')
+    _touch(tmp_path / 'out' / 'artifact.py')
+    _touch(tmp_path / 'pkg' / 'out' / 'nested.py')
+
+    files, stats = _found(tmp_path, max_file_size=100)
+
+    assert files == ['app.py', 'pkg/keep_pb2.py', 'pkg/mod.py', 'pkg/out/nested.py']
+    assert stats['excluded_dirs'] == 3
+    assert stats['gitignored'] == 2
+    assert stats['too_large'] == 1
+
+
+def test_include_and_exclude_globs(tmp_path):
+    _touch(tmp_path / 'src' / 'a.py')
+    _touch(tmp_path / 'src' / 'b.pyi')
+    _touch(tmp_path / 'tests' / 'test_a.py')
+
+    files, stats = _found(tmp_path, include=['*.py', '*.pyi'], exclude=['tests'])
+
+    assert files == ['src/a.py', 'src/b.pyi']
+    assert stats['excluded_dirs'] == 1
+
+
+def test_build_dirs_are_skipped_unless_packages(tmp_path):
+    _touch(tmp_path / 'build' / 'lib' / 'pkg' / 'mod.py')
+    _touch(tmp_path / 'dist' / 'setup.py')
+    _touch(tmp_path / 'myapp' / '__init__.py')
+    _touch(tmp_path / 'myapp' / 'build' / '__init__.py')
+    _touch(tmp_path / 'myapp' / 'build' / 'steps.py')
+    _touch(tmp_path / 'config' / 'env' / 'local.py')
+
+    files, stats = _found(tmp_path)
+
+    # build внутри пакета - тоже пакет, а не результат сборки
+    assert files == ['myapp/__init__.py', 'myapp/build/__init__.py', 'myapp/build/steps.py']
+    assert stats['excluded_dirs'] == 3
+
+    discovery = FileDiscovery(str(tmp_path))
+    assert discovery.is_candidate(os.path.join('myapp', 'build', 'steps.py'))
+    assert not discovery.is_candidate(os.path.join('config', 'env', 'local.py'))
+
+    files, _ = _found(tmp_path, exclude_non_package_dirs=())
+    assert 'config/env/local.py' in files and 'build/lib/pkg/mod.py' in files
+
+
+@pytest.mark.skipif(not hasattr(os, 'symlink'), reason='symlinks are not supported')
+def test_symlink_loops_are_skipped(tmp_path):
+    _touch(tmp_path / 'pkg' / 'mod.py')
+    os.symlink(str(tmp_path / 'pkg'), str(tmp_path / 'pkg' / 'loop'))
+
+    files, stats = _found(tmp_path)
+
+    assert files == ['pkg/mod.py']
+    assert stats['symlink_loops'] == 1
+
+
+def test_gitignore_patterns():
+    ignore = GitIgnore('sub', ['build/', 'docs/**/*.py', '/root_only.py', 'a?c.py'])
+
+    assert ignore.match('sub/x/build', True)
+    assert ignore.match('sub/x/build', False) is None
+    assert ignore.match('sub/docs/a/b/c.py', False)
+    assert ignore.match('sub/root_only.py', False)
+    assert ignore.match('sub/x/root_only.py', False) is None
+    assert ignore.match('sub/abc.py', False)
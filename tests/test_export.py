@@ -0,0 +1,92 @@
+# tests/test_export.py
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from analyzer.core import CodeAnalyzer
+from analyzer.export import iter_html_report, iter_mermaid, iter_svg
+from utils.export_cache import ExportCache
+from utils.file_manager import FileManager
+
+
+def _report():
+    analyzer = CodeAnalyzer('.')
+    sources = {
+        'app.py': 'import os\nfrom utils import file_manager\n\ndef f(x):\n    if x and x:\n        return 1\n',
+        'utils/__init__.py': '',
+        'utils/file_manager.py': 'import json\n\nclass FileManager:\n    def save(self, x):\n'
+                                 '        if x:\n            pass\n',
+    }
+    for path, source in sources.items():
+        analyzer._add_module(path, analyzer.analyze_file(source, path))
+    report = analyzer.generate_project_report()
+    report['complex_functions'][0]['name'] = '<script>'
+    return report
+
+
+def test_exports_are_generated_from_report():
+    report = _report()
+
+    page = ''.join(iter_html_report(report))
+    assert '<h3>3</h3>' in page
+    assert '&lt;script&gt;' in page and '<script>' not in page
+    assert '&quot;' not in page and '"app.py": [' in page
+
+    mermaid = ''.join(iter_mermaid(report))
+    assert mermaid.startswith('classDiagram\n')
+    assert '    class file_manager {\n        +process()\n        +manage(options)\n    }\n' in mermaid
+    assert '    app --> os\n' in mermaid
+    assert '    file_manager --> json\n' in mermaid
+
+    svg = ET.fromstring(''.join(iter_svg(report)).encode('utf-8'))
+    titles = {element.text for element in svg.iter('{http://www.w3.org/2000/svg}title')}
+    assert titles == {'app.py', 'utils' + os.sep, 'os', 'json'}
+
+
+def test_export_cache_stores_complete_exports_only(tmp_path):
+    cache = ExportCache(str(tmp_path))
+    cache.CHUNK_SIZE = 4
+
+    assert b''.join(cache.stream('p', 'a1', 'mermaid', iter(['ab', 'cd', 'ef']))) == b'abcdef'
+    first = cache.get('p', 'a1', 'mermaid')
+    assert first is not None
+
+    def failing():
+        yield 'partial'
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        list(cache.stream('p', 'a2', 'mermaid', failing()))
+    assert cache.get('p', 'a2', 'mermaid') is None
+
+    path = cache.ensure('p', 'a3', 'mermaid', lambda: iter(['new']))
+    assert open(path, encoding='utf-8').read() == 'new'
+    # Экспорт прежнего анализа удаляется, временные файлы не остаются
+    assert os.listdir(tmp_path / 'p') == [os.path.basename(path)]
+
+
+def test_export_endpoints_use_cache(tmp_path, monkeypatch):
+    pytest.importorskip('flask')
+    import app as app_module
+
+    monkeypatch.setattr(app_module, 'export_cache', ExportCache(str(tmp_path / 'exports')))
+    monkeypatch.setattr(FileManager, 'base_dir', str(tmp_path))
+    app_module.analysis_results['export-project'] = _report()
+    client = app_module.app.test_client()
+
+    response = client.get('/export/export-project/html?download=1')
+    assert response.status_code == 200
+    assert 'attachment' in response.headers['Content-Disposition']
+    body = response.get_data()
+
+    cached = client.get('/export/export-project/html')
+    assert cached.get_data() == body
+    assert 'ETag' in cached.headers
+
+    saved = client.post('/export/export-project/mermaid/save')
+    assert saved.status_code == 200
+    assert open(saved.get_json()['filepath'], encoding='utf-8').read().startswith('classDiagram')
+
+    assert client.get('/export/export-project/pdf').status_code == 400
+    assert client.get('/export/missing/html').status_code == 404
@@ -0,0 +1,87 @@
+# tests/test_git_diff.py
+import shutil
+import subprocess
+
+import pytest
+
+from analyzer.git_diff import GitError, diff_revisions
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+
+
+def _git(repo, *args):
+    subprocess.run(['git', '-C', str(repo), *args], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def _commit(repo, files, message):
+    for path, content in files.items():
+        target = repo / path
+        if content is None:
+            target.unlink()
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content, encoding='utf-8')
+    _git(repo, 'add', '-A')
+    _git(repo, '-c', 'user.name=test', '-c', 'user.email=test@example.com', 'commit', '-q', '-m', message)
+
+
+def test_diff_reports_complexity_modules_and_edges(tmp_path):
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    _git(repo, 'init', '-q')
+
+    _commit(repo, {
+        'pkg/__init__.py': '',
+        'pkg/a.py': 'import os\n\ndef f(x):\n    return x\n\ndef g(x):\n    if x:\n        return 1\n',
+        'pkg/old.py': 'def gone():\n    pass\n',
+        'README.md': 'docs\n',
+    }, 'base')
+    _commit(repo, {
+        'pkg/a.py': 'import json\nfrom . import new\n\ndef f(x):\n    if x and x:\n        return x\n\n'
+                    'def g(x):\n    return 1\n',
+        'pkg/old.py': None,
+        'pkg/new.py': 'class C:\n    def m(self):\n        pass\n',
+        'pkg/broken.py': 'def broken(:\n',
+        'README.md': 'more docs\n',
+    }, 'head')
+
+    delta = diff_revisions(str(repo), 'HEAD~1')
+
+    assert delta['files_changed'] == 4
+    assert delta['modules_added'] == ['pkg/broken.py', 'pkg/new.py']
+    assert delta['modules_removed'] == ['pkg/old.py']
+    assert delta['modules_modified'] == ['pkg/a.py']
+    assert [e['path'] for e in delta['errors']] == ['pkg/broken.py']
+
+    functions = delta['functions']
+    assert [(f['name'], f['base_complexity'], f['complexity']) for f in functions['complexity_increased']] == \
+        [('f', 1, 3)]
+    assert [(f['name'], f['delta']) for f in functions['complexity_decreased']] == [('g', -1)]
+    assert [(f['name'], f.get('class')) for f in functions['added']] == [('m', 'C')]
+    assert [f['name'] for f in functions['removed']] == ['gone']
+
+    assert delta['dependencies']['added'] == [
+        {'source': 'pkg/a.py', 'target': 'json', 'kind': 'stdlib'},
+        {'source': 'pkg/a.py', 'target': 'pkg/new.py', 'kind': 'internal'},
+    ]
+    assert delta['dependencies']['removed'] == [{'source': 'pkg/a.py', 'target': 'os', 'kind': 'stdlib'}]
+
+    with pytest.raises(GitError):
+        diff_revisions(str(repo), 'no-such-branch')
+
+
+def test_diff_skips_build_dirs_unless_packages(tmp_path):
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    _git(repo, 'init', '-q')
+
+    _commit(repo, {'pkg/__init__.py': ''}, 'base')
+    _commit(repo, {
+        'pkg/build/__init__.py': '',
+        'pkg/build/steps.py': 'def step():\n    pass\n',
+        'build/lib/pkg/__init__.py': '',
+    }, 'head')
+
+    assert diff_revisions(str(repo), 'HEAD~1')['modules_added'] == ['pkg/build/__init__.py', 'pkg/build/steps.py']
+    assert diff_revisions(str(repo), 'HEAD~1', exclude_non_package_dirs=())['modules_added'] == \
+        ['build/lib/pkg/__init__.py', 'pkg/build/__init__.py', 'pkg/build/steps.py']
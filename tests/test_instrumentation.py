@@ -0,0 +1,75 @@
+# tests/test_instrumentation.py
+import pytest
+
+from analyzer.core import CodeAnalyzer
+from analyzer.instrumentation import Instrumentation
+from utils.file_manager import FileManager
+from utils.prometheus import COUNTER, PrometheusRegistry
+
+
+def _project(root):
+    (root / 'a.py').write_text('import os\n\ndef f(x):\n    return x\n', encoding='utf-8')
+    (root / 'b.py').write_text('def broken(:\n', encoding='utf-8')
+    (root / 'c.py').write_text('x = 1\n' * 200, encoding='utf-8')
+    return root
+
+
+def test_report_contains_timings_only_when_enabled(tmp_path):
+    root = _project(tmp_path)
+
+    analyzer = CodeAnalyzer(str(root), instrumentation=Instrumentation(slowest=2))
+    analyzer.scan_project()
+    timings = analyzer.generate_project_report(sections=['call_graph'])['timings']
+
+    assert timings['files'] == 3
+    assert timings['bytes_read'] == sum((root / name).stat().st_size for name in ('a.py', 'b.py', 'c.py'))
+    assert timings['parse_failures'] == 1 and timings['failed_files'] == ['b.py']
+    assert len(timings['slowest_files']) == 2
+    assert timings['slowest_files'][0]['seconds'] >= timings['slowest_files'][1]['seconds']
+    for phase in ('discovery', 'read', 'parse', 'visit', 'analyze', 'report.metrics', 'report.call_graph'):
+        assert timings['phases'][phase]['seconds'] >= 0, phase
+    assert timings['phases']['read']['count'] == 3
+
+    plain = CodeAnalyzer(str(root))
+    plain.scan_project()
+    assert 'timings' not in plain.generate_project_report()
+    assert plain.instrumentation.to_dict()['files'] == 0
+
+
+def test_prometheus_registry_renders_text_format():
+    registry = PrometheusRegistry()
+    registry.describe('requests_total', COUNTER, 'Requests')
+    registry.inc('requests_total', endpoint='a"b', status='200')
+    registry.inc('requests_total', 2, endpoint='a"b', status='200')
+    registry.gauge_callback('sessions', 'Sessions', lambda: {(): 3})
+
+    assert registry.render() == (
+        '# HELP requests_total Requests\n'
+        '# TYPE requests_total counter\n'
+        'requests_total{endpoint="a\\"b",status="200"} 3\n'
+        '# HELP sessions Sessions\n'
+        '# TYPE sessions gauge\n'
+        'sessions 3\n'
+    )
+
+
+def test_metrics_endpoint(tmp_path, monkeypatch):
+    pytest.importorskip('flask')
+    import app as app_module
+
+    if not app_module.INSTRUMENTATION_ENABLED:
+        pytest.skip('instrumentation is disabled')
+    (tmp_path / 'project').mkdir()
+    root = _project(tmp_path / 'project')
+    monkeypatch.setattr(FileManager, 'base_dir', str(tmp_path))
+    client = app_module.app.test_client()
+
+    assert client.post('/analyze', data={'project_path': str(root)}).status_code == 200
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+    body = response.get_data(as_text=True)
+    assert 'code_analyzer_parse_failures_total' in body
+    assert 'code_analyzer_phase_seconds_total{phase="parse"}' in body
+    assert 'code_analyzer_http_requests_total{endpoint="analyze",method="POST",status="200"}' in body
@@ -0,0 +1,88 @@
+# tests/test_job_manager.py
+import threading
+
+import pytest
+
+from utils.job_manager import AnalysisJob, JobManager, JobLimitExceeded
+
+
+def _wait(job):
+    version = -1
+    while not job.is_finished:
+        version = job.wait_for_update(version, 5)
+    return job
+
+
+def test_job_reports_progress_and_result():
+    manager = JobManager(max_concurrent=1, max_queued=1)
+
+    def run(job):
+        for done in range(1, 4):
+            job.report_progress(done, 3)
+        return {'project_id': 'p'}
+
+    job = _wait(manager.submit('/project', run))
+    state = job.to_dict()
+
+    assert state['status'] == AnalysisJob.DONE
+    assert (state['files_done'], state['files_total']) == (3, 3)
+    assert state['result'] == {'project_id': 'p'}
+    assert state['eta'] == 0.0
+
+
+def test_job_cancellation_and_queue_limit():
+    manager = JobManager(max_concurrent=1, max_queued=1)
+    started = threading.Event()
+
+    def run(job):
+        started.set()
+        while True:
+            job.report_progress(0, 1)
+
+    running = manager.submit('/big', run)
+    started.wait(5)
+    queued = manager.submit('/other', run)
+
+    with pytest.raises(JobLimitExceeded):
+        manager.submit('/third', run)
+
+    queued.cancel()
+    running.cancel()
+
+    assert _wait(running).status == AnalysisJob.CANCELLED
+    assert _wait(queued).status == AnalysisJob.CANCELLED
+
+
+def test_event_stream_ends_with_finished_event():
+    manager = JobManager()
+    job = _wait(manager.submit('/project', lambda job: {'project_id': 'p'}))
+
+    events = list(manager.stream_events(job))
+
+    assert events[-1].startswith('event: finished\n')
+
+
+def test_analyze_clamps_requested_workers(tmp_path, monkeypatch):
+    pytest.importorskip('flask')
+    import app as app_module
+
+    requested = []
+    options = []
+
+    def analyze_project(project_path, workers, discovery_options, progress=None):
+        requested.append(workers)
+        options.append(discovery_options)
+        return None, {'total_modules': 0}
+
+    monkeypatch.setattr(app_module, '_analyze_project', analyze_project)
+    monkeypatch.setattr(app_module, '_summary', lambda report: {})
+    client = app_module.app.test_client()
+
+    assert client.post('/analyze', data={'project_path': str(tmp_path), 'workers': '10000'}).status_code == 200
+    assert client.post('/analyze', data={'project_path': str(tmp_path), 'workers': '1'}).status_code == 200
+    assert requested == [app_module.MAX_WORKERS_PER_JOB, 1]
+
+    assert 'build' in options[0]['exclude_non_package_dirs']
+    assert client.post('/analyze', data={'project_path': str(tmp_path), 'exclude_dir': 'fixtures',
+                                         'no_default_excludes': '1'}).status_code == 200
+    assert options[-1] == {'exclude': [], 'exclude_dirs': ['fixtures'], 'exclude_non_package_dirs': []}
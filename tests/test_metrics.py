@@ -0,0 +1,148 @@
+# tests/test_metrics.py
+import textwrap
+
+import numpy as np
+
+from analyzer.aggregates import MetricsAggregator
+from analyzer.core import CodeAnalyzer
+from analyzer.metrics import SourceLines
+from analyzer.model import ModuleRecord
+
+
+SOURCE = textwrap.dedent('''
+    # Модуль с примерами
+    import asyncio
+
+
+    async def fetch(items, limit):
+        """Загружает элементы."""
+        async for item in items:   # точка ветвления
+            if item > limit and limit:
+                return [x for x in item if x]
+            elif item:
+                continue
+            else:
+                assert item
+        return None
+
+
+    def route(command):
+        match command:
+            case 'start' if command:
+                return 1
+            case ['stop', *_]:
+                return 2
+            case _:
+                return route(command[1:])
+
+
+    class Worker:
+        async def run(self):
+            try:
+                await asyncio.sleep(0)
+            except OSError:
+                pass
+            else:
+                return lambda value: value if value else None
+''')
+
+
+def _functions(info):
+    functions = {func['name']: func for func in info['functions']}
+    for cls in info['classes']:
+        functions.update({method['name']: method for method in cls['methods']})
+    return functions
+
+
+def test_function_metrics_cover_async_match_and_comprehensions():
+    info = CodeAnalyzer('.').analyze_file(SOURCE, 'pkg/sample.py')
+    functions = _functions(info)
+
+    fetch = functions['fetch']
+    assert fetch['is_async']
+    # async for, if, and, генератор с условием, elif, assert
+    assert fetch['complexity'] == 1 + 1 + 1 + 1 + 2 + 1 + 1
+    # for (1) + if (1 + 1) + and (1) + elif (1) + else (1)
+    assert fetch['metrics']['cognitive_complexity'] == 6
+    assert fetch['metrics']['max_nesting'] == 2
+    assert fetch['metrics']['sloc'] == 10 and fetch['metrics']['comments'] == 0
+
+    route = functions['route']
+    # два case (кроме case _) и условие case
+    assert route['complexity'] == 4
+    # match (1) + рекурсивный вызов (1)
+    assert route['metrics']['cognitive_complexity'] == 2
+
+    run = functions['run']
+    assert run['is_async'] and [m['name'] for m in info['classes'][0]['methods']] == ['run']
+    # except, else у try, тернарный оператор
+    assert run['complexity'] == 4
+    # except (1), тернарный оператор внутри lambda (1 + 1)
+    assert run['metrics']['cognitive_complexity'] == 3
+
+    for func in functions.values():
+        metrics = func['metrics']
+        assert metrics['halstead_volume'] > 0 and metrics['halstead_effort'] >= metrics['halstead_volume']
+        assert 0 < metrics['maintainability_index'] <= 100
+
+    module = info['metrics']
+    assert (module['sloc'], module['comments'], module['blank']) == (27, 1, info['loc'] - 28)
+    assert module['complexity'] == 1 + sum(func['complexity'] - 1 for func in functions.values())
+    assert module['cognitive_complexity'] == sum(f['metrics']['cognitive_complexity'] for f in functions.values())
+
+
+def test_nested_functions_add_to_enclosing_function():
+    source = 'def outer(x):\n    if x:\n        def inner(y):\n            while y:\n                y -= 1\n'
+    info = CodeAnalyzer('.').analyze_file(source, 'nested.py')
+    outer, inner = info['functions']
+
+    assert (outer['complexity'], inner['complexity']) == (3, 2)
+    assert outer['metrics']['max_nesting'] == 2 and inner['metrics']['max_nesting'] == 1
+    assert outer['metrics']['halstead_volume'] > inner['metrics']['halstead_volume']
+
+
+def test_source_lines_count_ranges():
+    lines = SourceLines(['x = 1', '', '  # comment', 'y = 2'])
+    assert lines.count(1, 4) == (2, 1, 1)
+    assert lines.count(2, 3) == (0, 1, 1)
+    assert lines.count(5, 9) == (0, 0, 0)
+
+
+def test_aggregates_match_python_computation():
+    analyzer = CodeAnalyzer('.')
+    sources = {
+        'a.py': SOURCE,
+        'pkg/b.py': 'def f(x):\n    return x or 1\n\nclass C:\n    def m(self):\n        pass\n',
+        'pkg/c.py': '',
+        'broken.py': 'def broken(:\n',
+    }
+    for path, source in sources.items():
+        analyzer._add_module(path, analyzer.analyze_file(source, path))
+    report = analyzer.generate_project_report()
+    metrics = report['metrics']
+
+    complexities = [f['complexity'] for m in analyzer.modules.values() if 'error' not in m
+                    for f in _functions(m).values()]
+    assert metrics['functions']['count'] == len(complexities) == 5
+    assert metrics['functions']['complexity']['max'] == max(complexities)
+    assert metrics['functions']['complexity']['p50'] == round(float(np.percentile(complexities, 50)), 2)
+    assert sum(metrics['complexity_bands'].values()) == len(complexities)
+    assert metrics['modules']['count'] == 3
+    assert metrics['totals']['sloc'] == sum(m['metrics']['sloc'] for m in analyzer.modules.values() if 'error' not in m)
+
+    packages = {package['package']: package for package in metrics['packages']}
+    assert set(packages) == {'.', 'pkg'}
+    assert packages['pkg']['modules'] == 2 and packages['pkg']['functions'] == 2
+    assert packages['pkg']['complexity_max'] == 2
+
+    # Значения неизмененных модулей берутся из кеша агрегатора
+    aggregator = analyzer.aggregator
+    cached = aggregator._rows['a.py']
+    analyzer.modules['pkg/c.py'] = ModuleRecord.from_dict(analyzer.analyze_file('def g():\n    pass\n', 'pkg/c.py'))
+    updated = aggregator.aggregate(analyzer.modules)
+    assert aggregator._rows['a.py'] is cached
+    assert updated['functions']['count'] == 6
+    assert updated == MetricsAggregator().aggregate(analyzer.modules)
+    del analyzer.modules['a.py']
+    assert aggregator.aggregate(analyzer.modules) == MetricsAggregator().aggregate(analyzer.modules)
+    assert MetricsAggregator().aggregate({})['packages'] == []
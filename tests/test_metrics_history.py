@@ -0,0 +1,117 @@
+# tests/test_metrics_history.py
+import datetime
+
+import pytest
+
+from utils.file_manager import FileManager
+from utils.metrics_history import MetricsHistory
+from utils.pagination import PageRequestError
+
+DAY = 86400
+START = datetime.datetime(2024, 1, 1).timestamp()
+
+
+def _report(analysis_id, complexities, maintainability=50):
+    """Отчет с функциями {путь: {имя: сложность}}"""
+    modules = {}
+    for path, functions in complexities.items():
+        modules[path] = {
+            'path': path,
+            'loc': 10 * len(functions),
+            'metrics': {'complexity': sum(functions.values()), 'sloc': 8 * len(functions)},
+            'functions': [
+                {'name': name, 'line': line, 'complexity': complexity,
+                 'metrics': {'maintainability_index': maintainability, 'sloc': 8}}
+                for line, (name, complexity) in enumerate(sorted(functions.items()), 1)
+            ],
+            'classes': [{'name': 'Service', 'line': 50, 'methods': [
+                {'name': 'run', 'line': 51, 'complexity': 2, 'metrics': {}}]}],
+        }
+    return {'analysis_id': analysis_id, 'modules': modules}
+
+
+def _history(tmp_path):
+    history = MetricsHistory(str(tmp_path / 'history.sqlite3'))
+    history.record('p', _report('a1', {'pkg/a.py': {'load': 2, 'save': 5}, 'pkg/b.py': {'parse': 3},
+                                       'tools/c.py': {'main': 1}}), created=START)
+    history.record('p', _report('a2', {'pkg/a.py': {'load': 7, 'save': 4}, 'pkg/b.py': {'parse': 3},
+                                       'tools/c.py': {'main': 1}}), created=START + 30 * DAY)
+    history.record('p', _report('a3', {'pkg/a.py': {'load': 9, 'save': 4}, 'pkg/b.py': {'parse': 1, 'new': 6},
+                                       'tools/c.py': {'main': 1}}, maintainability=40), created=START + 60 * DAY)
+    return history
+
+
+def _values(result):
+    return [point['value'] for point in result['points']]
+
+
+def test_record_and_trends(tmp_path):
+    history = _history(tmp_path)
+    # Повторное сохранение того же анализа не добавляет снимок
+    assert history.record('p', _report('a3', {}), created=START + 61 * DAY) is None
+    assert [s['analysis_id'] for s in history.snapshots('p', {})['snapshots']] == ['a3', 'a2', 'a1']
+    assert history.snapshots('p', {})['snapshots'][0]['functions'] == 8
+
+    assert _values(history.trend('p', {'module': 'pkg/a.py', 'function': 'load'})) == [2, 7, 9]
+    assert _values(history.trend('p', {'module': 'pkg/a.py', 'function': 'Service.run'})) == [2, 2, 2]
+    assert _values(history.trend('p', {'module': 'pkg/b.py', 'metric': 'loc'})) == [10, 10, 20]
+    assert _values(history.trend('p', {'package': 'pkg'})) == [10, 14, 20]
+    assert _values(history.trend('p', {'package': 'pkg', 'agg': 'max'})) == [7, 11, 13]
+    assert _values(history.trend('p', {})) == [11, 15, 21]
+    assert _values(history.trend('p', {'module': 'pkg/a.py', 'function': 'load', 'since': '2024-01-15'})) == [7, 9]
+
+    assert history.trend('other', {}) is None
+    with pytest.raises(PageRequestError):
+        history.trend('p', {'metric': 'halstead_effort'})
+    with pytest.raises(PageRequestError):
+        history.trend('p', {'function': 'load'})
+
+
+def test_movers_and_regressions(tmp_path):
+    history = _history(tmp_path)
+
+    movers = history.top_movers('p', {})
+    assert (movers['base']['analysis_id'], movers['head']['analysis_id']) == ('a1', 'a3')
+    assert [(c['module'], c['function'], c['delta']) for c in movers['changes']] == [
+        ('pkg/a.py', 'load', 7), ('pkg/b.py', 'parse', -2), ('pkg/a.py', 'save', -1)]
+    assert [c['function'] for c in history.top_movers('p', {'direction': 'down', 'limit': '1'})['changes']] == \
+        ['parse']
+    assert history.top_movers('p', {'since': '2024-01-15'})['base']['analysis_id'] == 'a2'
+    modules = history.top_movers('p', {'level': 'module', 'metric': 'complexity'})['changes']
+    assert [(c['module'], c['delta']) for c in modules] == [('pkg/a.py', 6), ('pkg/b.py', 4)]
+
+    regressions = history.regressions('p', {})
+    assert regressions['base']['analysis_id'] == 'a2'
+    assert [(c['function'], c['before'], c['after']) for c in regressions['changes']] == [('load', 7, 9)]
+    assert [c['function'] for c in history.regressions('p', {'base': 'a1', 'threshold': '3'})['changes']] == \
+        ['load']
+    # Для индекса сопровождаемости ухудшение - снижение
+    worse = history.regressions('p', {'metric': 'maintainability_index', 'threshold': '5'})['changes']
+    assert {c['function'] for c in worse} == {'load', 'save', 'parse', 'main'}
+    assert history.regressions('p', {'head': 'a1'})['changes'] == []
+
+    with pytest.raises(PageRequestError):
+        history.regressions('p', {'base': 'missing'})
+
+
+def test_save_report_appends_history(tmp_path, monkeypatch):
+    pytest.importorskip('flask')
+    import app as app_module
+
+    monkeypatch.setattr(FileManager, 'base_dir', str(tmp_path))
+    monkeypatch.setattr(app_module, 'metrics_history', MetricsHistory(str(tmp_path / 'history.sqlite3')))
+    (tmp_path / 'project').mkdir()
+    (tmp_path / 'project' / 'mod.py').write_text('def f(x):\n    return x if x else 0\n', encoding='utf-8')
+    analyzer = app_module.CodeAnalyzer(str(tmp_path / 'project'))
+    analyzer.scan_project()
+    app_module.analysis_results['history-project'] = analyzer.generate_project_report()
+    client = app_module.app.test_client()
+
+    saved = client.get('/save_report/history-project').get_json()
+    assert saved['success'] and saved['history_snapshot'] is not None
+
+    trend = client.get('/history/history-project/trend?module=mod.py&function=f').get_json()
+    assert [point['value'] for point in trend['points']] == [2]
+    assert client.get('/history/history-project/regressions').get_json()['base'] is None
+    assert client.get('/history/history-project/movers?level=class').status_code == 400
+    assert client.get('/history/unknown/trend').status_code == 404
@@ -0,0 +1,90 @@
+# tests/test_pagination.py
+import pytest
+
+from analyzer.core import CodeAnalyzer
+from utils.pagination import ReportPaginator, PageRequestError, MODULES, FUNCTIONS, EDGES
+
+
+def _report(sources):
+    analyzer = CodeAnalyzer('.')
+    for path, source in sources.items():
+        analyzer._add_module(path, analyzer.analyze_file(source, path))
+    return analyzer.generate_project_report()
+
+
+SOURCES = {
+    f'pkg/mod{i}.py': 'import os\n' + ''.join(
+        f'def f{j}(x):\n    pass\n' + '    if x and x:\n        pass\n' * j for j in range(i % 4)
+    )
+    for i in range(10)
+}
+
+
+def test_cursor_paging_covers_all_rows_once():
+    report = _report(SOURCES)
+    paginator = ReportPaginator()
+
+    seen = []
+    args = {'limit': '3', 'sort': 'path', 'order': 'desc'}
+    while True:
+        page = paginator.page(report, MODULES, args)
+        assert page['total'] == 10
+        seen.extend(item['path'] for item in page['items'])
+        if page['next_cursor'] is None:
+            break
+        args = dict(args, cursor=page['next_cursor'])
+
+    assert seen == sorted(SOURCES, reverse=True)
+
+
+def test_fields_filters_and_sorting():
+    report = _report(SOURCES)
+    paginator = ReportPaginator()
+
+    page = paginator.page(report, FUNCTIONS, {
+        'fields': 'name,complexity', 'sort': 'complexity', 'order': 'desc', 'min_complexity': '2'
+    })
+    assert page['items'] and all(set(item) == {'name', 'complexity'} for item in page['items'])
+    complexities = [item['complexity'] for item in page['items']]
+    assert complexities == sorted(complexities, reverse=True)
+    assert min(complexities) >= 2
+
+    edges = paginator.page(report, EDGES, {'kind': 'stdlib'})
+    assert edges['total'] == 10
+    assert {item['target'] for item in edges['items']} == {'os'}
+
+
+def test_invalid_requests_and_stale_cursor():
+    report = _report(SOURCES)
+    paginator = ReportPaginator()
+
+    for args in ({'sort': 'error'}, {'fields': 'secret'}, {'limit': 'x'}, {'cursor': '!!'}):
+        with pytest.raises(PageRequestError):
+            paginator.page(report, MODULES, args)
+
+    cursor = paginator.page(report, MODULES, {'limit': '2'})['next_cursor']
+    changed = _report(dict(SOURCES, **{'new.py': 'x = 1\n'}))
+    assert changed['analysis_id'] != report['analysis_id']
+    with pytest.raises(PageRequestError):
+        paginator.page(changed, MODULES, {'limit': '2', 'cursor': cursor})
+
+
+def test_report_endpoints_support_etag():
+    flask = pytest.importorskip('flask')
+    import app as app_module
+
+    report = _report(SOURCES)
+    app_module.analysis_results['test-project'] = report
+    client = app_module.app.test_client()
+
+    response = client.get('/report/test-project/functions?limit=2')
+    assert response.status_code == 200
+    assert len(response.get_json()['items']) == 2
+    etag = response.headers['ETag']
+
+    cached = client.get('/report/test-project/functions?limit=2', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+
+    assert client.get('/report/test-project/modules?sort=bogus').status_code == 400
+    summary = client.get('/report/test-project?fields=total_modules,total_loc').get_json()
+    assert summary == {'total_modules': 10, 'total_loc': report['total_loc']}
@@ -0,0 +1,131 @@
+# tests/test_report_catalog.py
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from utils.file_manager import FileManager
+from utils.pagination import PageRequestError
+from utils.report_catalog import ReportCatalog
+
+
+def _catalog(tmp_path, **kwargs):
+    directories = {name: str(tmp_path / name) for name in ('reports', 'graphs', 'mermaid')}
+    for path in directories.values():
+        os.makedirs(path)
+    return ReportCatalog(str(tmp_path / 'catalog.sqlite3'), directories, FileManager.FILE_TYPES, **kwargs)
+
+
+def _write(path, data='x', created=None):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(data)
+    if created is not None:
+        os.utime(path, (created, created))
+
+
+def test_catalog_lists_pages_and_filters(tmp_path):
+    catalog = _catalog(tmp_path)
+    for i in range(5):
+        path = tmp_path / 'reports' / f'report_{i}.json'
+        _write(path)
+        catalog.record('reports', str(path))
+    _write(tmp_path / 'graphs' / 'graph_1.svg')
+    _write(tmp_path / 'reports' / 'notes.txt')
+
+    first = catalog.list({'limit': '4'})
+    assert first['total'] == 6 and len(first['reports']) == 4
+    second = catalog.list({'limit': '4', 'cursor': first['next_cursor']})
+    assert second['next_cursor'] is None
+    names = [r['filename'] for r in first['reports'] + second['reports']]
+    assert sorted(names) == ['graph_1.svg'] + [f'report_{i}.json' for i in range(5)]
+
+    svg = catalog.list({'type': 'SVG Diagram'})['reports']
+    assert [(r['filename'], r['category']) for r in svg] == [('graph_1.svg', 'graphs')]
+    assert catalog.list({'q': 'rt_3'})['total'] == 1
+    assert catalog.list({'q': '%'})['total'] == 0
+    assert catalog.list({'until': '2000-01-01'})['total'] == 0
+
+    with pytest.raises(PageRequestError):
+        catalog.list({'cursor': 'garbage'})
+    with pytest.raises(PageRequestError):
+        catalog.list({'since': 'yesterday'})
+
+
+def test_catalog_reconciles_external_changes_lazily(tmp_path):
+    catalog = _catalog(tmp_path)
+    assert catalog.list({})['total'] == 0
+
+    external = tmp_path / 'mermaid' / 'diagram.mermaid'
+    _write(external)
+    assert catalog.lookup('diagram.mermaid') == ('mermaid', str(tmp_path / 'mermaid'))
+
+    os.unlink(external)
+    assert catalog.lookup('diagram.mermaid') is None
+    assert catalog.list({})['total'] == 0
+    assert catalog.lookup('../catalog.sqlite3') is None
+
+    # Файл, сохраненный через каталог, не вызывает повторного сканирования директории
+    saved = tmp_path / 'reports' / 'report.json'
+    version = catalog.directory_version('reports')
+    _write(saved)
+    catalog.record('reports', str(saved), version)
+    row = catalog._conn.execute("SELECT mtime_ns FROM directories WHERE category = 'reports'").fetchone()
+    assert row[0] == os.stat(tmp_path / 'reports').st_mtime_ns
+
+
+def test_catalog_prunes_by_age_and_size(tmp_path):
+    catalog = _catalog(tmp_path, max_age=3600, max_total_bytes=25)
+    now = time.time()
+    old = tmp_path / 'reports' / 'old.json'
+    _write(old, created=now - 7200)
+    catalog.record('reports', str(old))
+    # ctime нельзя задать явно, поэтому возраст задается в индексе
+    catalog._conn.execute("UPDATE reports SET created = ? WHERE filename = 'old.json'", (now - 7200,))
+    catalog._conn.commit()
+
+    for i in range(3):
+        path = tmp_path / 'graphs' / f'g{i}.svg'
+        _write(path, 'y' * 10)
+        catalog.record('graphs', str(path))
+
+    assert not old.exists()
+    remaining = sorted(r['filename'] for r in catalog.list({})['reports'])
+    assert len(remaining) == 2 and 'g2.svg' in remaining
+    assert sorted(os.listdir(tmp_path / 'graphs')) == remaining
+
+
+def test_report_endpoints_use_catalog(tmp_path, monkeypatch):
+    pytest.importorskip('flask')
+    import app as app_module
+
+    monkeypatch.setattr(FileManager, 'base_dir', str(tmp_path))
+    catalog = ReportCatalog(str(tmp_path / 'catalog.sqlite3'), {
+        'reports': str(tmp_path / 'reports'),
+        'graphs': str(tmp_path / 'graphs'),
+        'mermaid': str(tmp_path / 'mermaid'),
+    }, FileManager.FILE_TYPES)
+    monkeypatch.setattr(app_module, 'report_catalog', catalog)
+    monkeypatch.setattr(FileManager, 'catalog', catalog)
+    client = app_module.app.test_client()
+
+    filepath = FileManager.save_to_file('graphs', 'graph.svg', lambda f: f.write('<svg/>'))
+    page = client.get('/list_reports?type=SVG Diagram').get_json()
+    assert page['total'] == 1 and page['reports'][0]['path'] == filepath
+
+    response = client.get('/download_report/graph.svg')
+    assert response.status_code == 200 and response.get_data() == b'<svg/>'
+    assert client.get('/download_report/missing.svg').status_code == 404
+    assert client.get('/list_reports?limit=x').status_code == 400
+
+
+def test_app_import_creates_no_files(tmp_path):
+    pytest.importorskip('flask')
+    env = {key: value for key, value in os.environ.items() if not key.startswith('CODE_ANALYZER_')}
+    env['PYTHONPATH'] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, '-c', 'import app; app.report_catalog.close(); app.metrics_history.close()'],
+                   cwd=str(tmp_path), env=env, check=True)
+
+    # Базы данных и директории данных создаются при первом обращении
+    assert os.listdir(tmp_path) == []
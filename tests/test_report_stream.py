@@ -0,0 +1,52 @@
+# tests/test_report_stream.py
+import json
+
+import pytest
+
+from analyzer.core import CodeAnalyzer
+from analyzer.model import json_default
+from analyzer.report_stream import ReportStreamWriter, iter_report, read_report, report_filename
+
+
+def _project(tmp_path):
+    root = tmp_path / 'project'
+    (root / 'pkg').mkdir(parents=True)
+    (root / 'pkg' / '__init__.py').write_text('', encoding='utf-8')
+    (root / 'pkg' / 'a.py').write_text('import os\n\ndef f(x):\n    if x:\n        return 1\n', encoding='utf-8')
+    (root / 'pkg' / 'b.py').write_text('from . import a\n\nclass C:\n    def m(self):\n        pass\n',
+                                       encoding='utf-8')
+    (root / 'broken.py').write_text('def broken(:\n', encoding='utf-8')
+    return root
+
+
+@pytest.mark.parametrize('compression', ['none', 'gzip', 'bz2', 'xz'])
+def test_streamed_report_round_trip(tmp_path, compression):
+    analyzer = CodeAnalyzer(str(_project(tmp_path)))
+    output = str(tmp_path / report_filename('report', compression))
+
+    with ReportStreamWriter(output) as writer:
+        analyzer.scan_project(on_module=writer.write_module)
+        report = analyzer.generate_project_report()
+        writer.write_summary(report)
+
+    assert writer.modules_written == len(analyzer.modules)
+
+    types = [record_type for record_type, _ in iter_report(output)]
+    assert types == ['header'] + ['module'] * len(analyzer.modules) + ['summary']
+
+    expected = json.loads(json.dumps(report, default=json_default))
+    assert read_report(output) == expected
+
+
+def test_save_report_and_invalid_input(tmp_path):
+    analyzer = CodeAnalyzer(str(_project(tmp_path)))
+    analyzer.scan_project()
+
+    output = str(tmp_path / 'report.ndjson.gz')
+    analyzer.save_report(output)
+    assert set(read_report(output)['modules']) == set(analyzer.modules)
+
+    plain = tmp_path / 'report.json'
+    analyzer.save_report(str(plain))
+    with pytest.raises(ValueError):
+        list(iter_report(str(plain)))
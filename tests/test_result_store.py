@@ -0,0 +1,95 @@
+# tests/test_result_store.py
+import os
+import time
+
+import pytest
+
+from utils.project_manager import ProjectManager
+from utils.result_store import MemoryResultStore, SharedFileResultStore, estimate_size
+
+
+def _report(n):
+    return {'total_modules': n, 'payload': 'x' * 100}
+
+
+def test_memory_store_evicts_lru_and_spills_to_disk(tmp_path):
+    budget = estimate_size(_report(1)) * 2
+    store = MemoryResultStore(budget, spill_dir=str(tmp_path))
+
+    store['a'] = _report(1)
+    store['b'] = _report(2)
+    assert store['a'] == _report(1)   # 'b' становится самым старым
+    store['c'] = _report(3)
+
+    assert os.path.exists(tmp_path / 'b.json')
+    assert 'b' in store               # проверка in не загружает отчет с диска
+    assert os.path.exists(tmp_path / 'b.json')
+    assert store['b'] == _report(2)   # загружается обратно с диска
+    assert 'missing' not in store
+
+
+def test_memory_store_bounds_spill_dir(tmp_path):
+    # Файл прежнего запуска удаляется первым, как самый старый
+    (tmp_path / 'old.json').write_text('x' * 1000, encoding='utf-8')
+    os.utime(tmp_path / 'old.json', (time.time() - 1000, time.time() - 1000))
+    store = MemoryResultStore(estimate_size(_report(1)), spill_dir=str(tmp_path), max_spill_bytes=500)
+
+    for name in 'abc':
+        store[name] = _report(1)
+
+    assert sorted(os.listdir(tmp_path)) == ['a.json', 'b.json']
+    assert store['a'] == _report(1)
+
+
+def test_size_estimate_does_not_serialize_report():
+    small = {'modules': {'a.py': object()}, 'total_loc': 10}
+    large = {'modules': {f'{i}.py': object() for i in range(100)}, 'total_loc': 10000}
+    assert estimate_size(small) < estimate_size(large)
+
+
+def test_memory_store_ttl_expires_entries():
+    store = MemoryResultStore(10 ** 6, ttl=0.01)
+    store['a'] = _report(1)
+    time.sleep(0.02)
+    assert 'a' not in store
+
+
+def test_shared_store_is_visible_across_instances(tmp_path):
+    first = SharedFileResultStore(str(tmp_path), 10 ** 6)
+    second = SharedFileResultStore(str(tmp_path), 10 ** 6)
+
+    first['p'] = _report(1)
+    assert second['p'] == _report(1)
+
+    first['p'] = _report(2)
+    assert second['p'] == _report(2)
+
+    del second['p']
+    assert 'p' not in first
+
+
+def test_project_id_is_stable(tmp_path):
+    project_id = ProjectManager.make_project_id(str(tmp_path))
+    assert project_id == ProjectManager.make_project_id(str(tmp_path) + os.sep)
+    assert len(project_id) == 16
+
+
+def test_routes_return_404_when_report_disappears(monkeypatch):
+    pytest.importorskip('flask')
+    import app as app_module
+
+    class VanishingStore(MemoryResultStore):
+        """Отчет истекает между проверкой in и чтением"""
+
+        def __contains__(self, project_id):
+            return True
+
+        def get(self, project_id, default=None):
+            return default
+
+    monkeypatch.setattr(app_module, 'analysis_results', VanishingStore(10 ** 6))
+    client = app_module.app.test_client()
+
+    for url in ('/report/gone', '/report/gone/modules', '/dependencies/gone/cycles', '/duplicates/gone',
+                '/symbols/gone?name=f', '/save_report/gone', '/export/gone/html'):
+        assert client.get(url).status_code == 404, url
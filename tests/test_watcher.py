@@ -0,0 +1,168 @@
+# tests/test_watcher.py
+import json
+
+import pytest
+
+from analyzer.core import OPTIONAL_SECTIONS, CodeAnalyzer
+from analyzer.dead_code import find_dead_code
+from analyzer.dependency_graph import DependencyGraph
+from analyzer.discovery import FileDiscovery
+from analyzer.model import json_default
+from analyzer.watcher import InotifyWatcher, PollingWatcher
+from utils.live_session import LiveSession
+
+
+def _project(root):
+    (root / 'pkg').mkdir(parents=True)
+    (root / 'pkg' / '__init__.py').write_text('', encoding='utf-8')
+    (root / 'pkg' / 'a.py').write_text('import os\n\ndef f(x):\n    if x:\n        return 1\n', encoding='utf-8')
+    (root / 'pkg' / 'b.py').write_text('from . import a\n\nclass C:\n    def m(self):\n        pass\n',
+                                       encoding='utf-8')
+    return root
+
+
+def _collect(watcher, attempts=20):
+    files, dirs = set(), set()
+    for _ in range(attempts):
+        new_files, new_dirs = watcher.poll(0.1)
+        files |= new_files
+        dirs |= new_dirs
+        if files or dirs:
+            break
+    return files, dirs
+
+
+def test_inotify_watcher_reports_changed_files(tmp_path):
+    root = _project(tmp_path / 'project')
+    (root / '.venv').mkdir()
+    try:
+        watcher = InotifyWatcher(FileDiscovery(str(root)))
+    except OSError:
+        pytest.skip('inotify is not available')
+
+    with watcher:
+        (root / 'pkg' / 'a.py').write_text('import sys\n', encoding='utf-8')
+        (root / 'pkg' / 'notes.txt').write_text('text\n', encoding='utf-8')
+        (root / '.venv' / 'dep.py').write_text('x = 1\n', encoding='utf-8')
+        assert _collect(watcher) == ({'pkg/a.py'}, set())
+
+        (root / 'pkg' / 'b.py').unlink()
+        assert _collect(watcher) == ({'pkg/b.py'}, set())
+
+        (root / 'sub').mkdir()
+        (root / 'sub' / 'c.py').write_text('x = 1\n', encoding='utf-8')
+        files, dirs = _collect(watcher)
+        # Файл может попасть как в пакет с созданием директории, так и в следующий
+        files |= _collect(watcher, 2)[0]
+        assert files == {'sub/c.py'}
+        assert dirs == {'sub'}
+
+
+def test_polling_watcher_reports_changed_files(tmp_path):
+    root = _project(tmp_path / 'project')
+    watcher = PollingWatcher(FileDiscovery(str(root)), interval=0)
+
+    (root / 'pkg' / 'a.py').write_text('import sys\n\n\n', encoding='utf-8')
+    (root / 'pkg' / 'b.py').unlink()
+    (root / 'pkg' / 'c.py').write_text('x = 1\n', encoding='utf-8')
+
+    assert watcher.poll(0) == ({'pkg/a.py', 'pkg/b.py', 'pkg/c.py'}, set())
+    assert watcher.poll(0) == (set(), set())
+
+
+def _edges(graph_data):
+    graph = DependencyGraph.from_dict(graph_data)
+    return {(graph.nodes[i], graph.nodes[j]) for i in range(len(graph.nodes)) for j in graph.successors(i)}
+
+
+def _assert_matches_full_scan(session, root):
+    analyzer = CodeAnalyzer(str(root))
+    analyzer.scan_project()
+    expected = analyzer.generate_project_report(top_k=session.top_k)
+    report = session.report
+
+    for key in ('total_modules', 'total_loc', 'total_functions', 'total_classes',
+                'dependency_graph', 'complex_functions'):
+        assert report[key] == expected[key], key
+    # Разделы по всему проекту не попадают в патч, их строят маршруты по индексам сессии
+    assert not set(OPTIONAL_SECTIONS) & set(report)
+    assert session.symbols.to_dict() == analyzer.get_symbol_index().to_dict()
+    assert session.clones.to_dict() == analyzer.get_clone_index().to_dict()
+    assert find_dead_code(session.symbols) == analyzer.find_dead_code()
+    assert json.dumps(report['modules'], sort_keys=True, default=json_default) == \
+        json.dumps(expected['modules'], sort_keys=True, default=json_default)
+    assert _edges(report['module_graph']) == _edges(expected['module_graph'])
+
+
+def test_live_session_patches_report_like_full_scan(tmp_path):
+    root = _project(tmp_path / 'project')
+    analyzer = CodeAnalyzer(str(root))
+    analyzer.scan_project()
+    report = analyzer.generate_project_report()
+    session = LiveSession('project', analyzer, report, PollingWatcher(analyzer.discovery), top_k=2)
+    first_id = report['analysis_id']
+
+    (root / 'pkg' / 'a.py').write_text('import json\nfrom . import b\n\ndef f(x):\n    if x and x:\n'
+                                       '        return 1\n\ndef g():\n    pass\n', encoding='utf-8')
+    event = session.apply_changes({'pkg/a.py'})
+
+    assert event['modules'] == {'added': [], 'removed': [], 'updated': ['pkg/a.py']}
+    assert event['dependencies'] == {
+        'added': [['pkg/a.py', 'json']],
+        'removed': [['pkg/a.py', 'os']]
+    }
+    assert report['analysis_id'] != first_id
+    _assert_matches_full_scan(session, root)
+
+    (root / 'pkg' / 'b.py').unlink()
+    (root / 'pkg' / 'sub').mkdir()
+    (root / 'pkg' / 'sub' / '__init__.py').write_text('from .. import a\n', encoding='utf-8')
+    event = session.apply_changes({'pkg/b.py'}, {'pkg/sub'})
+
+    assert event['modules']['added'] == ['pkg/sub/__init__.py']
+    assert event['modules']['removed'] == ['pkg/b.py']
+    assert event['summary']['total_modules'] == 3
+    _assert_matches_full_scan(session, root)
+
+    assert session.apply_changes({'pkg/missing.py', 'pkg/a.py'}) is None
+
+    stream = session.stream_events(last_version=0)
+    assert next(stream).startswith('event: ready')
+    assert next(stream).startswith('id: 1\nevent: update')
+
+
+def test_live_session_keeps_newer_report(tmp_path):
+    pytest.importorskip('flask')
+    import app as app_module
+
+    root = _project(tmp_path / 'project')
+    analyzer = CodeAnalyzer(str(root))
+    analyzer.scan_project()
+    report = analyzer.generate_project_report()
+    project_id = app_module.ProjectManager.make_project_id(str(root))
+    app_module.analysis_results[project_id] = report
+    session = LiveSession(project_id, analyzer, report, PollingWatcher(analyzer.discovery),
+                          persist=lambda updated, persisted_id: app_module._persist_live_report(
+                              project_id, updated, persisted_id))
+
+    (root / 'pkg' / 'a.py').write_text('def f():\n    pass\n', encoding='utf-8')
+    session.apply_changes({'pkg/a.py'})
+    session._persist()
+    assert app_module.analysis_results[project_id]['analysis_id'] == report['analysis_id']
+
+    # Отчет нового анализа не перезаписывается сеансом, запущенным раньше
+    newer = CodeAnalyzer(str(root), discovery=FileDiscovery(str(root), exclude=['pkg/b.py']))
+    newer.scan_project()
+    newer_report = newer.generate_project_report()
+    app_module.analysis_results[project_id] = newer_report
+    (root / 'pkg' / 'a.py').write_text('def g():\n    pass\n', encoding='utf-8')
+    session.apply_changes({'pkg/a.py'})
+    session._persist()
+    assert app_module.analysis_results[project_id] is newer_report
+
+    # Новый анализ наблюдаемого проекта останавливает наблюдение
+    app_module.watch_manager.start(session)
+    client = app_module.app.test_client()
+    assert client.post('/analyze', data={'project_path': str(root)}).get_json()['project_id'] == project_id
+    assert app_module.watch_manager.get(project_id) is None
+    assert app_module.analysis_results[project_id]['total_modules'] == 3
@@ -0,0 +1,108 @@
+# export_cache.py
+import glob
+import os
+import tempfile
+from typing import Callable, Iterator, Optional
+
+from analyzer.export import EXPORT_FORMATS, EXPORT_VERSION
+
+
+class ExportCache:
+    """
+    Дисковый кеш экспортов отчетов.
+
+    Файл экспорта определяется идентификатором проекта, идентификатором
+    анализа и форматом, поэтому повторный экспорт того же анализа
+    отдается с диска без повторной генерации. При сохранении экспорта
+    нового анализа файлы прежних анализов проекта удаляются.
+    """
+
+    # Размер части ответа при потоковой передаче, байт
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Директория для файлов экспорта
+        """
+        self.directory = directory
+
+    def path(self, project_id: str, analysis_id: str, export_format: str) -> str:
+        """Возвращает путь к файлу экспорта"""
+        extension = EXPORT_FORMATS[export_format][1]
+        return os.path.join(self.directory, project_id, f'v{EXPORT_VERSION}-{analysis_id}{extension}')
+
+    def get(self, project_id: str, analysis_id: str, export_format: str) -> Optional[str]:
+        """Возвращает путь к сохраненному экспорту или None"""
+        path = self.path(project_id, analysis_id, export_format)
+        return path if os.path.isfile(path) else None
+
+    def stream(self, project_id: str, analysis_id: str, export_format: str,
+               chunks: Iterator[str]) -> Iterator[bytes]:
+        """
+        Передает экспорт по частям, одновременно сохраняя его в кеш.
+
+        Файл появляется в кеше только после полной записи; если передача
+        прервана, временный файл удаляется.
+
+        Args:
+            project_id: Идентификатор проекта
+            analysis_id: Идентификатор анализа
+            export_format: Формат экспорта
+            chunks: Части экспорта
+
+        Yields:
+            Части экспорта в кодировке UTF-8
+        """
+        path = self.path(project_id, analysis_id, export_format)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                buffer = []
+                size = 0
+                for chunk in chunks:
+                    data = chunk.encode('utf-8')
+                    buffer.append(data)
+                    size += len(data)
+                    if size >= self.CHUNK_SIZE:
+                        block = b''.join(buffer)
+                        f.write(block)
+                        yield block
+                        buffer, size = [], 0
+                block = b''.join(buffer)
+                f.write(block)
+                yield block
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        self._prune(path)
+
+    def ensure(self, project_id: str, analysis_id: str, export_format: str,
+               chunks: Callable[[], Iterator[str]]) -> str:
+        """
+        Возвращает путь к экспорту, создавая его при отсутствии в кеше.
+
+        Args:
+            chunks: Функция, возвращающая части экспорта; вызывается
+                только при промахе кеша
+        """
+        path = self.get(project_id, analysis_id, export_format)
+        if path is None:
+            for _ in self.stream(project_id, analysis_id, export_format, chunks()):
+                pass
+            path = self.path(project_id, analysis_id, export_format)
+        return path
+
+    def _prune(self, keep: str) -> None:
+        """Удаляет экспорты того же формата, созданные для прежних анализов проекта"""
+        extension = os.path.splitext(keep)[1]
+        for path in glob.glob(os.path.join(glob.escape(os.path.dirname(keep)), f'*{extension}')):
+            if path != keep:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
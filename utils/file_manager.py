@@ -1,7 +1,8 @@
 # file_manager.py
 import os
 import datetime
-from typing import Dict, List, Any, Callable
+import hashlib
+from typing import Callable, Optional
 
 
 class FileManager:
@@ -9,9 +10,16 @@ class FileManager:
     REPORTS_DIR = 'reports'
     GRAPHS_DIR = 'graphs'
     MERMAID_DIR = 'mermaid'
+    CACHE_DIR = 'cache'
+    RESULTS_DIR = 'results'
+    EXPORTS_DIR = 'exports'
 
     FILE_TYPES = {
         '.json': 'JSON Report',
+        '.ndjson': 'NDJSON Report',
+        '.gz': 'NDJSON Report (gzip)',
+        '.bz2': 'NDJSON Report (bz2)',
+        '.xz': 'NDJSON Report (xz)',
         '.html': 'HTML Report',
         '.svg': 'SVG Diagram',
         '.mermaid': 'Mermaid Diagram'
@@ -19,66 +27,78 @@ class FileManager:
 
     CONTENT_TYPES = {
         '.json': 'application/json',
+        '.ndjson': 'application/x-ndjson',
+        '.gz': 'application/gzip',
+        '.bz2': 'application/x-bzip2',
+        '.xz': 'application/x-xz',
         '.html': 'text/html',
         '.svg': 'image/svg+xml',
         '.mermaid': 'text/plain'
     }
 
+    # Каталог сохраненных файлов (ReportCatalog); задается приложением
+    catalog = None
+
+    # Базовая директория данных приложения; None - текущая директория
+    base_dir = None
+
+    @classmethod
+    def get_base_dir(cls) -> str:
+        """Возвращает базовую директорию, в которой создаются директории данных приложения"""
+        return cls.base_dir or os.getcwd()
+
+    @classmethod
+    def get_data_path(cls, *parts: str) -> str:
+        """Возвращает путь внутри базовой директории, не создавая директорий"""
+        return os.path.join(cls.get_base_dir(), *parts)
+
     @staticmethod
     def get_timestamp() -> str:
         """Возвращает текущий timestamp для имен файлов"""
         return datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
 
     @classmethod
-    def save_to_file(cls, directory: str, filename: str, write_func: Callable) -> str:
-        """Сохраняет данные в файл, используя предоставленную функцию записи"""
-        dir_path = os.path.join(os.getcwd(), directory)
+    def get_output_path(cls, directory: str, filename: str) -> str:
+        """Возвращает путь к файлу в директории приложения, создавая директорию"""
+        dir_path = cls.get_data_path(directory)
         os.makedirs(dir_path, exist_ok=True)
 
-        filepath = os.path.join(dir_path, filename)
+        return os.path.join(dir_path, filename)
+
+    @classmethod
+    def save_to_file(cls, directory: str, filename: str, write_func: Callable) -> str:
+        """Сохраняет данные в файл, используя предоставленную функцию записи"""
+        filepath = cls.get_output_path(directory, filename)
+        version = cls.catalog.directory_version(directory) if cls.catalog is not None else None
 
         with open(filepath, 'w', encoding='utf-8') as f:
             write_func(f)
 
+        cls.register_file(directory, filepath, version)
         return filepath
 
     @classmethod
-    def scan_directory_for_reports(cls, dir_name: str, dir_path: str) -> List[Dict[str, Any]]:
-        """Сканирует директорию и возвращает информацию о файлах отчетов"""
-        reports = []
-
-        for filename in os.listdir(dir_path):
-            file_path = os.path.join(dir_path, filename)
-            if not os.path.isfile(file_path):
-                continue
-
-            _, ext = os.path.splitext(filename)
+    def register_file(cls, directory: str, filepath: str, version: Optional[int] = None) -> None:
+        """
+        Добавляет сохраненный файл в каталог отчетов, если он задан.
+
+        Args:
+            directory: Директория файла
+            filepath: Путь к файлу
+            version: Версия директории до записи файла (ReportCatalog.directory_version)
+        """
+        if cls.catalog is not None:
+            cls.catalog.record(directory, filepath, version)
 
-            if ext not in cls.FILE_TYPES:
-                continue
-
-            file_info = cls.get_file_info(filename, file_path, ext, dir_name)
-            reports.append(file_info)
+    @classmethod
+    def get_cache_path(cls, project_path: str) -> str:
+        """Возвращает путь к файлу кеша анализа для проекта"""
+        dir_path = cls.get_data_path(cls.CACHE_DIR)
+        os.makedirs(dir_path, exist_ok=True)
 
-        return reports
+        project_key = hashlib.sha1(os.path.abspath(project_path).encode('utf-8')).hexdigest()[:16]
 
-    @classmethod
-    def get_file_info(cls, filename: str, file_path: str, ext: str, dir_name: str) -> Dict[str, Any]:
-        """Получает информацию о файле отчета"""
-        creation_time = os.path.getctime(file_path)
-        creation_date = datetime.datetime.fromtimestamp(creation_time)
-        file_size = os.path.getsize(file_path)
-
-        size_str = cls.format_file_size(file_size)
-
-        return {
-            'filename': filename,
-            'created': creation_date.strftime('%Y-%m-%d %H:%M:%S'),
-            'path': file_path,
-            'type': cls.FILE_TYPES[ext],
-            'category': dir_name,
-            'size': size_str
-        }
+        return os.path.join(dir_path, f'analysis_{project_key}.sqlite3')
 
     @staticmethod
     def format_file_size(size_bytes: int) -> str:
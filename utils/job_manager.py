@@ -0,0 +1,221 @@
+# job_manager.py
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterator, Optional
+
+from analyzer.core import AnalysisCancelled
+
+
+class JobLimitExceeded(Exception):
+    """Превышено допустимое количество заданий в очереди"""
+
+
+class AnalysisJob:
+    """Фоновое задание анализа проекта"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+    def __init__(self, project_path: str):
+        self.job_id = uuid.uuid4().hex
+        self.project_path = project_path
+        self.status = self.QUEUED
+        self.files_done = 0
+        self.files_total = 0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+
+        self._cancel_requested = threading.Event()
+        self._changed = threading.Condition()
+        self._version = 0
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in self.FINISHED_STATES
+
+    def report_progress(self, done: int, total: int) -> None:
+        """Обновляет прогресс; прерывает анализ, если запрошена отмена"""
+        if self._cancel_requested.is_set():
+            raise AnalysisCancelled()
+
+        self.files_done = done
+        self.files_total = total
+        self._notify()
+
+    def cancel(self) -> None:
+        """Запрашивает отмену задания"""
+        self._cancel_requested.set()
+        if self.status == self.QUEUED:
+            self._finish(self.CANCELLED)
+
+    def _start(self) -> bool:
+        """Переводит задание в состояние выполнения; False, если оно уже отменено"""
+        if self._cancel_requested.is_set():
+            self._finish(self.CANCELLED)
+            return False
+
+        self.status = self.RUNNING
+        self.started_at = time.time()
+        self._notify()
+        return True
+
+    def _finish(self, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        if self.is_finished:
+            return
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        self._notify()
+
+    def _notify(self) -> None:
+        with self._changed:
+            self._version += 1
+            self._changed.notify_all()
+
+    def wait_for_update(self, version: int, timeout: float) -> int:
+        """Ожидает изменения состояния задания и возвращает новую версию"""
+        with self._changed:
+            self._changed.wait_for(lambda: self._version != version, timeout)
+            return self._version
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает состояние задания для API"""
+        now = self.finished_at or time.time()
+        elapsed = now - self.started_at if self.started_at else 0.0
+        throughput = self.files_done / elapsed if elapsed > 0 else 0.0
+        remaining = self.files_total - self.files_done
+
+        if self.is_finished:
+            eta = 0.0
+        elif throughput > 0:
+            eta = remaining / throughput
+        else:
+            eta = None
+
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'project_path': self.project_path,
+            'files_done': self.files_done,
+            'files_total': self.files_total,
+            'elapsed': round(elapsed, 3),
+            'throughput': round(throughput, 2),
+            'eta': round(eta, 1) if eta is not None else None,
+            'result': self.result,
+            'error': self.error
+        }
+
+
+class JobManager:
+    """Класс для выполнения заданий анализа в фоновых потоках"""
+
+    # Минимальный интервал между событиями прогресса в SSE-потоке, с
+    EVENT_INTERVAL = 0.25
+    # Интервал отправки keep-alive комментариев в SSE-потоке, с
+    KEEPALIVE_INTERVAL = 15.0
+
+    def __init__(self, max_concurrent: int = 2, max_queued: int = 8, keep_finished: int = 100):
+        """
+        Args:
+            max_concurrent: Сколько заданий может выполняться одновременно
+            max_queued: Сколько заданий может ожидать в очереди
+            keep_finished: Сколько завершенных заданий хранить для запросов статуса
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.keep_finished = keep_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix='analysis-job')
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, project_path: str, func: Callable[[AnalysisJob], Dict[str, Any]]) -> AnalysisJob:
+        """
+        Ставит задание анализа в очередь.
+
+        Args:
+            project_path: Путь к анализируемому проекту
+            func: Функция, выполняющая анализ; получает задание для
+                сообщения о прогрессе и возвращает результат
+
+        Returns:
+            Созданное задание
+
+        Raises:
+            JobLimitExceeded: Если очередь заполнена
+        """
+        with self._lock:
+            self._prune_finished()
+            active = sum(1 for job in self._jobs.values() if not job.is_finished)
+            if active >= self.max_concurrent + self.max_queued:
+                raise JobLimitExceeded(f'Too many analysis jobs: {active}')
+
+            job = AnalysisJob(project_path)
+            self._jobs[job.job_id] = job
+
+        self._executor.submit(self._run, job, func)
+        return job
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        """Возвращает задание по идентификатору"""
+        return self._jobs.get(job_id)
+
+    def status_counts(self) -> Dict[str, int]:
+        """Возвращает число хранимых заданий в каждом состоянии"""
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+    def _run(self, job: AnalysisJob, func: Callable[[AnalysisJob], Dict[str, Any]]) -> None:
+        if not job._start():
+            return
+
+        try:
+            result = func(job)
+        except AnalysisCancelled:
+            job._finish(AnalysisJob.CANCELLED)
+        except Exception as e:
+            job._finish(AnalysisJob.FAILED, error=str(e))
+        else:
+            job._finish(AnalysisJob.DONE, result=result)
+
+    def _prune_finished(self) -> None:
+        """Удаляет самые старые завершенные задания сверх лимита"""
+        finished = [job for job in self._jobs.values() if job.is_finished]
+        for job in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job.job_id]
+
+    def stream_events(self, job: AnalysisJob) -> Iterator[str]:
+        """
+        Генерирует Server-Sent Events с состоянием задания.
+
+        Поток завершается после события о завершении задания.
+        """
+        version = -1
+        while True:
+            new_version = job.wait_for_update(version, self.KEEPALIVE_INTERVAL)
+            if new_version == version:
+                yield ': keep-alive\n\n'
+                continue
+
+            version = new_version
+            state = job.to_dict()
+            event = 'finished' if job.is_finished else 'progress'
+            yield f'event: {event}\ndata: {json.dumps(state)}\n\n'
+
+            if job.is_finished:
+                return
+            time.sleep(self.EVENT_INTERVAL)
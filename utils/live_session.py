@@ -0,0 +1,342 @@
+# live_session.py
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Any, Callable, Iterator, Optional, Set
+
+from analyzer.core import OPTIONAL_SECTIONS, CodeAnalyzer
+from analyzer.dependency_graph import DependencyGraph, ModuleIndex
+from analyzer.model import ModuleRecord, json_default
+from analyzer.ranking import DEFAULT_TOP_K, iter_function_refs, top_complex_functions
+from analyzer.watcher import Watcher
+
+
+class WatchLimitExceeded(Exception):
+    """Превышено допустимое количество наблюдаемых проектов"""
+
+
+def _count(record: Optional[ModuleRecord], field: str) -> int:
+    if record is None:
+        return 0
+    if field == 'loc':
+        return record.get('loc', 0)
+    return len(record.get(field, ()))
+
+
+class LiveSession:
+    """
+    Наблюдение за проектом с инкрементальным обновлением отчета.
+
+    Фоновый поток получает от наблюдателя измененные файлы, повторно
+    анализирует только их и обновляет отчет и граф зависимостей без
+    полного пересчета. Каждое обновление публикуется как событие с
+    изменившимися модулями и ребрами графа.
+    """
+
+    # Сколько последних событий хранить для отстающих клиентов
+    MAX_EVENTS = 256
+    # Таймаут ожидания изменений наблюдателем; ограничивает время остановки, с
+    POLL_TIMEOUT = 0.5
+    # Интервал отправки keep-alive комментариев в SSE-потоке, с
+    KEEPALIVE_INTERVAL = 15.0
+
+    def __init__(self, project_id: str, analyzer: CodeAnalyzer, report: Dict[str, Any], watcher: Watcher,
+                 persist: Optional[Callable[[Dict[str, Any], Optional[str]], bool]] = None,
+                 persist_interval: float = 2.0, top_k: int = DEFAULT_TOP_K):
+        """
+        Args:
+            project_id: Идентификатор проекта
+            analyzer: Анализатор с результатами полного сканирования проекта
+            report: Отчет, созданный analyzer.generate_project_report
+            watcher: Наблюдатель за файлами проекта
+            persist: Функция сохранения обновленного отчета в хранилище; получает отчет и
+                analysis_id отчета, сохраненного сеансом ранее, и возвращает False, если отчет
+                в хранилище уже заменен (например, новым анализом проекта)
+            persist_interval: Минимальный интервал между сохранениями отчета, с
+            top_k: Размер списка самых сложных функций в отчете
+        """
+        self.project_id = project_id
+        self.analyzer = analyzer
+        self.report = report
+        self.watcher = watcher
+        self.persist = persist
+        self.persist_interval = persist_interval
+        self.top_k = top_k
+        # analysis_id последнего отчета, записанного сеансом в хранилище
+        self._persisted_id: Optional[str] = report.get('analysis_id')
+
+        self.module_index = ModuleIndex(analyzer.modules.keys())
+        self.graph = DependencyGraph.from_dict(report['module_graph'])
+        # Индексы символов и дубликатов обновляются анализатором на месте при каждом изменении
+        self.symbols = analyzer.get_symbol_index()
+        self.clones = analyzer.get_clone_index()
+
+        self._events: deque = deque(maxlen=self.MAX_EVENTS)
+        self._version = 0
+        self._changed = threading.Condition()
+        self._stop_requested = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=f'live-session-{project_id}', daemon=True)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Останавливает наблюдение и сохраняет последние изменения отчета"""
+        self._stop_requested.set()
+        if self._thread.is_alive() and threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        dirty = False
+        last_persist = time.monotonic()
+        try:
+            while not self._stop_requested.is_set():
+                files, dirs = self.watcher.poll(self.POLL_TIMEOUT)
+                if (files or dirs) and self.apply_changes(files, dirs) is not None:
+                    dirty = True
+
+                if dirty and time.monotonic() - last_persist >= self.persist_interval:
+                    self._persist()
+                    dirty = False
+                    last_persist = time.monotonic()
+        finally:
+            self.watcher.close()
+            if dirty:
+                self._persist()
+            with self._changed:
+                self._stopped = True
+                self._changed.notify_all()
+
+    def _persist(self) -> None:
+        # Отчет, замененный в хранилище после запуска сеанса, не перезаписывается
+        if self.persist is not None and self.persist(self.report, self._persisted_id):
+            self._persisted_id = self.report.get('analysis_id')
+
+    def _affected_paths(self, files: Set[str], dirs: Set[str]) -> List[str]:
+        """Раскрывает измененные директории в пути модулей, которые могли измениться"""
+        paths = set(files)
+        if not dirs:
+            return sorted(paths)
+
+        discovery = self.analyzer.discovery
+        if '' in dirs:
+            # Изменения неизвестны: сверяем весь проект
+            paths.update(self.analyzer.modules)
+            paths.update(rel_path for _, rel_path in discovery.iter_files())
+            return sorted(paths)
+
+        prefixes = tuple(d + os.sep for d in dirs)
+        paths.update(path for path in self.analyzer.modules if path.startswith(prefixes))
+        for rel_dir in dirs:
+            abs_dir = os.path.join(self.analyzer.project_root, rel_dir)
+            for dir_path, dir_names, file_names in os.walk(abs_dir):
+                rel = os.path.relpath(dir_path, self.analyzer.project_root)
+                dir_names[:] = [name for name in dir_names
+                                if not discovery.is_excluded_dir(os.path.join(rel, name))]
+                paths.update(path for path in (os.path.join(rel, name) for name in file_names)
+                             if discovery.is_candidate(path))
+        return sorted(paths)
+
+    def apply_changes(self, files: Set[str], dirs: Set[str] = frozenset()) -> Optional[Dict[str, Any]]:
+        """
+        Повторно анализирует измененные файлы и обновляет отчет.
+
+        Args:
+            files: Относительные пути измененных файлов
+            dirs: Относительные пути измененных директорий ('' - весь проект)
+
+        Returns:
+            Опубликованное событие или None, если модули проекта не изменились
+        """
+        started = time.perf_counter()
+        old_modules = self.analyzer.modules
+        changes = self.analyzer.update_files(self._affected_paths(files, dirs))
+        # Сохранение файла без изменения содержимого не порождает событие
+        changes = {path: record for path, record in changes.items() if record != old_modules.get(path)}
+        if not changes:
+            return None
+
+        event = self._patch_report(old_modules, changes)
+        event['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        self._publish(event)
+        return event
+
+    def _patch_report(self, old_modules: Dict[str, ModuleRecord],
+                      changes: Dict[str, Optional[ModuleRecord]]) -> Dict[str, Any]:
+        """
+        Обновляет разделы отчета, затронутые изменившимися модулями.
+
+        Разделы заменяются новыми объектами, а не изменяются на месте,
+        поэтому одновременная сериализация отчета видит согласованные данные.
+        """
+        report = self.report
+        modules = self.analyzer.modules
+        added = [path for path, record in changes.items() if record is not None and path not in old_modules]
+        removed = [path for path, record in changes.items() if record is None]
+        updated = [path for path, record in changes.items() if record is not None and path in old_modules]
+
+        totals = {'total_loc': 'loc', 'total_functions': 'functions', 'total_classes': 'classes'}
+        for key, field in totals.items():
+            report[key] += sum(_count(record, field) - _count(old_modules.get(path), field)
+                               for path, record in changes.items())
+        report['total_modules'] = len(modules)
+
+        # Граф импортов в формате get_dependency_graph
+        old_dependencies = report['dependency_graph']
+        dependencies = dict(old_dependencies)
+        edges_added: List[List[str]] = []
+        edges_removed: List[List[str]] = []
+        for path in changes:
+            before = set(old_dependencies.get(path, ()))
+            after = self.analyzer.dependencies.get(path)
+            if after is None:
+                dependencies.pop(path, None)
+                after = set()
+            else:
+                dependencies[path] = sorted(after)
+            edges_added.extend([path, target] for target in sorted(after - before))
+            edges_removed.extend([path, target] for target in sorted(before - after))
+        report['dependency_graph'] = dependencies
+
+        if added or removed:
+            # Изменился набор модулей: разрешение импортов других модулей могло измениться
+            self.module_index = ModuleIndex(modules.keys())
+            self.graph = DependencyGraph.from_modules(modules)
+        else:
+            for path in updated:
+                self.graph.update_module(self.module_index, path, modules[path])
+        report['module_graph'] = self.graph.to_dict()
+
+        report['complex_functions'] = self._update_complex_functions(report['complex_functions'], changes)
+        report['modules'] = modules
+        report['metrics'] = self.analyzer.aggregator.aggregate(modules)
+        # Разделы по всему проекту не пересчитываются при каждом сохранении:
+        # маршруты /symbols, /duplicates и /dead_code строят их по индексам сессии
+        for section in OPTIONAL_SECTIONS:
+            report.pop(section, None)
+
+        digest = hashlib.sha1(report.get('analysis_id', '').encode('utf-8'))
+        digest.update(json.dumps(changes, sort_keys=True, default=json_default).encode('utf-8'))
+        report['analysis_id'] = digest.hexdigest()
+
+        return {
+            'analysis_id': report['analysis_id'],
+            'modules': {'added': sorted(added), 'removed': sorted(removed), 'updated': sorted(updated)},
+            'dependencies': {'added': edges_added, 'removed': edges_removed},
+            'summary': {
+                'total_modules': report['total_modules'],
+                'total_loc': report['total_loc'],
+                'total_functions': report['total_functions'],
+                'total_classes': report['total_classes']
+            }
+        }
+
+    def _update_complex_functions(self, current: List[Dict[str, Any]],
+                                  changes: Dict[str, Optional[ModuleRecord]]) -> List[Dict[str, Any]]:
+        """Пересчитывает топ сложных функций, только если изменения могут на него повлиять"""
+        if len(current) == self.top_k and not any(func['module'] in changes for func in current):
+            threshold = current[-1]['complexity']
+            changed = {path: record for path, record in changes.items() if record is not None}
+            if all(ref[0] < threshold for ref in iter_function_refs(changed)):
+                return current
+        return top_complex_functions(self.analyzer.modules, self.top_k)
+
+    def _publish(self, event: Dict[str, Any]) -> None:
+        with self._changed:
+            self._version += 1
+            event['version'] = self._version
+            self._events.append(event)
+            self._changed.notify_all()
+
+    def stream_events(self, last_version: Optional[int] = None) -> Iterator[str]:
+        """
+        Генерирует Server-Sent Events с обновлениями отчета.
+
+        Args:
+            last_version: Версия последнего полученного клиентом события
+                (заголовок Last-Event-ID); None - только новые события
+
+        Клиент, пропустивший больше событий, чем хранится в буфере,
+        получает событие reset и должен заново загрузить граф.
+        """
+        version = self._version if last_version is None else last_version
+        yield f'event: ready\ndata: {json.dumps({"version": self._version})}\n\n'
+
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: self._version != version or self._stopped,
+                                       self.KEEPALIVE_INTERVAL)
+                events = [event for event in self._events if event['version'] > version]
+                missed = bool(self._events) and self._events[0]['version'] > version + 1
+                current = self._version
+                stopped = self._stopped
+
+            if missed:
+                version = current
+                yield f'id: {current}\nevent: reset\ndata: {json.dumps({"version": current})}\n\n'
+            elif events:
+                for event in events:
+                    yield f'id: {event["version"]}\nevent: update\ndata: {json.dumps(event)}\n\n'
+                version = events[-1]['version']
+            elif stopped:
+                yield 'event: stopped\ndata: {}\n\n'
+                return
+            else:
+                yield ': keep-alive\n\n'
+
+
+class LiveSessionManager:
+    """Класс для управления сеансами наблюдения за проектами"""
+
+    def __init__(self, max_sessions: int = 4):
+        """
+        Args:
+            max_sessions: Сколько проектов можно наблюдать одновременно
+        """
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, LiveSession] = {}
+        self._lock = threading.Lock()
+
+    def start(self, session: LiveSession) -> LiveSession:
+        """
+        Запускает сеанс, заменяя прежний сеанс того же проекта.
+
+        Raises:
+            WatchLimitExceeded: Если наблюдается слишком много проектов
+        """
+        with self._lock:
+            previous = self._sessions.pop(session.project_id, None)
+            if len(self._sessions) >= self.max_sessions:
+                if previous is not None:
+                    self._sessions[previous.project_id] = previous
+                raise WatchLimitExceeded(f'Too many watched projects: {len(self._sessions)}')
+            self._sessions[session.project_id] = session
+
+        if previous is not None:
+            previous.stop()
+        session.start()
+        return session
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, project_id: str) -> Optional[LiveSession]:
+        """Возвращает сеанс наблюдения проекта"""
+        return self._sessions.get(project_id)
+
+    def stop(self, project_id: str) -> bool:
+        """Останавливает наблюдение; False, если проект не наблюдался"""
+        with self._lock:
+            session = self._sessions.pop(project_id, None)
+        if session is None:
+            return False
+        session.stop()
+        return True
@@ -0,0 +1,434 @@
+# metrics_history.py
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from analyzer.metrics import FUNCTION_METRICS, MODULE_METRICS
+from utils.pagination import PageRequestError
+from utils.report_catalog import _parse_date
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 1000
+
+# Столбцы метрик строк модулей и функций
+MODULE_COLUMNS: Tuple[str, ...] = ('loc',) + tuple(MODULE_METRICS)
+FUNCTION_COLUMNS: Tuple[str, ...] = tuple(FUNCTION_METRICS)
+
+# Метрики, для которых ухудшение - уменьшение значения
+HIGHER_IS_BETTER = frozenset(('maintainability_index',))
+
+_SNAPSHOT_COLUMNS = 'id, analysis_id, created, report_file, modules, functions, loc'
+
+# Агрегаты значений модулей пакета в тренде
+AGGREGATES = {'sum': 'SUM', 'avg': 'AVG', 'max': 'MAX'}
+
+
+def _iter_functions(module: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Возвращает пары (полное имя, функция) функций и методов модуля"""
+    for func in module.get('functions', ()):
+        parent = func.get('parent')
+        yield (f'{parent}.{func["name"]}' if parent else func['name']), func
+    for cls in module.get('classes', ()):
+        for method in cls.get('methods', ()):
+            yield f'{cls["name"]}.{method["name"]}', method
+
+
+def _function_row(func: Dict[str, Any]) -> List[Any]:
+    metrics = func.get('metrics') or {}
+    return [func.get('complexity', 1)] + [metrics.get(name) for name in FUNCTION_COLUMNS[1:]]
+
+
+def _module_row(module: Dict[str, Any]) -> List[Any]:
+    metrics = module.get('metrics') or {}
+    return [module.get('loc', 0)] + [metrics.get(name) for name in MODULE_COLUMNS[1:]]
+
+
+def _format_time(created: float) -> str:
+    return datetime.datetime.fromtimestamp(created).strftime('%Y-%m-%dT%H:%M:%S')
+
+
+class MetricsHistory:
+    """
+    История метрик сохраненных отчетов в SQLite.
+
+    Каждое сохранение отчета добавляет снимок: строку проекта и по строке
+    на каждый модуль и функцию со значениями метрик в отдельных столбцах.
+    Индексы по (module, function) и (module) позволяют строить тренды
+    одной функции, модуля или пакета, не читая остальные строки снимков, а
+    сравнение двух снимков выполняется соединением по первичному ключу.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: Путь к файлу базы данных
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Соединение с базой; файл базы и его директория создаются при первом обращении"""
+        with self._connect_lock:
+            if self._connection is None:
+                self._connection = self._connect()
+            return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+
+        module_columns = ', '.join(f'{name} REAL' for name in MODULE_COLUMNS)
+        function_columns = ', '.join(f'{name} REAL' for name in FUNCTION_COLUMNS)
+        conn.executescript(f'''
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY,
+                project_id TEXT NOT NULL,
+                analysis_id TEXT NOT NULL,
+                created REAL NOT NULL,
+                report_file TEXT,
+                modules INTEGER NOT NULL,
+                functions INTEGER NOT NULL,
+                loc INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS snapshots_project ON snapshots (project_id, created);
+            CREATE TABLE IF NOT EXISTS module_metrics (
+                snapshot_id INTEGER NOT NULL,
+                module TEXT NOT NULL,
+                {module_columns},
+                PRIMARY KEY (snapshot_id, module)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS module_metrics_module ON module_metrics (module, snapshot_id);
+            CREATE TABLE IF NOT EXISTS function_metrics (
+                snapshot_id INTEGER NOT NULL,
+                module TEXT NOT NULL,
+                function TEXT NOT NULL,
+                line INTEGER NOT NULL,
+                {function_columns},
+                PRIMARY KEY (snapshot_id, module, function)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS function_metrics_symbol ON function_metrics (module, function, snapshot_id);
+        ''')
+        # Метрики, добавленные после создания базы, становятся новыми столбцами
+        for table, columns in (('module_metrics', MODULE_COLUMNS), ('function_metrics', FUNCTION_COLUMNS)):
+            existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+            for name in columns:
+                if name not in existing:
+                    conn.execute(f'ALTER TABLE {table} ADD COLUMN {name} REAL')
+        return conn
+
+    def close(self) -> None:
+        with self._connect_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def record(self, project_id: str, report: Dict[str, Any], report_file: Optional[str] = None,
+               created: Optional[float] = None) -> Optional[int]:
+        """
+        Добавляет снимок метрик отчета.
+
+        Args:
+            project_id: Идентификатор проекта
+            report: Отчет generate_project_report
+            report_file: Имя файла сохраненного отчета
+            created: Время снимка (по умолчанию - текущее)
+
+        Returns:
+            Номер снимка или None, если последний снимок проекта относится к
+            тому же анализу (повторное сохранение неизмененного отчета)
+        """
+        analysis_id = report.get('analysis_id') or ''
+        modules = report.get('modules', {})
+        module_rows = []
+        function_rows = []
+        for path, module in modules.items():
+            if module.get('error') is not None:
+                continue
+            module_rows.append([path] + _module_row(module))
+            for qualname, func in _iter_functions(module):
+                function_rows.append([path, qualname, func.get('line', 0)] + _function_row(func))
+
+        with self._lock, self._conn:
+            latest = self._conn.execute(
+                'SELECT analysis_id FROM snapshots WHERE project_id = ? ORDER BY created DESC, id DESC LIMIT 1',
+                (project_id,)).fetchone()
+            if latest is not None and analysis_id and latest[0] == analysis_id:
+                return None
+
+            snapshot_id = self._conn.execute(
+                'INSERT INTO snapshots (project_id, analysis_id, created, report_file, modules, functions, loc) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (project_id, analysis_id, time.time() if created is None else created, report_file,
+                 len(module_rows), len(function_rows), sum(row[1] or 0 for row in module_rows))
+            ).lastrowid
+            self._conn.executemany(
+                f'INSERT OR REPLACE INTO module_metrics (snapshot_id, module, {", ".join(MODULE_COLUMNS)}) '
+                f'VALUES (?, ?{", ?" * len(MODULE_COLUMNS)})',
+                ([snapshot_id] + row for row in module_rows))
+            self._conn.executemany(
+                f'INSERT OR REPLACE INTO function_metrics (snapshot_id, module, function, line, '
+                f'{", ".join(FUNCTION_COLUMNS)}) VALUES (?, ?, ?, ?{", ?" * len(FUNCTION_COLUMNS)})',
+                ([snapshot_id] + row for row in function_rows))
+        return snapshot_id
+
+    def snapshots(self, project_id: str, args: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Возвращает снимки проекта, начиная с самых новых.
+
+        Args:
+            project_id: Идентификатор проекта
+            args: Параметры запроса: limit, since и until (дата ISO 8601)
+        """
+        conditions, params = self._time_range(args)
+        limit = _limit(args)
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT {_SNAPSHOT_COLUMNS} FROM snapshots '
+                f'WHERE project_id = ?{conditions} ORDER BY created DESC, id DESC LIMIT ?',
+                [project_id] + params + [limit]).fetchall()
+        return {'snapshots': [self._snapshot_info(row) for row in rows]}
+
+    def trend(self, project_id: str, args: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает значения метрики по снимкам в порядке времени.
+
+        Args:
+            project_id: Идентификатор проекта
+            args: Параметры запроса: metric (по умолчанию complexity), since,
+                until и одно из: module и function - функция модуля; module -
+                модуль; package - сумма (agg: sum, avg, max) по модулям
+                пакета (путь директории, '' - весь проект)
+
+        Returns:
+            Словарь с описанием ряда и точками {analysis_id, created, value};
+            None, если у проекта нет снимков
+
+        Raises:
+            PageRequestError: При некорректных параметрах
+        """
+        if not self._has_snapshots(project_id):
+            return None
+        module = args.get('module')
+        function = args.get('function')
+        if function and not module:
+            raise PageRequestError('function requires module')
+        level = 'function' if function else 'module' if module else 'package'
+        metric = _metric(args, FUNCTION_COLUMNS if level == 'function' else MODULE_COLUMNS)
+        conditions, params = self._time_range(args, 's.')
+
+        if level == 'function':
+            sql = (f'SELECT s.analysis_id, s.created, f.{metric} FROM function_metrics f '
+                   'JOIN snapshots s ON s.id = f.snapshot_id '
+                   f'WHERE f.module = ? AND f.function = ? AND s.project_id = ?{conditions} ORDER BY s.created, s.id')
+            params = [module, function, project_id] + params
+            series = {'module': module, 'function': function}
+        elif level == 'module':
+            sql = (f'SELECT s.analysis_id, s.created, m.{metric} FROM module_metrics m '
+                   'JOIN snapshots s ON s.id = m.snapshot_id '
+                   f'WHERE m.module = ? AND s.project_id = ?{conditions} ORDER BY s.created, s.id')
+            params = [module, project_id] + params
+            series = {'module': module}
+        else:
+            package = (args.get('package') or '').strip('/')
+            aggregate = args.get('agg', 'sum')
+            if aggregate not in AGGREGATES:
+                raise PageRequestError(f'agg must be one of: {", ".join(AGGREGATES)}')
+            # Диапазон путей вместо LIKE, чтобы использовать индекс по module
+            prefix = f'{package}/' if package else ''
+            sql = (f'SELECT s.analysis_id, s.created, {AGGREGATES[aggregate]}(m.{metric}) FROM module_metrics m '
+                   'JOIN snapshots s ON s.id = m.snapshot_id '
+                   f'WHERE m.module >= ? AND m.module < ? AND s.project_id = ?{conditions} '
+                   'GROUP BY s.id ORDER BY s.created, s.id')
+            params = [prefix, prefix + '\U0010ffff', project_id] + params
+            series = {'package': package, 'agg': aggregate}
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return {
+            'metric': metric,
+            'level': level,
+            **series,
+            'points': [{'analysis_id': analysis_id, 'created': _format_time(created), 'value': _round(value)}
+                       for analysis_id, created, value in rows]
+        }
+
+    def top_movers(self, project_id: str, args: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает функции (или модули) с наибольшим изменением метрики.
+
+        Args:
+            project_id: Идентификатор проекта
+            args: Параметры запроса: metric, level (function или module),
+                head - идентификатор анализа (по умолчанию последний снимок),
+                base - идентификатор анализа или since - дата, с которой
+                сравнивать (по умолчанию первый снимок), direction (up, down,
+                both), limit
+
+        Returns:
+            Сравниваемые снимки и изменения по убыванию модуля изменения;
+            None, если у проекта нет снимков
+        """
+        direction = args.get('direction', 'both')
+        if direction not in ('up', 'down', 'both'):
+            raise PageRequestError('direction must be up, down or both')
+        condition = {'up': ' AND delta > 0', 'down': ' AND delta < 0', 'both': ' AND delta != 0'}[direction]
+        return self._compare(project_id, args, condition, [], 'ABS(delta) DESC', default_base='first')
+
+    def regressions(self, project_id: str, args: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает функции (или модули), метрика которых ухудшилась.
+
+        Ухудшение - рост метрики, для maintainability_index - снижение.
+
+        Args:
+            project_id: Идентификатор проекта
+            args: Параметры запроса: metric, level, head (по умолчанию
+                последний снимок), base (по умолчанию предыдущий перед head),
+                threshold - минимальное ухудшение (по умолчанию 1), limit
+
+        Returns:
+            Сравниваемые снимки и ухудшения по убыванию; None, если у
+            проекта нет снимков
+        """
+        try:
+            threshold = float(args.get('threshold', 1))
+        except ValueError:
+            raise PageRequestError('threshold must be a number')
+        metric = args.get('metric', 'complexity')
+        sign = -1 if metric in HIGHER_IS_BETTER else 1
+        return self._compare(project_id, args, f' AND delta * {sign} >= ?', [threshold], f'delta * {sign} DESC',
+                             default_base='previous')
+
+    def _compare(self, project_id: str, args: Dict[str, str], condition: str, condition_params: List[Any],
+                 order: str, default_base: str) -> Optional[Dict[str, Any]]:
+        """
+        Сравнивает метрики двух снимков проекта.
+
+        Args:
+            condition: Дополнительное условие на изменение (столбец delta)
+            condition_params: Параметры условия
+            order: Порядок изменений
+            default_base: Базовый снимок без параметров base и since:
+                first - первый снимок проекта, previous - предыдущий перед head
+        """
+        level = args.get('level', 'function')
+        if level not in ('function', 'module'):
+            raise PageRequestError('level must be function or module')
+        metric = _metric(args, FUNCTION_COLUMNS if level == 'function' else MODULE_COLUMNS)
+        limit = _limit(args)
+
+        with self._lock:
+            head = self._find_snapshot(project_id, args.get('head'), 'head')
+            if head is None:
+                return None
+            if args.get('base'):
+                base = self._find_snapshot(project_id, args['base'], 'base')
+            elif args.get('since'):
+                base = self._conn.execute(
+                    f'SELECT {_SNAPSHOT_COLUMNS} FROM snapshots '
+                    'WHERE project_id = ? AND created >= ? ORDER BY created, id LIMIT 1',
+                    (project_id, _parse_date(args['since'], 'since', end_of_day=False))).fetchone()
+            elif default_base == 'first':
+                base = self._conn.execute(
+                    f'SELECT {_SNAPSHOT_COLUMNS} FROM snapshots '
+                    'WHERE project_id = ? ORDER BY created, id LIMIT 1', (project_id,)).fetchone()
+            else:
+                base = self._conn.execute(
+                    f'SELECT {_SNAPSHOT_COLUMNS} FROM snapshots '
+                    'WHERE project_id = ? AND (created < ? OR (created = ? AND id < ?)) '
+                    'ORDER BY created DESC, id DESC LIMIT 1',
+                    (project_id, head[2], head[2], head[0])).fetchone()
+
+            changes = []
+            if base is not None and base[0] != head[0]:
+                if level == 'function':
+                    sql = (f'SELECT module, function, before, after, delta FROM ('
+                           f'SELECT h.module AS module, h.function AS function, b.{metric} AS before, '
+                           f'h.{metric} AS after, h.{metric} - b.{metric} AS delta FROM function_metrics h '
+                           'JOIN function_metrics b ON b.snapshot_id = ? AND b.module = h.module '
+                           'AND b.function = h.function WHERE h.snapshot_id = ?'
+                           f') WHERE delta IS NOT NULL{condition} ORDER BY {order}, module, function LIMIT ?')
+                else:
+                    sql = (f'SELECT module, NULL, before, after, delta FROM ('
+                           f'SELECT h.module AS module, b.{metric} AS before, h.{metric} AS after, '
+                           f'h.{metric} - b.{metric} AS delta FROM module_metrics h '
+                           'JOIN module_metrics b ON b.snapshot_id = ? AND b.module = h.module '
+                           'WHERE h.snapshot_id = ?'
+                           f') WHERE delta IS NOT NULL{condition} ORDER BY {order}, module LIMIT ?')
+                changes = self._conn.execute(sql, [base[0], head[0]] + condition_params + [limit]).fetchall()
+
+        return {
+            'metric': metric,
+            'level': level,
+            'base': self._snapshot_info(base) if base is not None else None,
+            'head': self._snapshot_info(head),
+            'changes': [
+                {**({'module': module, 'function': function} if level == 'function' else {'module': module}),
+                 'before': _round(before), 'after': _round(after), 'delta': _round(delta)}
+                for module, function, before, after, delta in changes
+            ]
+        }
+
+    def _has_snapshots(self, project_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM snapshots WHERE project_id = ? LIMIT 1',
+                                      (project_id,)).fetchone() is not None
+
+    def _find_snapshot(self, project_id: str, analysis_id: Optional[str], name: str) -> Optional[tuple]:
+        """Находит последний снимок с идентификатором анализа или последний снимок проекта"""
+        if analysis_id:
+            row = self._conn.execute(
+                f'SELECT {_SNAPSHOT_COLUMNS} FROM snapshots '
+                'WHERE project_id = ? AND analysis_id = ? ORDER BY created DESC, id DESC LIMIT 1',
+                (project_id, analysis_id)).fetchone()
+            if row is None:
+                raise PageRequestError(f'{name}: unknown analysis id {analysis_id}')
+            return row
+        return self._conn.execute(
+            f'SELECT {_SNAPSHOT_COLUMNS} FROM snapshots '
+            'WHERE project_id = ? ORDER BY created DESC, id DESC LIMIT 1', (project_id,)).fetchone()
+
+    @staticmethod
+    def _time_range(args: Dict[str, str], prefix: str = '') -> Tuple[str, List[Any]]:
+        conditions = ''
+        params: List[Any] = []
+        if args.get('since'):
+            conditions += f' AND {prefix}created >= ?'
+            params.append(_parse_date(args['since'], 'since', end_of_day=False))
+        if args.get('until'):
+            conditions += f' AND {prefix}created < ?'
+            params.append(_parse_date(args['until'], 'until', end_of_day=True))
+        return conditions, params
+
+    @staticmethod
+    def _snapshot_info(row: tuple) -> Dict[str, Any]:
+        _, analysis_id, created, report_file, modules, functions, loc = row
+        return {'analysis_id': analysis_id, 'created': _format_time(created), 'report_file': report_file,
+                'modules': modules, 'functions': functions, 'loc': loc}
+
+
+def _metric(args: Dict[str, str], columns: Tuple[str, ...]) -> str:
+    metric = args.get('metric', 'complexity')
+    if metric not in columns:
+        raise PageRequestError(f'metric must be one of: {", ".join(columns)}')
+    return metric
+
+
+def _limit(args: Dict[str, str]) -> int:
+    try:
+        limit = int(args.get('limit') or DEFAULT_LIMIT)
+    except ValueError:
+        raise PageRequestError('limit must be an integer')
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    if value is None:
+        return None
+    return int(value) if value == int(value) else round(value, 2)
@@ -0,0 +1,300 @@
+# pagination.py
+import base64
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple
+
+from analyzer.dependency_graph import DependencyGraph
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Метрики функций, доступные как поля строк таблицы функций
+FUNCTION_METRIC_FIELDS = ('cognitive_complexity', 'max_nesting', 'sloc', 'halstead_volume', 'maintainability_index')
+
+
+class PageRequestError(ValueError):
+    """Некорректные параметры постраничного запроса"""
+
+
+def iter_module_rows(report: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Строки таблицы модулей отчета"""
+    for path, module in report.get('modules', {}).items():
+        yield {
+            'path': path,
+            'loc': module.get('loc', 0),
+            'sloc': (module.get('metrics') or {}).get('sloc'),
+            'maintainability_index': (module.get('metrics') or {}).get('maintainability_index'),
+            'function_count': len(module.get('functions', [])),
+            'class_count': len(module.get('classes', [])),
+            'import_count': len(module.get('imports', [])),
+            'imports': module.get('imports', []),
+            'functions': module.get('functions', []),
+            'classes': module.get('classes', []),
+            'error': module.get('error')
+        }
+
+
+def _function_metrics(func: Dict[str, Any]) -> Dict[str, Any]:
+    metrics = func.get('metrics') or {}
+    return {name: metrics.get(name) for name in FUNCTION_METRIC_FIELDS}
+
+
+def iter_function_rows(report: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Строки таблицы функций и методов отчета"""
+    for path, module in report.get('modules', {}).items():
+        for func in module.get('functions', []):
+            yield {
+                'name': func['name'],
+                'module': path,
+                'class': None,
+                'line': func['line'],
+                'args': func.get('args', []),
+                'is_async': func.get('is_async', False),
+                'complexity': func.get('complexity', 0),
+                **_function_metrics(func)
+            }
+        for cls in module.get('classes', []):
+            for method in cls.get('methods', []):
+                yield {
+                    'name': method['name'],
+                    'module': path,
+                    'class': cls['name'],
+                    'line': method['line'],
+                    'args': method.get('args', []),
+                    'is_async': method.get('is_async', False),
+                    'complexity': method.get('complexity', 0),
+                    **_function_metrics(method)
+                }
+
+
+def iter_edge_rows(report: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Строки таблицы ребер разрешенного графа зависимостей"""
+    graph = DependencyGraph.from_dict(report['module_graph'])
+    for source_id, source in enumerate(graph.nodes):
+        for target_id in graph.successors(source_id):
+            yield {
+                'source': source,
+                'target': graph.nodes[target_id],
+                'kind': graph.kind(target_id)
+            }
+
+
+class Collection:
+    """Описание коллекции отчета, доступной постранично"""
+
+    def __init__(self, name: str, rows: Callable[[Dict[str, Any]], Iterator[Dict[str, Any]]],
+                 fields: Tuple[str, ...], default_fields: Tuple[str, ...],
+                 sortable: Tuple[str, ...], default_sort: str,
+                 filters: Dict[str, Callable[[Dict[str, Any], str], bool]]):
+        """
+        Args:
+            name: Имя коллекции
+            rows: Функция, возвращающая строки коллекции по отчету
+            fields: Все поля строки, доступные через параметр fields
+            default_fields: Поля, возвращаемые по умолчанию
+            sortable: Поля, по которым разрешена сортировка
+            default_sort: Поле сортировки по умолчанию
+            filters: Фильтры {параметр запроса: функция (строка, значение) -> bool}
+        """
+        self.name = name
+        self.rows = rows
+        self.fields = fields
+        self.default_fields = default_fields
+        self.sortable = sortable
+        self.default_sort = default_sort
+        self.filters = filters
+
+
+def _min_number(key: str) -> Callable[[Dict[str, Any], str], bool]:
+    return lambda row, value: row[key] >= float(value)
+
+
+def _prefix(key: str) -> Callable[[Dict[str, Any], str], bool]:
+    return lambda row, value: (row[key] or '').startswith(value)
+
+
+def _contains(key: str) -> Callable[[Dict[str, Any], str], bool]:
+    return lambda row, value: value.lower() in (row[key] or '').lower()
+
+
+def _equals(key: str) -> Callable[[Dict[str, Any], str], bool]:
+    return lambda row, value: row[key] == value
+
+
+MODULES = Collection(
+    'modules', iter_module_rows,
+    fields=('path', 'loc', 'sloc', 'maintainability_index', 'function_count', 'class_count', 'import_count',
+            'imports', 'functions', 'classes', 'error'),
+    default_fields=('path', 'loc', 'function_count', 'class_count', 'import_count', 'error'),
+    sortable=('path', 'loc', 'sloc', 'maintainability_index', 'function_count', 'class_count', 'import_count'),
+    default_sort='path',
+    filters={'path': _prefix('path'), 'q': _contains('path'), 'min_loc': _min_number('loc')}
+)
+
+FUNCTIONS = Collection(
+    'functions', iter_function_rows,
+    fields=('name', 'module', 'class', 'line', 'args', 'is_async', 'complexity') + FUNCTION_METRIC_FIELDS,
+    default_fields=('name', 'module', 'class', 'line', 'complexity'),
+    sortable=('name', 'module', 'line', 'complexity') + FUNCTION_METRIC_FIELDS,
+    default_sort='module',
+    filters={
+        'module': _prefix('module'),
+        'class': _equals('class'),
+        'q': _contains('name'),
+        'min_complexity': _min_number('complexity'),
+        'min_cognitive_complexity': _min_number('cognitive_complexity')
+    }
+)
+
+EDGES = Collection(
+    'edges', iter_edge_rows,
+    fields=('source', 'target', 'kind'),
+    default_fields=('source', 'target', 'kind'),
+    sortable=('source', 'target', 'kind'),
+    default_sort='source',
+    filters={'source': _prefix('source'), 'target': _prefix('target'), 'kind': _equals('kind')}
+)
+
+
+class ReportPaginator:
+    """
+    Постраничная выдача коллекций отчета с фильтрацией и сортировкой.
+
+    Отфильтрованные и отсортированные представления кешируются по
+    (версия анализа, коллекция, параметры), поэтому следующие страницы
+    не пересортировывают коллекцию. Курсор привязан к версии анализа и
+    параметрам запроса и становится недействительным после повторного анализа.
+    """
+
+    def __init__(self, max_views: int = 32):
+        """
+        Args:
+            max_views: Сколько отсортированных представлений хранить в памяти
+        """
+        self.max_views = max_views
+        self._views: 'OrderedDict[Tuple, List[Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def page(self, report: Dict[str, Any], collection: Collection, args: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Возвращает страницу коллекции.
+
+        Args:
+            report: Отчет анализа
+            collection: Описание коллекции
+            args: Параметры запроса: limit, cursor, fields, sort, order и фильтры коллекции
+
+        Returns:
+            Словарь с элементами страницы, общим числом элементов и курсором следующей страницы
+
+        Raises:
+            PageRequestError: При некорректных параметрах
+        """
+        limit = _parse_int(args.get('limit'), DEFAULT_PAGE_SIZE, 'limit')
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        sort = args.get('sort', collection.default_sort)
+        if sort not in collection.sortable:
+            raise PageRequestError(f'Cannot sort by {sort}; allowed: {", ".join(collection.sortable)}')
+        order = args.get('order', 'asc')
+        if order not in ('asc', 'desc'):
+            raise PageRequestError('order must be asc or desc')
+
+        fields = _parse_fields(args.get('fields'), collection)
+        filters = tuple(sorted((key, args[key]) for key in collection.filters if args.get(key)))
+
+        analysis_id = report.get('analysis_id', '')
+        view_key = (analysis_id, collection.name, sort, order, filters)
+        offset = _decode_cursor(args.get('cursor'), view_key)
+
+        rows = self._get_view(report, collection, view_key)
+        items = rows[offset:offset + limit]
+        next_offset = offset + len(items)
+
+        return {
+            'items': [{field: row[field] for field in fields} for row in items],
+            'total': len(rows),
+            'next_cursor': _encode_cursor(view_key, next_offset) if next_offset < len(rows) else None
+        }
+
+    def _get_view(self, report: Dict[str, Any], collection: Collection, view_key: Tuple) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._views.get(view_key)
+            if rows is not None:
+                self._views.move_to_end(view_key)
+                return rows
+
+        _, _, sort, order, filters = view_key
+        try:
+            checks = [(collection.filters[key], value) for key, value in filters]
+            rows = [
+                row for row in collection.rows(report)
+                if all(check(row, value) for check, value in checks)
+            ]
+        except ValueError as e:
+            raise PageRequestError(f'Invalid filter value: {e}')
+
+        # Стабильная сортировка: равные элементы остаются в порядке отчета
+        rows.sort(key=lambda row: _sort_key(row[sort]), reverse=order == 'desc')
+
+        if not view_key[0]:
+            # Отчет без идентификатора анализа нельзя отличить от другого - не кешируем
+            return rows
+
+        with self._lock:
+            self._views[view_key] = rows
+            while len(self._views) > self.max_views:
+                self._views.popitem(last=False)
+        return rows
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    # None сортируется отдельно от значений, чтобы не сравнивать None со строками
+    return (0, '') if value is None else (1, value)
+
+
+def _parse_int(value: Optional[str], default: int, name: str) -> int:
+    if value in (None, ''):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise PageRequestError(f'{name} must be an integer')
+
+
+def _parse_fields(value: Optional[str], collection: Collection) -> Tuple[str, ...]:
+    if not value:
+        return collection.default_fields
+
+    fields = tuple(field.strip() for field in value.split(',') if field.strip())
+    unknown = [field for field in fields if field not in collection.fields]
+    if unknown:
+        raise PageRequestError(f'Unknown fields: {", ".join(unknown)}; allowed: {", ".join(collection.fields)}')
+    return fields
+
+
+def _view_token(view_key: Tuple) -> str:
+    return json.dumps(view_key, separators=(',', ':'))
+
+
+def _encode_cursor(view_key: Tuple, offset: int) -> str:
+    payload = json.dumps({'o': offset, 'k': _view_token(view_key)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: Optional[str], view_key: Tuple) -> int:
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        offset = int(payload['o'])
+        token = payload['k']
+    except (ValueError, KeyError, TypeError):
+        raise PageRequestError('Invalid cursor')
+
+    if token != _view_token(view_key) or offset < 0:
+        raise PageRequestError('Cursor does not match this analysis or query; start from the first page')
+    return offset
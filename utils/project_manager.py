@@ -1,4 +1,6 @@
 # project_manager.py
+import hashlib
+import os
 from typing import Dict, List, Any, Optional
 
 
@@ -8,6 +10,18 @@ class ProjectManager:
     def __init__(self, analysis_results: Dict[str, Any]):
         self.analysis_results = analysis_results
 
+    @staticmethod
+    def make_project_id(project_path: str) -> str:
+        """
+        Возвращает стабильный идентификатор проекта.
+
+        Идентификатор вычисляется из нормализованного абсолютного пути,
+        поэтому совпадает во всех процессах, в отличие от hash(), который
+        зависит от рандомизации хешей.
+        """
+        normalized = os.path.normcase(os.path.abspath(project_path))
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:16]
+
     def check_project_exists(self, project_id: str) -> bool:
         """Проверяет, существует ли проект с указанным ID"""
         return project_id in self.analysis_results
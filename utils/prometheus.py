@@ -0,0 +1,88 @@
+# prometheus.py
+import math
+import threading
+from typing import Callable, Dict, List, Tuple
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_LabelSet = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+class PrometheusRegistry:
+    """
+    Счетчики и показатели приложения в текстовом формате Prometheus.
+
+    Значения с метками хранятся в словарях в памяти процесса; показатели,
+    вычисляемые при запросе (например, число наблюдаемых проектов),
+    регистрируются функциями и вызываются только при формировании ответа.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # {имя: (тип, описание, {метки: значение})}
+        self._metrics: Dict[str, Tuple[str, str, Dict[_LabelSet, float]]] = {}
+        self._callbacks: Dict[str, Callable[[], Dict[_LabelSet, float]]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        """Регистрирует метрику; повторная регистрация не сбрасывает значения"""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = (kind, help_text, {})
+
+    def gauge_callback(self, name: str, help_text: str, func: Callable[[], Dict[_LabelSet, float]]) -> None:
+        """
+        Регистрирует показатель, значения которого вычисляются при запросе.
+
+        Args:
+            name: Имя метрики
+            help_text: Описание
+            func: Функция, возвращающая {метки: значение}; метки - кортеж
+                пар (имя, значение), () - без меток
+        """
+        self.describe(name, GAUGE, help_text)
+        self._callbacks[name] = func
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Увеличивает счетчик (или показатель) на value"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            values = self._metrics[name][2]
+            values[key] = values.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        """Устанавливает значение показателя"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._metrics[name][2][key] = value
+
+    def render(self) -> str:
+        """Возвращает все метрики в текстовом формате Prometheus 0.0.4"""
+        computed = {name: func() for name, func in list(self._callbacks.items())}
+
+        lines: List[str] = []
+        with self._lock:
+            for name, (kind, help_text, values) in self._metrics.items():
+                lines.append(f'# HELP {name} {_escape(help_text)}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in sorted(computed.get(name, values).items()):
+                    if labels:
+                        label_text = ','.join(f'{key}="{_escape(str(val))}"' for key, val in labels)
+                        lines.append(f'{name}{{{label_text}}} {_format_value(value)}')
+                    else:
+                        lines.append(f'{name} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
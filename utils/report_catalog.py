@@ -0,0 +1,351 @@
+# report_catalog.py
+import base64
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+from utils.pagination import PageRequestError
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class ReportCatalog:
+    """
+    Индекс сохраненных отчетов и диаграмм в SQLite.
+
+    Файлы добавляются в индекс при сохранении (FileManager.save_to_file).
+    Изменения, сделанные в директориях в обход приложения, учитываются
+    лениво: перед запросом сравнивается время изменения директорий, и
+    пересканируется только изменившаяся директория. Список отчетов и поиск
+    файла по имени выполняются по индексам без обхода директорий.
+    """
+
+    def __init__(self, db_path: str, directories: Dict[str, str], file_types: Dict[str, str],
+                 max_age: Optional[float] = None, max_total_bytes: Optional[int] = None):
+        """
+        Args:
+            db_path: Путь к файлу базы данных
+            directories: Словарь {категория: путь к директории}
+            file_types: Словарь {расширение: название типа файла}; остальные файлы не индексируются
+            max_age: Максимальный возраст файла, с; более старые файлы удаляются
+            max_total_bytes: Максимальный суммарный размер файлов; при превышении
+                удаляются самые старые файлы
+        """
+        self.db_path = db_path
+        self.directories = directories
+        self.file_types = file_types
+        self.max_age = max_age
+        self.max_total_bytes = max_total_bytes
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Соединение с базой; файл базы и его директория создаются при первом обращении"""
+        with self._connect_lock:
+            if self._connection is None:
+                self._connection = self._connect()
+            return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS reports (
+                category TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                type TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                PRIMARY KEY (category, filename)
+            );
+            CREATE INDEX IF NOT EXISTS reports_filename ON reports (filename);
+            CREATE INDEX IF NOT EXISTS reports_created ON reports (created, filename);
+            CREATE INDEX IF NOT EXISTS reports_category_created ON reports (category, created, filename);
+            CREATE TABLE IF NOT EXISTS directories (
+                category TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL
+            );
+        ''')
+        return conn
+
+    def close(self) -> None:
+        with self._connect_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _file_type(self, filename: str) -> Optional[str]:
+        return self.file_types.get(os.path.splitext(filename)[1])
+
+    def directory_version(self, category: str) -> Optional[int]:
+        """Возвращает время изменения директории категории (None, если категория не каталогизируется)"""
+        dir_path = self.directories.get(category)
+        if dir_path is None:
+            return None
+        try:
+            return os.stat(dir_path).st_mtime_ns
+        except OSError:
+            return 0
+
+    def _advance_directory(self, category: str, version_before: Optional[int]) -> None:
+        """
+        Отмечает директорию сверенной после изменения, сделанного самим каталогом.
+
+        Если до изменения индекс был сверен с директорией, изменение уже
+        учтено, и повторное сканирование директории не нужно.
+        """
+        if version_before is None:
+            return
+        row = self._conn.execute('SELECT mtime_ns FROM directories WHERE category = ?', (category,)).fetchone()
+        if row is not None and row[0] == version_before:
+            self._conn.execute('UPDATE directories SET mtime_ns = ? WHERE category = ?',
+                               (self.directory_version(category), category))
+
+    def record(self, category: str, file_path: str, version_before: Optional[int] = None) -> None:
+        """
+        Добавляет или обновляет файл в индексе и применяет политику хранения.
+
+        Файлы вне каталогизируемых директорий и неизвестных типов пропускаются.
+
+        Args:
+            category: Категория (директория) файла
+            file_path: Путь к сохраненному файлу
+            version_before: Результат directory_version до записи файла
+        """
+        filename = os.path.basename(file_path)
+        file_type = self._file_type(filename)
+        if category not in self.directories or file_type is None:
+            return
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return
+
+        with self._lock, self._conn:
+            self._upsert(category, filename, file_type, st)
+            self._advance_directory(category, version_before)
+        self.prune(keep=(category, filename))
+
+    def _upsert(self, category: str, filename: str, file_type: str, st: os.stat_result) -> None:
+        self._conn.execute(
+            'INSERT OR REPLACE INTO reports (category, filename, type, size, created, mtime_ns) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (category, filename, file_type, st.st_size, st.st_ctime, st.st_mtime_ns)
+        )
+
+    def reconcile(self) -> None:
+        """Пересканирует директории, изменившиеся с момента последней сверки"""
+        with self._lock:
+            stored = dict(self._conn.execute('SELECT category, mtime_ns FROM directories'))
+            for category, dir_path in self.directories.items():
+                try:
+                    mtime_ns = os.stat(dir_path).st_mtime_ns
+                except OSError:
+                    mtime_ns = 0
+                if stored.get(category) != mtime_ns:
+                    with self._conn:
+                        self._rescan(category, dir_path, mtime_ns)
+
+    def _rescan(self, category: str, dir_path: str, mtime_ns: int) -> None:
+        known = {
+            filename: (size, file_mtime)
+            for filename, size, file_mtime in self._conn.execute(
+                'SELECT filename, size, mtime_ns FROM reports WHERE category = ?', (category,))
+        }
+
+        seen = set()
+        if mtime_ns:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    file_type = self._file_type(entry.name)
+                    if file_type is None or not entry.is_file():
+                        continue
+                    st = entry.stat()
+                    seen.add(entry.name)
+                    if known.get(entry.name) != (st.st_size, st.st_mtime_ns):
+                        self._upsert(category, entry.name, file_type, st)
+
+        self._conn.executemany('DELETE FROM reports WHERE category = ? AND filename = ?',
+                               [(category, filename) for filename in known.keys() - seen])
+        self._conn.execute('INSERT OR REPLACE INTO directories (category, mtime_ns) VALUES (?, ?)',
+                           (category, mtime_ns))
+
+    def lookup(self, filename: str) -> Optional[Tuple[str, str]]:
+        """
+        Находит сохраненный файл по имени.
+
+        Returns:
+            Пара (категория, путь к директории) или None, если файла нет
+        """
+        for attempt in range(2):
+            with self._lock:
+                rows = self._conn.execute(
+                    'SELECT category FROM reports WHERE filename = ?', (filename,)).fetchall()
+            # Категории проверяются в порядке directories, как при обходе директорий
+            categories = {row[0] for row in rows}
+            for category, dir_path in self.directories.items():
+                if category in categories and os.path.isfile(os.path.join(dir_path, filename)):
+                    return category, dir_path
+            if attempt == 0:
+                # Файла нет в индексе или он удален: сверяем индекс с директориями
+                self.reconcile()
+        return None
+
+    def list(self, args: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Возвращает страницу сохраненных файлов, начиная с самых новых.
+
+        Args:
+            args: Параметры запроса: limit, cursor, category, type, q
+                (подстрока имени файла), since и until (дата ISO 8601)
+
+        Returns:
+            Словарь с файлами страницы, общим числом файлов и курсором следующей страницы
+
+        Raises:
+            PageRequestError: При некорректных параметрах
+        """
+        self.reconcile()
+
+        try:
+            limit = int(args.get('limit') or DEFAULT_PAGE_SIZE)
+        except ValueError:
+            raise PageRequestError('limit must be an integer')
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        conditions: List[str] = []
+        params: List[Any] = []
+        if args.get('category'):
+            conditions.append('category = ?')
+            params.append(args['category'])
+        if args.get('type'):
+            conditions.append('type = ?')
+            params.append(args['type'])
+        if args.get('q'):
+            conditions.append("filename LIKE ? ESCAPE '\\'")
+            escaped = args['q'].replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(f'%{escaped}%')
+        if args.get('since'):
+            conditions.append('created >= ?')
+            params.append(_parse_date(args['since'], 'since', end_of_day=False))
+        if args.get('until'):
+            conditions.append('created < ?')
+            params.append(_parse_date(args['until'], 'until', end_of_day=True))
+
+        where = ' AND '.join(conditions) or '1'
+        page_conditions = where
+        page_params = list(params)
+        if args.get('cursor'):
+            created, filename = _decode_cursor(args['cursor'])
+            page_conditions += ' AND (created < ? OR (created = ? AND filename > ?))'
+            page_params.extend([created, created, filename])
+
+        with self._lock:
+            total = self._conn.execute(f'SELECT COUNT(*) FROM reports WHERE {where}', params).fetchone()[0]
+            rows = self._conn.execute(
+                f'SELECT category, filename, type, size, created FROM reports WHERE {page_conditions} '
+                'ORDER BY created DESC, filename ASC LIMIT ?',
+                page_params + [limit + 1]
+            ).fetchall()
+
+        next_cursor = _encode_cursor(rows[limit - 1][4], rows[limit - 1][1]) if len(rows) > limit else None
+        return {
+            'reports': [self._to_info(*row) for row in rows[:limit]],
+            'total': total,
+            'next_cursor': next_cursor
+        }
+
+    def _to_info(self, category: str, filename: str, file_type: str, size: int, created: float) -> Dict[str, Any]:
+        from utils.file_manager import FileManager
+
+        return {
+            'filename': filename,
+            'created': datetime.datetime.fromtimestamp(created).strftime('%Y-%m-%d %H:%M:%S'),
+            'path': os.path.join(self.directories[category], filename),
+            'type': file_type,
+            'category': category,
+            'size': FileManager.format_file_size(size)
+        }
+
+    def prune(self, keep: Optional[Tuple[str, str]] = None) -> List[str]:
+        """
+        Удаляет файлы, нарушающие политику хранения: старше max_age или
+        самые старые сверх max_total_bytes.
+
+        Args:
+            keep: Файл (категория, имя), который нельзя удалять, например только что сохраненный
+
+        Returns:
+            Имена удаленных файлов
+        """
+        if self.max_age is None and self.max_total_bytes is None:
+            return []
+
+        expired: List[Tuple[str, str]] = []
+        with self._lock:
+            if self.max_age is not None:
+                expired.extend(self._conn.execute(
+                    'SELECT category, filename FROM reports WHERE created < ?',
+                    (time.time() - self.max_age,)).fetchall())
+
+            if self.max_total_bytes is not None:
+                excess = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM reports').fetchone()[0] \
+                    - self.max_total_bytes
+                if excess > 0:
+                    expired_set = set(expired)
+                    for category, filename, size in self._conn.execute(
+                            'SELECT category, filename, size FROM reports ORDER BY created ASC, filename ASC'):
+                        if excess <= 0:
+                            break
+                        if (category, filename) == keep:
+                            continue
+                        if (category, filename) not in expired_set:
+                            expired.append((category, filename))
+                        excess -= size
+
+            expired = [item for item in expired if item != keep]
+            versions = {category: self.directory_version(category) for category, _ in expired}
+            for category, filename in expired:
+                try:
+                    os.unlink(os.path.join(self.directories[category], filename))
+                except OSError:
+                    pass
+            with self._conn:
+                self._conn.executemany('DELETE FROM reports WHERE category = ? AND filename = ?', expired)
+                for category, version in versions.items():
+                    self._advance_directory(category, version)
+
+        return [filename for _, filename in expired]
+
+
+def _parse_date(value: str, name: str, end_of_day: bool) -> float:
+    try:
+        moment = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise PageRequestError(f'{name} must be a date in ISO 8601 format')
+    if end_of_day and len(value) == 10:
+        # Дата без времени включает весь день
+        moment += datetime.timedelta(days=1)
+    return moment.timestamp()
+
+
+def _encode_cursor(created: float, filename: str) -> str:
+    payload = json.dumps([created, filename], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created, filename = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return float(created), str(filename)
+    except (ValueError, TypeError):
+        raise PageRequestError('Invalid cursor')
@@ -0,0 +1,348 @@
+# result_store.py
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+from analyzer.model import json_default
+
+
+# Объем JSON отчета почти пропорционален числу строк кода проекта (записи
+# функций и метрик) с небольшой добавкой на модуль (граф зависимостей)
+_BASE_BYTES = 2048
+_BYTES_PER_MODULE = 512
+_BYTES_PER_LOC = 44
+
+
+def estimate_size(report: Dict[str, Any]) -> int:
+    """Оценивает объем памяти отчета по числу модулей и строк кода, не сериализуя его"""
+    modules = report.get('modules') or ()
+    return _BASE_BYTES + _BYTES_PER_MODULE * len(modules) + _BYTES_PER_LOC * (report.get('total_loc') or 0)
+
+
+class ResultStore:
+    """
+    Базовый класс хранилища результатов анализа.
+
+    Поддерживает словарный интерфейс (in, [], get), поэтому может
+    использоваться вместо обычного словаря analysis_results. Наследники
+    переопределяют __contains__, чтобы проверка in не загружала отчет.
+    """
+
+    def get(self, project_id: str, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    def put(self, project_id: str, report: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def delete(self, project_id: str) -> None:
+        raise NotImplementedError
+
+    def __contains__(self, project_id: str) -> bool:
+        return self.get(project_id) is not None
+
+    def __getitem__(self, project_id: str) -> Dict[str, Any]:
+        report = self.get(project_id)
+        if report is None:
+            raise KeyError(project_id)
+        return report
+
+    def __setitem__(self, project_id: str, report: Dict[str, Any]) -> None:
+        self.put(project_id, report)
+
+    def __delitem__(self, project_id: str) -> None:
+        self.delete(project_id)
+
+
+class _LRUCache:
+    """LRU-кеш отчетов с ограничением по объему и времени жизни записей"""
+
+    def __init__(self, max_bytes: int, ttl: Optional[float]):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.total_bytes = 0
+        # project_id -> (отчет, размер, время сохранения, метка версии)
+        self._entries: 'OrderedDict[str, Tuple[Dict[str, Any], int, float, Any]]' = OrderedDict()
+
+    def get(self, project_id: str) -> Optional[Tuple[Dict[str, Any], Any]]:
+        entry = self._entries.get(project_id)
+        if entry is None:
+            return None
+
+        report, size, stored_at, tag = entry
+        if self.is_expired(stored_at):
+            self.pop(project_id)
+            return None
+
+        self._entries.move_to_end(project_id)
+        return report, tag
+
+    def put(self, project_id: str, report: Dict[str, Any], size: int,
+            stored_at: float, tag: Any = None) -> List[Tuple[str, Dict[str, Any], float]]:
+        """Сохраняет запись и возвращает вытесненные записи (id, отчет, время сохранения)"""
+        self.pop(project_id)
+        self._entries[project_id] = (report, size, stored_at, tag)
+        self.total_bytes += size
+
+        evicted = []
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            old_id, (old_report, old_size, old_stored_at, _) = self._entries.popitem(last=False)
+            self.total_bytes -= old_size
+            if not self.is_expired(old_stored_at):
+                evicted.append((old_id, old_report, old_stored_at))
+        return evicted
+
+    def pop(self, project_id: str) -> None:
+        entry = self._entries.pop(project_id, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def is_expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+
+def _write_json_atomic(file_path: str, report: Dict[str, Any], stored_at: float) -> None:
+    """Записывает отчет в файл атомарно, чтобы другие процессы не прочитали его частично"""
+    directory = os.path.dirname(file_path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(report, f, separators=(',', ':'), default=json_default)
+        os.utime(tmp_path, (stored_at, stored_at))
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class MemoryResultStore(ResultStore):
+    """
+    Хранилище отчетов в памяти процесса с LRU/TTL-вытеснением.
+
+    Когда суммарный объем отчетов превышает max_bytes, давно не
+    использованные отчеты вытесняются. Если задана spill_dir, вытесненные
+    отчеты сохраняются на диск и загружаются обратно при обращении.
+    Объем директории ограничен max_spill_bytes: после вытеснения удаляются
+    просроченные и самые старые файлы, в том числе оставшиеся от прежних
+    запусков.
+    """
+
+    def __init__(self, max_bytes: int, ttl: Optional[float] = None, spill_dir: Optional[str] = None,
+                 max_spill_bytes: Optional[int] = None):
+        """
+        Args:
+            max_bytes: Бюджет памяти для отчетов (по оценке estimate_size)
+            ttl: Время жизни отчета в секундах, None - без ограничения
+            spill_dir: Директория для вытесненных отчетов; создается при первом вытеснении
+            max_spill_bytes: Максимальный объем файлов в spill_dir, None - без ограничения
+        """
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+        self._cache = _LRUCache(max_bytes, ttl)
+        self._lock = threading.RLock()
+
+    def get(self, project_id: str, default: Any = None) -> Any:
+        with self._lock:
+            cached = self._cache.get(project_id)
+            if cached is not None:
+                return cached[0]
+
+            report, stored_at = self._load_spilled(project_id)
+            if report is None:
+                return default
+
+            self._put_cached(project_id, report, stored_at)
+            return report
+
+    def put(self, project_id: str, report: Dict[str, Any]) -> None:
+        with self._lock:
+            self._remove_spilled(project_id)
+            self._put_cached(project_id, report, time.time())
+
+    def delete(self, project_id: str) -> None:
+        with self._lock:
+            self._cache.pop(project_id)
+            self._remove_spilled(project_id)
+
+    def __contains__(self, project_id: str) -> bool:
+        with self._lock:
+            if self._cache.get(project_id) is not None:
+                return True
+            if not self.spill_dir:
+                return False
+            try:
+                stored_at = os.path.getmtime(self._spill_path(project_id))
+            except OSError:
+                return False
+            return not self._cache.is_expired(stored_at)
+
+    def _put_cached(self, project_id: str, report: Dict[str, Any], stored_at: float) -> None:
+        evicted = self._cache.put(project_id, report, estimate_size(report), stored_at)
+        if self.spill_dir and evicted:
+            for old_id, old_report, old_stored_at in evicted:
+                _write_json_atomic(self._spill_path(old_id), old_report, old_stored_at)
+            self._trim_spilled()
+
+    def _trim_spilled(self) -> None:
+        """Удаляет просроченные файлы spill_dir и самые старые файлы сверх max_spill_bytes"""
+        files = []
+        try:
+            with os.scandir(self.spill_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith('.json'):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    files.append((st.st_mtime, st.st_size, entry.path))
+        except OSError:
+            return
+
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for stored_at, size, path in files:
+            if not self._cache.is_expired(stored_at) and \
+                    (self.max_spill_bytes is None or total <= self.max_spill_bytes):
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def _spill_path(self, project_id: str) -> str:
+        return os.path.join(self.spill_dir, f'{project_id}.json')
+
+    def _load_spilled(self, project_id: str) -> Tuple[Optional[Dict[str, Any]], float]:
+        if not self.spill_dir:
+            return None, 0.0
+
+        file_path = self._spill_path(project_id)
+        try:
+            stored_at = os.path.getmtime(file_path)
+            if self._cache.is_expired(stored_at):
+                os.remove(file_path)
+                return None, 0.0
+
+            with open(file_path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            return None, 0.0
+
+        # Отчет возвращается в память, копия на диске больше не нужна
+        os.remove(file_path)
+        return report, stored_at
+
+    def _remove_spilled(self, project_id: str) -> None:
+        if self.spill_dir:
+            try:
+                os.remove(self._spill_path(project_id))
+            except OSError:
+                pass
+
+
+class SharedFileResultStore(ResultStore):
+    """
+    Хранилище отчетов в общей директории для нескольких процессов.
+
+    Каждый отчет хранится в отдельном файле, поэтому любой воркер
+    (например, gunicorn) может отдать отчет, созданный другим воркером.
+    Прочитанные отчеты кешируются в памяти процесса в пределах max_bytes
+    и перечитываются, если файл был изменен.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, ttl: Optional[float] = None):
+        """
+        Args:
+            directory: Общая директория отчетов; создается при первой записи
+            max_bytes: Бюджет памяти процесса для прочитанных отчетов
+            ttl: Время жизни отчета в секундах, None - без ограничения
+        """
+        self.directory = directory
+        self._cache = _LRUCache(max_bytes, ttl)
+        self._lock = threading.RLock()
+
+    def get(self, project_id: str, default: Any = None) -> Any:
+        file_path = self._path(project_id)
+        try:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._cache.pop(project_id)
+            return default
+
+        stored_at = mtime_ns / 1e9
+        with self._lock:
+            if self._cache.is_expired(stored_at):
+                self.delete(project_id)
+                return default
+
+            cached = self._cache.get(project_id)
+            if cached is not None and cached[1] == mtime_ns:
+                return cached[0]
+
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            return default
+
+        with self._lock:
+            self._cache.put(project_id, report, estimate_size(report), stored_at, mtime_ns)
+        return report
+
+    def put(self, project_id: str, report: Dict[str, Any]) -> None:
+        stored_at = time.time()
+        file_path = self._path(project_id)
+        _write_json_atomic(file_path, report, stored_at)
+
+        with self._lock:
+            self._cache.put(project_id, report, estimate_size(report), stored_at,
+                            os.stat(file_path).st_mtime_ns)
+
+    def delete(self, project_id: str) -> None:
+        with self._lock:
+            self._cache.pop(project_id)
+        try:
+            os.remove(self._path(project_id))
+        except OSError:
+            pass
+
+    def __contains__(self, project_id: str) -> bool:
+        try:
+            stored_at = os.stat(self._path(project_id)).st_mtime_ns / 1e9
+        except OSError:
+            return False
+        return not self._cache.is_expired(stored_at)
+
+    def _path(self, project_id: str) -> str:
+        return os.path.join(self.directory, f'{project_id}.json')
+
+
+def create_result_store(backend: str, directory: str, max_bytes: int,
+                        ttl: Optional[float] = None, max_spill_bytes: Optional[int] = None) -> ResultStore:
+    """
+    Создает хранилище результатов по имени бэкенда.
+
+    Args:
+        backend: 'memory' - память процесса с вытеснением на диск,
+            'shared' - общая директория для нескольких процессов
+        directory: Директория для вытесненных или общих отчетов
+        max_bytes: Бюджет памяти для отчетов
+        ttl: Время жизни отчета в секундах, None - без ограничения
+        max_spill_bytes: Максимальный объем вытесненных на диск отчетов ('memory')
+
+    Returns:
+        Хранилище результатов
+    """
+    if backend == 'memory':
+        return MemoryResultStore(max_bytes, ttl, spill_dir=directory, max_spill_bytes=max_spill_bytes)
+    if backend == 'shared':
+        return SharedFileResultStore(directory, max_bytes, ttl)
+
+    raise ValueError(f'Unknown result store backend: {backend}')